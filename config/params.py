@@ -1,9 +1,11 @@
 # =======================================
 # bkw_sim_amelia1/config/params.py
 # =======================================
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from typing import Optional, List
 import datetime
+import hashlib
+import json
 
 # ------------------------------------------------------------
 # 借入パラメータ
@@ -53,6 +55,23 @@ class AdditionalInvestmentParams:
     def depreciation_years(self):
         return self.life
 
+# ------------------------------------------------------------
+# 時系列スケジュール（家賃推移・空室・費用の物価連動）
+#   未指定（SimulationParams.schedule = None）なら従来どおり定額。
+#   年の区切りはシミュレーション年（開始月から12ヶ月ごと）。
+# ------------------------------------------------------------
+@dataclass
+class ScheduleParams:
+    rent_growth_rate: float = 0.0                     # 家賃の年次変化率（複利。負値で下落）
+    rent_age_decline_rate: float = 0.0                # 築年数による家賃下落率（年率）
+    rent_age_decline_until: Optional[int] = None      # この築年数で下落停止（None = 停止しない）
+    rent_index_by_year: Optional[List[float]] = None  # 年次家賃倍率の直接指定（指定時は上記2項目を無視）
+    vacancy_rate: float = 0.0                         # 空室率（全期間一定）
+    vacancy_by_year: Optional[List[float]] = None     # 年次空室率カーブ（指定時は vacancy_rate を無視）
+    cost_indexation_rate: float = 0.0                 # 管理費・修繕費・保険料・その他販管費の物価上昇率
+    # ※ 年次リストが保有期間より短い場合、最終値を以後も適用する
+    # ※ 固定資産税は評価替えベースのため物価連動の対象外
+
 # ------------------------------------------------------------
 # シミュレーション全体パラメータ
 # ------------------------------------------------------------
@@ -99,6 +118,12 @@ class SimulationParams:
     income_tax_rate: float = 0.20       # 個人の所得税率（デフォルト20%）
     corporate_tax_rate: float = 0.30    # 法人の法人税率（デフォルト30%）
 
+    # 家賃・空室・費用の時系列スケジュール（None = 定額）
+    schedule: Optional[ScheduleParams] = None
+
+    # 決算月（1〜12）。事業年度・消費税精算・税計算の区切り（個人は 12 = 暦年）
+    fiscal_year_end_month: int = 12
+
     # --------------------------------------------------------
     # 実効税率プロパティ（Tax Engine が参照する単一窓口）
     # --------------------------------------------------------
@@ -137,4 +162,70 @@ class SimulationParams:
     def monthly_other_management_cost(self):
         return self.other_management_fee_annual / 12
 
+# ------------------------------------------------------------
+# 事業体パラメータ（ポートフォリオ全体の税計算に使用）
+#   TaxEngine は entity_type / effective_tax_rate のみ参照するため、
+#   SimulationParams の代わりにそのまま渡せる。
+# ------------------------------------------------------------
+@dataclass
+class EntityParams:
+    entity_type: str = "corporate"
+    income_tax_rate: float = 0.20
+    corporate_tax_rate: float = 0.30
+    fiscal_year_end_month: int = 12
+
+    @property
+    def effective_tax_rate(self) -> float:
+        if self.entity_type == "corporate":
+            return self.corporate_tax_rate
+        return self.income_tax_rate
+
+# ------------------------------------------------------------
+# 正規化シリアライズ（シナリオ保存・重複判定・キャッシュキー用）
+# ------------------------------------------------------------
+def params_to_dict(params: SimulationParams) -> dict:
+    """SimulationParams を JSON 化可能な dict に変換する（日付は ISO 文字列）。"""
+    d = asdict(params)
+    if d.get("start_date") is not None:
+        d["start_date"] = d["start_date"].isoformat()
+    return d
+
+
+def params_from_dict(d: dict) -> SimulationParams:
+    """params_to_dict() の逆変換。"""
+    d = dict(d)
+    if d.get("initial_loan") is not None:
+        d["initial_loan"] = LoanParams(**d["initial_loan"])
+    d["exit_params"] = ExitParams(**d["exit_params"])
+    d["additional_investments"] = [
+        AdditionalInvestmentParams(**inv) for inv in d.get("additional_investments") or []
+    ]
+    if d.get("start_date"):
+        d["start_date"] = datetime.date.fromisoformat(d["start_date"])
+    if d.get("schedule") is not None:
+        d["schedule"] = ScheduleParams(**d["schedule"])
+    return SimulationParams(**d)
+
+
+def params_fingerprint(params: SimulationParams) -> str:
+    """
+    パラメータ内容の正規ハッシュ（SHA-256 の16進文字列）。
+    同じ入力なら必ず同じ値になる（キー順・int/float 表記の揺れを吸収）。
+    """
+    def normalize(v):
+        if isinstance(v, dict):
+            return {k: normalize(v[k]) for k in sorted(v)}
+        if isinstance(v, list):
+            return [normalize(x) for x in v]
+        if isinstance(v, bool) or v is None or isinstance(v, str):
+            return v
+        if isinstance(v, (int, float)):
+            return float(v)
+        return v
+
+    canonical = json.dumps(
+        normalize(params_to_dict(params)), ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
 # =========== END OF FILE ===========
\ No newline at end of file
@@ -0,0 +1,139 @@
+# ============================================================
+# core/bookkeeping/annual_entries.py
+# 年次集計モード（スクリーニング用）の仕訳生成
+# ============================================================
+#
+# 【責務】
+#   MonthlyEntryGenerator と同じ金額を、科目（借方・貸方）ごとに
+#   1年分まとめて1仕訳として記帳する。月次フェーズの仕訳件数が約 1/12 になり、
+#   台帳・財務諸表作成（FinancialStatementBuilder）の処理量も比例して減る。
+#   取得・Exit・決算（消費税精算・税計算・最終精算）の仕訳は月次モードと同数
+#   （1回の実行で約30件）のため、全仕訳の比は保有年数が短いほど 1/12 から離れる。
+#
+# 【金額の算出】
+#   家賃・費用・固定資産税 : MonthlySchedule の月次配列を年単位で合計
+#   減価償却               : 稼働中ユニットの月額 × 当年の償却月数
+#   借入返済               : LoanUnit.monthly_payment() を当年の月数分実行し、
+#                            利息・元金をそれぞれ合計（丸めは月次モードと同一、残高も更新）
+#   追加設備取得           : 月次モードと同じく取得月の日付で個別に記帳
+#
+#   各月の預金増減は cash_flows に残し、当座借越（OverdraftEngine.apply_year）が
+#   月次モードと同じ順序で借入・利息・返済を再現する。
+#
+# 【日付】
+#   集計仕訳はその事業年度（期間表 PeriodCalendar）の最初の月の日付で記帳する。
+#   記帳範囲（generate_span）が2つの事業年度にまたがる場合は事業年度ごとに分ける。
+#   Simulation はシミュレーション年末・決算月ごとに範囲を区切って呼ぶ。
+#
+# 【月次モードとの差】
+#   財務諸表（PL / BS / CF）は円未満の丸め差の範囲で月次モードと一致する。
+#
+# ============================================================
+
+import numpy as np
+
+from core.bookkeeping.monthly_entries import MonthlyEntryGenerator
+from core.ledger.journal_entry import make_entry_pair
+
+
+class AnnualEntryGenerator(MonthlyEntryGenerator):
+    """
+    年次集計モードの仕訳生成。
+    イベント（追加設備取得・償却/借入の開始終了）の扱いは MonthlyEntryGenerator と共通。
+
+    generate_span() 後の cash_flows :
+        [(記帳日, [各月の預金増減, ...]), ...]（事業年度ごと）
+    """
+
+    cash_flows = ()
+
+    def _sum_taxable_expense(self, totals: dict, split: dict, sl, expense_acct: str) -> None:
+        mask = split["gross"][sl] > 0
+        self._add(totals, expense_acct, "預金", split["tax_base"][sl][mask].sum())
+        self._add(totals, "仮払消費税", "預金", split["vat_deductible"][sl][mask].sum())
+        self._add(totals, "租税公課（消費税）", "預金", split["vat_nondeductible"][sl][mask].sum())
+
+    @staticmethod
+    def _add(totals: dict, dr: str, cr: str, amount: float) -> None:
+        totals[(dr, cr)] = totals.get((dr, cr), 0.0) + float(amount)
+
+    # ============================================================
+    # 年次仕訳生成メイン
+    # ============================================================
+    def generate_year(self, sim_year: int) -> bool:
+        """シミュレーション年 sim_year の12ヶ月分"""
+        return self.generate_span((sim_year - 1) * 12 + 1, sim_year * 12)
+
+    def generate_span(self, first: int, last: int) -> bool:
+        """通算月 first〜last（両端を含む）をまとめて記帳する。"""
+        sc = self._schedule_for(last - 1)
+
+        # 事業年度ごとに通算月をまとめる
+        groups = {}
+        for idx in range(first, last + 1):
+            d  = self.map_sim_to_calendar(idx)
+            fy = self.calendar.fiscal_year_of(d)
+            groups.setdefault(fy, []).append((idx, d))
+
+        self.cash_flows = []
+        for months in groups.values():
+            d0     = months[0][1]
+            totals = {}   # (借方, 貸方) → 金額（記帳順を保持）
+
+            # 月次配列の範囲（sim_month_index − 1、事業年度内の月は連続）
+            sl = slice(months[0][0] - 1, months[-1][0])
+
+            # 1) 家賃収入
+            rent_mask = sc.rent_gross[sl] > 0
+            self._add(totals, "預金", "売上高", sc.rent_sales[sl][rent_mask].sum())
+            self._add(totals, "預金", "仮受消費税", sc.rent_recv_vat[sl][rent_mask].sum())
+
+            # 2)〜6) 費用
+            self._sum_taxable_expense(totals, sc.expenses["管理費"], sl, "管理費")
+            self._sum_taxable_expense(totals, sc.expenses["修繕費"], sl, "修繕費")
+            self._add(totals, "保険料", "預金", sc.insurance[sl].sum())
+            self._sum_taxable_expense(totals, sc.expenses["その他販管費"], sl, "その他販管費")
+            self._add(totals, "固定資産税（土地）", "預金", sc.fa_tax_land[sl].sum())
+            self._add(totals, "固定資産税（建物）", "預金", sc.fa_tax_building[sl].sum())
+
+            # 各月の預金増減（上記の集計対象分）
+            cash = (
+                np.where(rent_mask, sc.rent_sales[sl] + sc.rent_recv_vat[sl], 0.0)
+                - sc.insurance[sl] - sc.fa_tax_land[sl] - sc.fa_tax_building[sl]
+            )
+            for acct in sc.TAXABLE_EXPENSES:
+                e = sc.expenses[acct]
+                cash = cash - np.where(
+                    e["gross"][sl] > 0,
+                    e["tax_base"][sl] + e["vat_deductible"][sl] + e["vat_nondeductible"][sl],
+                    0.0,
+                )
+            cash = cash.tolist()
+
+            # 7)〜9) 追加設備取得（個別記帳）・減価償却・借入返済（月ごとに計算して合計）
+            for k, (idx, d) in enumerate(months):
+                before = self.ledger.cash_balance
+                self._process_events(idx, d)
+                cash[k] += self.ledger.cash_balance - before
+
+                for unit in self._depreciating_units(idx, d):
+                    if unit.asset_type == "building":
+                        self._add(totals, "建物減価償却費", "建物減価償却累計額", unit.monthly_amount())
+                    else:
+                        self._add(totals, "追加設備減価償却費", "追加設備減価償却累計額", unit.monthly_amount())
+
+                for interest_acct, principal_acct, interest, principal in self._loan_payments(idx):
+                    self._add(totals, interest_acct, "預金", interest)
+                    self._add(totals, principal_acct, "預金", principal)
+                    cash[k] -= interest + principal
+
+            for (dr, cr), amount in totals.items():
+                if amount > 0:
+                    self.ledger.add_entries(make_entry_pair(d0, dr, cr, amount))
+            self.cash_flows.append((d0, cash))
+
+        return True
+
+# ============================================================
+# core/bookkeeping/annual_entries.py end
+# ============================================================
@@ -4,10 +4,17 @@
 # ============================================================
 
 from datetime import date
+
+import numpy as np
+
 from core.tax.tax_splitter import split_vat
+from core.bookkeeping.posting_plan import compile_posting_plan
+from core.bookkeeping.schedule import MonthlySchedule
 from core.depreciation.unit import DepreciationUnit
 from core.engine.loan_engine import LoanUnit
 from core.ledger.journal_entry import make_entry_pair
+from core.simulation.event_scheduler import EventScheduler
+from core.simulation.period_calendar import PeriodCalendar
 
 
 class MonthlyEntryGenerator:
@@ -25,253 +32,272 @@ class MonthlyEntryGenerator:
         4. 保険料（個別科目・非課税）
         5. その他販管費（個別科目）
         3. 固定資産税（土地・建物 別科目）
-        4. 追加設備取得（投資年月に一致する場合のみ）
+        4. 追加設備取得（投資年の1月、capex イベント）
         5. 減価償却（建物・追加設備）
         6. 借入返済（利息 + 元金）
+
+    記帳計画（core/bookkeeping/posting_plan.py）：
+        1)〜5)・固定資産税は月ごとの (借方, 貸方, 金額) の並びに事前展開し、
+        各月は日付を付けて記帳するだけにする。
+
+    イベント駆動（core/simulation/event_scheduler.py）：
+        追加設備取得・償却開始/終了・借入開始/終了は通算月のイベントとして
+        事前登録し、各月は期日の到来したイベントと稼働中のユニットだけを処理する。
+        償却期間は登録時にカレンダー配列から一括判定する（is_active と同じ式）。
     """
 
-    def __init__(self, params, ledger, calendar_mapper):
+    def __init__(self, params, ledger, calendar_mapper, scheduler: EventScheduler = None):
         self.p = params
         self.ledger = ledger
         self.map_sim_to_calendar = calendar_mapper
+        self.scheduler = scheduler if scheduler is not None else EventScheduler()
 
         self.vat_rate          = float(params.consumption_tax_rate)
         self.non_taxable_ratio = float(params.non_taxable_proportion)
         self.taxable_ratio     = 1.0 - self.non_taxable_ratio
 
+        # 家賃・費用の月次金額（保有期間分を一括計算）と経常仕訳の記帳計画
+        #   費用関連の入力が同じシナリオ間で共有される（変更しないこと）
+        self.plan     = compile_posting_plan(params)
+        self.schedule = self.plan.schedule
+
+        # 保有期間全月の期間表（償却期間の判定・年次集計の事業年度）
+        #   PeriodCalendar を渡された場合はその表を使い、
+        #   日付を返す関数の場合は通算月1の日付から同じ表を作る。
+        self._horizon = int(params.holding_years) * 12
+        if isinstance(calendar_mapper, PeriodCalendar) and calendar_mapper.n_months >= self._horizon:
+            self.calendar = calendar_mapper
+        else:
+            self.calendar = PeriodCalendar(
+                calendar_mapper(1), self._horizon, params.fiscal_year_end_month
+            )
+        self._cal_year  = self.calendar.year[:self._horizon]
+        self._cal_month = self.calendar.month[:self._horizon]
+
+        # 稼働中のユニット（登録順の連番 → ユニット）
+        self._live_dep  = {}
+        self._live_loan = {}
+        self._n_dep  = 0
+        self._n_loan = 0
+
+        # 追加設備取得（AdditionalInvestmentParams は year フィールドのみ、月は1月固定）
+        for inv in params.additional_investments or []:
+            if int(inv.year) >= 1:
+                self.scheduler.schedule((int(inv.year) - 1) * 12 + 1, "capex", inv)
+
+        # Phase 1 で登録済みのユニット（建物・初期ローン）
+        self._adopt_units()
+
     # ============================================================
-    # 月次仕訳生成メイン（仕様書6.2節 generate(sim_month_index)）
+    # イベント登録
     # ============================================================
-    def generate(self, sim_month_index: int) -> bool:
+    def _adopt_units(self) -> None:
+        """台帳に新たに登録されたユニットの開始・終了イベントを登録する。"""
+        units = self.ledger.depreciation_units
+        while self._n_dep < len(units):
+            self._schedule_depreciation(self._n_dep, units[self._n_dep])
+            self._n_dep += 1
 
-        d0 = self.map_sim_to_calendar(sim_month_index)
-        p  = self.p
+        loans = self.ledger.loan_units
+        while self._n_loan < len(loans):
+            loan = loans[self._n_loan]
+            self.scheduler.schedule(loan.start_sim_month, "loan_on", (self._n_loan, loan))
+            self.scheduler.schedule(loan.start_sim_month + loan.total_months, "loan_off", self._n_loan)
+            self._n_loan += 1
 
-        # シミュレーション年（1始まり）
-        sim_year  = (sim_month_index - 1) // 12 + 1
-        sim_month = (sim_month_index - 1) % 12 + 1
+    def _schedule_depreciation(self, key: int, unit) -> None:
+        """
+        保有期間内で unit.is_active となる区間ごとに dep_on / dep_off を登録する。
+        保有期間末まで続く区間は dep_off を登録しない。
+        """
+        elapsed = (self._cal_year - unit.start_year) * 12 + (self._cal_month - unit.start_month)
+        active  = ((elapsed >= 0) & (elapsed < unit.total_months)).astype(np.int8)
+        edges   = np.diff(np.concatenate([[0], active, [0]]))
+        starts  = np.flatnonzero(edges == 1) + 1    # 通算月（1始まり）
+        ends    = np.flatnonzero(edges == -1) + 1   # 区間の翌月
+        for on, off in zip(starts, ends):
+            self.scheduler.schedule(int(on), "dep_on", (key, unit))
+            if off <= self._horizon:
+                self.scheduler.schedule(int(off), "dep_off", key)
 
-        # ============================================================
-        # 1) 家賃収入（税込 → 税抜 + 仮受消費税）
-        # ============================================================
-        # 売上収入の分解：
-        #   非課税部分（住宅賃料）= gross × non_taxable_ratio  → 消費税なし、全額売上
-        #   課税部分（課税賃料）  = gross × (1 - non_taxable_ratio) = 税込
-        #     課税税抜  = 課税部分 / (1 + vat_rate)
-        #     仮受消費税 = 課税部分 - 課税税抜
-        #   売上高 = 課税税抜 + 非課税部分
-        if p.monthly_rent_incl > 0:
-            gross = float(p.monthly_rent_incl)
-            nontax_amount = round(gross * self.non_taxable_ratio)
-            taxable_incl  = gross - nontax_amount
-            taxable_excl  = round(taxable_incl / (1.0 + self.vat_rate)) if self.vat_rate > 0 else taxable_incl
-            recv_vat      = round(taxable_incl - taxable_excl)
-            sales_amount  = taxable_excl + nontax_amount
-            # 税抜売上高（課税税抜 + 非課税全額）
-            self.ledger.add_entries(make_entry_pair(
-                d0, "預金", "売上高", sales_amount
-            ))
-            # 仮受消費税（課税部分のみ）
-            if recv_vat > 0:
-                self.ledger.add_entries(make_entry_pair(
-                    d0, "預金", "仮受消費税", recv_vat
-                ))
+    def _process_events(self, sim_month_index: int, d0) -> None:
+        """期日の到来したイベントを登録順に処理する。"""
+        self._adopt_units()
+        for kind, payload in self.scheduler.pop_due(sim_month_index):
+            if kind == "capex":
+                self._acquire_additional(payload, sim_month_index, d0)
+                self._adopt_units()
+            elif kind == "dep_on":
+                key, unit = payload
+                self._live_dep[key] = unit
+            elif kind == "dep_off":
+                self._live_dep.pop(payload, None)
+            elif kind == "loan_on":
+                key, loan = payload
+                self._live_loan[key] = loan
+            elif kind == "loan_off":
+                self._live_loan.pop(payload, None)
 
-        # ============================================================
-        # 2) 管理費（税込 → 管理費 + VAT）
-        # ============================================================
-        if p.monthly_admin_cost_incl > 0:
-            a = split_vat(
-                gross_amount=float(p.monthly_admin_cost_incl),
-                vat_rate=self.vat_rate,
-                non_taxable_ratio=self.non_taxable_ratio,
-            )
-            self.ledger.add_entries(make_entry_pair(
-                d0, "管理費", "預金", a["tax_base"]
-            ))
-            if a["vat_deductible"] > 0:
-                self.ledger.add_entries(make_entry_pair(
-                    d0, "仮払消費税", "預金", a["vat_deductible"]
-                ))
-            # 控除不能 VAT → 租税公課（消費税）
-            if a["vat_nondeductible"] > 0:
-                self.ledger.add_entries(make_entry_pair(
-                    d0, "租税公課（消費税）", "預金", a["vat_nondeductible"]
-                ))
+    def _schedule_for(self, i: int) -> MonthlySchedule:
+        """保有期間を超える月が要求された場合は記帳計画・スケジュールを延長する。"""
+        if i >= self.schedule.n_months:
+            self.plan     = compile_posting_plan(self.p, n_months=(i // 12 + 1) * 12)
+            self.schedule = self.plan.schedule
+        return self.schedule
 
-        # ============================================================
-        # 3) 修繕費（税込 → 修繕費 + VAT）
-        # ============================================================
-        if p.monthly_repair_cost_incl > 0:
-            s = split_vat(
-                gross_amount=float(p.monthly_repair_cost_incl),
-                vat_rate=self.vat_rate,
-                non_taxable_ratio=self.non_taxable_ratio,
-            )
+    # ============================================================
+    # 稼働中ユニット
+    # ============================================================
+    def _depreciating_units(self, sim_month_index: int, d0) -> list:
+        """当月に償却するユニット（登録順）。"""
+        # 保有期間外の月は償却区間を事前判定していないため、全ユニットを判定する
+        if sim_month_index > self._horizon:
+            return [u for u in self.ledger.depreciation_units if u.is_active(d0.year, d0.month)]
+        return [self._live_dep[k] for k in sorted(self._live_dep)]
+
+    def _loan_payments(self, sim_month_index: int):
+        """
+        当月の返済（登録順）を (利息科目, 元金科目, 利息, 元金) で返す。
+        LoanUnit.monthly_payment() を呼ぶため残高が更新される。
+        """
+        for key in sorted(self._live_loan):
+            loan = self._live_loan[key]
+            # 期間内でも残高が尽きたら以後は処理しない
+            if not loan.is_active(sim_month_index):
+                del self._live_loan[key]
+                continue
+            interest, principal = loan.monthly_payment()
+
+            # 利息科目・元金科目をローン種別で切り替える
+            if getattr(loan, "loan_type", "initial") == "additional":
+                yield "追加設備借入利息", "追加設備投資借入金", interest, principal
+            else:
+                yield "長期借入金利息", "長期借入金", interest, principal
+
+    # ============================================================
+    # 追加設備取得（capex イベント）
+    # ============================================================
+    def _acquire_additional(self, inv, sim_month_index: int, d0) -> None:
+        gross    = float(inv.amount)
+        add_split = split_vat(
+            gross_amount=gross,
+            vat_rate=self.vat_rate,
+            non_taxable_ratio=self.non_taxable_ratio,
+        )
+        add_net    = add_split["tax_base"]
+        add_vat_d  = add_split["vat_deductible"]
+        add_vat_nd = add_split["vat_nondeductible"]
+
+        # 追加設備本体（税抜）
+        self.ledger.add_entries(make_entry_pair(
+            d0, "追加設備", "預金", add_net
+        ))
+        # 控除可能 VAT
+        if add_vat_d > 0:
             self.ledger.add_entries(make_entry_pair(
-                d0, "修繕費", "預金", s["tax_base"]
+                d0, "仮払消費税", "預金", add_vat_d
             ))
-            if s["vat_deductible"] > 0:
-                self.ledger.add_entries(make_entry_pair(
-                    d0, "仮払消費税", "預金", s["vat_deductible"]
-                ))
-            if s["vat_nondeductible"] > 0:
-                self.ledger.add_entries(make_entry_pair(
-                    d0, "租税公課（消費税）", "預金", s["vat_nondeductible"]
-                ))
-
-        # ============================================================
-        # 4) 保険料（非課税・仮払消費税なし）
-        # ============================================================
-        if p.monthly_insurance_cost > 0:
+        # 控除不能 VAT → 取得原価に算入
+        if add_vat_nd > 0:
             self.ledger.add_entries(make_entry_pair(
-                d0, "保険料", "預金", float(p.monthly_insurance_cost)
+                d0, "追加設備", "預金", add_vat_nd
             ))
+            add_net += add_vat_nd  # 償却対象原価に加算
 
-        # ============================================================
-        # 5) その他販管費（税込 → その他販管費 + VAT）
-        # ============================================================
-        if p.monthly_other_management_cost > 0:
-            o = split_vat(
-                gross_amount=float(p.monthly_other_management_cost),
-                vat_rate=self.vat_rate,
-                non_taxable_ratio=self.non_taxable_ratio,
-            )
+        # 付随借入金（loan_amount > 0 の場合）
+        add_loan_amt = float(getattr(inv, "loan_amount", 0) or 0)
+        if add_loan_amt > 0:
+            # 借入受取仕訳：預金 / 追加設備投資借入金
             self.ledger.add_entries(make_entry_pair(
-                d0, "その他販管費", "預金", o["tax_base"]
+                d0, "預金", "追加設備投資借入金", add_loan_amt
             ))
-            if o["vat_deductible"] > 0:
-                self.ledger.add_entries(make_entry_pair(
-                    d0, "仮払消費税", "預金", o["vat_deductible"]
-                ))
-            if o["vat_nondeductible"] > 0:
-                self.ledger.add_entries(make_entry_pair(
-                    d0, "租税公課（消費税）", "預金", o["vat_nondeductible"]
-                ))
+            # LoanUnit 登録（月次返済に使用）
+            add_loan_unit = LoanUnit(
+                amount=add_loan_amt,
+                annual_rate=float(getattr(inv, "loan_interest_rate", 0) or 0),
+                years=int(getattr(inv, "loan_years", 1) or 1),
+                start_sim_month=sim_month_index,
+                repayment_method="annuity",
+                loan_type="additional",
+            )
+            self.ledger.loan_units.append(add_loan_unit)
+
+        # 減価償却ユニット登録
+        unit_add = DepreciationUnit(
+            acquisition_cost=add_net,
+            useful_life_years=int(inv.life),
+            start_year=d0.year,
+            start_month=d0.month,
+            asset_type="additional",
+        )
+        self.ledger.register_depreciation_unit(unit_add)
+
+    # ============================================================
+    # 月次仕訳生成メイン（仕様書6.2節 generate(sim_month_index)）
+    # ============================================================
+    def generate(self, sim_month_index: int) -> bool:
+
+        d0 = self.map_sim_to_calendar(sim_month_index)
+
+        # 月次金額は MonthlySchedule で事前計算済み（家賃推移・空室・物価連動を反映）
+        i = sim_month_index - 1
+        self._schedule_for(i)
 
         # ============================================================
-        # 6) 固定資産税（土地・建物 別科目・非課税）
-        #    月次按分（年額 ÷ 12）
+        # 1)〜6) 家賃収入・管理費・修繕費・保険料・その他販管費・固定資産税
+        #   科目の組合せと金額は記帳計画（core/bookkeeping/posting_plan.py）に
+        #   展開済みのため、日付を付けて記帳するだけ。
+        #
+        #   家賃の分解：
+        #     非課税部分（住宅賃料）= gross × non_taxable_ratio  → 消費税なし、全額売上
+        #     課税部分（課税賃料）  = gross × (1 - non_taxable_ratio) = 税込
+        #       課税税抜  = 課税部分 / (1 + vat_rate)
+        #       仮受消費税 = 課税部分 - 課税税抜
+        #     売上高 = 課税税抜 + 非課税部分
+        #   課税費用：本体 → 費用科目、控除可能 VAT → 仮払消費税、
+        #             控除不能 VAT → 租税公課（消費税）
+        #   保険料・固定資産税は非課税（月次按分）
         # ============================================================
-        monthly_fa_land = p.fixed_asset_tax_land / 12
-        monthly_fa_bld  = p.fixed_asset_tax_building / 12
-
-        if monthly_fa_land > 0:
-            self.ledger.add_entries(make_entry_pair(
-                d0, "固定資産税（土地）", "預金", monthly_fa_land
-            ))
-        if monthly_fa_bld > 0:
-            self.ledger.add_entries(make_entry_pair(
-                d0, "固定資産税（建物）", "預金", monthly_fa_bld
-            ))
+        self.ledger.add_entries(self.plan.entries(i, d0))
 
         # ============================================================
-        # 7) 追加設備取得（投資年・月が一致する場合のみ）
+        # 7) 追加設備取得（投資年の1月）・償却/借入の開始・終了
         #    フィールド名：inv.year / inv.amount / inv.life（仕様書統一表）
         # ============================================================
-        if p.additional_investments:
-            for inv in p.additional_investments:
-                # AdditionalInvestmentParams は year フィールドのみ（月は1月固定）
-                if inv.year == sim_year and sim_month == 1:
-
-                    gross    = float(inv.amount)
-                    add_split = split_vat(
-                        gross_amount=gross,
-                        vat_rate=self.vat_rate,
-                        non_taxable_ratio=self.non_taxable_ratio,
-                    )
-                    add_net    = add_split["tax_base"]
-                    add_vat_d  = add_split["vat_deductible"]
-                    add_vat_nd = add_split["vat_nondeductible"]
-
-                    # 追加設備本体（税抜）
-                    self.ledger.add_entries(make_entry_pair(
-                        d0, "追加設備", "預金", add_net
-                    ))
-                    # 控除可能 VAT
-                    if add_vat_d > 0:
-                        self.ledger.add_entries(make_entry_pair(
-                            d0, "仮払消費税", "預金", add_vat_d
-                        ))
-                    # 控除不能 VAT → 取得原価に算入
-                    if add_vat_nd > 0:
-                        self.ledger.add_entries(make_entry_pair(
-                            d0, "追加設備", "預金", add_vat_nd
-                        ))
-                        add_net += add_vat_nd  # 償却対象原価に加算
-
-                    # 付随借入金（loan_amount > 0 の場合）
-                    add_loan_amt = float(getattr(inv, "loan_amount", 0) or 0)
-                    if add_loan_amt > 0:
-                        # 借入受取仕訳：預金 / 追加設備投資借入金
-                        self.ledger.add_entries(make_entry_pair(
-                            d0, "預金", "追加設備投資借入金", add_loan_amt
-                        ))
-                        # LoanUnit 登録（月次返済に使用）
-                        add_loan_unit = LoanUnit(
-                            amount=add_loan_amt,
-                            annual_rate=float(getattr(inv, "loan_interest_rate", 0) or 0),
-                            years=int(getattr(inv, "loan_years", 1) or 1),
-                            start_sim_month=sim_month_index,
-                            repayment_method="annuity",
-                            loan_type="additional",
-                        )
-                        self.ledger.loan_units.append(add_loan_unit)
-
-                    # 減価償却ユニット登録
-                    unit_add = DepreciationUnit(
-                        acquisition_cost=add_net,
-                        useful_life_years=int(inv.life),
-                        start_year=d0.year,
-                        start_month=d0.month,
-                        asset_type="additional",
-                    )
-                    self.ledger.register_depreciation_unit(unit_add)
+        self._process_events(sim_month_index, d0)
 
         # ============================================================
         # 8) 減価償却（仕様書6.2節 post_building_depreciation /
         #               post_additional_capex_depreciation）
         # ============================================================
-        for unit in self.ledger.depreciation_units:
-            if unit.is_active(d0.year, d0.month):
-                amt = unit.monthly_amount()
+        for unit in self._depreciating_units(sim_month_index, d0):
+            amt = unit.monthly_amount()
 
-                if unit.asset_type == "building":
-                    dr_acct = "建物減価償却費"
-                    cr_acct = "建物減価償却累計額"
-                else:
-                    dr_acct = "追加設備減価償却費"
-                    cr_acct = "追加設備減価償却累計額"
+            if unit.asset_type == "building":
+                dr_acct = "建物減価償却費"
+                cr_acct = "建物減価償却累計額"
+            else:
+                dr_acct = "追加設備減価償却費"
+                cr_acct = "追加設備減価償却累計額"
 
-                self.ledger.add_entries(make_entry_pair(
-                    d0, dr_acct, cr_acct, amt
-                ))
+            self.ledger.add_entries(make_entry_pair(
+                d0, dr_acct, cr_acct, amt
+            ))
 
         # ============================================================
         # 9) 借入返済（利息 + 元金）
         #    科目名：初期ローン → 長期借入金利息 / 長期借入金
         #           追加設備ローン → 追加設備借入利息 / 追加設備投資借入金
         # ============================================================
-        for loan in self.ledger.loan_units:
-            if loan.is_active(sim_month_index):
-                interest, principal = loan.monthly_payment()
-
-                # 利息科目・元金科目をローン種別で切り替える
-                if getattr(loan, "loan_type", "initial") == "additional":
-                    interest_acct = "追加設備借入利息"
-                    principal_acct = "追加設備投資借入金"
-                else:
-                    interest_acct = "長期借入金利息"
-                    principal_acct = "長期借入金"
-
-                if interest > 0:
-                    self.ledger.add_entries(make_entry_pair(
-                        d0, interest_acct, "預金", interest
-                    ))
-                if principal > 0:
-                    self.ledger.add_entries(make_entry_pair(
-                        d0, principal_acct, "預金", principal
-                    ))
+        for interest_acct, principal_acct, interest, principal in self._loan_payments(sim_month_index):
+            if interest > 0:
+                self.ledger.add_entries(make_entry_pair(
+                    d0, interest_acct, "預金", interest
+                ))
+            if principal > 0:
+                self.ledger.add_entries(make_entry_pair(
+                    d0, principal_acct, "預金", principal
+                ))
 
         return True
 
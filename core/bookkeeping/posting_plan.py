@@ -0,0 +1,181 @@
+# ============================================================
+# core/bookkeeping/posting_plan.py
+# 月次の経常仕訳（家賃・費用・固定資産税）の記帳計画
+# ============================================================
+#
+# 【責務】
+#   MonthlyEntryGenerator 1)〜6)（家賃収入・管理費・修繕費・保険料・
+#   その他販管費・固定資産税）の仕訳は、どの月にどの科目の組合せを
+#   いくらで記帳するかがパラメータだけで決まる。
+#   これを事前に (借方, 貸方, 金額) の並び（テンプレート）へ展開し、
+#   月次ループは日付を付けて記帳するだけにする。
+#     ・金額 0 の行の省略（従来の if 分岐）・消費税分解は展開時に1回だけ行う
+#     ・同じ並びの月（通常は同じシミュレーション年の12ヶ月）は1つのテンプレートを共有する
+#
+# 【キャッシュ】
+#   計画は費用関連の入力（CostInputs）だけで決まるため、
+#   compile_posting_plan() は CostInputs をキーに lru_cache で再利用する。
+#   スイープで借入条件・価格・出口条件だけを変える場合は、全シナリオが同じ計画を共有する。
+#   計画と MonthlySchedule は共有されるため、呼び出し側で変更しないこと。
+#
+# 【記帳順序】
+#   従来の generate() と同一：
+#     1) 売上高 → 仮受消費税
+#     2) 管理費 → 仮払消費税 → 租税公課（消費税）
+#     3) 修繕費 → 同上
+#     4) 保険料
+#     5) その他販管費 → 同上
+#     6) 固定資産税（土地）→ 固定資産税（建物）
+#
+# ============================================================
+
+from dataclasses import astuple, fields
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from config.params import ScheduleParams
+from core.bookkeeping.schedule import MonthlySchedule
+from core.ledger.journal_entry import JournalEntry
+
+
+class CostInputs(NamedTuple):
+    """
+    記帳計画を決める入力（ハッシュ可能）。
+    MonthlySchedule が参照する属性を SimulationParams と同じ名前で持つ。
+    """
+    monthly_rent_incl: float
+    monthly_admin_cost_incl: float
+    monthly_repair_cost_incl: float
+    monthly_insurance_cost: float
+    monthly_other_management_cost: float
+    fixed_asset_tax_land: float
+    fixed_asset_tax_building: float
+    consumption_tax_rate: float
+    non_taxable_proportion: float
+    building_age: int
+    schedule_values: Optional[tuple]   # ScheduleParams のフィールド値（リストはタプル化）
+
+    @property
+    def schedule(self) -> Optional[ScheduleParams]:
+        if self.schedule_values is None:
+            return None
+        names = [f.name for f in fields(ScheduleParams)]
+        return ScheduleParams(**dict(zip(names, self.schedule_values)))
+
+    @classmethod
+    def of(cls, params) -> "CostInputs":
+        s = params.schedule
+        schedule_values = None
+        if s is not None:
+            schedule_values = tuple(tuple(v) if isinstance(v, list) else v for v in astuple(s))
+        return cls(
+            float(params.monthly_rent_incl),
+            float(params.monthly_admin_cost_incl),
+            float(params.monthly_repair_cost_incl),
+            float(params.monthly_insurance_cost),
+            float(params.monthly_other_management_cost),
+            float(params.fixed_asset_tax_land),
+            float(params.fixed_asset_tax_building),
+            float(params.consumption_tax_rate),
+            float(params.non_taxable_proportion),
+            int(params.building_age),
+            schedule_values,
+        )
+
+
+class PostingPlan:
+    """
+    月次の経常仕訳の記帳計画。
+
+    schedule   : 展開元の MonthlySchedule（年次集計モードも参照する）
+    templates  : [((借方, 貸方, 金額), ...), ...]
+    month_template[i] : 通算月 i+1 が使うテンプレートの番号
+    """
+
+    def __init__(self, schedule: MonthlySchedule):
+        self.schedule = schedule
+        self.n_months = schedule.n_months
+
+        rows = _month_rows(schedule)
+        index = {}
+        self.templates = []
+        self.month_template = np.empty(self.n_months, dtype=np.int64)
+        for i, row in enumerate(rows):
+            k = index.get(row)
+            if k is None:
+                k = index[row] = len(self.templates)
+                self.templates.append(row)
+            self.month_template[i] = k
+
+    def postings(self, i: int) -> tuple:
+        """通算月 i+1 の (借方, 貸方, 金額) の並び"""
+        return self.templates[self.month_template[i]]
+
+    def entries(self, i: int, d0) -> list:
+        """通算月 i+1 の仕訳（日付 d0）"""
+        return [
+            JournalEntry(date=d0, description="", dr_account=dr, dr_amount=amount,
+                         cr_account=cr, cr_amount=amount)
+            for dr, cr, amount in self.postings(i)
+        ]
+
+
+def _month_rows(sc: MonthlySchedule) -> list:
+    """各月の (借方, 貸方, 金額) の並び（金額 0 の行は従来の分岐どおり省く）"""
+    n = sc.n_months
+    columns = []   # [(借方, 貸方, 金額配列, 記帳する月のマスク), ...]
+
+    # 1) 家賃収入
+    rent_on = sc.rent_gross > 0
+    columns.append(("預金", "売上高",     sc.rent_sales,    rent_on))
+    columns.append(("預金", "仮受消費税", sc.rent_recv_vat, rent_on & (sc.rent_recv_vat > 0)))
+
+    def taxable(acct):
+        e  = sc.expenses[acct]
+        on = e["gross"] > 0
+        columns.append((acct,                 "預金", e["tax_base"],          on))
+        columns.append(("仮払消費税",         "預金", e["vat_deductible"],    on & (e["vat_deductible"] > 0)))
+        columns.append(("租税公課（消費税）", "預金", e["vat_nondeductible"], on & (e["vat_nondeductible"] > 0)))
+
+    # 2) 管理費 / 3) 修繕費
+    taxable("管理費")
+    taxable("修繕費")
+    # 4) 保険料（非課税）
+    columns.append(("保険料", "預金", sc.insurance, sc.insurance > 0))
+    # 5) その他販管費
+    taxable("その他販管費")
+    # 6) 固定資産税
+    columns.append(("固定資産税（土地）", "預金", sc.fa_tax_land,     sc.fa_tax_land > 0))
+    columns.append(("固定資産税（建物）", "預金", sc.fa_tax_building, sc.fa_tax_building > 0))
+
+    amounts = [np.asarray(a, dtype=float).tolist() for _, _, a, _ in columns]
+    masks   = [np.asarray(m, dtype=bool).tolist() for _, _, _, m in columns]
+    return [
+        tuple(
+            (dr, cr, amounts[c][i])
+            for c, (dr, cr, _, _) in enumerate(columns)
+            if masks[c][i]
+        )
+        for i in range(n)
+    ]
+
+
+@lru_cache(maxsize=256)
+def _compile(inputs: CostInputs, n_months: int) -> PostingPlan:
+    return PostingPlan(MonthlySchedule(inputs, n_months=n_months))
+
+
+def compile_posting_plan(params, n_months: int = None) -> PostingPlan:
+    """
+    SimulationParams → 記帳計画（n_months 省略時は保有期間）。
+    費用関連の入力と月数が同じなら、同じ PostingPlan オブジェクトを返す。
+    """
+    if n_months is None:
+        n_months = int(params.holding_years) * 12
+    return _compile(CostInputs.of(params), int(n_months))
+
+# ============================================================
+# core/bookkeeping/posting_plan.py end
+# ============================================================
@@ -0,0 +1,134 @@
+# ============================================================
+# core/bookkeeping/schedule.py
+# 月次スケジュール（家賃推移・空室・費用の物価連動）の事前計算
+# ============================================================
+#
+# 【責務】
+#   SimulationParams（+ ScheduleParams）から、保有期間全月分の
+#   税込金額と消費税分解結果を numpy 配列で一括計算する。
+#   MonthlyEntryGenerator・CashFlowKernel は月ごとに配列を参照するだけで、
+#   月次ループ内での倍率計算・消費税分解は行わない。
+#
+# 【年次倍率（sim_year = 1 始まり、k = sim_year - 1）】
+#   家賃倍率 :
+#     rent_index_by_year 指定時 → rent_index_by_year[k]
+#     それ以外               → (1 + rent_growth_rate)^k
+#                              × Π_{j<k} (1 − rent_age_decline_rate)［築年数 building_age + j < 停止築年数 のとき］
+#   空室率   : vacancy_by_year[k]（指定時）／ vacancy_rate
+#   費用倍率 : (1 + cost_indexation_rate)^k
+#
+#   月額家賃（税込）= 年額 ÷ 12 × 家賃倍率 × (1 − 空室率)
+#   月額費用（税込）= 年額 ÷ 12 × 費用倍率（管理費・修繕費・保険料・その他販管費）
+#   固定資産税       = 年額 ÷ 12（定額）
+#
+# 【定額（schedule=None）の場合】
+#   全倍率 1.0・空室率 0 となり、従来の monthly_xxx プロパティと同じ金額になる。
+#
+# ============================================================
+
+import numpy as np
+
+from config.params import ScheduleParams
+from core.tax.tax_splitter import split_vat_array
+
+
+def _by_year(values, n_years: int, default: float) -> np.ndarray:
+    """年次リストを n_years 年分に揃える（不足分は最終値を延長）。"""
+    if not values:
+        return np.full(n_years, float(default))
+    arr = np.asarray(values, dtype=float)
+    if len(arr) >= n_years:
+        return arr[:n_years].copy()
+    return np.concatenate([arr, np.full(n_years - len(arr), arr[-1])])
+
+
+def yearly_factors(params, n_years: int) -> dict:
+    """
+    年次の倍率（長さ n_years）。
+        rent    : 家賃倍率
+        vacancy : 空室率
+        cost    : 費用倍率
+    """
+    s = params.schedule or ScheduleParams()
+    k = np.arange(n_years)
+
+    if s.rent_index_by_year:
+        rent = _by_year(s.rent_index_by_year, n_years, 1.0)
+    else:
+        rent = (1.0 + s.rent_growth_rate) ** k
+        if s.rent_age_decline_rate:
+            # 各年の改定時点で築年数が停止築年数未満なら下落を1段階適用
+            ages  = int(params.building_age) + k
+            steps = np.ones(n_years, dtype=int)
+            if s.rent_age_decline_until is not None:
+                steps = (ages < int(s.rent_age_decline_until)).astype(int)
+            n_steps = np.cumsum(steps) - steps   # k 年目までに適用済みの段数
+            rent = rent * (1.0 - s.rent_age_decline_rate) ** n_steps
+
+    vacancy = _by_year(s.vacancy_by_year, n_years, s.vacancy_rate)
+    cost    = (1.0 + s.cost_indexation_rate) ** k
+
+    return {"rent": rent, "vacancy": vacancy, "cost": cost}
+
+
+class MonthlySchedule:
+    """
+    保有期間全月分の月次金額（配列 index = sim_month_index − 1）。
+
+    rent_gross / rent_sales / rent_recv_vat    : 家賃（税込）・売上高・仮受消費税
+    expenses[科目] = {"gross", "tax_base", "vat_deductible", "vat_nondeductible"}
+                                               : 管理費・修繕費・その他販管費
+    insurance                                  : 保険料（非課税）
+    fa_tax_land / fa_tax_building              : 固定資産税（定額）
+    """
+
+    TAXABLE_EXPENSES = ("管理費", "修繕費", "その他販管費")
+
+    def __init__(self, params, n_months: int = None):
+        p = params
+        if n_months is None:
+            n_months = int(p.holding_years) * 12
+        self.n_months = int(n_months)
+
+        vat_rate          = float(p.consumption_tax_rate)
+        non_taxable_ratio = float(p.non_taxable_proportion)
+
+        n_years = (self.n_months + 11) // 12
+        f       = yearly_factors(p, n_years)
+        year_of = np.arange(self.n_months) // 12
+
+        rent_f = (f["rent"] * (1.0 - f["vacancy"]))[year_of]
+        cost_f = f["cost"][year_of]
+
+        # ---- 1) 家賃（MonthlyEntryGenerator の分解式と同一）----
+        gross = float(p.monthly_rent_incl) * rent_f
+        nontax_amount = np.round(gross * non_taxable_ratio)
+        taxable_incl  = gross - nontax_amount
+        if vat_rate > 0:
+            taxable_excl = np.round(taxable_incl / (1.0 + vat_rate))
+        else:
+            taxable_excl = taxable_incl
+        self.rent_gross    = gross
+        self.rent_sales    = taxable_excl + nontax_amount
+        self.rent_recv_vat = np.round(taxable_incl - taxable_excl)
+
+        # ---- 2)3)5) 課税費用（split_vat の配列版）----
+        self.expenses = {}
+        for acct, monthly in (
+            ("管理費",       p.monthly_admin_cost_incl),
+            ("修繕費",       p.monthly_repair_cost_incl),
+            ("その他販管費", p.monthly_other_management_cost),
+        ):
+            g = float(monthly) * cost_f
+            self.expenses[acct] = {"gross": g, **split_vat_array(g, vat_rate, non_taxable_ratio)}
+
+        # ---- 4) 保険料（非課税）----
+        self.insurance = float(p.monthly_insurance_cost) * cost_f
+
+        # ---- 6) 固定資産税（定額）----
+        self.fa_tax_land     = np.full(self.n_months, p.fixed_asset_tax_land / 12)
+        self.fa_tax_building = np.full(self.n_months, p.fixed_asset_tax_building / 12)
+
+# ============================================================
+# core/bookkeeping/schedule.py end
+# ============================================================
@@ -14,15 +14,17 @@
 #   4. 差額ゼロ   → 仕訳なし
 #
 # 【重要：calendar_year について】
-#   ledger.get_df() の year 列はカレンダー年（例：2025）。
-#   simulation.py から calendar_year（例：2025, 2026...）を受け取り、
-#   ledger の year 列と直接突き合わせてフィルタする。
+#   ledger の年（get_df() の year 列・trial_balance の年）は事業年度
+#   （決算月 12 ならカレンダー年。core/simulation/period_calendar.py）。
+#   simulation.py から事業年度（例：2025, 2026...）を受け取り、
+#   ledger.trial_balance(calendar_year) で当期分を集計する。
 #   sim_year（1, 2, 3...）を受け取ってはいけない。
 #
 # ===============================================
 
 from datetime import date
 from core.ledger.journal_entry import make_entry_pair
+from core.simulation.period_calendar import month_end
 
 
 class YearEndEntryGenerator:
@@ -40,17 +42,21 @@ class YearEndEntryGenerator:
     # --------------------------------------------------------
     # 消費税精算メイン（仕様書8.3節 generate_year_end(calendar_year)）
     # --------------------------------------------------------
-    def generate_year_end(self, calendar_year: int) -> None:
+    def generate_year_end(self, calendar_year: int, close_date: date = None) -> None:
         """
         Parameters
         ----------
         calendar_year : int
-            実カレンダー年（例：2025, 2026, 2027）。
+            事業年度（例：2025, 2026, 2027）。
             simulation.py が calendar_year を渡す。
             ledger.get_df() の year 列と必ず一致していること。
+        close_date : date
+            精算仕訳の日付。省略時は決算月の末日
+            （保有期間の途中で締める最終年度は simulation.py が渡す）。
         """
         # 期末日を仕訳日付として使用
-        close_date = date(calendar_year, 12, 31)
+        if close_date is None:
+            close_date = month_end(date(calendar_year, self.ledger.fiscal_year_end_month, 1))
 
         # 当期の仮払消費税残高（借方残 = 資産科目）
         vat_paid = self._balance("仮払消費税", calendar_year, asset=True)
@@ -100,25 +106,16 @@ class YearEndEntryGenerator:
         Parameters
         ----------
         account       : 勘定科目名
-        calendar_year : カレンダー年（ledger.year列と一致）
+        calendar_year : 事業年度（ledger.year列と一致）
         asset         : True  → 資産科目（借方残 = dr - cr を返す）
                         False → 負債科目（貸方残 = cr - dr を返す）
         """
-        df = self.ledger.get_df()
-        if df is None or df.empty:
-            return 0.0
-
-        # ★ year列はカレンダー年で直接フィルタ
-        df = df[(df["year"] == calendar_year) & (df["account"] == account)]
-        if df.empty:
-            return 0.0
-
-        dr = float(df[df["dr_cr"] == "debit" ]["amount"].sum())
-        cr = float(df[df["dr_cr"] == "credit"]["amount"].sum())
+        # ★ 事業年度の試算表（当期発生額）から残高を取り出す
+        net = self.ledger.trial_balance(calendar_year).balance(account)
 
         # 資産科目（仮払消費税）→ 借方残
         # 負債科目（仮受消費税）→ 貸方残
-        return (dr - cr) if asset else (cr - dr)
+        return net if asset else -net
 
 # ===============================================
 # core/bookkeeping/year_end_entries.py end
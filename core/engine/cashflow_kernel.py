@@ -0,0 +1,815 @@
+# =======================================
+# core/engine/cashflow_kernel.py
+# 高速スクリーニング用 配列カーネル
+# =======================================
+#
+# 【責務】
+#   SimulationParams から年次の PL / BS / CF を numpy 配列で直接計算する。
+#   仕訳（JournalEntry）を一切生成しないため、
+#   Simulation.run() + FinancialStatementBuilder.build() より桁違いに速い。
+#
+# 【再現している処理（仕訳エンジンと同一の金額・同一の順序）】
+#   Phase 1 : 取得（InitialEntryGenerator）
+#   Phase 2 : 月次（MonthlyEntryGenerator）→ 科目 × 月 の行列で一括計算
+#   Phase 3 : Exit（ExitEngine.execute_exit）
+#   当座借越 : OverdraftEngine（利息が残高依存のため月次の逐次ループ）
+#   Phase 4 : 消費税精算（YearEndEntryGenerator）
+#   Phase 5 : 税計算（TaxEngine.apply_loss_carryforward をそのまま使用）
+#   Phase 6 : 最終精算（ExitEngine.post_final_settlement_entries）
+#
+# 【出力】
+#   FinancialStatementBuilder.build() と同じ dict
+#   （pl / bs / cf は同じ行ラベル・同じ "Year XXXX" 列）
+#
+# 【同値性チェック】
+#   run(check_equivalence=True) で仕訳エンジンを併走させ、
+#   全セルの差が tol 円以内であることを検証する（不一致なら例外）。
+#
+# 【注意：CF の「固定資産売却収入」「売却費用」】
+#   fs_builder は摘要（description）に「売却」を含む預金仕訳から集計するが、
+#   ExitEngine の仕訳は摘要を持たないため、仕訳エンジンでも常にゼロになる。
+#   本カーネルも同じくゼロとする。
+#
+# =======================================
+
+import threading
+from collections import OrderedDict, namedtuple
+from dataclasses import replace
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from config.params import ExitParams, params_fingerprint
+from core.tax.tax_splitter import split_vat
+from core.bookkeeping.schedule import MonthlySchedule
+from core.tax.broker_fee_allocator import allocate_broker_fee
+from core.engine.loan_engine import payment_schedule
+from core.engine.tax_engine import TaxEngine, PRE_TAX_EXCLUDE
+from core.engine.exit_engine import ExitEngine
+from core.engine.overdraft_engine import to_yen
+from core.ledger import accounts
+from core.simulation.state_manager import StateManager
+from core.simulation.period_calendar import PeriodCalendar
+
+
+# ---------------------------------------------------------------
+# カーネルが扱う勘定科目（科目表のコード = 集計配列の行）
+# ---------------------------------------------------------------
+ACCOUNTS = [a.name for a in accounts.CHART]
+_IDX     = accounts.CODE
+
+# TaxEngine.extract_pre_tax_income と同じ除外規則
+_PRE_TAX_MASK = ~accounts.has_flag(np.arange(len(ACCOUNTS)), PRE_TAX_EXCLUDE)
+
+
+# ---------------------------------------------------------------
+# 共通プレフィックス（取得・月次フロー）のキャッシュ
+#   キーは Exit 条件・保有年数を除いたパラメータの指紋（prefix_key）。
+#   Exit 年・売却額だけが異なる変種（シナリオ比較）は取得〜月次の計算を共有する。
+# ---------------------------------------------------------------
+PREFIX_CACHE_SIZE = 32
+
+_Prefix = namedtuple("_Prefix", "n_months ev_dr ev_cr acq_touched mdr mcr m_touched dep_first")
+_PREFIX_CACHE = OrderedDict()
+_PREFIX_STATS = {"hits": 0, "misses": 0}
+_PREFIX_LOCK  = threading.Lock()
+
+
+def prefix_key(params, start_date: date = None) -> str:
+    """Exit 条件・保有年数を除いたパラメータの指紋（同じなら取得〜月次の計算を共有できる）"""
+    neutral = replace(
+        params,
+        holding_years=0,
+        exit_params=ExitParams(exit_year=0),
+        start_date=start_date or params.start_date,
+    )
+    return params_fingerprint(neutral)
+
+
+def prefix_cache_info() -> dict:
+    """共通プレフィックスのキャッシュ状況（hits・misses・size）"""
+    with _PREFIX_LOCK:
+        return {**_PREFIX_STATS, "size": len(_PREFIX_CACHE)}
+
+
+def clear_prefix_cache() -> None:
+    with _PREFIX_LOCK:
+        _PREFIX_CACHE.clear()
+        _PREFIX_STATS.update(hits=0, misses=0)
+
+
+class KernelEquivalenceError(AssertionError):
+    """カーネルと仕訳エンジンの財務諸表が一致しない場合に送出する。"""
+
+
+class CashFlowKernel:
+    """
+    仕訳を生成せずに年次財務諸表を計算する高速カーネル。
+
+    使い方：
+        fs = CashFlowKernel(params).run()
+        fs = CashFlowKernel(params).run(check_equivalence=True)  # 仕訳エンジンと照合
+    """
+
+    def __init__(self, params, start_date: date = None):
+        self.p          = params
+        self.start_date = start_date or params.start_date
+
+    # ============================================================
+    # メイン
+    # ============================================================
+    def run(self, check_equivalence: bool = False, tol: float = 1.0) -> dict:
+        p  = self.p
+        d0 = self.start_date
+        H  = int(p.holding_years)
+        N  = H * 12
+        A  = len(ACCOUNTS)
+
+        self.vat_rate          = float(p.consumption_tax_rate)
+        self.non_taxable_ratio = float(p.non_taxable_proportion)
+
+        # ---- 期間表（Simulation と同一の PeriodCalendar）----
+        calendar = PeriodCalendar(d0, N, p.fiscal_year_end_month)
+        idx      = np.arange(N)
+        m_fy     = calendar.fiscal_year
+
+        # ---- 年次バケット（事業年度）----
+        fy0 = calendar.fiscal_year_of(d0)
+        pre = self._prefix(d0, fy0, N)   # 取得・月次フロー（下記 Phase 1〜2）
+        y0  = fy0
+        y1  = int(m_fy[-1]) if N else fy0
+        Y   = y1 - y0 + 1
+        self._y0      = y0
+        self._ydr     = np.zeros((A, Y))
+        self._ycr     = np.zeros((A, Y))
+        self._touched = np.zeros(Y, dtype=bool)
+        # 月次以外の仕訳（取得・Exit・期末）の累積
+        self._ev_dr   = np.zeros(A)
+        self._ev_cr   = np.zeros(A)
+        # 当座借越の預金による返済額（CF「当座借越返済」用。最終精算の振替は含めない）
+        self._od_repay_m = np.zeros(N)
+        self._od_repay_y = np.zeros(Y)
+
+        # ==================================================
+        # Phase 1〜2: 取得・月次フロー（Exit 条件によらない共通プレフィックス）
+        #   取得・借入・月次条件が同じ変種（Exit 年・売却額違い）はキャッシュを共有する。
+        # ==================================================
+        self._ydr[:, 0] += pre.ev_dr
+        self._ycr[:, 0] += pre.ev_cr
+        self._ev_dr     += pre.ev_dr
+        self._ev_cr     += pre.ev_cr
+        self._touched[0] |= pre.acq_touched
+
+        # ---- 月次フロー（科目 × 月）----
+        mdr = pre.mdr[:, :N].copy()
+        mcr = pre.mcr[:, :N].copy()
+        m_touched = pre.m_touched[:N].copy()
+        if pre.dep_first < N:
+            m_touched[:] = True
+
+        def flow(dr, cr, amounts, months=slice(None)):
+            mdr[_IDX[dr], months] += amounts
+            mcr[_IDX[cr], months] += amounts
+            m_touched[months] = True
+
+        # ==================================================
+        # Phase 3: Exit（当座借越の計算前に確定させる）
+        #   Exit が参照する科目（固定資産・借入金）は当座借越の影響を受けないため、
+        #   先に計算して売却による預金増減だけを当座借越ループに渡す。
+        # ==================================================
+        exit_year = p.exit_params.exit_year
+        K = exit_year * 12 if 1 <= exit_year <= H else None
+        cash_i = _IDX["預金"]
+        acq_cash = self._ev_dr[cash_i] - self._ev_cr[cash_i]
+        exit_cash = 0.0
+        if K:
+            self._m_dr = mdr[:, :K].sum(axis=1)
+            self._m_cr = mcr[:, :K].sum(axis=1)
+            self._exit(int(m_fy[K - 1]))
+            exit_cash = (self._ev_dr[cash_i] - self._ev_cr[cash_i]) - acq_cash
+
+        # ---- 当座借越（月次の逐次計算）----
+        #   Exit 後最初の決算（最終精算）で借越残高は元入金へ振り替えられるため、
+        #   その締め月（通算月）を渡して以後の利息計算から外す。
+        settle_close = next((c for c, _, _ in calendar.closes() if K and c >= K), None)
+        self._overdraft(fy0, mdr, mcr, flow, acq_cash, exit_cash, K, m_fy, settle_close)
+
+        # ---- 月次フローを年次バケットへ ----
+        if N:
+            onehot = np.zeros((N, Y))
+            onehot[idx, m_fy - y0] = 1.0
+            self._ydr += mdr @ onehot
+            self._ycr += mcr @ onehot
+            self._touched[np.unique(m_fy[m_touched] - y0)] = True
+            self._od_repay_y += self._od_repay_m @ onehot
+
+        # ==================================================
+        # 決算ループ（Phase 4〜6、期間表の締め月ごと）
+        # ==================================================
+        state      = StateManager()
+        tax_engine = TaxEngine()
+        exited     = bool(K)
+
+        for close_idx, fiscal_year, _ in calendar.closes():
+            self._vat_settlement(fiscal_year)
+            self._tax(tax_engine, state, fiscal_year)
+
+            if exited and close_idx >= K:
+                # Exit 後最初の決算：締め月までの月次累積（当座借越を含む）で精算する。
+                # 最終精算日（get_df()["date"].max()）は締め月の事業年度に属する。
+                self._m_dr = mdr[:, :close_idx].sum(axis=1)
+                self._m_cr = mcr[:, :close_idx].sum(axis=1)
+                self._final_settlement(fiscal_year)
+                exited = False
+
+        self.state = state
+        result = self._statements()
+
+        if check_equivalence:
+            self.verify_equivalence(result, tol=tol)
+        return result
+
+    # ============================================================
+    # Phase 1〜2: 取得・月次フロー（共通プレフィックス）
+    #   N か月分の月次フロー行列は先頭 n か月を切り出せば n か月分と一致するため、
+    #   キャッシュ済みの月数が足りていれば再計算しない。
+    # ============================================================
+    def _prefix(self, d0: date, fy0: int, N: int) -> "_Prefix":
+        key = prefix_key(self.p, d0)
+        with _PREFIX_LOCK:
+            hit = _PREFIX_CACHE.get(key)
+            if hit is not None and hit.n_months >= N:
+                _PREFIX_CACHE.move_to_end(key)
+                _PREFIX_STATS["hits"] += 1
+                return hit
+        pre = self._build_prefix(d0, fy0, N)
+        with _PREFIX_LOCK:
+            _PREFIX_STATS["misses"] += 1
+            _PREFIX_CACHE[key] = pre
+            _PREFIX_CACHE.move_to_end(key)
+            while len(_PREFIX_CACHE) > PREFIX_CACHE_SIZE:
+                _PREFIX_CACHE.popitem(last=False)
+        return pre
+
+    def _build_prefix(self, d0: date, fy0: int, N: int) -> "_Prefix":
+        p = self.p
+        H = N // 12
+        A = len(ACCOUNTS)
+        calendar = PeriodCalendar(d0, N, p.fiscal_year_end_month)
+        m_year   = calendar.year
+        m_month  = calendar.month
+
+        # ---- 月次フロー（科目 × 月）----
+        mdr = np.zeros((A, N))
+        mcr = np.zeros((A, N))
+        m_touched = np.zeros(N, dtype=bool)
+
+        def flow(dr, cr, amounts, months=slice(None)):
+            mdr[_IDX[dr], months] += amounts
+            mcr[_IDX[cr], months] += amounts
+            m_touched[months] = True
+
+        dep_units = []   # (取得原価, 総月数, 開始年, 開始月, 種別)
+        loans     = []   # (金額, 年利, 年数, 返済方式, 種別, 開始月index 0始まり)
+
+        # ==================================================
+        # Phase 1: 取得（開始事業年度の1列だけで計上し、その列を取り出す）
+        # ==================================================
+        self._y0      = fy0
+        self._ydr     = np.zeros((A, 1))
+        self._ycr     = np.zeros((A, 1))
+        self._touched = np.zeros(1, dtype=bool)
+        self._ev_dr   = np.zeros(A)
+        self._ev_cr   = np.zeros(A)
+        self._acquisition(d0, fy0, dep_units, loans)
+
+        # ==================================================
+        # Phase 2: 月次（経常部分）
+        # ==================================================
+        self._recurring_flows(flow, N)
+
+        # ---- 追加設備（投資年の1月目）----
+        for inv in p.additional_investments or []:
+            if not (1 <= inv.year <= H):
+                continue
+            m = (inv.year - 1) * 12
+            add_split = split_vat(
+                gross_amount=float(inv.amount),
+                vat_rate=self.vat_rate,
+                non_taxable_ratio=self.non_taxable_ratio,
+            )
+            add_net = add_split["tax_base"]
+            flow("追加設備", "預金", add_net, m)
+            if add_split["vat_deductible"] > 0:
+                flow("仮払消費税", "預金", add_split["vat_deductible"], m)
+            if add_split["vat_nondeductible"] > 0:
+                flow("追加設備", "預金", add_split["vat_nondeductible"], m)
+                add_net += add_split["vat_nondeductible"]
+
+            add_loan_amt = float(getattr(inv, "loan_amount", 0) or 0)
+            if add_loan_amt > 0:
+                flow("預金", "追加設備投資借入金", add_loan_amt, m)
+                loans.append((
+                    add_loan_amt,
+                    float(getattr(inv, "loan_interest_rate", 0) or 0),
+                    int(getattr(inv, "loan_years", 1) or 1),
+                    "annuity",
+                    "additional",
+                    m,
+                ))
+            dep_units.append(
+                (add_net, int(inv.life) * 12, int(m_year[m]), int(m_month[m]), "additional")
+            )
+
+        # ---- 減価償却 ----
+        #   償却の flow は全月（slice(None)）に計上済みフラグを立てる。
+        #   先頭 n か月の切り出しでも同じになるよう、計上済みフラグは償却以外の分と
+        #   「償却が最初に発生する月」に分けて持つ。
+        touched   = m_touched.copy()
+        dep_first = N
+        for cost, total, sy, sm, kind in dep_units:
+            elapsed = (m_year - sy) * 12 + (m_month - sm)
+            active  = (elapsed >= 0) & (elapsed < total)
+            if not active.any():
+                continue
+            dep_first = min(dep_first, int(np.argmax(active)))
+            amt = np.where(active, cost / total, 0.0)
+            if kind == "building":
+                flow("建物減価償却費", "建物減価償却累計額", amt)
+            else:
+                flow("追加設備減価償却費", "追加設備減価償却累計額", amt)
+        m_touched[:] = touched
+
+        # ---- 借入返済 ----
+        for amount, rate, years, method, kind, start in loans:
+            interests, principals = payment_schedule(amount, rate, years, method)
+            n = max(0, min(len(interests), N - start))
+            if n == 0:
+                continue
+            months = slice(start, start + n)
+            if kind == "additional":
+                interest_acct, principal_acct = "追加設備借入利息", "追加設備投資借入金"
+            else:
+                interest_acct, principal_acct = "長期借入金利息", "長期借入金"
+            flow(interest_acct,  "預金", np.asarray(interests[:n]),  months)
+            flow(principal_acct, "預金", np.asarray(principals[:n]), months)
+
+        return _Prefix(N, self._ev_dr, self._ev_cr, bool(self._touched[0]), mdr, mcr, m_touched, dep_first)
+
+    # ============================================================
+    # 仕訳相当の計上ヘルパー（月次以外）
+    # ============================================================
+    def _post(self, year: int, dr: str, cr: str, amount: float) -> None:
+        yi = year - self._y0
+        self._ydr[_IDX[dr], yi] += amount
+        self._ycr[_IDX[cr], yi] += amount
+        self._ev_dr[_IDX[dr]]   += amount
+        self._ev_cr[_IDX[cr]]   += amount
+        self._touched[yi] = True
+
+    def _balance(self, account: str) -> float:
+        """Exit 時点の累積残高（借方 − 貸方）"""
+        i = _IDX[account]
+        return float(
+            (self._ev_dr[i] + self._m_dr[i]) - (self._ev_cr[i] + self._m_cr[i])
+        )
+
+    # ============================================================
+    # Phase 1: 取得（InitialEntryGenerator と同一）
+    # ============================================================
+    def _acquisition(self, d0: date, y: int, dep_units: list, loans: list) -> None:
+        p    = self.p
+        post = self._post
+
+        bld_gross = float(str(p.property_price_building).replace(",", ""))
+        b = split_vat(
+            gross_amount=bld_gross,
+            vat_rate=self.vat_rate,
+            non_taxable_ratio=self.non_taxable_ratio,
+        )
+        b_net    = b["tax_base"]
+        b_vat_d  = b["vat_deductible"]
+        b_vat_nd = b["vat_nondeductible"]
+
+        if b_net > 0:
+            post(y, "建物", "預金", b_net)
+        if b_vat_d > 0:
+            post(y, "仮払消費税", "預金", b_vat_d)
+        if b_vat_nd > 0:
+            post(y, "建物", "預金", b_vat_nd)
+            b_net += b_vat_nd
+
+        land = float(str(p.property_price_land).replace(",", ""))
+        if land > 0:
+            post(y, "土地", "預金", land)
+
+        broker_gross = float(str(p.brokerage_fee_amount_incl).replace(",", ""))
+        if broker_gross > 0:
+            alloc = allocate_broker_fee(
+                gross_broker_fee=broker_gross,
+                land_net=land,
+                building_net=b_net,
+                vat_rate=self.vat_rate,
+                non_taxable_ratio=self.non_taxable_ratio,
+            )
+            if alloc["land_cost_addition"] > 0:
+                post(y, "土地", "預金", alloc["land_cost_addition"])
+            if alloc["building_cost_addition"] > 0:
+                post(y, "建物", "預金", alloc["building_cost_addition"])
+                b_net += alloc["building_cost_addition"]
+            if alloc["vat_deductible"] > 0:
+                post(y, "仮払消費税", "預金", alloc["vat_deductible"])
+            if alloc["vat_nondeductible"] > 0:
+                post(y, "建物", "預金", alloc["vat_nondeductible"])
+                b_net += alloc["vat_nondeductible"]
+
+        if b_net > 0:
+            remaining_life = max(int(p.building_useful_life) - int(p.building_age), 1)
+            dep_units.append((b_net, remaining_life * 12, d0.year, d0.month, "building"))
+
+        if p.initial_equity > 0:
+            post(y, "預金", "元入金", p.initial_equity)
+
+        if p.initial_loan and p.initial_loan.amount > 0:
+            loans.append((
+                p.initial_loan.amount,
+                p.initial_loan.interest_rate,
+                p.initial_loan.years,
+                getattr(p.initial_loan, "repayment_method", "annuity"),
+                "initial",
+                0,
+            ))
+            post(y, "預金", "長期借入金", p.initial_loan.amount)
+
+    # ============================================================
+    # Phase 2: 月次の経常フロー（MonthlyEntryGenerator 1)〜6) と同一）
+    #   金額は MonthlySchedule（家賃推移・空室・物価連動）をそのまま使う
+    # ============================================================
+    def _recurring_flows(self, flow, n_months: int) -> None:
+        sc = MonthlySchedule(self.p, n_months=n_months)
+
+        def flow_where(dr, cr, amounts, cond):
+            # 仕訳エンジンの「if 金額 > 0」と同じく、条件を満たす月だけ計上する
+            months = np.flatnonzero(cond)
+            if len(months):
+                flow(dr, cr, amounts[months], months)
+
+        rent_on = sc.rent_gross > 0
+        flow_where("預金", "売上高",     sc.rent_sales,    rent_on)
+        flow_where("預金", "仮受消費税", sc.rent_recv_vat, rent_on & (sc.rent_recv_vat > 0))
+
+        for acct in MonthlySchedule.TAXABLE_EXPENSES:
+            s  = sc.expenses[acct]
+            on = s["gross"] > 0
+            flow_where(acct,                 "預金", s["tax_base"],          on)
+            flow_where("仮払消費税",         "預金", s["vat_deductible"],    on & (s["vat_deductible"] > 0))
+            flow_where("租税公課（消費税）", "預金", s["vat_nondeductible"], on & (s["vat_nondeductible"] > 0))
+
+        flow_where("保険料",             "預金", sc.insurance,       sc.insurance > 0)
+        flow_where("固定資産税（土地）", "預金", sc.fa_tax_land,     sc.fa_tax_land > 0)
+        flow_where("固定資産税（建物）", "預金", sc.fa_tax_building, sc.fa_tax_building > 0)
+
+    # ============================================================
+    # Phase 3: Exit（ExitEngine.execute_exit と同一）
+    # ============================================================
+    def _exit(self, year: int) -> None:
+        p  = self.p
+        ep = p.exit_params
+
+        def add(dr, cr, amt):
+            if amt > 0:
+                self._post(year, dr, cr, amt)
+
+        bld_excl, bld_vat = ExitEngine._split_incl_tax(
+            ep.building_exit_price, p.consumption_tax_rate
+        )
+        add("預金", "固定資産売却仮勘定", bld_excl)
+        add("預金", "仮受消費税",         bld_vat)
+        add("預金", "固定資産売却仮勘定", ep.land_exit_price)
+
+        bld_cost      = self._balance("建物")
+        bld_dep_total = abs(self._balance("建物減価償却累計額"))
+        bld_book      = max(0.0, bld_cost - bld_dep_total)
+        if bld_dep_total > 0:
+            add("建物減価償却累計額", "建物", bld_dep_total)
+        if bld_book > 0:
+            add("固定資産売却仮勘定", "建物", bld_book)
+
+        add_cost      = self._balance("追加設備")
+        add_dep_total = abs(self._balance("追加設備減価償却累計額"))
+        add_book      = max(0.0, add_cost - add_dep_total)
+        if add_dep_total > 0:
+            add("追加設備減価償却累計額", "追加設備", add_dep_total)
+        if add_book > 0:
+            add("固定資産売却仮勘定", "追加設備", add_book)
+
+        land_cost = self._balance("土地")
+        if land_cost > 0:
+            add("固定資産売却仮勘定", "土地", land_cost)
+
+        if ep.exit_cost > 0:
+            cost_excl, cost_vat = ExitEngine._split_incl_tax(
+                ep.exit_cost, p.consumption_tax_rate
+            )
+            taxable_ratio     = 1.0 - p.non_taxable_proportion
+            deductible_vat    = cost_vat * taxable_ratio
+            nondeductible_vat = cost_vat * p.non_taxable_proportion
+            add("固定資産売却仮勘定", "預金", cost_excl)
+            if nondeductible_vat > 0:
+                add("固定資産売却仮勘定", "預金", nondeductible_vat)
+            if deductible_vat > 0:
+                add("仮払消費税", "預金", deductible_vat)
+
+        net = -self._balance("固定資産売却仮勘定")
+        if net > 0:
+            add("固定資産売却仮勘定", "固定資産売却益（損）", net)
+        elif net < 0:
+            add("固定資産売却益（損）", "固定資産売却仮勘定", abs(net))
+
+        loan_balance = max(0.0, -self._balance("長期借入金"))
+        if loan_balance > 0:
+            add("長期借入金", "預金", loan_balance)
+        add_loan_balance = max(0.0, -self._balance("追加設備投資借入金"))
+        if add_loan_balance > 0:
+            add("追加設備投資借入金", "預金", add_loan_balance)
+
+    # ============================================================
+    # 当座借越（OverdraftEngine と同一）
+    #   取得直後・各月の月次直後・Exit 直後に預金残高を判定する。
+    #   利息が残高に依存するため、ここだけは月次の逐次ループで計算する。
+    #   借越残高は整数円（借入・返済は to_yen で丸めた預金残高）に保ち、
+    #   仕訳エンジンと同じ順序で利息 → 借入／返済を行って結果を完全に一致させる。
+    # ============================================================
+    def _overdraft(self, fy0, mdr, mcr, flow, acq_cash, exit_cash, K, m_fy, settle_close=None) -> None:
+        rate   = float(self.p.overdraft_interest_rate or 0.0)
+        cash_i = _IDX["預金"]
+        net    = mdr[cash_i] - mcr[cash_i]   # 当座借越以外の月次の預金増減
+        cash, od = acq_cash, 0.0
+
+        def settle(post):
+            nonlocal cash, od
+            yen = to_yen(cash)
+            if yen < 0:
+                post("預金", "当座借越借入金", -yen)
+                od, cash = od - yen, cash - yen
+            elif yen > 0 and od > 0:
+                repay = min(yen, od)
+                post("当座借越借入金", "預金", repay)
+                od, cash = od - repay, cash - repay
+                return repay
+            return 0.0
+
+        settle(lambda dr, cr, amt: self._post(fy0, dr, cr, amt))
+
+        for m in range(len(net)):
+            cash += net[m]
+            if od > 0 and rate > 0:
+                interest = to_yen(od * rate / 12)
+                if interest > 0:
+                    flow("当座借越利息", "預金", interest, m)
+                    cash -= interest
+            self._od_repay_m[m] += settle(lambda dr, cr, amt: flow(dr, cr, amt, m))
+
+            if K and m == K - 1:
+                # Exit 直後（売却日 = Exit 月の末日）
+                cash += exit_cash
+                y = int(m_fy[m])
+                self._od_repay_y[y - self._y0] += settle(
+                    lambda dr, cr, amt: self._post(y, dr, cr, amt)
+                )
+
+            if settle_close and m == settle_close - 1:
+                # 最終精算（_final_settlement）：借越残高を元入金へ振替（預金は動かない）
+                od = 0.0
+
+    # ============================================================
+    # Phase 4: 消費税精算（YearEndEntryGenerator と同一）
+    # ============================================================
+    def _vat_settlement(self, year: int) -> None:
+        yi = year - self._y0
+        vat_paid     = self._ydr[_IDX["仮払消費税"], yi] - self._ycr[_IDX["仮払消費税"], yi]
+        vat_received = self._ycr[_IDX["仮受消費税"], yi] - self._ydr[_IDX["仮受消費税"], yi]
+        diff = vat_received - vat_paid
+
+        if diff > 0:
+            self._post(year, "仮受消費税", "仮払消費税", vat_paid)
+            self._post(year, "仮受消費税", "未払消費税", diff)
+        elif diff < 0:
+            self._post(year, "仮受消費税", "仮払消費税", vat_received)
+            self._post(year, "未収還付消費税", "仮払消費税", abs(diff))
+
+    # ============================================================
+    # Phase 5: 税計算（TaxEngine と同一）
+    # ============================================================
+    def _tax(self, tax_engine: TaxEngine, state: StateManager, year: int) -> None:
+        yi = year - self._y0
+        pre_tax_income = float(
+            self._ycr[_PRE_TAX_MASK, yi].sum() - self._ydr[_PRE_TAX_MASK, yi].sum()
+        )
+        taxable_income = tax_engine.apply_loss_carryforward(
+            pre_tax_income=pre_tax_income,
+            state_manager=state,
+            entity_type=self.p.entity_type,
+            current_year=year,
+        )
+        tax_amount = tax_engine.compute_tax_amount(taxable_income, self.p.effective_tax_rate)
+        if tax_amount > 0:
+            self._post(year, "所得税（法人税）", "未払所得税（法人税）", tax_amount)
+
+    # ============================================================
+    # Phase 6: 最終精算（ExitEngine.post_final_settlement_entries と同一）
+    # ============================================================
+    def _final_settlement(self, year: int) -> None:
+        def add(dr, cr, amt):
+            if amt > 0:
+                self._post(year, dr, cr, amt)
+
+        od_balance = max(0.0, -self._balance("当座借越借入金"))
+        if od_balance > 0:
+            add("当座借越借入金", "元入金", od_balance)
+        vat_payable = max(0.0, -self._balance("未払消費税"))
+        if vat_payable > 0:
+            add("未払消費税", "元入金", vat_payable)
+        vat_refund = max(0.0, self._balance("未収還付消費税"))
+        if vat_refund > 0:
+            add("元入金", "未収還付消費税", vat_refund)
+        tax_payable = max(0.0, -self._balance("未払所得税（法人税）"))
+        if tax_payable > 0:
+            add("未払所得税（法人税）", "元入金", tax_payable)
+
+    # ============================================================
+    # 財務諸表の組み立て（fs_builder と同じ行ラベル・同じ計算式）
+    # ============================================================
+    def _statements(self) -> dict:
+        sel       = np.flatnonzero(self._touched)
+        years     = [self._y0 + int(i) for i in sel]
+        year_cols = [f"Year {y}" for y in years]
+
+        ydr = self._ydr[:, sel]
+        ycr = self._ycr[:, sel]
+        # 累積（df["year"] <= y）は未使用年も含めて積み上げてから抽出する
+        cdr = np.cumsum(self._ydr, axis=1)[:, sel]
+        ccr = np.cumsum(self._ycr, axis=1)[:, sel]
+
+        def D(a):  return ydr[_IDX[a]]
+        def C(a):  return ycr[_IDX[a]]
+        def AB(a): return cdr[_IDX[a]] - ccr[_IDX[a]]   # 資産：借方残
+        def LB(a): return ccr[_IDX[a]] - cdr[_IDX[a]]   # 負債・純資産：貸方残
+
+        # ---------------- PL ----------------
+        pl = {}
+        pl["売上高"]     = C("売上高")
+        pl["売上総利益"] = pl["売上高"]
+        opex = accounts.statement_lines(accounts.OPEX)
+        for a in opex:
+            pl[a] = D(a)
+        pl["営業利益"] = pl["売上総利益"] - sum(pl[a] for a in opex)
+        fin = accounts.statement_lines(accounts.INTEREST)
+        for a in fin:
+            pl[a] = D(a)
+        pl["経常利益"]             = pl["営業利益"] - sum(pl[a] for a in fin)
+        pl["固定資産売却益（損）"] = C("固定資産売却益（損）") - D("固定資産売却益（損）")
+        pl["税引前当期利益"]       = pl["経常利益"] + pl["固定資産売却益（損）"]
+        pl["所得税（法人税）"]     = D("所得税（法人税）")
+        pl["当期利益"]             = pl["税引前当期利益"] - pl["所得税（法人税）"]
+        pl_order = ["売上高", "売上総利益"] + opex + ["営業利益"] + fin + [
+            "経常利益", "固定資産売却益（損）", "税引前当期利益", "所得税（法人税）", "当期利益",
+        ]
+
+        # ---------------- BS ----------------
+        bs = {}
+        for a in ["預金", "未収還付消費税", "仮払消費税", "建物"]:
+            bs[a] = AB(a)
+        bs["建物減価償却累計額"]     = -LB("建物減価償却累計額")
+        bs["追加設備"]               = AB("追加設備")
+        bs["追加設備減価償却累計額"] = -LB("追加設備減価償却累計額")
+        bs["土地"]                   = AB("土地")
+        assets = accounts.statement_lines(accounts.ASSET | accounts.CONTRA_ASSET)
+        bs["資産合計"] = sum(bs[a] for a in assets)
+        liabs = accounts.statement_lines(accounts.LIABILITY) + ["元入金"]
+        for a in liabs:
+            bs[a] = LB(a)
+        bs["繰越利益剰余金"]   = np.cumsum(pl["当期利益"])
+        bs["負債・純資産合計"] = sum(bs[a] for a in liabs) + bs["繰越利益剰余金"]
+        bs_order = assets + ["資産合計"] + liabs + ["繰越利益剰余金", "負債・純資産合計"]
+
+        # ---------------- CF ----------------
+        zero = np.zeros(len(years))
+        cf = {"【営業収支】": zero}
+        cf["家賃収入（税抜）"] = C("売上高")
+        cf["営業収入計"]       = cf["家賃収入（税抜）"]
+        cf_opex = [
+            ("管理費", D("管理費")),
+            ("修繕費", D("修繕費")),
+            ("保険料", D("保険料")),
+            ("その他販管費", D("その他販管費")),
+            ("固定資産税（土地）", D("固定資産税（土地）")),
+            ("固定資産税（建物）", D("固定資産税（建物）")),
+            ("未払消費税納付", D("未払消費税")),
+            ("未払所得税納付", D("未払所得税（法人税）")),
+            ("長期借入金利息", D("長期借入金利息")),
+            ("追加設備借入利息", D("追加設備借入利息")),
+            ("当座借越利息", D("当座借越利息")),
+        ]
+        for k, v in cf_opex:
+            cf[k] = v
+        cf["営業支出計"] = sum(v for _, v in cf_opex)
+        cf["営業収支"]   = cf["営業収入計"] - cf["営業支出計"]
+        cf["【設備収支】"]     = zero
+        cf["固定資産売却収入"] = zero   # 摘要「売却」付き預金仕訳なし（冒頭注記参照）
+        cf["設備売却計"]       = cf["固定資産売却収入"]
+        cf["売却費用"]         = zero
+        cf["土地購入"]         = C("土地")
+        cf["建物購入"]         = C("建物")
+        cf["追加設備購入"]     = C("追加設備")
+        cf["設備購入計"]       = cf["土地購入"] + cf["建物購入"] + cf["追加設備購入"]
+        cf["設備収支"]         = cf["設備売却計"] - cf["設備購入計"] - cf["売却費用"]
+        cf["【財務収支】"]           = zero
+        cf["元入金調達"]             = C("元入金")
+        cf["長期借入金調達"]         = C("長期借入金")
+        cf["追加設備投資借入金調達"] = C("追加設備投資借入金")
+        cf["当座借越調達"]           = C("当座借越借入金")
+        cf["資金調達計"] = (
+            cf["元入金調達"] + cf["長期借入金調達"] + cf["追加設備投資借入金調達"] + cf["当座借越調達"]
+        )
+        cf["長期借入金返済"]         = D("長期借入金")
+        cf["追加設備投資借入金返済"] = D("追加設備投資借入金")
+        cf["当座借越返済"]           = self._od_repay_y[sel]
+        cf["借入金返済計"] = cf["長期借入金返済"] + cf["追加設備投資借入金返済"] + cf["当座借越返済"]
+        cf["財務収支"]     = cf["資金調達計"] - cf["借入金返済計"]
+        cf["【資金収支尻】"] = cf["営業収支"] + cf["設備収支"] + cf["財務収支"]
+
+        def frame(rows: dict, order: list) -> pd.DataFrame:
+            values = np.vstack([rows[r] for r in order]) if years else np.zeros((len(order), 0))
+            return pd.DataFrame(values, index=order, columns=year_cols)
+
+        debit_total  = float(self._ydr.sum())
+        credit_total = float(self._ycr.sum())
+        balance_diff = debit_total - credit_total
+
+        return {
+            "pl":           frame(pl, pl_order),
+            "bs":           frame(bs, bs_order),
+            "cf":           frame(cf, list(cf.keys())),
+            "is_balanced":  abs(balance_diff) < 1.0,
+            "balance_diff": abs(balance_diff),
+            "debit_total":  debit_total,
+            "credit_total": credit_total,
+        }
+
+    # ============================================================
+    # 同値性チェック（仕訳エンジンとの照合）
+    # ============================================================
+    def verify_equivalence(self, result: dict = None, tol: float = 1.0) -> dict:
+        """
+        仕訳エンジン（Simulation.run() + FinancialStatementBuilder.build()）を
+        実行し、PL / BS / CF の全セルを照合する。
+
+        Returns
+        -------
+        dict : 仕訳エンジン側の build() 結果
+
+        Raises
+        ------
+        KernelEquivalenceError : 行・列構成の不一致、または差額が tol 円超のセルがある場合
+        """
+        # 循環 import 回避のため遅延 import
+        from core.simulation.simulation import Simulation
+        from core.finance.fs_builder import FinancialStatementBuilder
+
+        if result is None:
+            result = self.run()
+
+        sim = Simulation(self.p, self.start_date)
+        sim.run()
+        reference = FinancialStatementBuilder(sim.ledger).build()
+
+        problems = []
+        for key in ("pl", "bs", "cf"):
+            got, exp = result[key], reference[key]
+            if list(got.index) != list(exp.index) or list(got.columns) != list(exp.columns):
+                problems.append(f"{key}: 行・列構成が一致しません")
+                continue
+            diff = np.abs(got.values - exp.values.astype(float))
+            for r, c in zip(*np.nonzero(diff > tol)):
+                problems.append(
+                    f"{key} [{got.index[r]}, {got.columns[c]}]: "
+                    f"kernel={got.iat[r, c]:,.0f}  journal={exp.iat[r, c]:,.0f}"
+                )
+
+        if problems:
+            raise KernelEquivalenceError(
+                "高速カーネルと仕訳エンジンの結果が一致しません：\n  "
+                + "\n  ".join(problems[:20])
+            )
+        return reference
+
+
+def run_kernel(params, check_equivalence: bool = False, tol: float = 1.0) -> dict:
+    """CashFlowKernel(params).run() の簡易エントリポイント。"""
+    return CashFlowKernel(params).run(check_equivalence=check_equivalence, tol=tol)
+
+# =======================================
+# core/engine/cashflow_kernel.py end
+# =======================================
@@ -6,8 +6,8 @@
 # 【配置】 core/engine/exit_engine.py
 #
 # 【外部から呼ぶメソッド（simulation.pyが呼ぶ）】
-#   1. execute_exit(params, state_manager, ledger)
-#        Exit年の12月月次完了後・消費税精算前に呼ぶ
+#   1. execute_exit(params, state_manager, ledger, sell_date)
+#        Exit月（Exit年の最終月）の月次完了後・消費税精算前に呼ぶ
 #        → 売却代金受取・簿価消去・売却費用・借入金完済
 #
 #   2. post_final_settlement_entries(state_manager, ledger)
@@ -22,6 +22,8 @@
 from datetime import date
 from typing import TYPE_CHECKING
 
+from core.simulation.period_calendar import PeriodCalendar
+
 if TYPE_CHECKING:
     from config.params import SimulationParams
     from core.simulation.state_manager import StateManager
@@ -54,13 +56,7 @@ class ExitEngine:
         負債・収益（貸方残高）: credit - debit
         ※ 本メソッドは「借方残高」として返す（呼び出し側で解釈する）
         """
-        df = ledger.get_df()
-        if df is None or df.empty:
-            return 0.0
-        sub = df[df["account"] == account]
-        debit  = sub[sub["dr_cr"] == "debit" ]["amount"].sum()
-        credit = sub[sub["dr_cr"] == "credit"]["amount"].sum()
-        return float(debit - credit)
+        return ledger.trial_balance().balance(account)
 
     # ------------------------------------------------------------------
     # 1. 外部API: execute_exit
@@ -70,6 +66,7 @@ class ExitEngine:
         params: "SimulationParams",
         state_manager: "StateManager",
         ledger: "LedgerManager",
+        sell_date: date = None,
     ) -> None:
         """
         仕様書9.3節 Exit Engine 実行順序：
@@ -78,10 +75,13 @@ class ExitEngine:
             3. 売却費用の計上
             4. 固定資産売却仮勘定の残高を損益へ振替
             5. 借入金の完済
+
+        sell_date : 売却日（省略時は params.start_date から数えた Exit 月の末日）
         """
-        ep        = params.exit_params
-        exit_year = ep.exit_year
-        sell_date = date(params.start_date.year + exit_year - 1, 12, 31)
+        ep = params.exit_params
+        if sell_date is None:
+            calendar  = PeriodCalendar(params.start_date, ep.exit_year * 12)
+            sell_date = calendar.month_end(ep.exit_year * 12)
 
         from core.ledger.journal_entry import make_entry_pair
 
@@ -110,17 +110,7 @@ class ExitEngine:
         # ---- 建物 ----
         bld_cost  = self._get_account_balance(ledger, "建物")
         # 建物減価償却累計額（BS科目）の貸方残高 = 累計償却額
-        bld_dep_total = abs(
-            ledger.get_df()[
-                (ledger.get_df()["account"] == "建物減価償却累計額") &
-                (ledger.get_df()["dr_cr"]   == "credit")
-            ]["amount"].sum()
-            -
-            ledger.get_df()[
-                (ledger.get_df()["account"] == "建物減価償却累計額") &
-                (ledger.get_df()["dr_cr"]   == "debit")
-            ]["amount"].sum()
-        )
+        bld_dep_total = abs(self._get_account_balance(ledger, "建物減価償却累計額"))
         bld_book = max(0.0, bld_cost - bld_dep_total)
 
         if bld_dep_total > 0:
@@ -131,17 +121,7 @@ class ExitEngine:
         # ---- 追加設備 ----
         add_cost = self._get_account_balance(ledger, "追加設備")
         # 追加設備減価償却累計額（BS科目）の貸方残高
-        add_dep_total = abs(
-            ledger.get_df()[
-                (ledger.get_df()["account"] == "追加設備減価償却累計額") &
-                (ledger.get_df()["dr_cr"]   == "credit")
-            ]["amount"].sum()
-            -
-            ledger.get_df()[
-                (ledger.get_df()["account"] == "追加設備減価償却累計額") &
-                (ledger.get_df()["dr_cr"]   == "debit")
-            ]["amount"].sum()
-        )
+        add_dep_total = abs(self._get_account_balance(ledger, "追加設備減価償却累計額"))
         add_book = max(0.0, add_cost - add_dep_total)
 
         if add_dep_total > 0:
@@ -175,11 +155,7 @@ class ExitEngine:
         # Step 4: 固定資産売却仮勘定の残高を損益へ振替
         # ==================================================
         # 残高 = 貸方合計 - 借方合計（貸方残がプラス = 売却益）
-        df = ledger.get_df()
-        kari = df[df["account"] == "固定資産売却仮勘定"]
-        kari_cr = kari[kari["dr_cr"] == "credit"]["amount"].sum()
-        kari_dr = kari[kari["dr_cr"] == "debit" ]["amount"].sum()
-        net = kari_cr - kari_dr
+        net = -self._get_account_balance(ledger, "固定資産売却仮勘定")
 
         if net > 0:
             # 売却益
@@ -226,7 +202,7 @@ class ExitEngine:
         """
         from core.ledger.journal_entry import make_entry_pair
 
-        # 売却日（最終精算は年末）
+        # 最終仕訳日（最終精算は決算日）
         df = ledger.get_df()
         if df is not None and not df.empty:
             settlement_date = df["date"].max()
@@ -263,13 +239,7 @@ class ExitEngine:
     # ------------------------------------------------------------------
     def _get_loan_balance(self, ledger, account: str) -> float:
         """負債（借入金）の残高：貸方合計 - 借方合計"""
-        df = ledger.get_df()
-        if df is None or df.empty:
-            return 0.0
-        sub = df[df["account"] == account]
-        credit = sub[sub["dr_cr"] == "credit"]["amount"].sum()
-        debit  = sub[sub["dr_cr"] == "debit" ]["amount"].sum()
-        return float(max(0.0, credit - debit))
+        return max(0.0, -ledger.trial_balance().balance(account))
 
     def _get_liability_balance(self, ledger, account: str) -> float:
         """負債科目の残高：貸方 - 借方"""
@@ -277,13 +247,7 @@ class ExitEngine:
 
     def _get_asset_balance(self, ledger, account: str) -> float:
         """資産科目の残高：借方 - 貸方"""
-        df = ledger.get_df()
-        if df is None or df.empty:
-            return 0.0
-        sub = df[df["account"] == account]
-        debit  = sub[sub["dr_cr"] == "debit" ]["amount"].sum()
-        credit = sub[sub["dr_cr"] == "credit"]["amount"].sum()
-        return float(max(0.0, debit - credit))
+        return max(0.0, ledger.trial_balance().balance(account))
 
 # =======================================
 # core/engine/exit_engine.py end
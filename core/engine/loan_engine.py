@@ -152,6 +152,39 @@ class LoanUnit:
         return self._remaining_balance
 
 
+# -----------------------------------------------------------------------
+# 返済スケジュール（月次配列）
+# 高速カーネル等、仕訳を生成しない経路が LoanUnit と同一の丸め結果を
+# 得るために使う。中身は LoanUnit.monthly_payment() の繰り返しそのもの。
+# -----------------------------------------------------------------------
+def payment_schedule(
+    amount: float,
+    annual_rate: float,
+    years: int,
+    repayment_method: str = "annuity",
+) -> Tuple[list, list]:
+    """
+    返り値：(interests, principals)
+        i 番目の要素 = 返済開始から i+1 ヶ月目の（利息, 元金）。
+        is_active() が False になった時点で打ち切る。
+    """
+    unit = LoanUnit(
+        amount=amount,
+        annual_rate=annual_rate,
+        years=years,
+        repayment_method=repayment_method,
+        start_sim_month=1,
+    )
+    interests, principals = [], []
+    m = 1
+    while unit.is_active(m):
+        interest, principal = unit.monthly_payment()
+        interests.append(interest)
+        principals.append(principal)
+        m += 1
+    return interests, principals
+
+
 # -----------------------------------------------------------------------
 # 後方互換：旧コードが LoanEngine を参照している箇所向けのエイリアス
 # 新規コードは LoanUnit を使うこと
@@ -0,0 +1,132 @@
+# =======================================
+# core/engine/overdraft_engine.py
+# 当座借越（自動借入・利息・自動返済）
+# =======================================
+#
+# 【責務】
+#   預金残高がマイナスになった時点で当座借越により自動的に資金を補い、
+#   借越残高に月次で利息を課し、余剰資金が生じたら自動返済する。
+#
+# 【呼び出しタイミング（simulation.py）】
+#   settle(d)        : 取得直後・Exit 直後（利息なし、借入／返済のみ）
+#   apply_month(d)   : 各月の月次仕訳の直後（利息 → 借入／返済）
+#   apply_year(flows): 年次集計モードの集計仕訳の直後
+#                      各月の預金増減から apply_month と同じ計算を月ごとに再現し、
+#                      利息・借入・返済をそれぞれ年合計で記帳する
+#
+# 【仕訳（摘要は CF の当座借越調達・返済の集計に使う）】
+#   利息   ：借）当座借越利息     ／ 貸）預金            摘要「当座借越利息」
+#   借入   ：借）預金             ／ 貸）当座借越借入金  摘要「当座借越実行」
+#   返済   ：借）当座借越借入金   ／ 貸）預金            摘要「当座借越返済」
+#
+# 【利息】
+#   月初（前月末）の借越残高 × 年利 ÷ 12、円未満四捨五入。
+#
+# 【円単位】
+#   借入・返済額は預金残高を円単位に丸めた額とし、借越残高を常に整数円に保つ
+#   （円未満の端数は預金に残る）。丸めは to_yen() で行い、預金残高の浮動小数点の
+#   累積誤差で .5 の境界の丸めが変わらないようにする。高速カーネル
+#   （core/engine/cashflow_kernel.py）も同じ順序・同じ丸めで計算し、結果を一致させる。
+#
+# 【残高の取得】
+#   LedgerManager が仕訳追加時に更新する累計残高（get_account_balance）を参照するため、
+#   台帳の走査は行わない。
+# =======================================
+
+from core.ledger.journal_entry import make_entry_pair
+
+
+OD_DRAW_DESC     = "当座借越実行"
+OD_REPAY_DESC    = "当座借越返済"
+OD_INTEREST_DESC = "当座借越利息"
+
+# 丸め前に落とす桁（円未満4桁より下は浮動小数点の累積誤差とみなす）
+_YEN_SNAP_DIGITS = 4
+
+
+def to_yen(x: float) -> float:
+    """円未満四捨五入（累積誤差を落としてから丸める）"""
+    return float(round(round(x, _YEN_SNAP_DIGITS)))
+
+
+class OverdraftEngine:
+
+    def __init__(self, params, ledger):
+        self.ledger      = ledger
+        self.annual_rate = float(params.overdraft_interest_rate or 0.0)
+
+    # --------------------------------------------------------
+    # 残高
+    # --------------------------------------------------------
+    @property
+    def balance(self) -> float:
+        """当座借越借入金の残高（貸方残）"""
+        return max(0.0, -self.ledger.get_account_balance("当座借越借入金"))
+
+    def _add(self, d, dr, cr, amt, description):
+        self.ledger.add_entries(make_entry_pair(d, dr, cr, amt, description=description))
+
+    # --------------------------------------------------------
+    # 月次：利息 → 借入／返済
+    # --------------------------------------------------------
+    def apply_month(self, d) -> None:
+        od = self.balance
+        if od > 0 and self.annual_rate > 0:
+            interest = to_yen(od * self.annual_rate / 12)
+            if interest > 0:
+                self._add(d, "当座借越利息", "預金", interest, OD_INTEREST_DESC)
+        self.settle(d)
+
+    # --------------------------------------------------------
+    # 年次集計モード：月次の借入／利息／返済を再現して合計で記帳
+    # --------------------------------------------------------
+    def apply_year(self, cash_flows) -> None:
+        """
+        cash_flows : [(記帳日, [各月の預金増減, ...]), ...]
+                     （AnnualEntryGenerator.cash_flows、増減は記帳済み）
+        """
+        for g, (d, deltas) in enumerate(cash_flows):
+            later = sum(sum(x) for _, x in cash_flows[g + 1:])
+            cash  = self.ledger.cash_balance - later - sum(deltas)   # 期首の預金
+            od    = self.balance
+            interest_sum = draw_sum = repay_sum = 0.0
+            for delta in deltas:
+                cash += delta
+                if od > 0 and self.annual_rate > 0:
+                    interest = to_yen(od * self.annual_rate / 12)
+                    if interest > 0:
+                        cash -= interest
+                        interest_sum += interest
+                yen = to_yen(cash)
+                if yen < 0:
+                    od += -yen
+                    draw_sum += -yen
+                    cash -= yen
+                elif yen > 0 and od > 0:
+                    repay = min(yen, od)
+                    od -= repay
+                    cash -= repay
+                    repay_sum += repay
+
+            if interest_sum > 0:
+                self._add(d, "当座借越利息", "預金", interest_sum, OD_INTEREST_DESC)
+            if draw_sum > 0:
+                self._add(d, "預金", "当座借越借入金", draw_sum, OD_DRAW_DESC)
+            if repay_sum > 0:
+                self._add(d, "当座借越借入金", "預金", repay_sum, OD_REPAY_DESC)
+
+    # --------------------------------------------------------
+    # 借入／返済のみ
+    # --------------------------------------------------------
+    def settle(self, d) -> None:
+        cash = to_yen(self.ledger.cash_balance)
+        if cash < 0:
+            self._add(d, "預金", "当座借越借入金", -cash, OD_DRAW_DESC)
+            return
+        od = self.balance
+        if cash > 0 and od > 0:
+            self._add(d, "当座借越借入金", "預金", min(cash, od), OD_REPAY_DESC)
+
+# =======================================
+# core/engine/overdraft_engine.py end
+# =======================================
@@ -13,8 +13,9 @@
 #   4. post_tax_journal_entries : 仕訳計上（所得税（法人税）／未払所得税（法人税））
 #
 # 【重要：calendar_year について】
-#   ledger.get_df() の year 列はカレンダー年（例：2025）。
-#   simulation.py から calendar_year を受け取り、ledger.year と直接突き合わせる。
+#   ledger の年（get_df() の year 列・trial_balance の年）は事業年度
+#   （決算月 12 ならカレンダー年。core/simulation/period_calendar.py）。
+#   simulation.py から事業年度を受け取り、ledger.trial_balance(calendar_year) で集計する。
 #   sim_year（1, 2, 3...）を受け取ってはいけない。
 #
 # 【欠損金繰越期間（システム固定値・仕様書10.3節）】
@@ -24,7 +25,12 @@
 # =======================================
 
 import datetime
+
+import numpy as np
+
+from core.ledger import accounts
 from core.ledger.journal_entry import JournalEntry
+from core.simulation.period_calendar import month_end
 
 
 # 欠損金繰越上限年数（仕様書10.3節）
@@ -34,35 +40,11 @@ _LOSS_CARRYFORWARD_YEARS = {
 }
 
 # -----------------------------------------------------------------------
-# BS科目セット
-# extract_pre_tax_income でPL科目のみを抽出するために除外するBS科目一覧。
+# 税引前利益から除外する科目（科目表のフラグ）
 # BS科目は借方・貸方の残高で損益計算しない。
+# 所得税（法人税）は税引前利益の計算に含めない。
 # -----------------------------------------------------------------------
-_BS_ACCOUNTS = {
-    # 流動資産
-    "預金",
-    "未収還付消費税",
-    "仮払消費税",
-    # 固定資産
-    "建物",
-    "建物減価償却累計額",
-    "追加設備",
-    "追加設備減価償却累計額",
-    "土地",
-    # 流動負債
-    "未払消費税",
-    "未払所得税（法人税）",
-    # 仮勘定
-    "仮受消費税",
-    "固定資産売却仮勘定",
-    # 固定負債
-    "長期借入金",
-    "追加設備投資借入金",
-    "当座借越借入金",
-    # 純資産
-    "元入金",
-    "繰越利益剰余金",
-}
+PRE_TAX_EXCLUDE = accounts.BS | accounts.INCOME_TAX
 
 
 class TaxEngine:
@@ -76,15 +58,18 @@ class TaxEngine:
     # --------------------------------------------------------
     # 統合API（simulation.py が呼ぶ唯一のエントリポイント）
     # --------------------------------------------------------
-    def calculate_tax(self, params, state_manager, ledger, current_year: int) -> None:
+    def calculate_tax(
+        self, params, state_manager, ledger, current_year: int, close_date=None
+    ) -> None:
         """
         Parameters
         ----------
         params        : SimulationParams（entity_type / effective_tax_rate を参照）
         state_manager : StateManager（loss_carryforward_list を読み書き）
         ledger        : LedgerManager（仕訳抽出・計上先）
-        current_year  : int  カレンダー年（例：2025, 2026）
+        current_year  : int  事業年度（例：2025, 2026）
                         simulation.py が calendar_year を渡すこと。
+        close_date    : 税仕訳の日付（省略時は決算月の末日）
         """
         # Step 1: 税引前利益を抽出
         pre_tax_income = self.extract_pre_tax_income(ledger, current_year)
@@ -102,7 +87,7 @@ class TaxEngine:
 
         # Step 4: 税額がある場合のみ仕訳計上
         if tax_amount > 0:
-            self.post_tax_journal_entries(tax_amount, ledger, current_year)
+            self.post_tax_journal_entries(tax_amount, ledger, current_year, close_date)
 
     # --------------------------------------------------------
     # Step 1: 税引前利益の抽出
@@ -119,20 +104,12 @@ class TaxEngine:
         -------
         float : 税引前利益（負の場合は当期純損失）
         """
-        df = ledger.get_df()
-        if df is None or df.empty:
-            return 0.0
+        # ★ calendar_year の試算表から、BS科目と税関連科目を除いたPL科目のみを集計する
+        tb = ledger.trial_balance(current_year)
+        pl = ~accounts.has_flag(np.arange(len(tb.debit)), PRE_TAX_EXCLUDE)
 
-        # ★ calendar_year で当期仕訳を絞り込む
-        df = df[df["year"] == current_year]
-
-        # BS科目と税関連科目を除外してPL科目のみにする
-        # 所得税（法人税）は税引前利益の計算に含めない
-        EXCLUDE = _BS_ACCOUNTS | {"所得税（法人税）"}
-        df = df[~df["account"].isin(EXCLUDE)]
-
-        credit_total = float(df[df["dr_cr"] == "credit"]["amount"].sum())
-        debit_total  = float(df[df["dr_cr"] == "debit" ]["amount"].sum())
+        credit_total = float(tb.credit[pl].sum())
+        debit_total  = float(tb.debit[pl].sum())
 
         return credit_total - debit_total
 
@@ -154,7 +131,7 @@ class TaxEngine:
         Parameters
         ----------
         entity_type : "corporate" or "individual"
-        current_year : カレンダー年
+        current_year : 事業年度
 
         Returns
         -------
@@ -212,7 +189,9 @@ class TaxEngine:
     # --------------------------------------------------------
     # Step 4: 税仕訳の計上
     # --------------------------------------------------------
-    def post_tax_journal_entries(self, tax_amount: float, ledger, current_year: int) -> None:
+    def post_tax_journal_entries(
+        self, tax_amount: float, ledger, current_year: int, close_date=None
+    ) -> None:
         """
         所得税（法人税）を費用計上し、未払所得税（法人税）を負債計上する。
 
@@ -220,9 +199,11 @@ class TaxEngine:
             借）所得税（法人税）    tax_amount
             貸）未払所得税（法人税） tax_amount
 
-        日付：当期12月31日（期末）
+        日付：close_date（省略時は当期の決算月末日）
         """
-        entry_date = datetime.date(current_year, 12, 31)
+        entry_date = close_date or month_end(
+            datetime.date(current_year, ledger.fiscal_year_end_month, 1)
+        )
 
         entry = JournalEntry(
             date=entry_date,
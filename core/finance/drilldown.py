@@ -0,0 +1,112 @@
+# ============================================================
+# core/finance/drilldown.py
+# 財務諸表のセル → 仕訳行 の逆引き索引（ドリルダウン）
+# ============================================================
+#
+# 【責務】
+#   FinancialStatementBuilder.build() が記録した各行の出どころ
+#     sources[表][行] = {(科目コード, 貸借, 摘要の条件, 累計か): 符号}
+#   と get_df() 形式の仕訳から、(表, 行, 年) のセルを構成する仕訳行を返す。
+#
+# 【索引】
+#   仕訳行を (事業年度, 貸借, 科目コード) で1回だけ並べ替え、キー → 行位置の配列を持つ。
+#   セルの問い合わせは出どころごとに該当キーの配列を連結するだけ（累計は年末までの各年）。
+#   摘要の条件はその候補行にだけ適用するため、計算量は該当行数 k に比例する。
+#
+# 【照合】
+#   value(表, 行, 年) = Σ 符号 × 金額 は財務諸表のセルと一致する
+#   （FinancialStatementBuilder は月次スナップショットから集計するため、独立した検算になる）。
+#
+# 【使い方】
+#   builder = FinancialStatementBuilder(ledger)
+#   fs      = builder.build()
+#   drill   = builder.drilldown(ledger_df)
+#   drill.drill("cf", "当座借越返済", 2027)   # 該当仕訳（sign 列付き）
+#
+# ============================================================
+
+import numpy as np
+import pandas as pd
+
+
+class DrillDownIndex:
+
+    def __init__(self, ledger_df: pd.DataFrame, sources: dict, years: list):
+        df = ledger_df.reset_index(drop=True)
+        self.df      = df
+        self.sources = sources
+        self.years   = [int(y) for y in years]
+
+        year   = df["year"].to_numpy(dtype=np.int64)
+        code   = df["account_code"].to_numpy(dtype=np.int64)
+        credit = (df["dr_cr"] == "credit").to_numpy()
+        self._amount = df["amount"].to_numpy(dtype=float)
+        self._desc   = df["description"].to_numpy(dtype=object)
+
+        # (事業年度, 貸借, 科目コード) → 行位置（元の行順）
+        order = np.lexsort((code, credit, year))
+        keys  = np.stack([year[order], credit[order].astype(np.int64), code[order]], axis=1)
+        if len(order):
+            starts = np.flatnonzero(np.r_[True, (keys[1:] != keys[:-1]).any(axis=1)])
+            ends   = np.r_[starts[1:], len(order)]
+        else:
+            starts = ends = np.zeros(0, dtype=np.int64)
+        self._groups = {
+            (int(keys[s, 0]), "credit" if keys[s, 1] else "debit", int(keys[s, 2])): order[s:e]
+            for s, e in zip(starts, ends)
+        }
+        self._empty = np.zeros(0, dtype=np.int64)
+
+    # --------------------------------------------------------
+    # 問い合わせ
+    # --------------------------------------------------------
+    @staticmethod
+    def _year(year) -> int:
+        """2025 / "Year 2025" のどちらでも受け付ける"""
+        if isinstance(year, str):
+            year = year.split()[-1]
+        return int(year)
+
+    def rows(self, statement: str) -> list:
+        return list(self.sources[statement])
+
+    def positions(self, statement: str, row: str, year) -> tuple:
+        """セルを構成する仕訳行の (行位置, 符号)"""
+        y = self._year(year)
+        pos, sign = [], []
+        for (code, side, match, cumulative), s in self.sources[statement][row].items():
+            years = [v for v in self.years if v <= y] if cumulative else [y]
+            for v in years:
+                p = self._groups.get((v, side, code), self._empty)
+                if match is not None and len(p):
+                    p = p[[isinstance(d, str) and match(d) for d in self._desc[p]]]
+                pos.append(p)
+                sign.append(np.full(len(p), s))
+        if not pos:
+            return self._empty, np.zeros(0)
+        return np.concatenate(pos), np.concatenate(sign)
+
+    def group_total(self, year, side: str, code: int) -> float:
+        """(事業年度, 貸借, 科目コード) の金額合計（該当なしは 0）"""
+        p = self._groups.get((self._year(year), side, int(code)))
+        return float(self._amount[p].sum()) if p is not None else 0.0
+
+    def entry_ids(self, statement: str, row: str, year) -> np.ndarray:
+        """セルを構成する仕訳行の id（get_df() の id 列）"""
+        pos, _ = self.positions(statement, row, year)
+        return self.df["id"].to_numpy()[np.sort(pos)]
+
+    def value(self, statement: str, row: str, year) -> float:
+        """該当仕訳から再計算したセルの値"""
+        pos, sign = self.positions(statement, row, year)
+        return float(np.dot(sign, self._amount[pos]))
+
+    def drill(self, statement: str, row: str, year) -> pd.DataFrame:
+        """セルを構成する仕訳行（日付・id 順、sign 列 = セルへの寄与の符号）"""
+        pos, sign = self.positions(statement, row, year)
+        out = self.df.iloc[pos].assign(sign=sign)
+        return out.sort_values(["date", "id"], kind="stable")
+
+# ============================================================
+# core/finance/drilldown.py end
+# ============================================================
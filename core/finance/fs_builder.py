@@ -2,32 +2,70 @@
 # core/finance/fs_builder.py
 # 仕様書 第11章 Reporting Layer 準拠版
 # ============================================================
+#
+# 【集計方法】
+#   LedgerManager.trial_balance（月次スナップショット）から
+#   科目コード（core/ledger/accounts.py）× 年の借方・貸方合計を取り出し、
+#   各表の行はその配列から取り出す。BS は年末までの累計試算表を使う。
+#   行の並び（営業費用・支払利息・資産・負債）は科目表の区分フラグから決まる。
+#   摘要で区別する行（売却収入・売却費用・当座借越返済）は摘要別合計から集計する。
+#
+# 【ドリルダウン】
+#   各行を集計しながら、その行を構成する仕訳の出どころ
+#     (科目コード, 貸借, 摘要の条件, 累計か) → 符号
+#   を self.sources[表][行] に記録する（合計行は構成行の出どころを符号付きで合成）。
+#   drilldown() はこれを core/finance/drilldown.py の逆引き索引に渡し、
+#   (表, 行, 年) のセルから該当する仕訳行を台帳を再走査せずに返す。
+#
+# ============================================================
 
+import numpy as np
 import pandas as pd
 
+from core.engine.overdraft_engine import OD_REPAY_DESC
+from core.ledger import accounts
+from core.ledger.accounts import CODE
+
+
+# 摘要で区別する行の条件（ドリルダウンの出どころのキーにもなる）
+def _is_sale(desc: str) -> bool:
+    return "売却" in desc
+
+
+def _is_sale_cost(desc: str) -> bool:
+    return "売却費用" in desc
+
+
+def _is_od_repay(desc: str) -> bool:
+    return desc == OD_REPAY_DESC
+
 
 class FinancialStatementBuilder:
 
     def __init__(self, ledger):
-        self.ledger = ledger
+        self.ledger  = ledger
+        self.sources = {}   # 表 → 行 → {(科目コード, 貸借, 摘要の条件, 累計か): 符号}
+        self.years   = []
 
     # ============================================================
     # メイン：PL / BS / CF 全体を構築
     # ============================================================
     def build(self) -> dict:
-        df = self.ledger.get_df().copy()
-
-        # year列はledger.get_df()が付与済み
-        years     = sorted(df["year"].dropna().unique().astype(int))
+        # 仕訳のある事業年度
+        years     = self.ledger.years
         year_cols = [f"Year {y}" for y in years]
+        self.years = list(years)
+
+        t = _YearTotals(self.ledger, years)
 
-        pl_df = self._build_pl(df, years, year_cols)
-        bs_df = self._build_bs(df, years, year_cols, pl_df)
-        cf_df = self._build_cf(df, years, year_cols)
+        pl_df = self._build_pl(t, year_cols)
+        bs_df = self._build_bs(t, year_cols, pl_df)
+        cf_df = self._build_cf(t, year_cols)
 
         # 貸借一致チェック
-        debit_total  = df[df["dr_cr"] == "debit" ]["amount"].sum()
-        credit_total = df[df["dr_cr"] == "credit"]["amount"].sum()
+        tb = self.ledger.trial_balance()
+        debit_total  = tb.debit.sum()
+        credit_total = tb.credit.sum()
         balance_diff = debit_total - credit_total
 
         return {
@@ -40,337 +78,293 @@ class FinancialStatementBuilder:
             "credit_total": credit_total,
         }
 
+    def drilldown(self, ledger_df: pd.DataFrame = None):
+        """
+        build() 後に、セル → 仕訳行 の逆引き索引（DrillDownIndex）を返す。
+        ledger_df : ledger.get_df()（作成済みなら渡すと再生成しない）
+        """
+        from core.finance.drilldown import DrillDownIndex
+        if ledger_df is None:
+            ledger_df = self.ledger.get_df()
+        return DrillDownIndex(ledger_df, self.sources, self.years)
+
     # ============================================================
     # ① 損益計算書（PL）
     # ============================================================
-    def _build_pl(self, df: pd.DataFrame, years: list, year_cols: list) -> pd.DataFrame:
-
-        pl_rows = [
-            "売上高",
-            "売上総利益",
-            "管理費",
-            "修繕費",
-            "保険料",
-            "その他販管費",
-            "建物減価償却費",
-            "追加設備減価償却費",
-            "固定資産税（土地）",
-            "固定資産税（建物）",
-            "租税公課（消費税）",
-            "営業利益",
-            "長期借入金利息",
-            "追加設備借入利息",
-            "当座借越利息",
+    def _build_pl(self, t: "_YearTotals", year_cols: list) -> pd.DataFrame:
+
+        def dr(acc): return t.dr[CODE[acc]]
+        def cr(acc): return t.cr[CODE[acc]]
+
+        opex = accounts.statement_lines(accounts.OPEX)
+        fin  = accounts.statement_lines(accounts.INTEREST)
+
+        pl, src = {}, self.sources.setdefault("pl", {})
+        pl["売上高"]     = cr("売上高")
+        pl["売上総利益"] = pl["売上高"]
+        src["売上高"]     = _src("売上高", "credit")
+        src["売上総利益"] = src["売上高"]
+
+        for acc in opex:
+            pl[acc]  = dr(acc)
+            src[acc] = _src(acc, "debit")
+        pl["営業利益"]  = pl["売上総利益"] - sum(pl[acc] for acc in opex)
+        src["営業利益"] = _combine(src["売上総利益"], *(_neg(src[acc]) for acc in opex))
+
+        for acc in fin:
+            pl[acc]  = dr(acc)
+            src[acc] = _src(acc, "debit")
+        pl["経常利益"]  = pl["営業利益"] - sum(pl[acc] for acc in fin)
+        src["経常利益"] = _combine(src["営業利益"], *(_neg(src[acc]) for acc in fin))
+
+        # 売却損益（貸方残 = 益、借方残 = 損）
+        pl["固定資産売却益（損）"] = cr("固定資産売却益（損）") - dr("固定資産売却益（損）")
+        pl["税引前当期利益"]       = pl["経常利益"] + pl["固定資産売却益（損）"]
+        src["固定資産売却益（損）"] = _neg(_net("固定資産売却益（損）"))
+        src["税引前当期利益"]       = _combine(src["経常利益"], src["固定資産売却益（損）"])
+
+        # 所得税（法人税）：TaxEngineが借方に計上
+        pl["所得税（法人税）"] = dr("所得税（法人税）")
+        pl["当期利益"]         = pl["税引前当期利益"] - pl["所得税（法人税）"]
+        src["所得税（法人税）"] = _src("所得税（法人税）", "debit")
+        src["当期利益"]         = _combine(src["税引前当期利益"], _neg(src["所得税（法人税）"]))
+
+        pl_rows = ["売上高", "売上総利益"] + opex + ["営業利益"] + fin + [
             "経常利益",
             "固定資産売却益（損）",
             "税引前当期利益",
             "所得税（法人税）",
             "当期利益",
         ]
-        pl = pd.DataFrame(0.0, index=pl_rows, columns=year_cols)
-
-        def dr(acc, ydf): return ydf[(ydf["dr_cr"] == "debit")  & (ydf["account"] == acc)]["amount"].sum()
-        def cr(acc, ydf): return ydf[(ydf["dr_cr"] == "credit") & (ydf["account"] == acc)]["amount"].sum()
-
-        for y in years:
-            col = f"Year {y}"
-            ydf = df[df["year"] == y]
-
-            pl.loc["売上高",             col] = cr("売上高",             ydf)
-            pl.loc["売上総利益",         col] = pl.loc["売上高", col]
-
-            pl.loc["管理費",             col] = dr("管理費",             ydf)
-            pl.loc["修繕費",             col] = dr("修繕費",             ydf)
-            pl.loc["保険料",             col] = dr("保険料",             ydf)
-            pl.loc["その他販管費",       col] = dr("その他販管費",       ydf)
-            pl.loc["建物減価償却費",     col] = dr("建物減価償却費",     ydf)
-            pl.loc["追加設備減価償却費", col] = dr("追加設備減価償却費", ydf)
-            pl.loc["固定資産税（土地）", col] = dr("固定資産税（土地）", ydf)
-            pl.loc["固定資産税（建物）", col] = dr("固定資産税（建物）", ydf)
-            pl.loc["租税公課（消費税）", col] = dr("租税公課（消費税）", ydf)
-
-            pl.loc["営業利益", col] = (
-                pl.loc["売上総利益",         col]
-                - pl.loc["管理費",             col]
-                - pl.loc["修繕費",             col]
-                - pl.loc["保険料",             col]
-                - pl.loc["その他販管費",       col]
-                - pl.loc["建物減価償却費",     col]
-                - pl.loc["追加設備減価償却費", col]
-                - pl.loc["固定資産税（土地）", col]
-                - pl.loc["固定資産税（建物）", col]
-                - pl.loc["租税公課（消費税）", col]
-            )
-
-            pl.loc["長期借入金利息",   col] = dr("長期借入金利息",   ydf)
-            pl.loc["追加設備借入利息", col] = dr("追加設備借入利息", ydf)
-            pl.loc["当座借越利息",     col] = dr("当座借越利息",     ydf)
-
-            pl.loc["経常利益", col] = (
-                pl.loc["営業利益",         col]
-                - pl.loc["長期借入金利息",   col]
-                - pl.loc["追加設備借入利息", col]
-                - pl.loc["当座借越利息",     col]
-            )
-
-            # 売却損益（貸方残 = 益、借方残 = 損）
-            gain = cr("固定資産売却益（損）", ydf)
-            loss = dr("固定資産売却益（損）", ydf)
-            pl.loc["固定資産売却益（損）", col] = gain - loss
-
-            pl.loc["税引前当期利益", col] = (
-                pl.loc["経常利益",             col]
-                + pl.loc["固定資産売却益（損）", col]
-            )
-
-            # 所得税（法人税）：TaxEngineが借方に計上
-            pl.loc["所得税（法人税）", col] = dr("所得税（法人税）", ydf)
-
-            pl.loc["当期利益", col] = (
-                pl.loc["税引前当期利益", col]
-                - pl.loc["所得税（法人税）", col]
-            )
-
-        return pl
+        return _frame(pl, pl_rows, year_cols)
 
     # ============================================================
     # ② 貸借対照表（BS）
     # ============================================================
-    def _build_bs(
-        self,
-        df: pd.DataFrame,
-        years: list,
-        year_cols: list,
-        pl_df: pd.DataFrame,
-    ) -> pd.DataFrame:
-
-        bs_rows = [
-            # 資産
-            "預金",
-            "未収還付消費税",
-            "仮払消費税",
-            "建物",
-            "建物減価償却累計額",
-            "追加設備",
-            "追加設備減価償却累計額",
-            "土地",
-            "資産合計",
-            # 負債
-            "未払消費税",
-            "未払所得税（法人税）",
-            "当座借越借入金",
-            "長期借入金",
-            "追加設備投資借入金",
-            # 純資産
-            "元入金",
-            "繰越利益剰余金",
-            "負債・純資産合計",
-        ]
-        bs = pd.DataFrame(0.0, index=bs_rows, columns=year_cols)
-
-        for y in years:
-            col  = f"Year {y}"
-            ydf  = df[df["year"] <= y]  # 累積
-
-            def asset_bal(acc):
-                """資産科目：借方残（dr - cr）"""
-                dr = ydf[(ydf["dr_cr"] == "debit")  & (ydf["account"] == acc)]["amount"].sum()
-                cr = ydf[(ydf["dr_cr"] == "credit") & (ydf["account"] == acc)]["amount"].sum()
-                return float(dr - cr)
-
-            def liab_bal(acc):
-                """負債・純資産科目：貸方残（cr - dr）"""
-                dr = ydf[(ydf["dr_cr"] == "debit")  & (ydf["account"] == acc)]["amount"].sum()
-                cr = ydf[(ydf["dr_cr"] == "credit") & (ydf["account"] == acc)]["amount"].sum()
-                return float(cr - dr)
-
-            # ---- 資産 ----
-            bs.loc["預金",             col] = asset_bal("預金")
-            bs.loc["未収還付消費税",   col] = asset_bal("未収還付消費税")
-            bs.loc["仮払消費税",       col] = asset_bal("仮払消費税")
-            bs.loc["建物",             col] = asset_bal("建物")
-            bs.loc["追加設備",         col] = asset_bal("追加設備")
-            bs.loc["土地",             col] = asset_bal("土地")
-
-            # 減価償却累計額：貸方残（資産のマイナス項目）→ 表示はマイナス
-            bld_dep = ydf[(ydf["dr_cr"] == "credit") & (ydf["account"] == "建物減価償却累計額")]["amount"].sum()
-            bld_dep -= ydf[(ydf["dr_cr"] == "debit")  & (ydf["account"] == "建物減価償却累計額")]["amount"].sum()
-            bs.loc["建物減価償却累計額", col] = -float(bld_dep)
-
-            add_dep = ydf[(ydf["dr_cr"] == "credit") & (ydf["account"] == "追加設備減価償却累計額")]["amount"].sum()
-            add_dep -= ydf[(ydf["dr_cr"] == "debit")  & (ydf["account"] == "追加設備減価償却累計額")]["amount"].sum()
-            bs.loc["追加設備減価償却累計額", col] = -float(add_dep)
-
-            bs.loc["資産合計", col] = (
-                bs.loc["預金",                     col]
-                + bs.loc["未収還付消費税",         col]
-                + bs.loc["仮払消費税",             col]
-                + bs.loc["建物",                   col]
-                + bs.loc["建物減価償却累計額",     col]
-                + bs.loc["追加設備",               col]
-                + bs.loc["追加設備減価償却累計額", col]
-                + bs.loc["土地",                   col]
-            )
-
-            # ---- 負債 ----
-            bs.loc["未払消費税",         col] = liab_bal("未払消費税")
-            bs.loc["未払所得税（法人税）", col] = liab_bal("未払所得税（法人税）")
-            bs.loc["当座借越借入金",     col] = liab_bal("当座借越借入金")
-            bs.loc["長期借入金",         col] = liab_bal("長期借入金")
-            bs.loc["追加設備投資借入金", col] = liab_bal("追加設備投資借入金")
-
-            # ---- 純資産 ----
-            bs.loc["元入金",             col] = liab_bal("元入金")
-
-            # 繰越利益剰余金 = 当期までの当期利益累計
-            prev_cols = [f"Year {yy}" for yy in years if yy <= y]
-            bs.loc["繰越利益剰余金", col] = float(pl_df.loc["当期利益", prev_cols].sum())
-
-            bs.loc["負債・純資産合計", col] = (
-                bs.loc["未払消費税",           col]
-                + bs.loc["未払所得税（法人税）", col]
-                + bs.loc["当座借越借入金",       col]
-                + bs.loc["長期借入金",           col]
-                + bs.loc["追加設備投資借入金",   col]
-                + bs.loc["元入金",               col]
-                + bs.loc["繰越利益剰余金",       col]
-            )
-
-        return bs
+    def _build_bs(self, t: "_YearTotals", year_cols: list, pl_df: pd.DataFrame) -> pd.DataFrame:
+
+        # 累積（year <= y）の 借方 − 貸方
+        net = t.cum_net
+
+        # 資産：借方残（dr - cr）
+        # 減価償却累計額：貸方残（資産のマイナス項目）→ 表示はマイナス（= dr - cr）
+        assets = accounts.statement_lines(accounts.ASSET | accounts.CONTRA_ASSET)
+        # 負債・純資産：貸方残（cr - dr）
+        liabs  = accounts.statement_lines(accounts.LIABILITY)
+
+        bs, src = {}, self.sources.setdefault("bs", {})
+        for acc in assets:
+            bs[acc]  = net[CODE[acc]]
+            src[acc] = _net(acc, cumulative=True)
+        bs["資産合計"]  = sum(bs[acc] for acc in assets)
+        src["資産合計"] = _combine(*(src[acc] for acc in assets))
+
+        for acc in liabs + ["元入金"]:
+            bs[acc]  = -net[CODE[acc]]
+            src[acc] = _neg(_net(acc, cumulative=True))
+
+        # 繰越利益剰余金 = 当期までの当期利益累計
+        bs["繰越利益剰余金"]  = np.cumsum(pl_df.loc["当期利益"].to_numpy(dtype=float))
+        src["繰越利益剰余金"] = _cumulative(self.sources["pl"]["当期利益"])
+
+        bs["負債・純資産合計"] = (
+            sum(bs[acc] for acc in liabs) + bs["元入金"] + bs["繰越利益剰余金"]
+        )
+        src["負債・純資産合計"] = _combine(
+            *(src[acc] for acc in liabs), src["元入金"], src["繰越利益剰余金"]
+        )
+
+        bs_rows = (
+            assets + ["資産合計"]
+            + liabs
+            + ["元入金", "繰越利益剰余金", "負債・純資産合計"]
+        )
+        return _frame(bs, bs_rows, year_cols)
 
     # ============================================================
     # ③ 資金収支計算書（CF）直接法
     # ============================================================
-    def _build_cf(self, df: pd.DataFrame, years: list, year_cols: list) -> pd.DataFrame:
-
-        cf_rows = [
-            "【営業収支】",
-            "家賃収入（税抜）",
-            "営業収入計",
-            "管理費",
-            "修繕費",
-            "保険料",
-            "その他販管費",
-            "固定資産税（土地）",
-            "固定資産税（建物）",
-            "未払消費税納付",
-            "未払所得税納付",
-            "長期借入金利息",
-            "追加設備借入利息",
-            "当座借越利息",
-            "営業支出計",
-            "営業収支",
-            "【設備収支】",
-            "固定資産売却収入",
-            "設備売却計",
-            "売却費用",
-            "土地購入",
-            "建物購入",
-            "追加設備購入",
-            "設備購入計",
-            "設備収支",
-            "【財務収支】",
-            "元入金調達",
-            "長期借入金調達",
-            "追加設備投資借入金調達",
-            "資金調達計",
-            "長期借入金返済",
-            "追加設備投資借入金返済",
-            "借入金返済計",
-            "財務収支",
-            "【資金収支尻】",
-        ]
-        cf = pd.DataFrame(0.0, index=cf_rows, columns=year_cols)
-
-        def dr_sum(acc, y): return df[(df["year"] == y) & (df["dr_cr"] == "debit")  & (df["account"] == acc)]["amount"].sum()
-        def cr_sum(acc, y): return df[(df["year"] == y) & (df["dr_cr"] == "credit") & (df["account"] == acc)]["amount"].sum()
-
-        for y in years:
-            col = f"Year {y}"
-
-            # 営業収入
-            cf.loc["家賃収入（税抜）", col] = cr_sum("売上高", y)
-            cf.loc["営業収入計",       col] = cf.loc["家賃収入（税抜）", col]
-
-            # 営業支出（個別科目で集計）
-            cf.loc["管理費",             col] = dr_sum("管理費",             y)
-            cf.loc["修繕費",             col] = dr_sum("修繕費",             y)
-            cf.loc["保険料",             col] = dr_sum("保険料",             y)
-            cf.loc["その他販管費",       col] = dr_sum("その他販管費",       y)
-            cf.loc["固定資産税（土地）", col] = dr_sum("固定資産税（土地）", y)
-            cf.loc["固定資産税（建物）", col] = dr_sum("固定資産税（建物）", y)
-            cf.loc["未払消費税納付",     col] = dr_sum("未払消費税",         y)
-            cf.loc["未払所得税納付",     col] = dr_sum("未払所得税（法人税）", y)
-            cf.loc["長期借入金利息",     col] = dr_sum("長期借入金利息",     y)
-            cf.loc["追加設備借入利息",   col] = dr_sum("追加設備借入利息",   y)
-            cf.loc["当座借越利息",       col] = dr_sum("当座借越利息",       y)
-
-            cf.loc["営業支出計", col] = (
-                cf.loc["管理費",               col]
-                + cf.loc["修繕費",             col]
-                + cf.loc["保険料",             col]
-                + cf.loc["その他販管費",       col]
-                + cf.loc["固定資産税（土地）", col]
-                + cf.loc["固定資産税（建物）", col]
-                + cf.loc["未払消費税納付",     col]
-                + cf.loc["未払所得税納付",     col]
-                + cf.loc["長期借入金利息",     col]
-                + cf.loc["追加設備借入利息",   col]
-                + cf.loc["当座借越利息",       col]
-            )
-            cf.loc["営業収支", col] = cf.loc["営業収入計", col] - cf.loc["営業支出計", col]
-
-            # 設備収支
-            cf.loc["固定資産売却収入", col] = dr_sum("預金", y) - cr_sum("預金", y)  # 売却時の預金増加分（概算）
-            # ※ より正確には「固定資産売却仮勘定」経由の預金入金を抽出する
-            # ここでは売却益仕訳から預金を直接参照
-            cf.loc["固定資産売却収入", col] = (
-                df[(df["year"] == y) & (df["dr_cr"] == "debit") & (df["account"] == "預金") &
-                   (df["description"].str.contains("売却", na=False))]["amount"].sum()
-            )
-            cf.loc["設備売却計", col] = cf.loc["固定資産売却収入", col]
-            cf.loc["売却費用",   col] = (
-                df[(df["year"] == y) & (df["dr_cr"] == "credit") & (df["account"] == "預金") &
-                   (df["description"].str.contains("売却費用", na=False))]["amount"].sum()
-            )
-            cf.loc["土地購入",     col] = cr_sum("土地",     y)
-            cf.loc["建物購入",     col] = cr_sum("建物",     y)
-            cf.loc["追加設備購入", col] = cr_sum("追加設備", y)
-            cf.loc["設備購入計", col] = (
-                cf.loc["土地購入", col]
-                + cf.loc["建物購入", col]
-                + cf.loc["追加設備購入", col]
-            )
-            cf.loc["設備収支", col] = (
-                cf.loc["設備売却計", col]
-                - cf.loc["設備購入計", col]
-                - cf.loc["売却費用",   col]
-            )
-
-            # 財務収支
-            cf.loc["元入金調達",             col] = cr_sum("元入金",             y)
-            cf.loc["長期借入金調達",         col] = cr_sum("長期借入金",         y)
-            cf.loc["追加設備投資借入金調達", col] = cr_sum("追加設備投資借入金", y)
-            cf.loc["資金調達計", col] = (
-                cf.loc["元入金調達",             col]
-                + cf.loc["長期借入金調達",         col]
-                + cf.loc["追加設備投資借入金調達", col]
-            )
-            cf.loc["長期借入金返済",         col] = dr_sum("長期借入金",         y)
-            cf.loc["追加設備投資借入金返済", col] = dr_sum("追加設備投資借入金", y)
-            cf.loc["借入金返済計", col] = (
-                cf.loc["長期借入金返済",         col]
-                + cf.loc["追加設備投資借入金返済", col]
-            )
-            cf.loc["財務収支", col] = cf.loc["資金調達計", col] - cf.loc["借入金返済計", col]
-
-            cf.loc["【資金収支尻】", col] = (
-                cf.loc["営業収支", col]
-                + cf.loc["設備収支", col]
-                + cf.loc["財務収支", col]
-            )
-
-        return cf
+    def _build_cf(self, t: "_YearTotals", year_cols: list) -> pd.DataFrame:
+
+        def dr_sum(acc): return t.dr[CODE[acc]]
+        def cr_sum(acc): return t.cr[CODE[acc]]
+
+        cf, src = {}, self.sources.setdefault("cf", {})
+        cf["【営業収支】"] = t.zero
+
+        # 営業収入
+        cf["家賃収入（税抜）"] = cr_sum("売上高")
+        cf["営業収入計"]       = cf["家賃収入（税抜）"]
+
+        # 営業支出（個別科目で集計）
+        opex_accounts = {
+            "管理費":             "管理費",
+            "修繕費":             "修繕費",
+            "保険料":             "保険料",
+            "その他販管費":       "その他販管費",
+            "固定資産税（土地）": "固定資産税（土地）",
+            "固定資産税（建物）": "固定資産税（建物）",
+            "未払消費税納付":     "未払消費税",
+            "未払所得税納付":     "未払所得税（法人税）",
+            "長期借入金利息":     "長期借入金利息",
+            "追加設備借入利息":   "追加設備借入利息",
+            "当座借越利息":       "当座借越利息",
+        }
+        cf_opex = {row: dr_sum(acc) for row, acc in opex_accounts.items()}
+        cf.update(cf_opex)
+        cf["営業支出計"] = sum(cf_opex.values())
+        cf["営業収支"]   = cf["営業収入計"] - cf["営業支出計"]
+
+        # 設備収支
+        # 売却時の預金入金（摘要に「売却」を含む預金の借方）
+        cf["【設備収支】"]     = t.zero
+        cf["固定資産売却収入"] = t.by_description("預金", "debit", _is_sale)
+        cf["設備売却計"] = cf["固定資産売却収入"]
+        cf["売却費用"]   = t.by_description("預金", "credit", _is_sale_cost)
+        cf["土地購入"]     = cr_sum("土地")
+        cf["建物購入"]     = cr_sum("建物")
+        cf["追加設備購入"] = cr_sum("追加設備")
+        cf["設備購入計"]   = cf["土地購入"] + cf["建物購入"] + cf["追加設備購入"]
+        cf["設備収支"]     = cf["設備売却計"] - cf["設備購入計"] - cf["売却費用"]
+
+        # 財務収支
+        cf["【財務収支】"]           = t.zero
+        cf["元入金調達"]             = cr_sum("元入金")
+        cf["長期借入金調達"]         = cr_sum("長期借入金")
+        cf["追加設備投資借入金調達"] = cr_sum("追加設備投資借入金")
+        cf["当座借越調達"]           = cr_sum("当座借越借入金")
+        cf["資金調達計"] = (
+            cf["元入金調達"]
+            + cf["長期借入金調達"]
+            + cf["追加設備投資借入金調達"]
+            + cf["当座借越調達"]
+        )
+        cf["長期借入金返済"]         = dr_sum("長期借入金")
+        cf["追加設備投資借入金返済"] = dr_sum("追加設備投資借入金")
+        # 当座借越の返済は預金による返済のみ（最終精算の元入金振替は資金移動なし）
+        cf["当座借越返済"] = t.by_description("当座借越借入金", "debit", _is_od_repay)
+        cf["借入金返済計"] = (
+            cf["長期借入金返済"]
+            + cf["追加設備投資借入金返済"]
+            + cf["当座借越返済"]
+        )
+        cf["財務収支"] = cf["資金調達計"] - cf["借入金返済計"]
+
+        cf["【資金収支尻】"] = cf["営業収支"] + cf["設備収支"] + cf["財務収支"]
+
+        # ---- ドリルダウンの出どころ（上の式と同じ構成）----
+        for row in ("【営業収支】", "【設備収支】", "【財務収支】"):
+            src[row] = {}
+        src["家賃収入（税抜）"] = _src("売上高", "credit")
+        src["営業収入計"]       = src["家賃収入（税抜）"]
+        for row, acc in opex_accounts.items():
+            src[row] = _src(acc, "debit")
+        src["営業支出計"] = _combine(*(src[row] for row in opex_accounts))
+        src["営業収支"]   = _combine(src["営業収入計"], _neg(src["営業支出計"]))
+
+        src["固定資産売却収入"] = _src("預金", "debit", match=_is_sale)
+        src["設備売却計"]       = src["固定資産売却収入"]
+        src["売却費用"]         = _src("預金", "credit", match=_is_sale_cost)
+        src["土地購入"]         = _src("土地", "credit")
+        src["建物購入"]         = _src("建物", "credit")
+        src["追加設備購入"]     = _src("追加設備", "credit")
+        src["設備購入計"]       = _combine(src["土地購入"], src["建物購入"], src["追加設備購入"])
+        src["設備収支"]         = _combine(
+            src["設備売却計"], _neg(src["設備購入計"]), _neg(src["売却費用"])
+        )
+
+        src["元入金調達"]             = _src("元入金", "credit")
+        src["長期借入金調達"]         = _src("長期借入金", "credit")
+        src["追加設備投資借入金調達"] = _src("追加設備投資借入金", "credit")
+        src["当座借越調達"]           = _src("当座借越借入金", "credit")
+        src["資金調達計"] = _combine(
+            src["元入金調達"], src["長期借入金調達"],
+            src["追加設備投資借入金調達"], src["当座借越調達"],
+        )
+        src["長期借入金返済"]         = _src("長期借入金", "debit")
+        src["追加設備投資借入金返済"] = _src("追加設備投資借入金", "debit")
+        src["当座借越返済"]           = _src("当座借越借入金", "debit", match=_is_od_repay)
+        src["借入金返済計"] = _combine(
+            src["長期借入金返済"], src["追加設備投資借入金返済"], src["当座借越返済"]
+        )
+        src["財務収支"]       = _combine(src["資金調達計"], _neg(src["借入金返済計"]))
+        src["【資金収支尻】"] = _combine(src["営業収支"], src["設備収支"], src["財務収支"])
+        self.sources["cf"] = {row: src[row] for row in cf}   # 表の行順に揃える
+
+        return _frame(cf, list(cf), year_cols)
+
+
+# ============================================================
+# 科目コード × 年 の借方・貸方合計
+# ============================================================
+class _YearTotals:
+    """
+    dr[code, i] / cr[code, i] : years[i] 年の科目別 借方・貸方合計
+    cum_net[code, i]          : years[i] 年末までの累計 借方 − 貸方
+    行は科目コード（末尾は科目表にない科目 = UNKNOWN）。
+    """
+
+    def __init__(self, ledger, years: list):
+        self.ledger = ledger
+        self._col   = {y: i for i, y in enumerate(years)}
+        n = accounts.UNKNOWN + 1
+
+        year_tbs = [ledger.trial_balance(y) for y in years]
+        cum_tbs  = [ledger.trial_balance(y, cumulative=True) for y in years]
+        self.dr      = np.array([tb.debit  for tb in year_tbs]).reshape(len(years), n).T
+        self.cr      = np.array([tb.credit for tb in year_tbs]).reshape(len(years), n).T
+        self.cum_net = np.array([tb.net    for tb in cum_tbs ]).reshape(len(years), n).T
+        self.zero    = np.zeros(len(years))
+
+    def by_description(self, account: str, dr_cr: str, match) -> np.ndarray:
+        """摘要が match を満たす仕訳の年別合計"""
+        out = np.zeros(len(self._col))
+        for (y, desc), amount in self.ledger.description_totals(account, dr_cr).items():
+            if y in self._col and isinstance(desc, str) and match(desc):
+                out[self._col[y]] += amount
+        return out
+
+
+# ============================================================
+# ドリルダウンの出どころ
+#   {(科目コード, 貸借, 摘要の条件 or None, 累計か): 符号}
+#   セルの値 = Σ 符号 × （該当する仕訳行の金額合計）
+# ============================================================
+def _src(acc: str, side: str, match=None) -> dict:
+    return {(CODE[acc], side, match, False): 1.0}
+
+
+def _net(acc: str, cumulative: bool = False) -> dict:
+    """借方 − 貸方"""
+    return {(CODE[acc], "debit", None, cumulative): 1.0, (CODE[acc], "credit", None, cumulative): -1.0}
+
+
+def _neg(sources: dict) -> dict:
+    return {k: -v for k, v in sources.items()}
+
+
+def _cumulative(sources: dict) -> dict:
+    """年末までの累計に読み替える"""
+    return {(code, side, match, True): v for (code, side, match, _), v in sources.items()}
+
+
+def _combine(*terms: dict) -> dict:
+    """出どころの和（打ち消し合う項は除く）"""
+    out = {}
+    for sources in terms:
+        for k, v in sources.items():
+            v = out.get(k, 0.0) + v
+            if v:
+                out[k] = v
+            else:
+                out.pop(k, None)
+    return out
+
+
+def _frame(rows: dict, order: list, year_cols: list) -> pd.DataFrame:
+    """行名 → 年次配列 の dict を order の並びの DataFrame にする。"""
+    data = np.array([np.asarray(rows[r], dtype=float) for r in order]).reshape(len(order), len(year_cols))
+    return pd.DataFrame(data, index=order, columns=year_cols)
 
 # ============================================================
 # core/finance/fs_builder.py end
@@ -0,0 +1,328 @@
+# ============================================================
+# core/finance/metrics.py
+# 投資指標（NPV・IRR・DSCR・LTV・エクイティマルチプル・回収年）
+# ============================================================
+#
+# 【責務】
+#   年次キャッシュフローの numpy 配列から投資指標を計算する。
+#   すべての関数は 1次元（1シナリオ）・2次元（シナリオ × 年）の両方を受け付け、
+#   2次元の場合はシナリオ単位でまとめて（ループなしで）計算する。
+#
+# 【配列関数】
+#   npv(flows, rate, initial)        : Σ flows[t] / (1+rate)^(t+1) − initial
+#   irr(flows)                       : flows[0] を t=0 とする内部収益率（解なしは NaN）
+#   dscr(noi, debt_service)          : 年次 NOI ÷ 元利返済額（返済なしの年は NaN）
+#   ltv_path(debt, value)            : 年末借入残高 ÷ 物件価額
+#   equity_multiple(dist, equity)    : 分配総額 ÷ 自己資金
+#   first_index(mask)                : 各行で最初に True となる列（なければ −1）
+#
+# 【財務諸表からの指標】
+#   batch_metrics(fs_list, params_list) : 複数シナリオ分（年数が異なる場合は末尾を埋める）
+#   investment_metrics(fs, params)      : 1シナリオ分
+#
+#   キャッシュフローの定義は従来の経済探偵レポート（ui/app.py）と同じ：
+#     年次 CF   = CF「営業収支」、最終年に売却純収入（期末預金 − 営業収支累計）を加算
+#     I₀        = 取得総額（土地 + 建物 + 仲介手数料）
+#     IRR       = 上記 CF と I₀ に対する内部収益率（NPV = 0 となる割引率）
+#   自己資金ベース：
+#     エクイティ IRR       = [−元入金, 0, …, 期末預金] の内部収益率
+#     エクイティマルチプル = 期末預金 ÷ 元入金
+#   DSCR = NOI ÷ 約定返済額（初期ローン・追加設備ローンの利息 + 元金、売却時の一括返済は除く）
+#   LTV  = 年末借入残高（長期借入金 + 追加設備投資借入金）÷（土地 + 建物の取得価格）
+#
+# ============================================================
+
+from datetime import date
+
+import numpy as np
+
+from core.engine.loan_engine import payment_schedule
+from core.simulation.period_calendar import PeriodCalendar
+
+
+# NOI から控除する運営費（CF の営業支出のうち、利息・税の納付を除くもの）
+NOI_EXPENSE_ROWS = (
+    "管理費", "修繕費", "保険料", "その他販管費", "固定資産税（土地）", "固定資産税（建物）",
+)
+DEBT_ROWS = ("長期借入金", "追加設備投資借入金")
+
+
+def _rows(a) -> np.ndarray:
+    """1次元は (1, n) に揃える。"""
+    a = np.asarray(a, dtype=float)
+    return a[None, :] if a.ndim == 1 else a
+
+
+def _out(x: np.ndarray, one_d: bool):
+    if one_d:
+        x = x[0]
+        return float(x) if np.ndim(x) == 0 else x
+    return x
+
+
+# ============================================================
+# 配列関数
+# ============================================================
+def npv(flows, rate, initial=0.0):
+    """
+    flows   : (n,) または (m, n)。flows[..., t] は t+1 年目末の CF
+    rate    : 割引率（スカラー または (m,)）
+    initial : 期首投資額（スカラー または (m,)）
+    """
+    one_d = np.ndim(flows) == 1
+    f     = _rows(flows)
+    rate  = np.broadcast_to(np.asarray(rate, dtype=float), (f.shape[0],))
+    t     = np.arange(1, f.shape[1] + 1)
+    pv    = np.sum(f / (1.0 + rate[:, None]) ** t, axis=1)
+    return _out(pv - np.asarray(initial, dtype=float), one_d)
+
+
+def irr(flows, lo: float = -0.99, hi: float = 10.0, tol: float = 1e-10, max_iter: int = 200):
+    """
+    内部収益率。flows[..., 0] を t=0（通常は投資額のマイナス）とする。
+
+    解法：割引率のグリッド上で NPV の符号変化を探し、最も低い符号変化区間を
+    二分法で詰める（全シナリオ同時）。符号変化がない行は NaN。
+    """
+    one_d = np.ndim(flows) == 1
+    f     = _rows(flows)
+    m, n  = f.shape
+    t     = np.arange(n)
+
+    grid = np.unique(np.concatenate([
+        np.linspace(lo, 1.0, 400, endpoint=False),
+        np.geomspace(1.0, hi, 60),
+    ]))
+    values = f @ ((1.0 + grid[:, None]) ** -t).T      # (m, グリッド数)
+    sign   = np.sign(values)
+
+    change = (sign[:, :-1] * sign[:, 1:]) <= 0
+    change &= ~((sign[:, :-1] == 0) & (sign[:, 1:] == 0))
+    found  = change.any(axis=1)
+    k      = np.argmax(change, axis=1)
+
+    a  = grid[k]
+    b  = grid[np.minimum(k + 1, len(grid) - 1)]
+    fa = values[np.arange(m), k]
+
+    for _ in range(max_iter):
+        mid  = 0.5 * (a + b)
+        fmid = np.sum(f * (1.0 + mid[:, None]) ** -t, axis=1)
+        left = np.sign(fmid) == np.sign(fa)
+        a    = np.where(left, mid, a)
+        fa   = np.where(left, fmid, fa)
+        b    = np.where(left, b, mid)
+        if np.max(b - a) < tol:
+            break
+
+    result = np.where(found, 0.5 * (a + b), np.nan)
+    # グリッド点がちょうど解の場合
+    exact  = found & (fa == 0)
+    result = np.where(exact, a, result)
+    return _out(result, one_d)
+
+
+def dscr(noi, debt_service):
+    """年次 DSCR（返済額 0 の年は NaN）。"""
+    noi, ds = np.asarray(noi, dtype=float), np.asarray(debt_service, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(ds > 0, noi / np.where(ds > 0, ds, 1.0), np.nan)
+
+
+def ltv_path(debt, value):
+    """年末 LTV（物件価額 0 以下は NaN）。"""
+    debt  = np.asarray(debt, dtype=float)
+    value = np.asarray(value, dtype=float)
+    if value.ndim == 1 and debt.ndim == 2:
+        value = value[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(value > 0, debt / np.where(value > 0, value, 1.0), np.nan)
+
+
+def equity_multiple(distributions, equity):
+    """分配総額 ÷ 自己資金（自己資金 0 以下は NaN）。"""
+    dist, eq = np.asarray(distributions, dtype=float), np.asarray(equity, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(eq > 0, dist / np.where(eq > 0, eq, 1.0), np.nan)
+
+
+def first_index(mask):
+    """各行で最初に True となる列番号（なければ −1）。"""
+    one_d = np.ndim(mask) == 1
+    mk    = np.atleast_2d(np.asarray(mask, dtype=bool))
+    idx   = np.where(mk.any(axis=1), np.argmax(mk, axis=1), -1)
+    return int(idx[0]) if one_d else idx
+
+
+# ============================================================
+# パラメータ由来の系列
+# ============================================================
+def total_acquisition_cost(params) -> float:
+    """取得総額（土地 + 建物 + 仲介手数料）"""
+    return params.property_price_building + params.property_price_land + params.brokerage_fee_amount_incl
+
+
+def debt_service_schedule(params, n_years: int) -> np.ndarray:
+    """
+    事業年度ごとの約定元利返済額（長さ n_years、財務諸表の列と同じ並び）。
+    初期ローン（1ヶ月目開始）と追加設備ローン（投資年の1ヶ月目開始・元利均等）の合計。
+    月は期間表（PeriodCalendar）で事業年度に振り分け、
+    Exit月の翌月以降は 0（売却時の一括返済は含めない）。
+    """
+    months = np.zeros(n_years * 12)
+    loans  = []
+    loan   = params.initial_loan
+    if loan is not None and loan.amount > 0:
+        loans.append((loan.amount, loan.interest_rate, loan.years, loan.repayment_method, 1))
+    for inv in params.additional_investments or []:
+        amount = float(getattr(inv, "loan_amount", 0) or 0)
+        if amount > 0 and int(inv.year) >= 1:
+            loans.append((
+                amount,
+                float(getattr(inv, "loan_interest_rate", 0) or 0),
+                int(getattr(inv, "loan_years", 1) or 1),
+                "annuity",
+                (int(inv.year) - 1) * 12 + 1,
+            ))
+
+    for amount, rate, years, method, start in loans:
+        interests, principals = payment_schedule(amount, rate, years, method)
+        pay = np.asarray(interests, dtype=float) + np.asarray(principals, dtype=float)
+        s   = start - 1
+        e   = min(s + len(pay), len(months))
+        if e > s:
+            months[s:e] += pay[:e - s]
+
+    exit_year = int(params.exit_params.exit_year)
+    if exit_year >= 1:
+        months[exit_year * 12:] = 0.0
+
+    # 開始日がない場合は1月開始として扱う（年の値は使わない）
+    calendar = PeriodCalendar(
+        params.start_date or date(2000, 1, 1), len(months),
+        params.fiscal_year_end_month,
+    )
+    column = calendar.fiscal_year - calendar.fiscal_year[0] if len(months) else np.zeros(0, dtype=int)
+    return np.bincount(column, weights=months, minlength=n_years)[:n_years]
+
+
+# ============================================================
+# 財務諸表からの指標
+# ============================================================
+def _row(tbl, label, n) -> np.ndarray:
+    if label in tbl.index and tbl.shape[1]:
+        return tbl.loc[label].to_numpy(dtype=float)[:n]
+    return np.zeros(n)
+
+
+def statement_years(fs: dict) -> np.ndarray:
+    """財務諸表の列（"Year 2025" 形式）の事業年度"""
+    return np.array([int(str(c).split()[-1]) for c in fs["bs"].columns], dtype=int)
+
+
+def batch_metrics(fs_list: list, params_list: list) -> dict:
+    """
+    複数シナリオの投資指標。年次系列は (シナリオ数, 最大年数) で、
+    年数の足りないシナリオは末尾を NaN で埋める。
+
+    Returns
+    -------
+    dict
+        years            : 事業年度（NaN 埋め）
+        op               : 営業収支（0 埋め）
+        flows            : 年次 CF（営業収支、最終年に売却純収入を加算、0 埋め）
+        final_cash / pv / npv / irr / equity_irr / equity_multiple
+        payback_index    : 累積 CF が I₀（元入金、なければ取得総額）を超えた列（なければ −1）
+        positive_index   : 営業収支が初めてプラスになった列（なければ −1）
+        dscr / ltv       : 年次系列
+        min_dscr / max_ltv
+    """
+    if len(fs_list) != len(params_list):
+        raise ValueError("fs_list と params_list の件数が一致しません。")
+    m = len(fs_list)
+    n = max(fs["bs"].shape[1] for fs in fs_list) if m else 0
+
+    years   = np.full((m, n), np.nan)
+    op      = np.zeros((m, n))
+    flows   = np.zeros((m, n))
+    noi     = np.full((m, n), np.nan)
+    service = np.full((m, n), np.nan)
+    debt    = np.full((m, n), np.nan)
+    final_cash = np.zeros(m)
+    rate    = np.zeros(m)
+    i0      = np.zeros(m)
+    equity  = np.zeros(m)
+    value   = np.zeros(m)
+    recover = np.zeros(m)
+
+    for r, (fs, p) in enumerate(zip(fs_list, params_list)):
+        bs, cf = fs["bs"], fs["cf"]
+        k = bs.shape[1]
+        if k == 0:
+            continue
+        years[r, :k] = statement_years(fs)
+        cash          = _row(bs, "預金", k)
+        final_cash[r] = cash[-1]
+
+        op[r, :k]    = _row(cf, "営業収支", k)
+        flows[r, :k] = op[r, :k]
+        flows[r, k - 1] += final_cash[r] - op[r, :k].sum()
+
+        noi[r, :k] = _row(cf, "営業収入計", k) - sum(_row(cf, row, k) for row in NOI_EXPENSE_ROWS)
+        service[r, :k] = debt_service_schedule(p, k)
+        debt[r, :k]    = sum(_row(bs, row, k) for row in DEBT_ROWS)
+
+        rate[r]    = p.cf_discount_rate or 0.03
+        i0[r]      = total_acquisition_cost(p)
+        equity[r]  = p.initial_equity
+        value[r]   = p.property_price_land + p.property_price_building
+        recover[r] = p.initial_equity if p.initial_equity > 0 else i0[r]
+
+    pv = npv(flows, rate) if m else np.zeros(0)
+
+    project = np.concatenate([-i0[:, None], flows], axis=1)
+    eq_flow = np.zeros((m, n + 1))
+    eq_flow[:, 0] = -equity
+    last = np.maximum(np.sum(~np.isnan(years), axis=1), 1)
+    eq_flow[np.arange(m), last] = final_cash
+    valid_eq = equity > 0
+
+    dscr_path = dscr(noi, service)
+    ltv       = ltv_path(debt, value)
+
+    with np.errstate(invalid="ignore"):
+        min_dscr = np.where(np.isnan(dscr_path).all(axis=1), np.nan,
+                            np.nanmin(np.where(np.isnan(dscr_path), np.inf, dscr_path), axis=1))
+        max_ltv  = np.where(np.isnan(ltv).all(axis=1), np.nan,
+                            np.nanmax(np.where(np.isnan(ltv), -np.inf, ltv), axis=1))
+
+    return {
+        "years":           years,
+        "op":              op,
+        "flows":           flows,
+        "final_cash":      final_cash,
+        "pv":              pv,
+        "npv":             pv - i0,
+        "irr":             irr(project) if m else np.zeros(0),
+        "equity_irr":      np.where(valid_eq, irr(eq_flow), np.nan) if m else np.zeros(0),
+        "equity_multiple": equity_multiple(final_cash, equity),
+        "payback_index":   first_index(np.cumsum(op, axis=1) >= recover[:, None]),
+        "positive_index":  first_index(op > 0),
+        "dscr":            dscr_path,
+        "ltv":             ltv,
+        "min_dscr":        min_dscr,
+        "max_ltv":         max_ltv,
+    }
+
+
+def investment_metrics(fs: dict, params) -> dict:
+    """1シナリオの投資指標（batch_metrics の1行分。スカラーは float）。"""
+    out = {}
+    for key, v in batch_metrics([fs], [params]).items():
+        v = v[0]
+        out[key] = v if np.ndim(v) else (int(v) if key.endswith("_index") else float(v))
+    return out
+
+# ============================================================
+# core/finance/metrics.py end
+# ============================================================
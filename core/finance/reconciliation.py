@@ -0,0 +1,215 @@
+# ============================================================
+# core/finance/reconciliation.py
+# 資金収支計算書（CF）と BS 預金の照合
+# ============================================================
+#
+# 【責務】
+#   CF の【資金収支尻】が BS 預金の期中増減（期末 − 期首）を説明しているかを確かめ、
+#   説明できない差異（未説明差異）を年・科目ごとに示す。
+#
+# 【3つの粒度】
+#   statement_bridge(fs)         : 財務諸表だけで年次ブリッジ
+#                                  期首預金 + 資金収支尻 = 期末預金（CF）と BS 預金の差
+#   check_batch(results)         : 多数の実行（fs の列）の差異を numpy の2次元配列
+#                                  （実行 × 年）で一括判定する。バッチ結果の不変条件チェック用
+#   reconcile_ledger(ledger)     : 台帳から、預金の増減を相手科目 × 年 に分解し、
+#                                  同じ科目が CF に計上した額と突き合わせて科目別の未説明差異を出す
+#
+# 【科目別の突き合わせ（reconcile_ledger）】
+#   預金増減[科目]  : 預金を含む仕訳のうち相手科目が「科目」のものの 借方 − 貸方（預金側）
+#   CF計上[科目]    : 資金収支尻の出どころ（FinancialStatementBuilder.sources）のうち
+#                     その科目の借方・貸方合計に符号を掛けたもの。
+#                     預金そのものを出どころとする行（売却収入・売却費用）は、
+#                     該当する預金仕訳を相手科目に振り分ける。
+#   未説明[科目]    = 預金増減 − CF計上（科目の合計 = 預金増減 − 資金収支尻）
+#   預金の仕訳は get_df() の借方行・貸方行の組から配列で取り出し、
+#   摘要の条件は重複のない摘要にだけ適用する。
+#   build() 済みの builder と fs を渡すと財務諸表を作り直さない。
+#
+# 【判定】
+#   |差異| > tol（既定 1円）の年を flagged とする。
+#
+# ============================================================
+
+import numpy as np
+import pandas as pd
+
+from core.finance.fs_builder import FinancialStatementBuilder
+from core.ledger.accounts import CHART, UNKNOWN, code_of
+
+
+CASH     = "預金"
+CF_TOTAL = "【資金収支尻】"
+BRIDGE_ROWS = ["期首預金", "資金収支尻", "期末預金（CF）", "期末預金（BS）", "未説明差異"]
+
+_NAMES = [a.name for a in CHART] + ["（科目表外）"]
+
+
+# ============================================================
+# ① 財務諸表だけのブリッジ
+# ============================================================
+def _deltas(cash: np.ndarray, cf: np.ndarray) -> tuple:
+    """
+    cash / cf : (実行, 年) の BS 預金・資金収支尻（年数の短い実行は NaN 埋め）
+    戻り値    : (期首預金, 未説明差異)
+    """
+    opening = np.zeros_like(cash)
+    opening[:, 1:] = cash[:, :-1]
+    return opening, cash - opening - cf
+
+
+def statement_bridge(fs: dict, tol: float = 1.0) -> pd.DataFrame:
+    """期首預金・資金収支尻・期末預金（CF / BS）・未説明差異の年次表（flagged 行付き）"""
+    cash = fs["bs"].loc[CASH].to_numpy(dtype=float)[None, :]
+    cf   = fs["cf"].loc[CF_TOTAL].to_numpy(dtype=float)[None, :]
+    opening, delta = _deltas(cash, cf)
+    data = np.vstack([opening, cf, opening + cf, cash, delta])
+    out  = pd.DataFrame(data, index=BRIDGE_ROWS, columns=fs["bs"].columns)
+    out.loc["flagged"] = np.abs(delta[0]) > tol
+    return out
+
+
+def check_batch(results, names=None, tol: float = 1.0) -> pd.DataFrame:
+    """
+    results : fs（evaluate_scenario / ResultsStore.statements の戻り値）の列
+    names   : 実行名（省略時は連番）
+    戻り値  : 1実行1行（n_years・max_abs_delta・first_flagged・flagged）
+    """
+    results = list(results)
+    names   = list(names) if names is not None else list(range(len(results)))
+    n_years = np.array([r["bs"].shape[1] for r in results], dtype=int)
+    width   = int(n_years.max()) if len(results) else 0
+
+    cash = np.full((len(results), width), np.nan)
+    cf   = np.full((len(results), width), np.nan)
+    for k, r in enumerate(results):
+        cash[k, :n_years[k]] = r["bs"].loc[CASH].to_numpy(dtype=float)
+        cf[k, :n_years[k]]   = r["cf"].loc[CF_TOTAL].to_numpy(dtype=float)
+
+    _, delta = _deltas(cash, cf)
+    absd  = np.where(np.isnan(delta), 0.0, np.abs(delta))
+    bad   = absd > tol
+    first = np.where(bad.any(axis=1), bad.argmax(axis=1), -1)
+
+    first_year = []
+    for k, r in enumerate(results):
+        first_year.append(r["bs"].columns[first[k]] if first[k] >= 0 else None)
+
+    return pd.DataFrame({
+        "run":           names,
+        "n_years":       n_years,
+        "max_abs_delta": absd.max(axis=1) if width else np.zeros(len(results)),
+        "first_flagged": first_year,
+        "flagged":       bad.any(axis=1),
+    })
+
+
+# ============================================================
+# ② 台帳からの科目別ブリッジ
+# ============================================================
+def _cash_entries(ledger, df: pd.DataFrame) -> dict:
+    """
+    預金を含む仕訳の配列（事業年度・相手科目コード・預金側の符号・金額・摘要・預金側の貸借）
+    df : ledger.get_df()（1仕訳 = 借方行・貸方行の2行が id 順に並ぶ）
+    """
+    # 個別仕訳を持たないシンク（集計シンク）は NotImplementedError（読み出す仕訳はない）
+    next(ledger.sink.iter_entries(len(ledger.sink)), None)
+
+    df   = df.sort_values("id", kind="stable")
+    code = df["account_code"].to_numpy(dtype=np.int64)
+    dr, cr = code[0::2], code[1::2]
+    cash = code_of(CASH)
+    is_dr = (dr == cash) & (cr != cash)   # 預金が借方（入金）
+    is_cr = (cr == cash) & (dr != cash)   # 預金が貸方（出金）
+    hit   = is_dr | is_cr
+
+    amount = df["amount"].to_numpy(dtype=float)
+    return {
+        "year":   df["year"].to_numpy(dtype=np.int64)[0::2][hit],
+        "contra": np.where(is_dr, cr, dr)[hit],
+        "sign":   np.where(is_dr, 1.0, -1.0)[hit],
+        "amount": np.where(is_dr, amount[0::2], amount[1::2])[hit],
+        "desc":   df["description"].to_numpy(dtype=object)[0::2][hit],
+        "side":   np.where(is_dr, "debit", "credit")[hit],
+    }
+
+
+def _match_descriptions(desc: np.ndarray, match) -> np.ndarray:
+    """摘要の条件を重複のない摘要にだけ適用し、行ごとの bool 配列に戻す"""
+    codes, uniques = pd.factorize(desc)
+    ok = np.array([isinstance(d, str) and bool(match(d)) for d in uniques] + [False], dtype=bool)
+    return ok[codes]   # 欠損（-1）は末尾の False
+
+
+def _by_account_year(year, code, weights, years) -> np.ndarray:
+    """(科目コード, 年) の合計配列（科目表外は末尾）"""
+    n   = UNKNOWN + 1
+    col = np.searchsorted(years, year)
+    out = np.bincount(code * len(years) + col, weights=weights, minlength=n * len(years))
+    return out.reshape(n, len(years))
+
+
+def reconcile_ledger(ledger, fs: dict = None, tol: float = 1.0, builder=None) -> dict:
+    """
+    台帳から預金増減を相手科目別に分解し、CF の計上額と突き合わせる。
+
+    fs      : 財務諸表（省略時は builder.build() の結果）
+    builder : build() 済みの FinancialStatementBuilder（出どころ sources を使う）。
+              省略時、または未構築の場合のみ build() する
+
+    戻り値 :
+        bridge      : 期首預金・相手科目別の預金増減・期末預金（行 = 科目、列 = "Year XXXX"）
+        cf          : 科目別の CF 計上額
+        unexplained : 科目別の未説明差異（預金増減 − CF 計上、差異のある科目のみ）
+        summary     : statement_bridge()（年次の未説明差異と flagged）
+    """
+    builder = builder if builder is not None else FinancialStatementBuilder(ledger)
+    if fs is None or not builder.sources:
+        built = builder.build()
+        fs    = fs if fs is not None else built
+    years   = np.asarray(builder.years, dtype=np.int64)
+    cols    = [f"Year {y}" for y in years]
+    df      = ledger.get_df()
+    e       = _cash_entries(ledger, df)
+    n       = UNKNOWN + 1
+
+    # 預金増減（相手科目 × 年）
+    movement = _by_account_year(e["year"], e["contra"], e["sign"] * e["amount"], years)
+
+    # CF 計上（資金収支尻の出どころを科目ごとに）
+    drill = builder.drilldown(df)
+    cf_by = np.zeros((n, len(years)))
+    cash_code = code_of(CASH)
+    for (code, side, match, _), s in builder.sources["cf"][CF_TOTAL].items():
+        if code == cash_code:
+            # 預金を出どころとする行は、該当する預金仕訳を相手科目へ振り分ける
+            hit = e["side"] == side
+            if match is not None:
+                hit &= _match_descriptions(e["desc"], match)
+            cf_by += s * _by_account_year(e["year"][hit], e["contra"][hit], e["amount"][hit], years)
+            continue
+        for k, y in enumerate(years):
+            cf_by[code, k] += s * drill.group_total(y, side, code)
+
+    unexplained = movement - cf_by
+    summary = statement_bridge(fs, tol)
+    opening = summary.loc["期首預金"].to_numpy(dtype=float)
+
+    used = np.flatnonzero(np.abs(movement).sum(axis=1) > 0)
+    bridge = pd.DataFrame(
+        np.vstack([opening, movement[used], opening + movement.sum(axis=0)]),
+        index=["期首預金"] + [_NAMES[c] for c in used] + ["期末預金"],
+        columns=cols,
+    )
+    cf_rows = np.flatnonzero(np.abs(cf_by).sum(axis=1) > 0)
+    bad     = np.flatnonzero(np.abs(unexplained).max(axis=1) > tol) if len(years) else []
+    return {
+        "bridge":      bridge,
+        "cf":          pd.DataFrame(cf_by[cf_rows], index=[_NAMES[c] for c in cf_rows], columns=cols),
+        "unexplained": pd.DataFrame(unexplained[bad], index=[_NAMES[c] for c in bad], columns=cols),
+        "summary":     summary,
+    }
+
+# ============================================================
+# core/finance/reconciliation.py end
+# ============================================================
@@ -0,0 +1,165 @@
+# ===============================
+# core/ledger/accounts.py
+# 勘定科目表（整数コード・区分・正常残高・表示行）
+# ===============================
+#
+# 【責務】
+#   シミュレーションが使う全勘定科目を1か所で定義し、
+#     コード     : 0 始まりの連番（配列の添字としてそのまま使える）
+#     区分       : BS / PL と、資産・評価勘定・負債・純資産・仮勘定・収益・費用などのフラグ
+#     正常残高   : debit（借方残）/ credit（貸方残）
+#     表示行     : 財務諸表（PL / BS）の行名（表示しない仮勘定は None）
+#   を与える。科目名（日本語）は表示用のラベルとして残す。
+#
+# 【使い方】
+#   codes = account_codes(df)                 # 仕訳 DataFrame → 科目コード配列
+#   m     = has_flag(codes, BS | INCOME_TAX)  # フラグのいずれかを持つ行（ビットマスク）
+#   codes == CODE["預金"]                      # 特定科目は整数比較
+#
+#   科目表にない科目名は UNKNOWN（フラグ 0）になる。
+#   FLAGS は UNKNOWN 用の末尾要素（0）を持つため、FLAGS[codes] はそのまま引ける。
+#
+# ===============================
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+# -----------------------------------------------------------------------
+# 区分フラグ（ビットマスク）
+# -----------------------------------------------------------------------
+BS            = 1 << 0
+PL            = 1 << 1
+ASSET         = 1 << 2    # 資産（借方残）
+CONTRA_ASSET  = 1 << 3    # 資産の評価勘定（減価償却累計額・貸方残）
+LIABILITY     = 1 << 4
+EQUITY        = 1 << 5
+SUSPENSE      = 1 << 6    # 仮勘定（期中に消去され BS には表示しない）
+REVENUE       = 1 << 7
+OPEX          = 1 << 8    # 営業費用（営業利益の計算対象）
+INTEREST      = 1 << 9    # 支払利息（経常利益の計算対象）
+EXTRAORDINARY = 1 << 10   # 特別損益（固定資産売却益（損））
+INCOME_TAX    = 1 << 11   # 所得税（法人税）
+CASH          = 1 << 12
+BORROWING     = 1 << 13   # 借入金
+
+
+@dataclass(frozen=True)
+class Account:
+    code: int
+    name: str
+    kind: str         # "BS" / "PL"
+    normal: str       # "debit" / "credit"
+    line: str         # 財務諸表の表示行（None = 表示しない）
+    flags: int
+
+
+# -----------------------------------------------------------------------
+# 科目表（並び = コード順 = 財務諸表の表示順）
+#   (科目名, フラグ, 正常残高, 表示するか)
+# -----------------------------------------------------------------------
+_CHART_SPEC = [
+    # ---- 資産 ----
+    ("預金",                   BS | ASSET | CASH,          "debit",  True),
+    ("未収還付消費税",         BS | ASSET,                 "debit",  True),
+    ("仮払消費税",             BS | ASSET,                 "debit",  True),
+    ("建物",                   BS | ASSET,                 "debit",  True),
+    ("建物減価償却累計額",     BS | CONTRA_ASSET,          "credit", True),
+    ("追加設備",               BS | ASSET,                 "debit",  True),
+    ("追加設備減価償却累計額", BS | CONTRA_ASSET,          "credit", True),
+    ("土地",                   BS | ASSET,                 "debit",  True),
+    # ---- 負債 ----
+    ("未払消費税",             BS | LIABILITY,             "credit", True),
+    ("未払所得税（法人税）",   BS | LIABILITY,             "credit", True),
+    ("当座借越借入金",         BS | LIABILITY | BORROWING, "credit", True),
+    ("長期借入金",             BS | LIABILITY | BORROWING, "credit", True),
+    ("追加設備投資借入金",     BS | LIABILITY | BORROWING, "credit", True),
+    # ---- 純資産 ----
+    ("元入金",                 BS | EQUITY,                "credit", True),
+    ("繰越利益剰余金",         BS | EQUITY,                "credit", True),
+    # ---- 仮勘定 ----
+    ("仮受消費税",             BS | SUSPENSE,              "credit", False),
+    ("固定資産売却仮勘定",     BS | SUSPENSE,              "credit", False),
+    # ---- 収益 ----
+    ("売上高",                 PL | REVENUE,               "credit", True),
+    # ---- 営業費用 ----
+    ("管理費",                 PL | OPEX,                  "debit",  True),
+    ("修繕費",                 PL | OPEX,                  "debit",  True),
+    ("保険料",                 PL | OPEX,                  "debit",  True),
+    ("その他販管費",           PL | OPEX,                  "debit",  True),
+    ("建物減価償却費",         PL | OPEX,                  "debit",  True),
+    ("追加設備減価償却費",     PL | OPEX,                  "debit",  True),
+    ("固定資産税（土地）",     PL | OPEX,                  "debit",  True),
+    ("固定資産税（建物）",     PL | OPEX,                  "debit",  True),
+    ("租税公課（消費税）",     PL | OPEX,                  "debit",  True),
+    # ---- 支払利息 ----
+    ("長期借入金利息",         PL | INTEREST,              "debit",  True),
+    ("追加設備借入利息",       PL | INTEREST,              "debit",  True),
+    ("当座借越利息",           PL | INTEREST,              "debit",  True),
+    # ---- 特別損益・税 ----
+    ("固定資産売却益（損）",   PL | EXTRAORDINARY,         "credit", True),
+    ("所得税（法人税）",       PL | INCOME_TAX,            "debit",  True),
+]
+
+CHART = tuple(
+    Account(
+        code=i,
+        name=name,
+        kind="BS" if flags & BS else "PL",
+        normal=normal,
+        line=name if shown else None,
+        flags=flags,
+    )
+    for i, (name, flags, normal, shown) in enumerate(_CHART_SPEC)
+)
+
+CODE    = {a.name: a.code for a in CHART}
+UNKNOWN = len(CHART)
+
+# コード → フラグ（末尾は UNKNOWN 用の 0）
+FLAGS = np.array([a.flags for a in CHART] + [0], dtype=np.int64)
+
+_NAME_INDEX = pd.Index([a.name for a in CHART])
+
+
+# -----------------------------------------------------------------------
+# 参照
+# -----------------------------------------------------------------------
+def code_of(name: str) -> int:
+    """科目名 → コード（科目表にない場合は UNKNOWN）"""
+    return CODE.get(name, UNKNOWN)
+
+
+def codes_of(names) -> np.ndarray:
+    """科目名の列 → コード配列（科目表にない科目は UNKNOWN）"""
+    codes = _NAME_INDEX.get_indexer(pd.Index(names))
+    codes[codes < 0] = UNKNOWN
+    return codes.astype(np.int64)
+
+
+def account_codes(df: pd.DataFrame) -> np.ndarray:
+    """仕訳 DataFrame の科目コード配列（account_code 列があればそれを使う）"""
+    if "account_code" in df.columns:
+        return df["account_code"].to_numpy(dtype=np.int64)
+    return codes_of(df["account"])
+
+
+def has_flag(codes: np.ndarray, flags: int) -> np.ndarray:
+    """flags のいずれかのビットを持つ行の真偽配列"""
+    return (FLAGS[codes] & flags) != 0
+
+
+def accounts_with(flags: int) -> list:
+    """flags のいずれかのビットを持つ科目（コード順）"""
+    return [a for a in CHART if a.flags & flags]
+
+
+def statement_lines(flags: int) -> list:
+    """flags を持つ科目の財務諸表表示行（コード順・非表示科目を除く）"""
+    return [a.line for a in accounts_with(flags) if a.line is not None]
+
+# ===============================
+# core/ledger/accounts.py end
+# ===============================
@@ -0,0 +1,178 @@
+# ===============================
+# core/ledger/integrity.py
+# 台帳の整合性チェック（一括・ベクトル化）
+# ===============================
+#
+# 【責務】
+#   仕訳1件ごとの print 警告（旧 JournalEntry.__post_init__）に代えて、
+#   台帳単位でまとめて検査し、結果を IntegrityReport として返す。
+#
+# 【検査項目】（check 列）
+#   entry_balance   : 仕訳1件の 借方金額 ≠ 貸方金額（許容誤差 tol）
+#   negative_amount : 借方・貸方金額が負
+#   unknown_account : 科目表（core/ledger/accounts.py）にない科目
+#   date_balance    : 日付ごとの 借方合計 ≠ 貸方合計
+#   period_balance  : 事業年度ごとの試算表の 借方合計 ≠ 貸方合計
+#
+# 【モード】
+#   "off"     : 検査しない（空のレポート）
+#   "sampled" : 日付を sample_rate の割合で無作為に選び、その日付の仕訳だけを検査する
+#               （日付単位で選ぶため date_balance も正しく判定できる）
+#   "full"    : 全仕訳を検査する
+#   period_balance は月次スナップショット（試算表）から求めるため、
+#   "sampled" でも全年度を検査する。
+#
+# 【増分検査】
+#   start を渡すと start 件目以降の仕訳だけを検査する（フェーズの区切りごとに
+#   新しい仕訳だけを見る場合。Simulation(integrity=...) が使う）。
+#   仕訳はシンクの iter_entries(start) で start 件目から読み、先頭から読み直さない。
+#   個別仕訳を持たないシンク（集計シンク）では period_balance のみ検査する。
+#
+# 【使い方】
+#   report = ledger.check_integrity("full")
+#   report.ok          # 問題なしなら True
+#   report.issues      # 1問題1行の DataFrame
+#   report.counts()    # 検査項目別の件数
+#
+# ===============================
+
+
+import numpy as np
+import pandas as pd
+
+from core.ledger.accounts import UNKNOWN, code_of
+
+
+INTEGRITY_MODES = ("off", "sampled", "full")
+ISSUE_COLUMNS   = ["check", "position", "date", "account", "description", "amount"]
+
+
+class IntegrityReport:
+    """
+    mode      : 検査モード
+    n_entries : 検査対象範囲の仕訳数
+    n_checked : 実際に検査した仕訳数（"sampled" では抽出した日付の仕訳数）
+    issues    : 1問題1行の DataFrame（列 = ISSUE_COLUMNS）
+                position は検査範囲の先頭からではなく台帳全体での仕訳の位置。
+                amount は entry_balance・date_balance・period_balance では 借方 − 貸方。
+                period_balance の date 列は事業年度、position は -1。
+    """
+
+    def __init__(self, mode: str, n_entries: int = 0, n_checked: int = 0, issues=None):
+        self.mode      = mode
+        self.n_entries = n_entries
+        self.n_checked = n_checked
+        self.issues    = issues if issues is not None else pd.DataFrame(columns=ISSUE_COLUMNS)
+
+    @property
+    def ok(self) -> bool:
+        return self.issues.empty
+
+    def counts(self) -> dict:
+        """検査項目別の問題件数"""
+        return self.issues["check"].value_counts().to_dict()
+
+    def __repr__(self) -> str:
+        return (f"IntegrityReport(mode={self.mode!r}, checked={self.n_checked}/{self.n_entries}, "
+                f"issues={self.counts()})")
+
+
+def _issues(check: str, mask, position, date, account, description, amount) -> pd.DataFrame:
+    return pd.DataFrame({
+        "check":       check,
+        "position":    np.asarray(position)[mask],
+        "date":        np.asarray(date, dtype=object)[mask],
+        "account":     np.asarray(account, dtype=object)[mask],
+        "description": np.asarray(description, dtype=object)[mask],
+        "amount":      np.asarray(amount, dtype=float)[mask],
+    }, columns=ISSUE_COLUMNS)
+
+
+def check_ledger(
+    ledger,
+    mode: str = "full",
+    tol: float = 1.0,
+    sample_rate: float = 0.1,
+    seed: int = 0,
+    start: int = 0,
+    periods: bool = True,
+) -> IntegrityReport:
+    """
+    ledger      : LedgerManager
+    mode        : "off" / "sampled" / "full"
+    tol         : 貸借差の許容誤差（円）
+    sample_rate : "sampled" で検査する日付の割合
+    start       : 検査を始める仕訳の位置（増分検査）
+    periods     : False なら period_balance を省略する（増分検査の途中の区切り）
+    """
+    if mode not in INTEGRITY_MODES:
+        raise ValueError(f"未知の検査モードです: {mode}")
+    if mode == "off":
+        return IntegrityReport(mode)
+
+    found = []
+
+    # ---------------------------------------------
+    # 事業年度ごとの貸借一致（試算表から。全シンク共通）
+    # ---------------------------------------------
+    years = ledger.years if periods else []
+    diff  = np.zeros(len(years))
+    for k, y in enumerate(years):
+        tb = ledger.trial_balance(y)
+        diff[k] = tb.debit.sum() - tb.credit.sum()
+    n = len(years)
+    found.append(_issues("period_balance", np.abs(diff) > tol, np.full(n, -1), years,
+                         np.full(n, None), np.full(n, None), diff))
+
+    # ---------------------------------------------
+    # 仕訳単位の検査（個別仕訳を持つシンクのみ）
+    # ---------------------------------------------
+    try:
+        entries = list(ledger.sink.iter_entries(start))
+    except NotImplementedError:
+        entries = []
+    n_entries = len(entries)
+
+    dates   = np.array([e.date for e in entries], dtype=object)
+    ordinal = np.array([d.toordinal() for d in dates], dtype=np.int64)
+    pos     = np.arange(start, start + n_entries)
+    if mode == "sampled" and n_entries:
+        uniq = np.unique(ordinal)
+        k    = min(len(uniq), max(1, int(round(len(uniq) * sample_rate))))
+        keep = np.isin(ordinal, np.random.default_rng(seed).choice(uniq, size=k, replace=False))
+        entries = [e for e, m in zip(entries, keep) if m]
+        dates, ordinal, pos = dates[keep], ordinal[keep], pos[keep]
+
+    if entries:
+        dr_acc = np.array([e.dr_account for e in entries], dtype=object)
+        cr_acc = np.array([e.cr_account for e in entries], dtype=object)
+        dr     = np.array([e.dr_amount for e in entries], dtype=float)
+        cr     = np.array([e.cr_amount for e in entries], dtype=float)
+        desc   = np.array([e.description for e in entries], dtype=object)
+        pair   = np.array([f"{a} / {b}" for a, b in zip(dr_acc, cr_acc)], dtype=object)
+
+        found.append(_issues("entry_balance", np.abs(dr - cr) > tol, pos, dates, pair, desc, dr - cr))
+        found.append(_issues("negative_amount", dr < 0, pos, dates, dr_acc, desc, dr))
+        found.append(_issues("negative_amount", cr < 0, pos, dates, cr_acc, desc, cr))
+
+        codes = {a: code_of(a) for a in set(dr_acc) | set(cr_acc)}
+        found.append(_issues("unknown_account", np.array([codes[a] == UNKNOWN for a in dr_acc]),
+                             pos, dates, dr_acc, desc, dr))
+        found.append(_issues("unknown_account", np.array([codes[a] == UNKNOWN for a in cr_acc]),
+                             pos, dates, cr_acc, desc, cr))
+
+        # 日付ごとの貸借一致
+        #   position・date はその日付の最初の仕訳
+        _, first, inv = np.unique(ordinal, return_index=True, return_inverse=True)
+        by_date = np.bincount(inv, weights=dr - cr, minlength=len(first))
+        m = len(first)
+        found.append(_issues("date_balance", np.abs(by_date) > tol, pos[first], dates[first],
+                             np.full(m, None), np.full(m, None), by_date))
+
+    found  = [f for f in found if len(f)]
+    issues = pd.concat(found, ignore_index=True) if found else None
+    return IntegrityReport(mode, n_entries, len(entries), issues)
+
+# ===============================
+# core/ledger/integrity.py end
+# ===============================
@@ -0,0 +1,166 @@
+# ===============================
+# core/ledger/journal_archive.py
+# 固定長バイナリの仕訳アーカイブ（numpy.memmap で読む）
+# ===============================
+#
+# 【責務】
+#   大量の実行結果（数万〜数十万本）を後から横断集計するため、
+#   仕訳を1行16バイトの固定長レコードで書き出し、読み出しは
+#   numpy.memmap でファイルをそのまま配列として参照する（pandas への変換・
+#   文字列の解析を行わない）。
+#
+# 【ファイル形式】（リトルエンディアン）
+#   ヘッダ 32バイト
+#     magic     8バイト  b"BKWJNL01"
+#     version   uint32   1
+#     fye       uint32   決算月（事業年度の計算用）
+#     n_rows    uint64   レコード数
+#     予備      8バイト
+#   レコード 16バイト × n_rows（JournalEntry 1件 → 借方・貸方の2レコード）
+#     date      int32    日付の序数（date.toordinal()）
+#     account   int16    科目コード（core/ledger/accounts.py、科目表にない科目は UNKNOWN）
+#     side      int8     0 = 借方 / 1 = 貸方
+#     (pad)     int8
+#     amount    int64    金額（円、四捨五入）
+#
+# 【精度】
+#   金額は1レコードごとに円単位へ丸めるため、合計は台帳（float）と
+#   最大で 0.5円 × レコード数 ずれる。摘要・科目名は保持しない
+#   （摘要で区別する資金収支の一部の行は再現できない。財務諸表は台帳から作る）。
+#
+# 【使い方】
+#   ledger.write_archive("runs/0001.bkwj")                 # LedgerManager から書き出し
+#   arc = JournalArchive("runs/0001.bkwj")
+#   years, totals = arc.year_account_totals()               # totals[年, 貸借, 科目コード]
+#   years, totals = stack_year_account_totals(paths)        # totals[実行, 年, 貸借, 科目コード]
+#
+# ===============================
+
+import struct
+
+import numpy as np
+
+from core.ledger.accounts import UNKNOWN, code_of
+from core.simulation.period_calendar import fiscal_year
+
+
+MAGIC   = b"BKWJNL01"
+VERSION = 1
+
+_HEADER      = struct.Struct("<8sIIQ8x")
+HEADER_SIZE  = _HEADER.size   # 32
+RECORD_DTYPE = np.dtype([
+    ("date",    "<i4"),
+    ("account", "<i2"),
+    ("side",    "i1"),
+    ("pad",     "i1"),
+    ("amount",  "<i8"),
+])
+
+# 1970-01-01 の序数（datetime64[D] との変換用）
+_EPOCH_ORDINAL = 719163
+N_CODES        = UNKNOWN + 1
+
+
+# ============================================================
+# 書き出し
+# ============================================================
+def write_archive(entries, path: str, fiscal_year_end_month: int = 12) -> int:
+    """JournalEntry の列をアーカイブ形式で書き出し、レコード数を返す。"""
+    dates, accts, sides, amounts = [], [], [], []
+    for e in entries:
+        d = e.date.toordinal()
+        dates   += (d, d)
+        accts   += (code_of(e.dr_account), code_of(e.cr_account))
+        sides   += (0, 1)
+        amounts += (e.dr_amount, e.cr_amount)
+
+    rec = np.zeros(len(dates), dtype=RECORD_DTYPE)
+    rec["date"]    = dates
+    rec["account"] = accts
+    rec["side"]    = sides
+    rec["amount"]  = np.rint(np.asarray(amounts, dtype=float))
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, int(fiscal_year_end_month), len(rec)))
+        f.write(rec.tobytes())
+    return len(rec)
+
+
+# ============================================================
+# 読み出し
+# ============================================================
+class JournalArchive:
+    """
+    アーカイブ1本（1実行分）。records はファイルを参照する memmap（読み取り専用）。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            head = f.read(HEADER_SIZE)
+        if len(head) < HEADER_SIZE:
+            raise ValueError(f"仕訳アーカイブではありません: {path}")
+        magic, version, fye, n_rows = _HEADER.unpack(head)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"仕訳アーカイブではありません: {path}")
+        self.fiscal_year_end_month = int(fye)
+        self.n_rows = int(n_rows)
+        if self.n_rows:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode="r",
+                                     offset=HEADER_SIZE, shape=(self.n_rows,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def fiscal_years(self) -> np.ndarray:
+        """レコードごとの事業年度"""
+        days  = (self.records["date"] - _EPOCH_ORDINAL).astype("datetime64[D]")
+        month = days.astype("datetime64[M]")
+        year  = month.astype("datetime64[Y]").astype(np.int64) + 1970
+        mon   = (month.astype(np.int64) % 12) + 1
+        return fiscal_year(year, mon, self.fiscal_year_end_month)
+
+    def year_account_totals(self, years=None) -> tuple:
+        """
+        事業年度 × 貸借 × 科目コード の金額合計。
+        years : 集計する事業年度の並び（省略時はアーカイブ内の年）
+        戻り値 : (years, totals)  totals.shape = (len(years), 2, N_CODES)
+        """
+        fy = self.fiscal_years()
+        if years is None:
+            years = np.unique(fy)
+        years = np.asarray(years, dtype=np.int64)
+        totals = np.zeros((len(years), 2, N_CODES))
+        if not len(years) or not self.n_rows:
+            return years, totals
+
+        pos  = np.searchsorted(years, fy)
+        hit  = (pos < len(years)) & (years[np.minimum(pos, len(years) - 1)] == fy)
+        r    = self.records
+        flat = (pos[hit] * 2 + r["side"][hit]) * N_CODES + r["account"][hit]
+        totals += np.bincount(flat, weights=r["amount"][hit], minlength=totals.size).reshape(totals.shape)
+        return years, totals
+
+
+def stack_year_account_totals(paths, years=None) -> tuple:
+    """
+    複数のアーカイブの事業年度 × 貸借 × 科目コード合計を積み重ねる。
+    years を省略した場合は全アーカイブの事業年度の和集合。
+    戻り値 : (years, totals)  totals.shape = (len(paths), len(years), 2, N_CODES)
+    """
+    archives = [JournalArchive(p) for p in paths]
+    if years is None:
+        found = [np.unique(a.fiscal_years()) for a in archives]
+        years = np.unique(np.concatenate(found)) if found else np.zeros(0, dtype=np.int64)
+    years  = np.asarray(years, dtype=np.int64)
+    totals = np.zeros((len(archives), len(years), 2, N_CODES))
+    for k, a in enumerate(archives):
+        totals[k] = a.year_account_totals(years)[1]
+    return years, totals
+
+# ===============================
+# core/ledger/journal_archive.py end
+# ===============================
@@ -17,6 +17,9 @@ class JournalEntry:
     ※ 借方と貸方を *1つの JournalEntry にまとめる* のが設計の基本。
       LedgerManager.get_df() は JournalEntry 1件から
       借方行・貸方行の 2行を生成する。
+
+    ※ 借方・貸方金額の一致などの整合性は生成時には検査しない。
+      台帳単位でまとめて検査する（core/ledger/integrity.py）。
     """
 
     date: date          # 仕訳日
@@ -26,15 +29,6 @@ class JournalEntry:
     cr_account: str     # 貸方科目
     cr_amount: float    # 貸方金額
 
-    def __post_init__(self):
-        # 借方と貸方の一致チェック（許容誤差 ±1.0円）
-        if abs(self.dr_amount - self.cr_amount) > 1.0:
-            print(
-                f"Warning: Unbalanced JournalEntry on {self.date}: "
-                f"{self.dr_account} {self.dr_amount} / "
-                f"{self.cr_account} {self.cr_amount}  ({self.description})"
-            )
-
 
 # =======================================
 # 仕訳生成ユーティリティ（正式版）
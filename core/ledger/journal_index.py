@@ -0,0 +1,116 @@
+# ===============================
+# core/ledger/journal_index.py
+# 仕訳の検索インデックス（全仕訳画面のページング・絞り込み用）
+# ===============================
+#
+# 【責務】
+#   get_df() 形式の仕訳 DataFrame を (date, account, description) で索引付けし、
+#   科目・年・金額範囲・摘要・貸借による絞り込みと、指定ページ分だけの切り出しを行う。
+#   画面には表示ページの行だけを渡すため、仕訳件数が多くても転送量は一定。
+#
+# 【索引】
+#   行は (date, id) 順（従来の全仕訳タブと同じ並び）に並べ替えて保持する。
+#     年        : date 順なので年ごとの行範囲（開始・終了位置）を二分探索で求める
+#     科目・摘要 : 値 → 行位置（昇順）の配列
+#     金額      : 行位置順の配列を絞り込み後の候補にだけ適用
+#   絞り込み結果は行位置の配列で、ページ切り出しは iloc で該当行のみ取り出す。
+#
+# ===============================
+
+import numpy as np
+import pandas as pd
+
+
+class JournalIndex:
+
+    def __init__(self, ledger_df: pd.DataFrame):
+        df = ledger_df.sort_values(["date", "id"], kind="stable").reset_index(drop=True)
+        self.df = df
+
+        self._years   = df["year"].to_numpy(dtype=int)
+        self._amounts = df["amount"].to_numpy(dtype=float)
+        self._dr_cr   = df["dr_cr"].to_numpy()
+
+        self._by_account     = self._postings(df["account"])
+        self._by_description = self._postings(df["description"].fillna(""))
+
+    @staticmethod
+    def _postings(col: pd.Series) -> dict:
+        """値 → 行位置（昇順）"""
+        codes, uniques = pd.factorize(col, sort=True)
+        order  = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        return {u: order[bounds[i]:bounds[i + 1]] for i, u in enumerate(uniques)}
+
+    # --------------------------------------------------------
+    # 絞り込み候補
+    # --------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.df)
+
+    @property
+    def accounts(self) -> list:
+        return list(self._by_account)
+
+    @property
+    def descriptions(self) -> list:
+        return [d for d in self._by_description if d]
+
+    @property
+    def years(self) -> list:
+        return sorted(set(self._years.tolist()))
+
+    # --------------------------------------------------------
+    # 絞り込み
+    # --------------------------------------------------------
+    def query(
+        self,
+        accounts=None,
+        years=None,
+        amount_min: float = None,
+        amount_max: float = None,
+        descriptions=None,
+        dr_cr: str = None,
+    ) -> np.ndarray:
+        """
+        条件に一致する行位置（表示順）を返す。None の条件は絞り込まない。
+        years : (開始年, 終了年) の範囲（両端を含む）
+        """
+        if years is not None:
+            lo, hi = years
+            start = int(np.searchsorted(self._years, lo, side="left"))
+            stop  = int(np.searchsorted(self._years, hi, side="right"))
+            pos = np.arange(start, stop)
+        else:
+            pos = np.arange(len(self.df))
+
+        for keys, postings in ((accounts, self._by_account), (descriptions, self._by_description)):
+            if keys is None:
+                continue
+            hit = [postings[k] for k in keys if k in postings]
+            sel = np.unique(np.concatenate(hit)) if hit else np.zeros(0, dtype=int)
+            pos = np.intersect1d(pos, sel, assume_unique=True)
+
+        if amount_min is not None:
+            pos = pos[self._amounts[pos] >= amount_min]
+        if amount_max is not None:
+            pos = pos[self._amounts[pos] <= amount_max]
+        if dr_cr is not None:
+            pos = pos[self._dr_cr[pos] == dr_cr]
+        return pos
+
+    # --------------------------------------------------------
+    # ページ切り出し
+    # --------------------------------------------------------
+    def page(self, positions: np.ndarray, page: int, page_size: int) -> pd.DataFrame:
+        """positions のうち page 番目（1始まり）のページの行だけを返す。"""
+        start = max(0, (int(page) - 1) * int(page_size))
+        return self.df.iloc[positions[start:start + int(page_size)]]
+
+    @staticmethod
+    def n_pages(n_rows: int, page_size: int) -> int:
+        return max(1, -(-int(n_rows) // int(page_size)))
+
+# ===============================
+# core/ledger/journal_index.py end
+# ===============================
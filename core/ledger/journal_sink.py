@@ -0,0 +1,640 @@
+# ===============================
+# core/ledger/journal_sink.py
+# ===============================
+#
+# 【責務】
+#   LedgerManager が受け取った仕訳の「保存先」を差し替え可能にする。
+#
+#   MemoryJournalSink      : 全仕訳をメモリに保持（従来どおり・デフォルト）
+#   AggregatingJournalSink : (事業年度, 科目, 貸借, 摘要) 単位の合計のみ保持
+#                            → メモリは O(科目数 × 年数)
+#   SpillJournalSink       : 仕訳をディスク上の追記ログへ書き出し、
+#                            メモリにはバッファ分しか残さない
+#                            （読み出し後は読んだ分をキャッシュ。cache_reads=False で無効）
+#   SQLiteJournalSink      : 仕訳を SQLite の journal テーブルへ run_id 付きで書き出す
+#                            （複数回の実行を1つのアーカイブに蓄積・監査用）
+#   CompactJournalSink     : (日付, 摘要, 借方, 貸方) が同じ仕訳を1行にまとめて件数付きで保持
+#                            （元の仕訳は連番・金額の配列として残し、復元できる）
+#
+# 【共通インターフェース】
+#   append(entry)            : 仕訳1件を受け取る
+#   __len__()                : 受け取った仕訳件数
+#   iter_entries(start=0)    : 個別仕訳を順に返す（集計シンクは非対応）
+#                              start 件目（0始まり）から返す。先頭から読み飛ばさず、
+#                              メモリはリストの添字・SQLite は id の範囲・追記ログは
+#                              flush ごとに記録したバイト位置から読み始める（増分検査用）
+#   to_frame()               : LedgerManager.get_df() と同じ列の DataFrame
+#   account_balance(account) : 借方 − 貸方 の単純合計
+#   account_balances()       : 全科目の 借方 − 貸方（LedgerManager の初期化用）
+#   monthly_totals()         : (日付, 摘要, 科目, 貸借, 金額) の行
+#                              （月・科目・貸借・摘要ごとの合計でもよい。試算表の初期化用）
+#
+#   to_frame() は表示用の科目名（account）に加えて科目コード（account_code、
+#   core/ledger/accounts.py）を持つ。集計側は科目コードの整数配列で絞り込む。
+#
+# 【SQLiteJournalSink】
+#   append() はバッファに溜め、buffer_size 件ごとに executemany で
+#   1トランザクションにまとめて書き込む。索引は (run_id, account, year) と
+#   (run_id, date)。残高・月次合計は SQL の集計（GROUP BY）で返すため、
+#   既存の run_id を開いた LedgerManager は仕訳全件を読み込まずに
+#   試算表（→ FinancialStatementBuilder）を構成できる。
+#   year 列はカレンダー年（事業年度への変換は LedgerManager.get_df()）。
+#
+# 【CompactJournalSink】
+#   月次仕訳は同じ日付に 仮払消費税 / 預金・租税公課（消費税） / 預金 などを
+#   費目ごとに重ねて起票するため、(日付, 摘要, 借方, 貸方) でまとめると行数が減る。
+#   日付・摘要は変えないため、year・month・description で絞り込む集計結果は同じ。
+#   to_frame() は count 列（まとめた仕訳の件数）を持つ。
+#   keep_components=True（既定）では元の仕訳ごとに (行番号, 借方金額, 貸方金額) を
+#   配列で保持し、components(row) で1行の内訳を、expand() で受け取り順の
+#   元の仕訳列を復元する（監査用）。False ならまとめた合計のみ保持する。
+#   __len__() は受け取った（まとめる前の）仕訳件数、n_rows はまとめた後の行数。
+#
+# 【AggregatingJournalSink の to_frame() について】
+#   1行 = (事業年度, 科目, 貸借, 摘要) の合計。date はそのキーの最終日付。
+#   事業年度は fiscal_year_end_month（決算月）で区切る（LedgerManager と同じ値を渡す）。
+#   tax_engine / year_end_entries / exit_engine / fs_builder は
+#   year・account・dr_cr・description でしか絞り込まないため、
+#   個別仕訳を持たなくても同じ集計結果になる。
+#
+# ===============================
+
+import csv
+import io
+import os
+from array import array
+import sqlite3
+import tempfile
+import uuid
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from core.ledger.accounts import code_of, codes_of
+from core.ledger.journal_entry import JournalEntry
+from core.simulation.period_calendar import fiscal_year
+
+
+LEDGER_COLUMNS = [
+    "id", "date", "year", "month", "account", "dr_cr", "amount", "description",
+    "account_code",
+]
+
+
+def entries_to_frame(entries) -> pd.DataFrame:
+    """
+    JournalEntry の列から get_df() 形式の DataFrame を生成する。
+    JournalEntry 1件 → 借方行・貸方行の2行。
+    """
+    rows = []
+    eid  = 1
+    for e in entries:
+        base = {
+            "date":        e.date,
+            "description": e.description,
+        }
+        rows.append({**base,
+            "id":      eid,
+            "account": e.dr_account,
+            "dr_cr":   "debit",
+            "amount":  e.dr_amount,
+        })
+        eid += 1
+        rows.append({**base,
+            "id":      eid,
+            "account": e.cr_account,
+            "dr_cr":   "credit",
+            "amount":  e.cr_amount,
+        })
+        eid += 1
+
+    return _finalize_frame(rows)
+
+
+def _finalize_frame(rows: list) -> pd.DataFrame:
+    """行リスト（または DataFrame）に year・month・account_code 列を付与し、列順を固定する。"""
+    if len(rows) == 0:
+        return pd.DataFrame(columns=LEDGER_COLUMNS)
+
+    df = pd.DataFrame(rows)
+    df["date"]  = pd.to_datetime(df["date"], errors="coerce")
+    df["year"]  = df["date"].dt.year
+    df["month"] = df["date"].dt.month
+    df["account_code"] = codes_of(df["account"])
+
+    # 列順を固定
+    return df[LEDGER_COLUMNS]
+
+
+def _parse_date(text: str):
+    """
+    追記ログの日付文字列を復元する。
+    最終精算仕訳は get_df()["date"].max()（Timestamp）を日付に持つため、
+    時刻付きの文字列は Timestamp として戻す。
+    """
+    if "T" in text:
+        return pd.Timestamp(text)
+    return date.fromisoformat(text)
+
+
+# =======================================
+# 基底クラス
+# =======================================
+class JournalSink:
+    """仕訳保存先の共通インターフェース。"""
+
+    def append(self, entry: JournalEntry) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def iter_entries(self, start: int = 0):
+        raise NotImplementedError(
+            f"{type(self).__name__} は個別仕訳を保持していません。"
+        )
+
+    @property
+    def entries(self) -> list:
+        return list(self.iter_entries())
+
+    def to_frame(self) -> pd.DataFrame:
+        return entries_to_frame(self.iter_entries())
+
+    def account_balance(self, account_name: str) -> float:
+        balance = 0.0
+        for e in self.iter_entries():
+            if e.dr_account == account_name:
+                balance += e.dr_amount
+            if e.cr_account == account_name:
+                balance -= e.cr_amount
+        return balance
+
+    def account_balances(self) -> dict:
+        df = self.to_frame()
+        return {account: self.account_balance(account) for account in df["account"].unique()}
+
+    def monthly_totals(self):
+        df = self.to_frame()
+        return zip(df["date"], df["description"], df["account"], df["dr_cr"], df["amount"])
+
+    def close(self) -> None:
+        pass
+
+
+# =======================================
+# ① メモリ保持（従来動作）
+# =======================================
+class MemoryJournalSink(JournalSink):
+
+    def __init__(self):
+        self._entries = []
+
+    def append(self, entry: JournalEntry) -> None:
+        self._entries.append(entry)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def iter_entries(self, start: int = 0):
+        return iter(self._entries[start:] if start else self._entries)
+
+    @property
+    def entries(self) -> list:
+        # 従来の ledger.entries と同じく実リストを返す
+        return self._entries
+
+
+# =======================================
+# ② 集計のみ保持（バッチ実行向け）
+# =======================================
+class AggregatingJournalSink(JournalSink):
+    """
+    (事業年度, 科目, 貸借, 摘要) → [金額合計, 最終日付] のみ保持する。
+    個別仕訳は保持しないため iter_entries() は使えない。
+    """
+
+    def __init__(self, fiscal_year_end_month: int = 12):
+        self.fiscal_year_end_month = int(fiscal_year_end_month)
+        self._totals = {}
+        self._count  = 0
+
+    def append(self, entry: JournalEntry) -> None:
+        y = fiscal_year(entry.date.year, entry.date.month, self.fiscal_year_end_month)
+        self._add((y, entry.dr_account, "debit",  entry.description), entry.dr_amount, entry.date)
+        self._add((y, entry.cr_account, "credit", entry.description), entry.cr_amount, entry.date)
+        self._count += 1
+
+    def _add(self, key, amount, d) -> None:
+        # 最終精算仕訳の日付は Timestamp のため date に揃えてから比較する
+        if isinstance(d, pd.Timestamp):
+            d = d.date()
+        slot = self._totals.get(key)
+        if slot is None:
+            self._totals[key] = [amount, d]
+        else:
+            slot[0] += amount
+            if d > slot[1]:
+                slot[1] = d
+
+    def __len__(self) -> int:
+        return self._count
+
+    def to_frame(self) -> pd.DataFrame:
+        rows = []
+        for eid, ((_, account, dr_cr, description), (amount, d)) in enumerate(
+            self._totals.items(), start=1
+        ):
+            rows.append({
+                "id":          eid,
+                "date":        d,
+                "account":     account,
+                "dr_cr":       dr_cr,
+                "amount":      amount,
+                "description": description,
+            })
+        return _finalize_frame(rows)
+
+    def account_balance(self, account_name: str) -> float:
+        balance = 0.0
+        for (_, account, dr_cr, _), (amount, _) in self._totals.items():
+            if account == account_name:
+                balance += amount if dr_cr == "debit" else -amount
+        return balance
+
+    # ---- ワーカー間での受け渡し用 ----
+    def merge(self, other: "AggregatingJournalSink") -> None:
+        """他の集計シンクの合計を取り込む。"""
+        for key, (amount, d) in other._totals.items():
+            self._add(key, amount, d)
+        self._count += other._count
+
+
+# =======================================
+# ③ ディスク追記ログ
+# =======================================
+class SpillJournalSink(JournalSink):
+    """
+    仕訳を CSV 追記ログに書き出す。
+    buffer_size 件たまるごとにファイルへ flush し、メモリから解放する。
+
+    path を省略した場合は一時ファイルを作成し、close() で削除する。
+
+    flush ごとに (その flush の先頭の仕訳番号, バイト位置) を記録し、
+    ファイルは start を含む flush の位置から読み始める。
+
+    cache_reads : True（既定）→ 読み出した仕訳と to_frame() の結果をメモリに残し、
+                  次の読み出しでは前回以降に flush された分だけを読み足す
+                  （compact・アーカイブ・整合性チェック・get_df() が同じログを何度も読むため）。
+                  False → 毎回ファイルから読む（実行中もメモリをバッファ分に抑える場合）
+    """
+
+    def __init__(self, path: str = None, buffer_size: int = 4096, cache_reads: bool = True):
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="bkw_journal_", suffix=".csv")
+            os.close(fd)
+            self._owns_file = True
+        else:
+            self._owns_file = False
+        self.path        = path
+        self.buffer_size = int(buffer_size)
+        self._buffer     = []
+        self._count      = 0
+        self._offsets    = array("q")   # flush ごとの先頭の仕訳番号
+        self._positions  = array("q")   # 同・ファイル上のバイト位置
+        self.cache_reads = bool(cache_reads)
+        self._read_cache = []           # 読み出し済みの仕訳（先頭から）
+        self._frame      = None         # to_frame() の結果（読み足すまで有効）
+        # 既存ファイルは上書き（1シミュレーション = 1ログ）
+        open(self.path, "w", encoding="utf-8", newline="").close()
+
+    def append(self, entry: JournalEntry) -> None:
+        self._buffer.append(entry)
+        self._count += 1
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        self._offsets.append(self._count - len(self._buffer))
+        self._positions.append(os.path.getsize(self.path))
+        with open(self.path, "a", encoding="utf-8", newline="") as f:
+            w = csv.writer(f)
+            for e in self._buffer:
+                w.writerow([
+                    e.date.isoformat(), e.description,
+                    e.dr_account, repr(float(e.dr_amount)),
+                    e.cr_account, repr(float(e.cr_amount)),
+                ])
+        self._buffer = []
+
+    def __len__(self) -> int:
+        return self._count
+
+    def iter_entries(self, start: int = 0):
+        self.flush()
+        if self.cache_reads:
+            return iter(self._cached()[start:])
+        return self._read(start)
+
+    def to_frame(self) -> pd.DataFrame:
+        if not self.cache_reads:
+            return entries_to_frame(self.iter_entries())
+        entries = self._cached()
+        if self._frame is None:
+            self._frame = entries_to_frame(entries)
+        # get_df() は year 列を書き換えるため複製を返す
+        return self._frame.copy()
+
+    def _cached(self) -> list:
+        """読み出し済みの仕訳（前回以降に flush された分だけファイルから読み足す）"""
+        self.flush()
+        cache = self._read_cache
+        if len(cache) < self._count:
+            cache.extend(self._read(len(cache)))
+            self._frame = None
+        return cache
+
+    def _read(self, start: int):
+        if start >= self._count:
+            return
+        # start を含む flush の先頭へシークし、その flush 内の手前の行だけ読み飛ばす
+        k = int(np.searchsorted(np.frombuffer(self._offsets, dtype=np.int64), start, side="right")) - 1
+        skip = start - self._offsets[k]
+        with open(self.path, "rb") as raw:
+            raw.seek(self._positions[k])
+            f = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+            for i, (d, desc, dr_acc, dr_amt, cr_acc, cr_amt) in enumerate(csv.reader(f)):
+                if i < skip:
+                    continue
+                yield JournalEntry(
+                    date=_parse_date(d),
+                    description=desc,
+                    dr_account=dr_acc,
+                    dr_amount=float(dr_amt),
+                    cr_account=cr_acc,
+                    cr_amount=float(cr_amt),
+                )
+
+    def close(self) -> None:
+        self._buffer = []
+        self._read_cache, self._frame = [], None
+        if self._owns_file and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+# =======================================
+# ④ SQLite（実行結果のアーカイブ向け）
+# =======================================
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal (
+    run_id       TEXT    NOT NULL,
+    id           INTEGER NOT NULL,
+    date         TEXT    NOT NULL,
+    year         INTEGER NOT NULL,
+    month        INTEGER NOT NULL,
+    account      TEXT    NOT NULL,
+    account_code INTEGER NOT NULL,
+    dr_cr        TEXT    NOT NULL,
+    amount       REAL    NOT NULL,
+    description  TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_journal_account_year ON journal (run_id, account, year);
+CREATE INDEX IF NOT EXISTS ix_journal_date         ON journal (run_id, date);
+CREATE INDEX IF NOT EXISTS ix_journal_id           ON journal (run_id, id);
+"""
+
+
+class SQLiteJournalSink(JournalSink):
+    """
+    仕訳を SQLite の journal テーブルへ書き出す（1仕訳 = 借方行・貸方行の2行）。
+
+    path   : データベースファイル（省略時はメモリ上の DB）
+    run_id : 実行の識別子（省略時は新規に採番）。既存の run_id を渡すと
+             その仕訳を引き継ぐ（LedgerManager は SQL の集計から初期化される）。
+    """
+
+    def __init__(self, path: str = None, run_id: str = None, buffer_size: int = 4096):
+        self.path        = path or ":memory:"
+        self.run_id      = run_id or uuid.uuid4().hex
+        self.buffer_size = int(buffer_size)
+        self._buffer     = []
+        # バックグラウンド実行（ui/jobs.py）では生成と書き込みのスレッドが異なる
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(_SQLITE_SCHEMA)
+        (rows,) = self._conn.execute(
+            "SELECT COUNT(*) FROM journal WHERE run_id = ?", (self.run_id,)
+        ).fetchone()
+        self._count = rows // 2
+
+    @staticmethod
+    def list_runs(path: str) -> list:
+        """データベースに保存されている run_id（初回書き込み順）"""
+        conn = sqlite3.connect(path)
+        try:
+            conn.executescript(_SQLITE_SCHEMA)
+            rows = conn.execute(
+                "SELECT run_id FROM journal GROUP BY run_id ORDER BY MIN(rowid)"
+            ).fetchall()
+        finally:
+            conn.close()
+        return [r[0] for r in rows]
+
+    def append(self, entry: JournalEntry) -> None:
+        self._buffer.append(entry)
+        self._count += 1
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        first = (self._count - len(self._buffer)) * 2 + 1
+        rows  = []
+        for k, e in enumerate(self._buffer):
+            d  = e.date
+            ds = d.isoformat()
+            rows.append((self.run_id, first + 2 * k, ds, d.year, d.month,
+                         e.dr_account, code_of(e.dr_account), "debit",
+                         float(e.dr_amount), e.description))
+            rows.append((self.run_id, first + 2 * k + 1, ds, d.year, d.month,
+                         e.cr_account, code_of(e.cr_account), "credit",
+                         float(e.cr_amount), e.description))
+        with self._conn:   # 1トランザクション
+            self._conn.executemany(
+                "INSERT INTO journal (run_id, id, date, year, month, account, account_code,"
+                " dr_cr, amount, description) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        self._buffer = []
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _query(self, sql: str, params: tuple = ()):
+        self.flush()
+        return self._conn.execute(sql, (self.run_id, *params))
+
+    def iter_entries(self, start: int = 0):
+        # 仕訳 k（0始まり）は id = 2k+1（借方）・2k+2（貸方）
+        rows = self._query(
+            "SELECT date, description, account, amount FROM journal"
+            " WHERE run_id = ? AND id > ? ORDER BY id",
+            (2 * int(start),),
+        )
+        # 借方行・貸方行の順に2行ずつ取り出す
+        for (d, desc, dr_acc, dr_amt), (_, _, cr_acc, cr_amt) in zip(rows, rows):
+            yield JournalEntry(
+                date=_parse_date(d),
+                description=desc,
+                dr_account=dr_acc,
+                dr_amount=dr_amt,
+                cr_account=cr_acc,
+                cr_amount=cr_amt,
+            )
+
+    def to_frame(self) -> pd.DataFrame:
+        self.flush()
+        df = pd.read_sql_query(
+            "SELECT id, date, account, dr_cr, amount, description FROM journal"
+            " WHERE run_id = ? ORDER BY id",
+            self._conn, params=(self.run_id,),
+        )
+        return _finalize_frame(df)
+
+    def account_balance(self, account_name: str) -> float:
+        (balance,) = self._query(
+            "SELECT TOTAL(CASE dr_cr WHEN 'debit' THEN amount ELSE -amount END)"
+            " FROM journal WHERE run_id = ? AND account = ?",
+            (account_name,),
+        ).fetchone()
+        return balance
+
+    def account_balances(self) -> dict:
+        return dict(self._query(
+            "SELECT account, TOTAL(CASE dr_cr WHEN 'debit' THEN amount ELSE -amount END)"
+            " FROM journal WHERE run_id = ? GROUP BY account"
+        ).fetchall())
+
+    def monthly_totals(self):
+        rows = self._query(
+            "SELECT MAX(date), description, account, dr_cr, TOTAL(amount) FROM journal"
+            " WHERE run_id = ? GROUP BY year, month, account, dr_cr, description"
+        ).fetchall()
+        return [(_parse_date(d), desc, acc, dr_cr, amount) for d, desc, acc, dr_cr, amount in rows]
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+
+
+# =======================================
+# ⑤ 同一日付・同一科目組合せの圧縮
+# =======================================
+class CompactJournalSink(JournalSink):
+    """
+    (日付, 摘要, 借方, 貸方) が同じ仕訳を1行（金額合計・件数）にまとめて保持する。
+
+    keep_components : True → 元の仕訳の内訳を保持し、components() / expand() で復元できる
+    """
+
+    def __init__(self, keep_components: bool = True):
+        self.keep_components = bool(keep_components)
+        self._index = {}   # (日付, 摘要, 借方, 貸方) → 行番号
+        self._rows  = []   # [日付, 摘要, 借方, 貸方, 借方金額, 貸方金額, 件数]
+        self._count = 0
+        # 元の仕訳（受け取り順の連番 = 添字）→ 行番号・金額
+        self._row_of = array("q")
+        self._dr     = array("d")
+        self._cr     = array("d")
+
+    @classmethod
+    def from_entries(cls, entries, keep_components: bool = True) -> "CompactJournalSink":
+        sink = cls(keep_components)
+        for e in entries:
+            sink.append(e)
+        return sink
+
+    def append(self, entry: JournalEntry) -> None:
+        key = (entry.date, entry.description, entry.dr_account, entry.cr_account)
+        row = self._index.get(key)
+        if row is None:
+            row = self._index[key] = len(self._rows)
+            self._rows.append([*key, 0.0, 0.0, 0])
+        r = self._rows[row]
+        r[4] += entry.dr_amount
+        r[5] += entry.cr_amount
+        r[6] += 1
+        self._count += 1
+        if self.keep_components:
+            self._row_of.append(row)
+            self._dr.append(entry.dr_amount)
+            self._cr.append(entry.cr_amount)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def n_rows(self) -> int:
+        """まとめた後の行数"""
+        return len(self._rows)
+
+    @property
+    def counts(self) -> list:
+        """行ごとのまとめた仕訳件数"""
+        return [r[6] for r in self._rows]
+
+    def iter_entries(self, start: int = 0):
+        """まとめた後の仕訳（金額は合計）を行番号順に返す（start は行番号）。"""
+        for d, desc, dr, cr, dr_amt, cr_amt, _ in (self._rows[start:] if start else self._rows):
+            yield JournalEntry(
+                date=d, description=desc,
+                dr_account=dr, dr_amount=dr_amt,
+                cr_account=cr, cr_amount=cr_amt,
+            )
+
+    def to_frame(self) -> pd.DataFrame:
+        df = entries_to_frame(self.iter_entries())
+        df["count"] = np.repeat(np.asarray(self.counts, dtype=np.int64), 2)
+        return df
+
+    # ---- 監査リンク（keep_components=True の場合のみ）----
+    def _require_components(self) -> None:
+        if not self.keep_components:
+            raise ValueError("keep_components=False のため元の仕訳を保持していません。")
+
+    def row_of(self, seq: int) -> int:
+        """受け取り順 seq（0始まり）の元の仕訳がまとめられた行番号"""
+        self._require_components()
+        return self._row_of[seq]
+
+    def components(self, row: int) -> list:
+        """行 row にまとめた元の仕訳を (受け取り順の連番, JournalEntry) で返す。"""
+        self._require_components()
+        d, desc, dr, cr = self._rows[row][:4]
+        seqs = np.flatnonzero(np.frombuffer(self._row_of, dtype=np.int64) == row)
+        return [
+            (int(k), JournalEntry(date=d, description=desc,
+                                  dr_account=dr, dr_amount=self._dr[k],
+                                  cr_account=cr, cr_amount=self._cr[k]))
+            for k in seqs
+        ]
+
+    def expand(self):
+        """元の仕訳を受け取り順に復元する。"""
+        self._require_components()
+        rows = self._rows
+        for row, dr_amt, cr_amt in zip(self._row_of, self._dr, self._cr):
+            d, desc, dr, cr = rows[row][:4]
+            yield JournalEntry(
+                date=d, description=desc,
+                dr_account=dr, dr_amount=dr_amt,
+                cr_account=cr, cr_amount=cr_amt,
+            )
+
+# ===============================
+# core/ledger/journal_sink.py end
+# ===============================
@@ -3,16 +3,57 @@
 # ===============================
 
 import pandas as pd
+from core.ledger.accounts import code_of
+from core.ledger.integrity import IntegrityReport, check_ledger
+from core.ledger.journal_archive import write_archive
 from core.ledger.journal_entry import JournalEntry, make_entry_pair
+from core.ledger.journal_sink import CompactJournalSink, JournalSink, MemoryJournalSink
+from core.ledger.trial_balance import PeriodTotals, TrialBalance
+from core.simulation.period_calendar import fiscal_year
 
 
 class LedgerManager:
 
-    def __init__(self):
-        self.entries           = []
+    def __init__(self, sink: JournalSink = None, fiscal_year_end_month: int = 12):
+        # 仕訳の保存先（省略時はメモリ保持 = 従来動作）
+        self.sink               = sink if sink is not None else MemoryJournalSink()
+        # 決算月（year 列・試算表の年は事業年度。core/simulation/period_calendar.py）
+        self.fiscal_year_end_month = int(fiscal_year_end_month)
         self.depreciation_units = []
         self.loan_units         = []
 
+        # 科目別の累計残高（借方 − 貸方）。仕訳追加のたびに O(1) で更新する。
+        # 既に仕訳を持つシンク（ポートフォリオの連結等）を渡された場合はそこから初期化。
+        self._balances = {}
+        # 月次の科目別合計（試算表・core/ledger/trial_balance.py）
+        self._periods  = PeriodTotals(self.fiscal_year_end_month)
+        if len(self.sink):
+            self._balances = self.sink.account_balances()
+            for d, description, account, dr_cr, amount in self.sink.monthly_totals():
+                self._periods.post_side(d, description, code_of(account), dr_cr, amount)
+
+    # -----------------------------------------
+    # 仕訳一覧（保存先シンクに委譲）
+    # -----------------------------------------
+    @property
+    def entries(self) -> list:
+        return self.sink.entries
+
+    # -----------------------------------------
+    # 仕訳の圧縮
+    #   (日付, 摘要, 借方, 貸方) が同じ仕訳を1行にまとめた CompactJournalSink に
+    #   保存先を移し替える（以後の仕訳も同様にまとめる）。
+    #   残高・試算表は変わらない。個別仕訳を持たないシンク（集計シンク）は対象外。
+    #   最初から圧縮する場合は LedgerManager(sink=CompactJournalSink()) を使う。
+    # -----------------------------------------
+    def compact(self, keep_components: bool = True) -> CompactJournalSink:
+        if isinstance(self.sink, CompactJournalSink):
+            return self.sink
+        compacted = CompactJournalSink.from_entries(self.sink.iter_entries(), keep_components)
+        self.sink.close()
+        self.sink = compacted
+        return compacted
+
     # -----------------------------------------
     # 仕訳追加
     # -----------------------------------------
@@ -21,7 +62,15 @@ class LedgerManager:
             raise TypeError(
                 f"LedgerManager.add_entry expects JournalEntry, got {type(entry)}"
             )
-        self.entries.append(entry)
+        self.sink.append(entry)
+        b = self._balances
+        b[entry.dr_account] = b.get(entry.dr_account, 0.0) + entry.dr_amount
+        b[entry.cr_account] = b.get(entry.cr_account, 0.0) - entry.cr_amount
+        self._periods.post(
+            entry.date, entry.description,
+            code_of(entry.dr_account), entry.dr_amount,
+            code_of(entry.cr_account), entry.cr_amount,
+        )
 
     def add_entries(self, entries):
         for e in entries:
@@ -46,62 +95,65 @@ class LedgerManager:
         return self.loan_units
 
     # -----------------------------------------
-    # 勘定科目残高（単純合計）
+    # 勘定科目残高（単純合計 = 借方 − 貸方）
+    #   仕訳追加時に更新済みの累計を返すため、台帳を走査しない（O(1)）。
     # -----------------------------------------
     def get_account_balance(self, account_name: str) -> float:
-        balance = 0.0
-        for e in self.entries:
-            if e.dr_account == account_name:
-                balance += e.dr_amount
-            if e.cr_account == account_name:
-                balance -= e.cr_amount
-        return balance
+        return self._balances.get(account_name, 0.0)
+
+    @property
+    def cash_balance(self) -> float:
+        """現時点の預金残高。"""
+        return self._balances.get("預金", 0.0)
+
+    # -----------------------------------------
+    # 試算表（科目コード別の借方・貸方合計）
+    #   period     : 年（int）・(年, 月)・None（全期間）
+    #   cumulative : True → period 末までの累計（BS残高）
+    #   月次スナップショットから返すため、台帳を走査しない。
+    # -----------------------------------------
+    def trial_balance(self, period=None, cumulative: bool = False) -> TrialBalance:
+        return self._periods.trial_balance(period, cumulative)
+
+    @property
+    def years(self) -> list:
+        """仕訳のある事業年度（昇順）。"""
+        return self._periods.years
+
+    def description_totals(self, account: str, dr_cr: str) -> dict:
+        """科目・貸借ごとの (年, 摘要) → 金額。"""
+        return self._periods.description_totals(account, dr_cr)
+
+    # -----------------------------------------
+    # 整合性チェック（core/ledger/integrity.py）
+    #   mode  : "off" / "sampled" / "full"
+    #   start : 検査を始める仕訳の位置（増分検査）
+    # -----------------------------------------
+    def check_integrity(self, mode: str = "full", start: int = 0, **kwargs) -> IntegrityReport:
+        return check_ledger(self, mode, start=start, **kwargs)
+
+    # -----------------------------------------
+    # 固定長バイナリのアーカイブへ書き出し（core/ledger/journal_archive.py）
+    #   JournalArchive(path) で memmap として読み、実行を横断して集計する。
+    #   個別仕訳を持たないシンク（集計シンク）は対象外。
+    # -----------------------------------------
+    def write_archive(self, path: str) -> int:
+        return write_archive(self.sink.iter_entries(), path, self.fiscal_year_end_month)
 
     # -----------------------------------------
     # DataFrame 変換
     # get_df() が返す列：
-    #   id, date, year, month, account, dr_cr, amount, description
+    #   id, date, year, month, account, dr_cr, amount, description, account_code
     #
-    # year・month 列を持つことで、tax_engine / year_end_entries /
-    # exit_engine が df["year"] == n でそのまま絞り込める。
+    # account は表示用の科目名、account_code は科目表（core/ledger/accounts.py）の
+    # 整数コード。集計処理は account_code で絞り込む。
+    # year 列は事業年度（決算月 12 ならカレンダー年）、month 列はカレンダー月。
+    # 行の生成は保存先シンクが担当する（core/ledger/journal_sink.py）。
     # -----------------------------------------
     def get_df(self) -> pd.DataFrame:
-        if not self.entries:
-            return pd.DataFrame(columns=[
-                "id", "date", "year", "month",
-                "account", "dr_cr", "amount", "description"
-            ])
-
-        rows = []
-        eid  = 1
-        for e in self.entries:
-            base = {
-                "date":        e.date,
-                "description": e.description,
-            }
-            rows.append({**base,
-                "id":      eid,
-                "account": e.dr_account,
-                "dr_cr":   "debit",
-                "amount":  e.dr_amount,
-            })
-            eid += 1
-            rows.append({**base,
-                "id":      eid,
-                "account": e.cr_account,
-                "dr_cr":   "credit",
-                "amount":  e.cr_amount,
-            })
-            eid += 1
-
-        df = pd.DataFrame(rows)
-        df["date"]  = pd.to_datetime(df["date"], errors="coerce")
-        df["year"]  = df["date"].dt.year
-        df["month"] = df["date"].dt.month
-
-        # 列順を固定
-        df = df[["id", "date", "year", "month", "account", "dr_cr", "amount", "description"]]
-
+        df = self.sink.to_frame()
+        if self.fiscal_year_end_month != 12 and len(df):
+            df["year"] = fiscal_year(df["year"], df["month"], self.fiscal_year_end_month)
         return df
 
 # ===============================
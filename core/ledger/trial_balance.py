@@ -0,0 +1,204 @@
+# ===============================
+# core/ledger/trial_balance.py
+# 期間別試算表（月次スナップショット）
+# ===============================
+#
+# 【責務】
+#   LedgerManager が仕訳を受け取るたびに、月（年, 月）ごとの
+#   科目コード別 借方・貸方合計を更新し、試算表を返す。
+#
+#     trial_balance(2025)                   : 2025年度の発生額
+#     trial_balance((2025, 3))              : 2025年3月（カレンダー月）の発生額
+#     trial_balance(2025, cumulative=True)  : 2025年度末までの累計（BS残高）
+#     trial_balance()                       : 全期間の累計
+#
+#   年は事業年度（core/simulation/period_calendar.py、決算月 12 ならカレンダー年）。
+#   月はカレンダー順に並ぶため、事業年度は連続する月の範囲として引ける。
+#
+# 【スナップショット】
+#   累計は月の昇順に積み上げた累計配列（月次スナップショット）として保持し、
+#   問い合わせのたびに未計算の月だけを延長する。
+#   過去の月へ仕訳が追加された場合は、その月以降のスナップショットだけを捨てる
+#   （通常の記帳は日付順のため、末尾への延長のみで済む）。
+#   年次の発生額も年ごとにキャッシュし、その年への仕訳で破棄する。
+#
+# 【摘要別合計】
+#   資金収支計算書の一部の行（売却収入・当座借越返済など）は摘要で区別するため、
+#   (事業年度, 科目コード, 貸借, 摘要) 単位の合計も併せて保持する。
+#
+# ===============================
+
+import bisect
+
+import numpy as np
+import pandas as pd
+
+from core.ledger import accounts
+from core.simulation.period_calendar import fiscal_year
+
+
+DEBIT, CREDIT = 0, 1
+_SIDE = {"debit": DEBIT, "credit": CREDIT}
+
+
+class TrialBalance:
+    """
+    科目コード別の借方・貸方合計。
+    debit[code] / credit[code] : 配列の末尾は科目表にない科目（UNKNOWN）の合計。
+    """
+
+    def __init__(self, debit: np.ndarray, credit: np.ndarray):
+        self.debit  = debit
+        self.credit = credit
+
+    @property
+    def net(self) -> np.ndarray:
+        """科目別 借方 − 貸方"""
+        return self.debit - self.credit
+
+    def _code(self, account: str) -> int:
+        if account not in accounts.CODE:
+            raise KeyError(f"科目表にない科目です: {account}")
+        return accounts.CODE[account]
+
+    def balance(self, account: str) -> float:
+        """科目残高（借方 − 貸方）"""
+        c = self._code(account)
+        return float(self.debit[c] - self.credit[c])
+
+    def debit_of(self, account: str) -> float:
+        return float(self.debit[self._code(account)])
+
+    def credit_of(self, account: str) -> float:
+        return float(self.credit[self._code(account)])
+
+    def total(self, flags: int, side: str) -> float:
+        """flags のいずれかを持つ科目の借方（side="debit"）または貸方の合計"""
+        arr  = self.debit if side == "debit" else self.credit
+        hit  = accounts.has_flag(np.arange(len(arr)), flags)
+        return float(arr[hit].sum())
+
+    def to_frame(self) -> pd.DataFrame:
+        """表示用（科目・借方・貸方・残高、発生のある科目のみ）"""
+        rows = [
+            {"科目": a.name, "借方": self.debit[a.code], "貸方": self.credit[a.code],
+             "残高": self.debit[a.code] - self.credit[a.code]}
+            for a in accounts.CHART
+            if self.debit[a.code] or self.credit[a.code]
+        ]
+        return pd.DataFrame(rows, columns=["科目", "借方", "貸方", "残高"])
+
+
+class PeriodTotals:
+    """月次の科目別合計と累計スナップショット（LedgerManager が保持する）。"""
+
+    def __init__(self, fiscal_year_end_month: int = 12):
+        self._fye     = int(fiscal_year_end_month)
+        self._n       = accounts.UNKNOWN + 1
+        self._periods = {}   # (年, 月) → ndarray (2, n)
+        self._keys    = []   # 月の昇順
+        self._cum     = []   # _keys[:len(_cum)] までの累計
+        self._years   = {}   # 事業年度 → 発生額（キャッシュ）
+        self._desc    = {}   # (事業年度, コード, 貸借, 摘要) → 金額
+
+    def _fy(self, year: int, month: int) -> int:
+        return fiscal_year(year, month, self._fye)
+
+    def _fy_bounds(self, fy: int) -> tuple:
+        """事業年度 fy の月キーの範囲 [開始, 終了]"""
+        first = (fy, 1) if self._fye == 12 else (fy - 1, self._fye + 1)
+        return first, (fy, self._fye)
+
+    # --------------------------------------------------------
+    # 記帳
+    # --------------------------------------------------------
+    def _slot(self, year: int, month: int) -> np.ndarray:
+        key = (year, month)
+        # この月以降の累計・当年の発生額を破棄
+        if self._cum and key <= self._keys[len(self._cum) - 1]:
+            del self._cum[bisect.bisect_left(self._keys, key):]
+        self._years.pop(self._fy(year, month), None)
+
+        slot = self._periods.get(key)
+        if slot is None:
+            slot = self._periods[key] = np.zeros((2, self._n))
+            bisect.insort(self._keys, key)
+        return slot
+
+    def post(self, d, description: str, dr_code: int, dr_amount: float,
+             cr_code: int, cr_amount: float) -> None:
+        slot = self._slot(d.year, d.month)
+        slot[DEBIT,  dr_code] += dr_amount
+        slot[CREDIT, cr_code] += cr_amount
+        fy = self._fy(d.year, d.month)
+        self._add_desc((fy, dr_code, DEBIT,  description), dr_amount)
+        self._add_desc((fy, cr_code, CREDIT, description), cr_amount)
+
+    def post_side(self, d, description: str, code: int, side: str, amount: float) -> None:
+        """借方・貸方の片側のみ（get_df() の1行）を記帳する。"""
+        s = _SIDE[side]
+        self._slot(d.year, d.month)[s, code] += amount
+        self._add_desc((self._fy(d.year, d.month), code, s, description), amount)
+
+    def _add_desc(self, key, amount: float) -> None:
+        self._desc[key] = self._desc.get(key, 0.0) + amount
+
+    # --------------------------------------------------------
+    # 参照
+    # --------------------------------------------------------
+    @property
+    def years(self) -> list:
+        return sorted({self._fy(y, m) for y, m in self._keys})
+
+    def _cumulative(self, upto: int) -> np.ndarray:
+        """_keys[:upto] の累計（スナップショットを必要分だけ延長する）"""
+        if upto <= 0:
+            return np.zeros((2, self._n))
+        for i in range(len(self._cum), upto):
+            prev = self._cum[-1] if self._cum else 0.0
+            self._cum.append(prev + self._periods[self._keys[i]])
+        return self._cum[upto - 1]
+
+    def _year(self, year: int) -> np.ndarray:
+        arr = self._years.get(year)
+        if arr is None:
+            first, last = self._fy_bounds(year)
+            lo = bisect.bisect_left(self._keys, first)
+            hi = bisect.bisect_right(self._keys, last)
+            arr = np.zeros((2, self._n))
+            for key in self._keys[lo:hi]:
+                arr = arr + self._periods[key]
+            self._years[year] = arr
+        return arr
+
+    def trial_balance(self, period=None, cumulative: bool = False) -> TrialBalance:
+        """
+        period     : 事業年度（int）・(カレンダー年, 月)・None（全期間）
+        cumulative : True → period 末までの累計
+        """
+        if period is None:
+            arr = self._cumulative(len(self._keys))
+        elif cumulative:
+            if isinstance(period, (int, np.integer)):
+                end = self._fy_bounds(int(period))[1]
+            else:
+                end = tuple(period)
+            arr = self._cumulative(bisect.bisect_right(self._keys, end))
+        elif isinstance(period, (int, np.integer)):
+            arr = self._year(int(period))
+        else:
+            arr = self._periods.get(tuple(period), np.zeros((2, self._n)))
+        return TrialBalance(arr[DEBIT].copy(), arr[CREDIT].copy())
+
+    def description_totals(self, account: str, side: str) -> dict:
+        """科目・貸借を指定した (事業年度, 摘要) → 金額"""
+        code, s = accounts.code_of(account), _SIDE[side]
+        return {
+            (y, desc): amount
+            for (y, c, sd, desc), amount in self._desc.items()
+            if c == code and sd == s
+        }
+
+# ===============================
+# core/ledger/trial_balance.py end
+# ===============================
@@ -0,0 +1,88 @@
+# ===============================
+# core/simulation/cli.py
+# シナリオファイルのバッチ実行（コマンドライン）
+# ===============================
+#
+# 【使い方】
+#   python -m core.simulation.cli scenario1.json scenario2.json ...
+#       --engine journal|annual|kernel  計算エンジン（既定：journal）
+#       --cache-dir DIR                  結果キャッシュの保存先（既定：~/.cache/bkw_sim）
+#       --no-cache                       キャッシュを使わない
+#       --out DIR                        PL/BS/CF を <DIR>/<シナリオ名>_{pl,bs,cf}.csv に出力
+#       --store FILE                     結果を SQLite ウェアハウスに記録（core/simulation/results_store.py）
+#       --batch NAME                     ウェアハウスに記録するバッチ名（既定：実行日時）
+#
+# 【シナリオファイル】
+#   params_to_dict()（config/params.py）形式の JSON。
+#
+# 【出力】
+#   標準出力に 1シナリオ1行の JSON（scenario・cached・指標）。
+#
+# ===============================
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+from config.params import params_from_dict
+from core.simulation.result_cache import ResultCache
+from core.simulation.results_store import ResultsStore
+from core.simulation.sweep import evaluate_scenario
+
+
+def load_scenario(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return params_from_dict(json.load(f))
+
+
+def run_scenario_file(path: str, engine: str = "journal", cache=None, out_dir: str = None,
+                      store=None, batch: str = None) -> dict:
+    """シナリオファイル1件を実行し、標準出力用の dict を返す。store があれば結果を記録する。"""
+    params = load_scenario(path)
+    cached = cache is not None and (params, engine) in cache
+    fs = evaluate_scenario(params, engine=engine, cache=cache)
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+        for k in ("pl", "bs", "cf"):
+            fs[k].to_csv(os.path.join(out_dir, f"{name}_{k}.csv"), encoding="utf-8-sig")
+    if store is not None:
+        store.record(params, fs, name=name, batch=batch, engine=engine)
+
+    return {"scenario": name, "cached": cached, **fs["metrics"]}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="不動産投資シミュレーションのバッチ実行")
+    parser.add_argument("scenarios", nargs="+", help="シナリオ JSON ファイル")
+    parser.add_argument("--engine", choices=["journal", "annual", "kernel"], default="journal")
+    parser.add_argument("--cache-dir", default=None)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--out", default=None)
+    parser.add_argument("--store", default=None)
+    parser.add_argument("--batch", default=None)
+    args = parser.parse_args(argv)
+
+    cache = None if args.no_cache else ResultCache(root=args.cache_dir)
+    store = ResultsStore(args.store) if args.store else None
+    batch = args.batch or datetime.now().isoformat(timespec="seconds")
+    try:
+        for path in args.scenarios:
+            row = run_scenario_file(path, engine=args.engine, cache=cache, out_dir=args.out,
+                                    store=store, batch=batch)
+            print(json.dumps(row, ensure_ascii=False))
+    finally:
+        if store is not None:
+            store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# ===============================
+# core/simulation/cli.py end
+# ===============================
@@ -0,0 +1,158 @@
+# ===============================
+# core/simulation/compare.py
+# 複数シナリオの並列計算と比較表
+# ===============================
+#
+# 【責務】
+#   2〜10 程度の SimulationParams の変種（借入条件・Exit 年違いなど）をまとめて計算し、
+#   PL / BS / CF と指標を1つの比較表（基準シナリオとの差額付き）に揃える。
+#
+# 【計算の共有】
+#   取得・借入・月次条件が同じ変種（prefix_key が同じ。Exit 年・売却額だけが異なる）は
+#   1つのタスクにまとめ、保有年数の長い順に同じプロセスで計算する。
+#   カーネルの共通プレフィックスキャッシュ（core/engine/cashflow_kernel.py）により、
+#   2件目以降は取得〜月次フローを再計算しない。
+#   グループ同士は executor（Streamlit では ui/worker_pool.py のセッション窓口）で並列に計算する。
+#
+# 【比較表】
+#   diff_table(results, "cf")  : 行 = (科目, 年)、列 = 各シナリオの値 + 「Δ シナリオ」（基準との差）
+#   metrics_table(results)     : 行 = 指標、列は同上
+#   年数の異なるシナリオは、ない年を NaN とする。
+#
+# 【使い方】
+#   results = compare_scenarios({"借入7割": p1, "借入5割": p2, "10年売却": p3})
+#   diff_table(results, "pl", base="借入7割")
+#
+# ===============================
+
+from concurrent.futures import as_completed
+
+import pandas as pd
+
+from config.params import SimulationParams
+from core.engine.cashflow_kernel import prefix_key
+from core.simulation.sweep import SWEEP_METRICS, evaluate_batch
+
+
+MAX_VARIANTS = 10
+STATEMENT_KEYS = ("pl", "bs", "cf")
+DELTA_PREFIX = "Δ "
+
+
+def group_by_prefix(variants: dict) -> list:
+    """
+    {名前: params} を共通プレフィックスごとにまとめる。
+    戻り値 : [[(名前, params), ...], ...]（各グループは保有年数の長い順）
+    """
+    groups = {}
+    for name, params in variants.items():
+        groups.setdefault(prefix_key(params), []).append((name, params))
+    return [
+        sorted(g, key=lambda item: -int(item[1].holding_years))
+        for g in groups.values()
+    ]
+
+
+def _evaluate_group(group: list, engine: str) -> list:
+    """[(名前, params), ...] → [(名前, fs), ...]（ワーカープロセスから呼ばれる）"""
+    results = evaluate_batch([p for _, p in group], engine)
+    return [(name, fs) for (name, _), fs in zip(group, results)]
+
+
+def compare_scenarios(
+    variants: dict,
+    engine: str = "kernel",
+    executor=None,
+    progress=None,
+) -> dict:
+    """
+    variants : {名前: SimulationParams}（最大 MAX_VARIANTS 件）
+    executor : concurrent.futures.Executor 互換（省略時は呼び出し元で順に計算）
+    progress : progress("比較", 計算済み件数, 全件数)。SimulationCancelled で中断
+    戻り値   : {名前: fs}（variants と同じ順。fs は evaluate_scenario と同じ dict）
+    """
+    if not variants:
+        raise ValueError("比較するシナリオがありません。")
+    if len(variants) > MAX_VARIANTS:
+        raise ValueError(f"比較できるシナリオは {MAX_VARIANTS} 件までです。")
+    for name, params in variants.items():
+        if not isinstance(params, SimulationParams):
+            raise TypeError(f"{name}: SimulationParams ではありません。")
+
+    groups = group_by_prefix(variants)
+    done   = {}
+
+    def report():
+        if progress is not None:
+            progress("比較", len(done), len(variants))
+
+    report()
+    if executor is None:
+        for group in groups:
+            done.update(_evaluate_group(group, engine))
+            report()
+    else:
+        futures = [executor.submit(_evaluate_group, g, engine) for g in groups]
+        try:
+            for fut in as_completed(futures):
+                done.update(fut.result())
+                report()
+        finally:
+            # 中断・例外時は未着手のグループを取り消す
+            for fut in futures:
+                fut.cancel()
+    return {name: done[name] for name in variants}
+
+
+# ============================================================
+# 比較表
+# ============================================================
+def _with_deltas(values: pd.DataFrame, base: str) -> pd.DataFrame:
+    """各シナリオの値の列に「Δ シナリオ」（基準との差）の列を加える"""
+    if base not in values.columns:
+        raise KeyError(base)
+    deltas = {
+        f"{DELTA_PREFIX}{name}": values[name] - values[base]
+        for name in values.columns if name != base
+    }
+    return pd.concat([values, pd.DataFrame(deltas, index=values.index)], axis=1)
+
+
+def diff_table(results: dict, statement: str, base: str = None) -> pd.DataFrame:
+    """
+    results   : compare_scenarios() の戻り値
+    statement : "pl" / "bs" / "cf"
+    base      : 基準シナリオ（省略時は先頭）
+    戻り値    : 行 = (科目, 年) の MultiIndex、列 = 各シナリオ + 「Δ シナリオ」
+    """
+    if statement not in STATEMENT_KEYS:
+        raise ValueError(f"未知の財務諸表です: {statement}")
+    base = base if base is not None else next(iter(results))
+
+    lines, years = [], []
+    for fs in results.values():
+        df = fs[statement]
+        lines += [r for r in df.index if r not in lines]
+        years += [c for c in df.columns if c not in years]
+    years = sorted(years, key=lambda c: int(str(c).split()[-1]))
+
+    index  = pd.MultiIndex.from_product([lines, years], names=["科目", "年"])
+    values = pd.DataFrame({
+        name: fs[statement].reindex(index=lines, columns=years).to_numpy(dtype=float).ravel()
+        for name, fs in results.items()
+    }, index=index)
+    return _with_deltas(values, base)
+
+
+def metrics_table(results: dict, base: str = None) -> pd.DataFrame:
+    """行 = 指標（SWEEP_METRICS）、列 = 各シナリオ + 「Δ シナリオ」"""
+    base = base if base is not None else next(iter(results))
+    values = pd.DataFrame(
+        {name: [fs["metrics"][m] for m in SWEEP_METRICS] for name, fs in results.items()},
+        index=list(SWEEP_METRICS),
+    )
+    return _with_deltas(values, base)
+
+# ===============================
+# core/simulation/compare.py end
+# ===============================
@@ -0,0 +1,54 @@
+# ===============================
+# core/simulation/event_scheduler.py
+# 月次イベントスケジューラ（ヒープ）
+# ===============================
+#
+# 【責務】
+#   「通算月 N に起きること」をあらかじめ登録しておき、
+#   各月は期日の到来したイベントだけを取り出す。
+#   毎月すべての追加投資・償却ユニット・借入ユニットを走査する必要がなくなる。
+#
+# 【キュー】
+#   イベントはキュー名ごとに別ヒープで管理する。
+#     "monthly"    : MonthlyEntryGenerator（追加設備取得・償却開始/終了・借入開始/終了）
+#     "simulation" : Simulation（Exit）
+#
+# 【順序】
+#   同じ月のイベントは登録順に取り出す（(月, 登録連番) でヒープ化）。
+#   取り出し中に同じ月のイベントが追加された場合も、その月のうちに取り出す。
+#
+# ===============================
+
+import heapq
+import itertools
+
+
+class EventScheduler:
+
+    def __init__(self):
+        self._queues = {}
+        self._seq    = itertools.count()
+
+    def schedule(self, sim_month_index: int, kind: str, payload=None, queue: str = "monthly") -> None:
+        """通算月 sim_month_index（1始まり）にイベントを登録する。"""
+        heap = self._queues.setdefault(queue, [])
+        heapq.heappush(heap, (int(sim_month_index), next(self._seq), kind, payload))
+
+    def pop_due(self, sim_month_index: int, queue: str = "monthly"):
+        """期日（sim_month_index 以前）のイベントを (kind, payload) で順に返す。"""
+        heap = self._queues.get(queue)
+        while heap and heap[0][0] <= sim_month_index:
+            _, _, kind, payload = heapq.heappop(heap)
+            yield kind, payload
+
+    def next_month(self, queue: str = "monthly"):
+        """次のイベントの月（なければ None）。"""
+        heap = self._queues.get(queue)
+        return heap[0][0] if heap else None
+
+    def __len__(self) -> int:
+        return sum(len(h) for h in self._queues.values())
+
+# ===============================
+# core/simulation/event_scheduler.py end
+# ===============================
@@ -0,0 +1,106 @@
+# ===============================
+# core/simulation/period_calendar.py
+# 期間カレンダー（通算月 → 日付・事業年度・決算月）
+# ===============================
+#
+# 【責務】
+#   保有期間の全月について
+#     日付          : その月の1日（開始日の月から1ヶ月ずつ進む実カレンダー）
+#     事業年度      : 決算月（fiscal_year_end_month）で区切った年度
+#     期中の月      : 事業年度の何ヶ月目か（1〜12）
+#     決算（締め）  : 決算月、または保有期間の最終月
+#   を事前計算した表を持ち、各エンジンは日付計算の代わりにこの表を引く。
+#
+# 【事業年度の呼び方】
+#   年度末（決算月）のカレンダー年で呼ぶ（「2026年3月期」= 2025年4月〜2026年3月 → 2026）。
+#   決算月 12 の場合はカレンダー年と一致する。
+#   台帳の year 列・試算表の年・財務諸表の "Year XXXX" 列はすべて事業年度。
+#
+# 【締め】
+#   決算月の月次完了後に消費税精算・税計算を行う（Simulation）。
+#   保有期間の最終月が決算月でない場合は、その月で最終事業年度を締める。
+#   締めの仕訳日はその月の末日。
+#
+# ===============================
+
+import calendar
+from datetime import date
+
+import numpy as np
+
+
+def fiscal_year(year, month, fiscal_year_end_month: int = 12):
+    """カレンダー年・月 → 事業年度（配列も可）"""
+    return year + (month > fiscal_year_end_month)
+
+
+def month_end(d) -> date:
+    """その月の末日"""
+    return date(d.year, d.month, calendar.monthrange(d.year, d.month)[1])
+
+
+class PeriodCalendar:
+    """
+    通算月（1始まり）ごとの期間表。
+    配列はすべて長さ n_months（添字 = 通算月 − 1）。
+
+        year / month   : カレンダー年・月
+        fiscal_year    : 事業年度
+        fiscal_period  : 事業年度内の月（1〜12）
+        is_year_end    : 締めの月
+    """
+
+    def __init__(self, start_date: date, n_months: int, fiscal_year_end_month: int = 12):
+        fye = int(fiscal_year_end_month)
+        if not 1 <= fye <= 12:
+            raise ValueError(f"決算月は1〜12で指定してください: {fiscal_year_end_month}")
+        self.start_date            = start_date
+        self.n_months              = int(n_months)
+        self.fiscal_year_end_month = fye
+
+        k = start_date.year * 12 + (start_date.month - 1) + np.arange(self.n_months)
+        self.year          = k // 12
+        self.month         = k % 12 + 1
+        self.fiscal_year   = fiscal_year(self.year, self.month, fye)
+        self.fiscal_period = (self.month - fye - 1) % 12 + 1
+        self.is_year_end   = self.month == fye
+        if self.n_months:
+            self.is_year_end[-1] = True
+
+        self._dates = [date(int(y), int(m), 1) for y, m in zip(self.year, self.month)]
+
+    # --------------------------------------------------------
+    # 通算月 → 日付
+    # --------------------------------------------------------
+    def date(self, sim_month_index: int) -> date:
+        """通算月の1日。保有期間を超える月は同じ規則で計算する。"""
+        if 1 <= sim_month_index <= self.n_months:
+            return self._dates[sim_month_index - 1]
+        k = self.start_date.year * 12 + (self.start_date.month - 1) + sim_month_index - 1
+        return date(k // 12, k % 12 + 1, 1)
+
+    __call__ = date
+
+    def month_end(self, sim_month_index: int) -> date:
+        return month_end(self.date(sim_month_index))
+
+    def fiscal_year_of(self, d) -> int:
+        return int(fiscal_year(d.year, d.month, self.fiscal_year_end_month))
+
+    # --------------------------------------------------------
+    # 締め
+    # --------------------------------------------------------
+    def closes(self) -> list:
+        """締めの月を (通算月, 事業年度, 締め日) で返す（昇順）。"""
+        return [
+            (int(i) + 1, int(self.fiscal_year[i]), self.month_end(int(i) + 1))
+            for i in np.flatnonzero(self.is_year_end)
+        ]
+
+    def year_end_date(self, fy: int) -> date:
+        """事業年度 fy の決算日（決算月の末日）"""
+        return month_end(date(int(fy), self.fiscal_year_end_month, 1))
+
+# ===============================
+# core/simulation/period_calendar.py end
+# ===============================
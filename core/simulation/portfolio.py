@@ -0,0 +1,203 @@
+# ===============================
+# core/simulation/portfolio.py
+# 複数物件ポートフォリオの連結シミュレーション
+# ===============================
+#
+# 【責務】
+#   1つの事業体（法人・個人）が保有する複数物件を、
+#     ① 物件単位：取得・月次・Exit（Phase 1〜3）を並列ワーカーで実行
+#     ② 事業体単位：連結仕訳に対して消費税精算・税計算・最終精算（Phase 4〜6）を1回だけ実行
+#   する。欠損金の繰越控除は事業体全体の所得に対して適用される。
+#
+# 【処理の流れ】
+#   1. 物件を chunk_size 件ずつワーカープロセスへ配布
+#      各物件は Simulation.run(entity_phases=False) で Phase 1〜3 のみ実行
+#   2. ワーカーは物件ごとの仕訳を AggregatingJournalSink に集約して返す
+#      （journal="full" の場合は個別仕訳も返す）
+#   3. 親プロセスで集約シンクを merge し、連結台帳を作成
+#   4. 全事業年度（entity.fiscal_year_end_month で区切る）について、古い順に
+#        YearEndEntryGenerator.generate_year_end → TaxEngine.calculate_tax
+#      （締めの仕訳日は各事業年度の決算月末日）
+#   5. 全物件が売却済み（exit_year <= holding_years）なら最終精算
+#
+# 【journal モード】
+#   "aggregate" : 連結台帳は (事業年度, 科目, 貸借, 摘要) 単位の合計のみ（既定・大規模向け）
+#   "full"      : 全物件の個別仕訳を保持（件数 ≒ 物件数 × 年数 × 数百）
+#   いずれのモードでも Phase 4〜6 は集約台帳上で計算する。
+#
+# 【当座借越】
+#   資金繰りは事業体全体の預金で判断すべきものだが、集約台帳は年単位のため
+#   月次の資金不足を判定できない。ポートフォリオでは当座借越を適用せず、
+#   連結預金のマイナスはそのまま BS に表示する。
+#
+# ===============================
+
+from concurrent.futures import ProcessPoolExecutor
+
+from config.params import EntityParams
+from core.ledger.ledger import LedgerManager
+from core.ledger.journal_sink import AggregatingJournalSink, MemoryJournalSink
+from core.bookkeeping.year_end_entries import YearEndEntryGenerator
+from core.engine.exit_engine import ExitEngine
+from core.engine.tax_engine import TaxEngine
+from core.simulation.simulation import Simulation
+from core.simulation.state_manager import StateManager
+
+
+class _RecordingSink(AggregatingJournalSink):
+    """集約しつつ、追加された仕訳（事業体単位の仕訳）を記録する。"""
+
+    def __init__(self, fiscal_year_end_month: int = 12):
+        super().__init__(fiscal_year_end_month)
+        self.recorded = []
+
+    def append(self, entry) -> None:
+        super().append(entry)
+        self.recorded.append(entry)
+
+
+def _simulate_chunk(chunk: list, journal: str, fiscal_year_end_month: int = 12):
+    """
+    物件パラメータのリストを Phase 1〜3 まで実行する（ワーカープロセス側）。
+    仕訳は事業体の決算月で事業年度に集約する。
+
+    Returns
+    -------
+    (AggregatingJournalSink, list)  集約仕訳・個別仕訳（journal="full" の場合のみ）
+    """
+    merged  = AggregatingJournalSink(fiscal_year_end_month)
+    entries = []
+    for params in chunk:
+        if journal == "full":
+            sink = MemoryJournalSink()
+        else:
+            sink = AggregatingJournalSink(fiscal_year_end_month)
+        sim  = Simulation(params, params.start_date, journal_sink=sink)
+        sim.run(entity_phases=False)
+        if journal == "full":
+            entries.extend(sink.entries)
+            for e in sink.entries:
+                merged.append(e)
+        else:
+            merged.merge(sink)
+    return merged, entries
+
+
+class Portfolio:
+    """
+    使い方：
+        pf = Portfolio(properties, EntityParams("corporate", corporate_tax_rate=0.30))
+        pf.run()
+        fs = pf.build_statements()
+
+    properties : SimulationParams のリスト（start_date は各物件で必須）
+                 物件側の entity_type / 税率は使わず、entity の設定で課税する。
+    """
+
+    def __init__(
+        self,
+        properties: list,
+        entity: EntityParams = None,
+        journal: str = "aggregate",
+        max_workers: int = None,
+        chunk_size: int = 8,
+    ):
+        if not properties:
+            raise ValueError("properties が空です。")
+        if journal not in ("aggregate", "full"):
+            raise ValueError(f"未知の journal モードです: {journal}")
+        for p in properties:
+            if p.start_date is None:
+                raise ValueError("ポートフォリオの各物件には start_date が必要です。")
+
+        self.properties  = list(properties)
+        self.entity      = entity or EntityParams()
+        self.journal     = journal
+        self.max_workers = max_workers
+        self.chunk_size  = max(1, int(chunk_size))
+
+        self.ledger = None
+        self.state  = StateManager()
+
+    # --------------------------------------------------------
+    # ① 物件単位（並列）
+    # --------------------------------------------------------
+    def _simulate_properties(self):
+        chunks = [
+            self.properties[i:i + self.chunk_size]
+            for i in range(0, len(self.properties), self.chunk_size)
+        ]
+        fye = self.entity.fiscal_year_end_month
+        if self.max_workers == 1 or len(chunks) == 1:
+            results = [_simulate_chunk(c, self.journal, fye) for c in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as ex:
+                # map は投入順に返す → 連結結果の合計順序が実行ごとに変わらない
+                results = list(ex.map(
+                    _simulate_chunk, chunks,
+                    [self.journal] * len(chunks), [fye] * len(chunks),
+                ))
+
+        agg, entries = _RecordingSink(fye), []
+        for chunk_agg, chunk_entries in results:
+            agg.merge(chunk_agg)
+            entries.extend(chunk_entries)
+        return agg, entries
+
+    # --------------------------------------------------------
+    # メインエントリポイント
+    # --------------------------------------------------------
+    def run(self) -> None:
+        agg, entries = self._simulate_properties()
+        fye = self.entity.fiscal_year_end_month
+        entity_ledger = LedgerManager(sink=agg, fiscal_year_end_month=fye)
+
+        years = entity_ledger.years
+        first_year, last_year = years[0], years[-1]
+
+        # ==================================================
+        # ② 事業体単位：消費税精算・税計算（古い事業年度から順に）
+        # ==================================================
+        year_end = YearEndEntryGenerator(
+            params=self.entity, ledger=entity_ledger, start_year=first_year,
+        )
+        tax_engine = TaxEngine()
+        # 締めの仕訳日は省略時の決算月末日（各エンジンが ledger の決算月から求める）
+        for calendar_year in range(first_year, last_year + 1):
+            year_end.generate_year_end(calendar_year)
+            tax_engine.calculate_tax(
+                params=self.entity,
+                state_manager=self.state,
+                ledger=entity_ledger,
+                current_year=calendar_year,
+            )
+
+        # ==================================================
+        # ③ 最終精算（全物件が売却済みの場合のみ）
+        # ==================================================
+        if all(p.exit_params.exit_year <= p.holding_years for p in self.properties):
+            ExitEngine().post_final_settlement_entries(self.state, entity_ledger)
+
+        if self.journal == "full":
+            self.ledger = LedgerManager(fiscal_year_end_month=fye)
+            self.ledger.add_entries(entries)
+            self.ledger.add_entries(agg.recorded)
+        else:
+            self.ledger = entity_ledger
+
+    def build_statements(self) -> dict:
+        """連結 PL / BS / CF（FinancialStatementBuilder.build() と同じ dict）。"""
+        from core.finance.fs_builder import FinancialStatementBuilder
+
+        if self.ledger is None:
+            self.run()
+        return FinancialStatementBuilder(self.ledger).build()
+
+
+def run_portfolio(properties: list, entity: EntityParams = None, **kwargs) -> dict:
+    """Portfolio(properties, entity, **kwargs) を実行して連結財務諸表を返す。"""
+    return Portfolio(properties, entity, **kwargs).build_statements()
+
+# ===============================
+# core/simulation/portfolio.py end
+# ===============================
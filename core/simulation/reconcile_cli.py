@@ -0,0 +1,93 @@
+# ===============================
+# core/simulation/reconcile_cli.py
+# CF 資金収支尻と BS 預金の照合（コマンドライン）
+# ===============================
+#
+# 【使い方】
+#   python -m core.simulation.reconcile_cli scenario1.json scenario2.json ...
+#       シナリオを仕訳エンジンで実行し、相手科目別の預金ブリッジと未説明差異を表示する
+#       （core/finance/reconciliation.py の reconcile_ledger）
+#
+#   python -m core.simulation.reconcile_cli --store results.db [--batch NAME]
+#       ウェアハウスに記録済みの実行を財務諸表だけで一括照合する（check_batch）
+#
+#       --tol YEN      差異とみなす閾値（既定：1円）
+#       --strict       差異のある実行があれば終了コード 1
+#
+# 【出力】
+#   シナリオ : シナリオごとに 年次ブリッジ（summary）と 科目別の未説明差異
+#   --store  : 1実行1行の JSON（run・n_years・max_abs_delta・first_flagged・flagged）
+#
+# ===============================
+
+import argparse
+import json
+import os
+import sys
+
+import pandas as pd
+
+from core.finance.reconciliation import check_batch, reconcile_ledger
+from core.simulation.cli import load_scenario
+from core.simulation.results_store import ResultsStore
+from core.simulation.simulation import Simulation
+
+
+def reconcile_scenario_file(path: str, tol: float = 1.0) -> dict:
+    """シナリオファイル1件を仕訳エンジンで実行し、reconcile_ledger() の結果を返す。"""
+    params = load_scenario(path)
+    sim = Simulation(params, params.start_date)
+    sim.run()
+    return reconcile_ledger(sim.ledger, tol=tol)
+
+
+def check_store(store: ResultsStore, batch: str = None, tol: float = 1.0) -> pd.DataFrame:
+    """ウェアハウスの実行（batch 指定時はそのバッチのみ）を一括照合する。"""
+    runs = store.query(batch=batch)["run_id"].tolist()
+    return check_batch([store.statements(r) for r in runs], names=runs, tol=tol)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="CF 資金収支尻と BS 預金の照合")
+    parser.add_argument("scenarios", nargs="*", help="シナリオ JSON ファイル")
+    parser.add_argument("--store", default=None)
+    parser.add_argument("--batch", default=None)
+    parser.add_argument("--tol", type=float, default=1.0)
+    parser.add_argument("--strict", action="store_true")
+    args = parser.parse_args(argv)
+    if not args.scenarios and not args.store:
+        parser.error("シナリオファイルか --store を指定してください")
+
+    flagged = False
+    with pd.option_context("display.width", 200, "display.max_columns", None,
+                           "display.float_format", "{:,.0f}".format):
+        for path in args.scenarios:
+            result = reconcile_scenario_file(path, tol=args.tol)
+            name = os.path.splitext(os.path.basename(path))[0]
+            print(f"=== {name} ===")
+            print(result["summary"])
+            if len(result["unexplained"]):
+                flagged = True
+                print("--- 未説明差異（科目別） ---")
+                print(result["unexplained"])
+
+    if args.store:
+        store = ResultsStore(args.store)
+        try:
+            checked = check_store(store, batch=args.batch, tol=args.tol)
+        finally:
+            store.close()
+        for row in checked.to_dict("records"):
+            print(json.dumps({k: (v.item() if hasattr(v, "item") else v) for k, v in row.items()},
+                             ensure_ascii=False))
+        flagged |= bool(checked["flagged"].any())
+
+    return 1 if (args.strict and flagged) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# ===============================
+# core/simulation/reconcile_cli.py end
+# ===============================
@@ -0,0 +1,290 @@
+# ===============================
+# core/simulation/result_cache.py
+# シナリオ計算結果のディスクキャッシュ
+# ===============================
+#
+# 【責務】
+#   同じ SimulationParams の計算結果（PL/BS/CF・貸借チェック値・指標）を
+#   ディスクに保存し、次回以降は再計算せずに返す。
+#
+# 【キー（内容アドレス）】
+#   sha256( params_fingerprint(params) | namespace | code_version )
+#     namespace    : "journal"（Simulation）/ "kernel"（CashFlowKernel）など
+#     code_version : core/・config/ 配下の .py の内容ハッシュ（既定）
+#                    → エンジンを修正すると自動的に別キーになる
+#
+# 【保存形式】
+#   <root>/<キー先頭2桁>/<キー>.npz（np.savez_compressed）
+#     <stmt>__values / <stmt>__index / <stmt>__columns : pl / bs / cf
+#     scalar__<name>  : is_balanced・balance_diff 等
+#     metric__<name>  : 指標（任意）
+#
+# 【同時アクセス】
+#   ・書込みは一時ファイル → os.replace の原子的置換（読み手は完全なファイルしか見ない）
+#   ・合計サイズ（.size）の更新と LRU 削除は <root>/.lock の排他ロック（fcntl）下で行う
+#   ・削除と読込みが競合した場合は「キャッシュなし」として扱う
+#
+# 【LRU】
+#   ヒット時に mtime を更新し、合計サイズが max_bytes を超えたら mtime の古い順に削除する。
+#   合計サイズは <root>/.size（整数のバイト数）に保持し、put() はロック下で増減を加えるだけで
+#   ディレクトリを走査しない。走査（os.walk + stat）は合計が max_bytes を超えたとき、
+#   および evict() / size_bytes() / clear() の明示的な呼び出し時のみ行い、.size を実測値で更新する。
+#   .size がない・壊れている場合は初回の put() で走査して作り直す。
+#
+# ===============================
+
+import hashlib
+import os
+import tempfile
+import zipfile
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from config.params import SimulationParams, params_fingerprint
+
+try:
+    import fcntl
+except ImportError:  # Windows：ロックなし（原子的置換のみで整合性を保つ）
+    fcntl = None
+
+
+STATEMENT_KEYS = ("pl", "bs", "cf")
+SCALAR_KEYS    = ("is_balanced", "balance_diff", "debit_total", "credit_total")
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "bkw_sim")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_PROJECT_ROOT  = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+_code_version  = None
+
+
+def code_version() -> str:
+    """core/・config/ 配下のソースの内容ハッシュ（プロセス内で1回だけ計算）。"""
+    global _code_version
+    if _code_version is None:
+        h = hashlib.sha256()
+        for top in ("core", "config"):
+            base = os.path.join(_PROJECT_ROOT, top)
+            for dirpath, dirnames, filenames in os.walk(base):
+                dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+                for name in sorted(filenames):
+                    if not name.endswith(".py"):
+                        continue
+                    path = os.path.join(dirpath, name)
+                    h.update(os.path.relpath(path, _PROJECT_ROOT).encode("utf-8"))
+                    with open(path, "rb") as f:
+                        h.update(f.read())
+        _code_version = h.hexdigest()[:16]
+    return _code_version
+
+
+class ResultCache:
+    """
+    使い方：
+        cache = ResultCache()                       # ~/.cache/bkw_sim
+        fs = cache.get(params, namespace="journal")
+        if fs is None:
+            fs = ...計算...
+            cache.put(params, fs, namespace="journal")
+    """
+
+    def __init__(self, root: str = None, max_bytes: int = DEFAULT_MAX_BYTES, salt: str = None):
+        self.root      = root or os.environ.get("BKW_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.max_bytes = int(max_bytes)
+        self.salt      = salt if salt is not None else code_version()
+        os.makedirs(self.root, exist_ok=True)
+
+    # --------------------------------------------------------
+    # キー
+    # --------------------------------------------------------
+    def key(self, params: SimulationParams, namespace: str = "journal") -> str:
+        text = f"{params_fingerprint(params)}|{namespace}|{self.salt}"
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + ".npz")
+
+    # --------------------------------------------------------
+    # 読込み
+    # --------------------------------------------------------
+    def get(self, params: SimulationParams, namespace: str = "journal"):
+        """ヒットすれば結果 dict、なければ None。"""
+        path = self._path(self.key(params, namespace))
+        try:
+            with np.load(path, allow_pickle=False) as z:
+                result = _decode(z)
+            os.utime(path)   # LRU 用に最終利用時刻を更新
+        except (FileNotFoundError, zipfile.BadZipFile, KeyError, ValueError, EOFError):
+            return None
+        return result
+
+    def __contains__(self, item) -> bool:
+        params, namespace = item if isinstance(item, tuple) else (item, "journal")
+        return os.path.exists(self._path(self.key(params, namespace)))
+
+    # --------------------------------------------------------
+    # 書込み
+    # --------------------------------------------------------
+    def put(self, params: SimulationParams, result: dict, namespace: str = "journal") -> None:
+        path = self._path(self.key(params, namespace))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, **_encode(result))
+            size = os.path.getsize(tmp)
+            with self._lock():
+                total = self._read_total()
+                if total is None:
+                    total = self._sync_total()
+                total += size - _file_size(path)
+                os.replace(tmp, path)
+                self._write_total(total)
+                if total > self.max_bytes:
+                    self._evict_locked()
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    # --------------------------------------------------------
+    # LRU 削除
+    # --------------------------------------------------------
+    @contextmanager
+    def _lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.root, ".lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _total_path(self) -> str:
+        return os.path.join(self.root, ".size")
+
+    def _read_total(self):
+        """.size の合計バイト数（なし・壊れている場合は None）"""
+        try:
+            with open(self._total_path(), "r", encoding="utf-8") as f:
+                return int(f.read().strip())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_total(self, total: int) -> None:
+        with open(self._total_path(), "w", encoding="utf-8") as f:
+            f.write(str(max(0, int(total))))
+
+    def _sync_total(self) -> int:
+        """走査した実測値で .size を更新する（ロック下で呼ぶ）"""
+        total = sum(size for _, size, _ in self._scan())
+        self._write_total(total)
+        return total
+
+    def _scan(self) -> list:
+        """[(mtime, size, path), ...]"""
+        files = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if not name.endswith(".npz"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((st.st_mtime, st.st_size, path))
+        return files
+
+    def size_bytes(self) -> int:
+        """キャッシュの合計サイズ（走査した実測値。.size も更新する）"""
+        with self._lock():
+            return self._sync_total()
+
+    def evict(self) -> int:
+        """合計サイズが max_bytes 以下になるまで古い順に削除。削除件数を返す。"""
+        with self._lock():
+            return self._evict_locked()
+
+    def _evict_locked(self) -> int:
+        files = self._scan()
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        self._write_total(total)
+        return removed
+
+    def clear(self) -> None:
+        with self._lock():
+            for _, _, path in self._scan():
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self._write_total(0)
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+# ============================================================
+# 結果 dict ⇔ npz 配列
+# ============================================================
+def _encode(result: dict) -> dict:
+    arrays = {}
+    for k in STATEMENT_KEYS:
+        df = result.get(k)
+        if df is None:
+            continue
+        arrays[f"{k}__values"]  = df.to_numpy(dtype=float)
+        arrays[f"{k}__index"]   = np.array([str(x) for x in df.index])
+        arrays[f"{k}__columns"] = np.array([str(x) for x in df.columns])
+    for k in SCALAR_KEYS:
+        if k in result:
+            arrays[f"scalar__{k}"] = np.asarray(result[k], dtype=float)
+    for k, v in (result.get("metrics") or {}).items():
+        arrays[f"metric__{k}"] = np.asarray(v, dtype=float)
+    return arrays
+
+
+def _decode(z) -> dict:
+    result = {}
+    for k in STATEMENT_KEYS:
+        if f"{k}__values" not in z.files:
+            continue
+        result[k] = pd.DataFrame(
+            z[f"{k}__values"],
+            index=[str(x) for x in z[f"{k}__index"]],
+            columns=[str(x) for x in z[f"{k}__columns"]],
+        )
+    for k in SCALAR_KEYS:
+        if f"scalar__{k}" in z.files:
+            v = float(z[f"scalar__{k}"])
+            result[k] = bool(v) if k == "is_balanced" else v
+    metrics = {
+        name[len("metric__"):]: float(z[name]) for name in z.files if name.startswith("metric__")
+    }
+    if metrics:
+        result["metrics"] = metrics
+    return result
+
+# ===============================
+# core/simulation/result_cache.py end
+# ===============================
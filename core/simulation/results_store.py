@@ -0,0 +1,272 @@
+# ===============================
+# core/simulation/results_store.py
+# 実行結果ウェアハウス（SQLite）
+# ===============================
+#
+# 【責務】
+#   バッチ実行（CLI・スイープ）の結果を1つの SQLite ファイルに蓄積し、
+#   「NPV > 0 かつ最小預金残高 > 500万円」のような条件で
+#   再計算・Excel を開くことなく絞り込み・並べ替えできるようにする。
+#
+# 【テーブル】
+#   runs       : 1実行 = 1行
+#                run_id・batch（夜間バッチ名など）・name・engine・created_at・
+#                fingerprint（params_fingerprint）・params（params_to_dict の JSON）・
+#                指標列（SWEEP_METRICS、列ごとに索引）
+#   statements : 年次の PL / BS / CF の値（run_id, statement, line, year, value）
+#
+# 【保存先】
+#   path 省略時は環境変数 BKW_RESULTS_DB、なければ ~/.cache/bkw_sim/results.db。
+#
+# 【使い方】
+#   store = ResultsStore("results.db")
+#   store.record(params, evaluate_scenario(params), name="A棟", batch="2025-06-01")
+#   df = store.query([("npv", ">", 0), ("min_cash", ">", 5_000_000)],
+#                    order_by="irr", descending=True)
+#   fs = store.statements(df["run_id"].iloc[0])   # {"pl", "bs", "cf"}
+#
+#   指標が NaN（IRR 解なし等）の場合は NULL として保存され、条件に一致しない。
+#
+# ===============================
+
+import json
+import os
+import sqlite3
+import uuid
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from config.params import SimulationParams, params_fingerprint, params_from_dict, params_to_dict
+from core.simulation.result_cache import DEFAULT_CACHE_DIR
+from core.simulation.sweep import SWEEP_METRICS, scenario_metrics
+
+
+DEFAULT_STORE_PATH = os.path.join(DEFAULT_CACHE_DIR, "results.db")
+
+
+STATEMENT_KEYS = ("pl", "bs", "cf")
+FILTER_OPS     = ("<", "<=", ">", ">=", "=", "!=")
+RUN_COLUMNS    = ["run_id", "batch", "name", "engine", "created_at"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    batch       TEXT,
+    name        TEXT,
+    engine      TEXT,
+    created_at  TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    params      TEXT NOT NULL,
+    {metric_columns}
+);
+CREATE TABLE IF NOT EXISTS statements (
+    run_id    TEXT    NOT NULL,
+    statement TEXT    NOT NULL,
+    line      TEXT    NOT NULL,
+    year      INTEGER NOT NULL,
+    value     REAL,
+    PRIMARY KEY (run_id, statement, line, year)
+);
+CREATE INDEX IF NOT EXISTS ix_runs_batch       ON runs (batch);
+CREATE INDEX IF NOT EXISTS ix_runs_fingerprint ON runs (fingerprint);
+CREATE INDEX IF NOT EXISTS ix_statements_line  ON statements (statement, line, year);
+{metric_indexes}
+""".format(
+    metric_columns=",\n    ".join(f"{m} REAL" for m in SWEEP_METRICS),
+    metric_indexes="\n".join(
+        f"CREATE INDEX IF NOT EXISTS ix_runs_{m} ON runs ({m});" for m in SWEEP_METRICS
+    ),
+)
+
+
+class ResultsStore:
+    """
+    実行結果（パラメータ・指標・年次財務諸表）の SQLite ストア。
+
+    path : データベースファイル（":memory:" も可）
+    """
+
+    def __init__(self, path: str = None):
+        path = path or os.environ.get("BKW_RESULTS_DB", DEFAULT_STORE_PATH)
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path  = path
+        # Streamlit はスクリプトの再実行ごとにスレッドが変わりうる
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # --------------------------------------------------------
+    # 記録
+    # --------------------------------------------------------
+    def record(
+        self,
+        params: SimulationParams,
+        fs: dict,
+        name: str = None,
+        batch: str = None,
+        engine: str = None,
+        run_id: str = None,
+    ) -> str:
+        """1実行分を保存して run_id を返す。fs は evaluate_scenario() の戻り値。"""
+        return self.record_many([(params, fs, name)], batch=batch, engine=engine,
+                                run_ids=[run_id] if run_id else None)[0]
+
+    def record_many(self, items: list, batch: str = None, engine: str = None,
+                    run_ids: list = None) -> list:
+        """
+        items : [(params, fs, name), ...]
+        全件を1トランザクションで保存し、run_id のリストを返す。
+        fs に "metrics" がない場合は scenario_metrics() で計算する。
+        """
+        created = datetime.now().isoformat(timespec="seconds")
+        ids       = list(run_ids) if run_ids else [uuid.uuid4().hex for _ in items]
+        run_rows  = []
+        stmt_rows = []
+        for run_id, (params, fs, name) in zip(ids, items):
+            metrics = fs.get("metrics") or scenario_metrics(fs, params)
+            run_rows.append((
+                run_id, batch, name, engine, created,
+                params_fingerprint(params),
+                json.dumps(params_to_dict(params), ensure_ascii=False),
+                *(_to_real(metrics.get(m)) for m in SWEEP_METRICS),
+            ))
+            for key in STATEMENT_KEYS:
+                stmt_rows.extend(_statement_rows(run_id, key, fs[key]))
+
+        columns = ["run_id", "batch", "name", "engine", "created_at", "fingerprint", "params",
+                   *SWEEP_METRICS]
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO runs ({', '.join(columns)})"
+                f" VALUES ({', '.join('?' * len(columns))})",
+                run_rows,
+            )
+            self._conn.executemany(
+                "DELETE FROM statements WHERE run_id = ?", [(r,) for r in ids]
+            )
+            self._conn.executemany(
+                "INSERT INTO statements (run_id, statement, line, year, value)"
+                " VALUES (?, ?, ?, ?, ?)",
+                stmt_rows,
+            )
+        return ids
+
+    # --------------------------------------------------------
+    # 検索
+    # --------------------------------------------------------
+    def query(
+        self,
+        filters: list = (),
+        order_by: str = None,
+        descending: bool = False,
+        limit: int = None,
+        batch: str = None,
+    ) -> pd.DataFrame:
+        """
+        filters  : [(指標, 演算子, 値), ...]（AND 結合。演算子は FILTER_OPS）
+        order_by : 並べ替える指標（NULL は末尾）
+        batch    : 指定したバッチのみ
+        戻り値の列は RUN_COLUMNS + SWEEP_METRICS。
+        """
+        where, args = [], []
+        for metric, op, value in filters:
+            _check_metric(metric)
+            if op not in FILTER_OPS:
+                raise ValueError(f"未知の演算子です: {op}")
+            where.append(f"{metric} {op} ?")
+            args.append(float(value))
+        if batch is not None:
+            where.append("batch = ?")
+            args.append(batch)
+
+        sql = f"SELECT {', '.join(RUN_COLUMNS + SWEEP_METRICS)} FROM runs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if order_by is not None:
+            _check_metric(order_by)
+            sql += f" ORDER BY {order_by} IS NULL, {order_by} {'DESC' if descending else 'ASC'}"
+        else:
+            sql += " ORDER BY created_at, rowid"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+
+        df = pd.read_sql_query(sql, self._conn, params=args)
+        df[SWEEP_METRICS] = df[SWEEP_METRICS].astype(float)
+        return df
+
+    def batches(self) -> list:
+        """記録されているバッチ名（新しい順）"""
+        rows = self._conn.execute(
+            "SELECT batch FROM runs WHERE batch IS NOT NULL"
+            " GROUP BY batch ORDER BY MAX(created_at) DESC"
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    # --------------------------------------------------------
+    # 1実行分の復元
+    # --------------------------------------------------------
+    def params(self, run_id: str) -> SimulationParams:
+        row = self._conn.execute("SELECT params FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise KeyError(run_id)
+        return params_from_dict(json.loads(row[0]))
+
+    def statements(self, run_id: str) -> dict:
+        """{"pl", "bs", "cf"}（FinancialStatementBuilder.build() と同じ行・"Year XXXX" 列）"""
+        df = pd.read_sql_query(
+            "SELECT statement, line, year, value FROM statements WHERE run_id = ?"
+            " ORDER BY rowid",
+            self._conn, params=(run_id,),
+        )
+        if df.empty:
+            raise KeyError(run_id)
+        out = {}
+        for key in STATEMENT_KEYS:
+            rows  = df[df["statement"] == key]
+            lines = list(dict.fromkeys(rows["line"]))
+            years = sorted(rows["year"].unique())
+            table = rows.pivot(index="line", columns="year", values="value")
+            table = table.reindex(index=lines, columns=years)
+            table.columns = [f"Year {y}" for y in years]
+            table.index.name = None
+            out[key] = table
+        return out
+
+
+# ============================================================
+# 内部ヘルパー
+# ============================================================
+def _check_metric(metric: str) -> None:
+    # 列名は SQL に直接埋め込むため、既知の指標名のみ許可する
+    if metric not in SWEEP_METRICS:
+        raise ValueError(f"未知の指標です: {metric}（{', '.join(SWEEP_METRICS)}）")
+
+
+def _to_real(v):
+    """NaN・None は NULL として保存する"""
+    if v is None:
+        return None
+    v = float(v)
+    return None if np.isnan(v) else v
+
+
+def _statement_rows(run_id: str, key: str, table: pd.DataFrame) -> list:
+    years = [int(str(c).split()[-1]) for c in table.columns]
+    return [
+        (run_id, key, str(line), year, _to_real(value))
+        for line, values in zip(table.index, table.to_numpy(dtype=float))
+        for year, value in zip(years, values)
+    ]
+
+# ===============================
+# core/simulation/results_store.py end
+# ===============================
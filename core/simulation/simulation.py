@@ -9,30 +9,75 @@
 #
 # 【処理順序（仕様書0.7節 絶対厳守）】
 #   Phase 1 : 取得フェーズ（InitialEntryGenerator）
-#   Phase 2 : 月次フェーズ × 12ヶ月（MonthlyEntryGenerator）
-#   Phase 3 : Exit フェーズ（ExitEngine）← Exit年のみ、月次完了後
-#   Phase 4 : 消費税精算（YearEndEntryGenerator）
+#   Phase 2 : 月次フェーズ（MonthlyEntryGenerator）
+#   Phase 3 : Exit フェーズ（ExitEngine）← Exit月の月次完了後
+#   Phase 4 : 消費税精算（YearEndEntryGenerator）← 決算月の月次完了後
 #   Phase 5 : 税計算（TaxEngine）
-#   Phase 6 : 最終精算（ExitEngine.post_final_settlement_entries）← Exit年のみ、Tax後
+#   Phase 6 : 最終精算（ExitEngine.post_final_settlement_entries）← Exit後最初の決算・Tax後
+#
+#   追加設備取得・償却/借入の開始終了・Exit は EventScheduler に通算月の
+#   イベントとして事前登録し、各月は期日の到来したイベントだけを処理する。
+#   Exit は Exit 年の最終月（通算月 exit_year × 12）の月次完了後に処理する。
+#
+#   当座借越（OverdraftEngine）は Phase 1 直後・各月の月次直後・Exit 直後に
+#   預金残高を確認し、自動借入・利息計上・自動返済を行う。
+#
+# 【granularity】
+#   "monthly" : 月次仕訳（既定）
+#   "annual"  : 年次集計仕訳（AnnualEntryGenerator、スクリーニング用）
+#               Phase 2 をシミュレーション年末・決算月ごとの集計記帳に置き換える。
+#               財務諸表は丸め差の範囲で月次と一致する
+#               （当座借越も月次の借入・利息・返済を再現して年合計で記帳）。
+#
+# 【期間表・事業年度】
+#   通算月 → 日付・事業年度・決算月の対応は PeriodCalendar
+#   （core/simulation/period_calendar.py）で事前計算し、全フェーズがこれを引く。
+#   params.fiscal_year_end_month（決算月）の月次完了後に Phase 4〜5 を行い、
+#   保有期間の最終月が決算月でなければその月で最終事業年度を締める。
+#   締めの仕訳日は締め月の末日。
 #
 # 【重要：calendar_year について】
-#   ledger.get_df() の year 列はカレンダー年（例：2025, 2026, 2027）。
+#   ledger.get_df() の year 列・試算表の年は事業年度（決算月 12 ならカレンダー年）。
 #   year_end_entries / tax_engine は ledger.year と突き合わせてフィルタするため、
-#   sim_year（1, 2, 3...）ではなく calendar_year（2025, 2026, 2027...）を渡す。
-#   calendar_year = start_date.year + sim_year - 1
+#   sim_year（1, 2, 3...）ではなく期間表の事業年度（2025, 2026...）を渡す。
+#
+# 【進捗・中断】
+#   run(progress=...) を渡すと各フェーズの開始時に progress(phase, done, total) を呼ぶ。
+#     phase : "取得" / "月次" / "Exit" / "消費税精算" / "税計算" / "最終精算" / "完了"
+#     done  : 完了したシミュレーション年数（0〜holding_years）
+#     total : holding_years
+#   progress が SimulationCancelled を送出すると、その時点で run() を中断する
+#   （台帳は途中までの仕訳を持つため、中断後の結果は使わないこと）。
+#
+# 【整合性チェック】
+#   Simulation(integrity="sampled" / "full") を渡すと、各フェーズの開始時
+#   （progress と同じ区切り）に前回の区切り以降の仕訳を検査し
+#   （core/ledger/integrity.py）、integrity_reports に (phase, IntegrityReport) を追加する。
+#   事業年度ごとの貸借一致は「完了」の区切りでまとめて検査する。
+#   既定の "off" では検査しない（バッチ実行のスループット優先）。
 #
 # ===============================
 
+from dataclasses import replace
 from datetime import date
 
 from config.params import SimulationParams
+from core.ledger.integrity import INTEGRITY_MODES
 from core.ledger.ledger import LedgerManager
 from core.bookkeeping.initial_entries import InitialEntryGenerator
 from core.bookkeeping.monthly_entries import MonthlyEntryGenerator
+from core.bookkeeping.annual_entries import AnnualEntryGenerator
 from core.bookkeeping.year_end_entries import YearEndEntryGenerator
 from core.engine.exit_engine import ExitEngine
 from core.engine.tax_engine import TaxEngine
+from core.engine.overdraft_engine import OverdraftEngine
 from core.simulation.state_manager import StateManager
+from core.simulation.event_scheduler import EventScheduler
+from core.simulation.period_calendar import PeriodCalendar
+
+
+class SimulationCancelled(Exception):
+    """progress コールバックから送出して run() を中断する。"""
 
 
 class Simulation:
@@ -43,27 +88,76 @@ class Simulation:
     自身は仕訳を一切生成しない。
     """
 
-    def __init__(self, params: SimulationParams, start_date: date):
-        self.params     = params
-        self.start_date = start_date
-        self.ledger     = LedgerManager()
+    def __init__(
+        self,
+        params: SimulationParams,
+        start_date: date,
+        journal_sink=None,
+        granularity: str = "monthly",
+        integrity: str = "off",
+    ):
+        """
+        journal_sink : 仕訳の保存先（core/ledger/journal_sink.py）。
+                       省略時はメモリ保持。バッチ実行で財務諸表だけ必要な場合は
+                       AggregatingJournalSink を渡すとメモリを大幅に削減できる。
+                       実行結果を監査用に残す場合は SQLiteJournalSink（run_id 付き）。
+                       同じ日付・科目組合せの仕訳をまとめる場合は CompactJournalSink。
+        granularity  : "monthly"（既定）／ "annual"（年次集計・スクリーニング用）
+        integrity    : フェーズの区切りごとの整合性チェック "off"（既定）／ "sampled" ／ "full"
+        """
+        if granularity not in ("monthly", "annual"):
+            raise ValueError(f"未知の granularity です: {granularity}")
+        if integrity not in INTEGRITY_MODES:
+            raise ValueError(f"未知の integrity です: {integrity}")
+        self.params      = params
+        self.start_date  = start_date
+        self.granularity = granularity
+        self.integrity   = integrity
+        self.integrity_reports = []
+        self.calendar    = PeriodCalendar(
+            start_date, int(params.holding_years) * 12, params.fiscal_year_end_month
+        )
+        self.ledger     = LedgerManager(
+            sink=journal_sink, fiscal_year_end_month=params.fiscal_year_end_month
+        )
         self.state      = StateManager()
 
     # --------------------------------------------------------
     # カレンダーマッパー
-    # シミュレーション通算月（1始まり）→ 実カレンダー日付
+    # シミュレーション通算月（1始まり）→ 実カレンダー日付（期間表を引く）
     # 例：start_date = 2025-01-01, sim_month_index = 13 → 2026-01-01
+    #     start_date = 2025-04-01, sim_month_index = 10 → 2026-01-01
     # --------------------------------------------------------
     def map_sim_to_calendar(self, sim_month_index: int) -> date:
-        idx   = sim_month_index - 1
-        year  = self.start_date.year + (idx // 12)
-        month = ((self.start_date.month - 1) + (idx % 12)) % 12 + 1
-        return date(year, month, 1)
+        return self.calendar.date(sim_month_index)
 
     # --------------------------------------------------------
     # メインエントリポイント
     # --------------------------------------------------------
-    def run(self) -> None:
+    def run(self, entity_phases: bool = True, progress=None) -> None:
+        """
+        entity_phases : False の場合は物件単位の Phase 1〜3 のみ実行し、
+                        消費税精算・税計算・最終精算（Phase 4〜6）を省略する。
+                        資金繰り（当座借越）も事業体単位の判断となるため行わない。
+                        ポートフォリオ（core/simulation/portfolio.py）で
+                        事業体全体の精算をまとめて行うために使う。
+        progress      : progress(phase, done, total)。SimulationCancelled で中断。
+        """
+        total   = self.params.holding_years
+        checked = 0   # 整合性チェック済みの仕訳数
+
+        def report(phase: str, done: int) -> None:
+            nonlocal checked
+            if self.integrity != "off":
+                result = self.ledger.check_integrity(
+                    self.integrity, start=checked, periods=(phase == "完了"),
+                )
+                checked += result.n_entries
+                self.integrity_reports.append((phase, result))
+            if progress is not None:
+                progress(phase, done, total)
+
+        report("取得", 0)
 
         # ==================================================
         # Phase 1: 取得フェーズ
@@ -73,13 +167,23 @@ class Simulation:
         init = InitialEntryGenerator(self.params, self.ledger)
         init.generate(self.start_date)
 
+        # 当座借越：預金がマイナスなら自動借入、余剰があれば自動返済
+        overdraft = OverdraftEngine(self.params, self.ledger) if entity_phases else None
+        if overdraft:
+            overdraft.settle(self.start_date)
+
         # ==================================================
         # Phase 2以降で使うエンジンをあらかじめ生成しておく
         # ==================================================
-        monthly    = MonthlyEntryGenerator(
+        scheduler  = EventScheduler()
+        calendar   = self.calendar
+        annual     = self.granularity == "annual"
+        generator  = AnnualEntryGenerator if annual else MonthlyEntryGenerator
+        monthly    = generator(
             params=self.params,
             ledger=self.ledger,
-            calendar_mapper=self.map_sim_to_calendar,
+            calendar_mapper=calendar,
+            scheduler=scheduler,
         )
         year_end   = YearEndEntryGenerator(
             params=self.params,
@@ -88,65 +192,127 @@ class Simulation:
         )
         tax_engine = TaxEngine()
         exit_year  = self.params.exit_params.exit_year
-        exit_eng   = None  # Exit年になるまで None のまま
+        exit_eng   = None  # Exit月になるまで None のまま
+        if 1 <= exit_year <= self.params.holding_years:
+            scheduler.schedule(exit_year * 12, "exit", queue="simulation")
 
         # ==================================================
-        # 年次ループ（sim_year: 1 始まり）
+        # 月次ループ（sim_month_index: 1 始まり）
         # ==================================================
-        for sim_year in range(1, self.params.holding_years + 1):
-
-            # ★ カレンダー年を計算する（ledger.year列と必ず一致させること）
-            # sim_year=1 → start_date.year（例：2025）
-            # sim_year=2 → start_date.year + 1（例：2026）
-            calendar_year = self.start_date.year + sim_year - 1
+        exited     = False
+        span_first = 1   # 年次集計モードで未記帳の最初の月
+        for sim_month_index in range(1, calendar.n_months + 1):
+            done = (sim_month_index - 1) // 12   # 完了したシミュレーション年数
+            self.state.current_month = sim_month_index
+            if sim_month_index % 12 == 1:
+                report("月次", done)
 
             # ----------------------------------------------
-            # Phase 2: 月次フェーズ（1月〜12月）
+            # Phase 2: 月次フェーズ
             #   各月の家賃収入・費用・減価償却・借入返済を仕訳生成する。
-            #   追加設備はinv.yearとsim_yearが一致する月（1月）に取得処理。
+            #   追加設備は inv.year の1ヶ月目に capex イベントとして取得処理。
+            #   年次集計モードではシミュレーション年末・決算月の位置で
+            #   未記帳の月をまとめて記帳する。
             # ----------------------------------------------
-            for month in range(1, 13):
-                sim_month_index = (sim_year - 1) * 12 + month
-                self.state.current_month = sim_month_index
+            is_close = bool(calendar.is_year_end[sim_month_index - 1])
+            if annual:
+                if sim_month_index % 12 and not is_close:
+                    continue
+                monthly.generate_span(span_first, sim_month_index)
+                span_first = sim_month_index + 1
+                if overdraft:
+                    overdraft.apply_year(monthly.cash_flows)
+            else:
                 monthly.generate(sim_month_index)
+                if overdraft:
+                    overdraft.apply_month(calendar.date(sim_month_index))
 
             # ----------------------------------------------
-            # Phase 3: Exit フェーズ（Exit年のみ）
-            #   月次12月完了後・消費税精算前に実行する（仕様書9章）。
+            # Phase 3: Exit フェーズ（exit イベント = Exit年の最終月）
+            #   月次完了後・消費税精算前に実行する（仕様書9章）。
             #   固定資産売却仮勘定方式で売却益（損）を確定させる。
             # ----------------------------------------------
-            if sim_year == exit_year:
-                exit_eng = ExitEngine()
-                exit_eng.execute_exit(self.params, self.state, self.ledger)
+            for kind, _ in scheduler.pop_due(sim_month_index, queue="simulation"):
+                if kind == "exit":
+                    report("Exit", done)
+                    sell_date = calendar.month_end(sim_month_index)
+                    exit_eng = ExitEngine()
+                    exit_eng.execute_exit(self.params, self.state, self.ledger, sell_date)
+                    if overdraft:
+                        # 売却代金で借越を返済（売却日 = Exit 月の末日）
+                        overdraft.settle(sell_date)
+                    exited = True
+
+            # 物件単位の実行（ポートフォリオ）では Phase 4〜6 を事業体側で行う
+            if not is_close or not entity_phases:
+                continue
+
+            fiscal_year = int(calendar.fiscal_year[sim_month_index - 1])
+            close_date  = calendar.month_end(sim_month_index)
 
             # ----------------------------------------------
             # Phase 4: 消費税精算
             #   仮払消費税・仮受消費税を相殺し、
             #   差額を未払消費税（納税）または未収還付消費税（還付）へ振替。
-            #   ★ calendar_year を渡す（ledger.year列と一致させるため）
+            #   ★ 事業年度を渡す（ledger.year列と一致させるため）
             # ----------------------------------------------
-            year_end.generate_year_end(calendar_year)
+            report("消費税精算", done)
+            year_end.generate_year_end(fiscal_year, close_date)
 
             # ----------------------------------------------
             # Phase 5: 税計算
             #   税引前利益を計算し、欠損金繰越控除を適用後、
             #   所得税（法人税）と未払所得税（法人税）を計上する。
-            #   ★ calendar_year を渡す（ledger.year列と一致させるため）
+            #   ★ 事業年度を渡す（ledger.year列と一致させるため）
             # ----------------------------------------------
+            report("税計算", done)
             tax_engine.calculate_tax(
                 params=self.params,
                 state_manager=self.state,
                 ledger=self.ledger,
-                current_year=calendar_year,
+                current_year=fiscal_year,
+                close_date=close_date,
             )
 
             # ----------------------------------------------
-            # Phase 6: 最終精算（Exit年のみ・Tax Phase後）
+            # Phase 6: 最終精算（Exit後最初の決算・Tax Phase後）
             #   当座借越借入金・未払消費税・未払所得税（法人税）等を
             #   元入金へ振替し、BSを最終形（預金・元入金・繰越利益剰余金のみ）に整える。
             # ----------------------------------------------
-            if sim_year == exit_year and exit_eng is not None:
+            if exited:
+                report("最終精算", done)
                 exit_eng.post_final_settlement_entries(self.state, self.ledger)
+                exited = False
+
+        report("完了", total)
+
+    # --------------------------------------------------------
+    # 財務諸表の取得（キャッシュ対応）
+    # --------------------------------------------------------
+    def build_statements(self, cache=None) -> dict:
+        """
+        run() → FinancialStatementBuilder.build() の結果を返す。
+
+        cache : ResultCache（core/simulation/result_cache.py）。
+                ヒットした場合は run() を実行しないため、ledger は空のまま。
+                仕訳が必要な画面（全仕訳タブ等）では cache を渡さないこと。
+        """
+        from core.finance.fs_builder import FinancialStatementBuilder
+
+        # 開始日は self.start_date が正（params.start_date と異なる場合がある）
+        key_params = replace(self.params, start_date=self.start_date)
+        namespace  = "journal" if self.granularity == "monthly" else self.granularity
+        if cache is not None:
+            hit = cache.get(key_params, namespace=namespace)
+            if hit is not None:
+                return hit
+
+        self.run()
+        fs = FinancialStatementBuilder(self.ledger).build()
+
+        if cache is not None:
+            cache.put(key_params, fs, namespace=namespace)
+        return fs
 
 # ===============================
 # core/simulation/simulation.py end
@@ -0,0 +1,478 @@
+# ===============================
+# core/simulation/sweep.py
+# パラメータ空間のグリッドスイープ
+# ===============================
+#
+# 【責務】
+#   SimulationParams の複数項目（軸）を直積展開し、全組合せを並列実行して
+#   主要指標を N 次元の結果キューブ（軸ラベル付き numpy 配列）に格納する。
+#
+# 【軸の指定方法】
+#   axes = {
+#       "initial_loan.interest_rate": [0.015, 0.020, 0.025],   # ドット区切りの属性パス
+#       "ltv":                        [0.5, 0.6, 0.7],         # 派生軸（AXIS_SETTERS）
+#       "annual_rent_income_incl":    [3_000_000, 3_600_000],
+#       "exit_cap_rate":              [0.045, 0.050],
+#   }
+#   軸は記述順に適用される（ltv → 金利 の順序依存はない）。
+#
+# 【重複排除】
+#   展開後のパラメータを params_fingerprint() で同一判定し、
+#   同じ内容の組合せは1回だけ計算してキューブの該当セル全てに配る。
+#   例：ltv=0（借入なし）の行では金利軸の値が結果に影響しない。
+#
+# 【中断・再開】
+#   checkpoint_dir を指定すると、計算済みの組合せを partial.jsonl に逐次追記する。
+#   同じ checkpoint_dir で再実行すると計算済みの組合せをスキップする。
+#   各行に engine を記録し、engine の異なる行（と engine のない古い行）は再計算する
+#   （ResultCache が engine ごとに namespace を分けるのと同じ）。
+#   run(progress=...) でチャンク完了ごとに進捗を通知し、progress から
+#   SimulationCancelled（core/simulation/simulation.py）を送出すると中断する。
+#
+# 【計算エンジン】
+#   engine="kernel"  : core/engine/cashflow_kernel.py（デフォルト・高速）
+#   engine="journal" : Simulation.run() + FinancialStatementBuilder.build()
+#   engine="annual"  : 同上（granularity="annual"、年次集計仕訳）
+#
+# 【結果キャッシュ】
+#   cache=ResultCache(...) を渡すと、過去に計算済みのシナリオはディスクから読む。
+#
+# 【実行プール】
+#   executor を渡すとチャンクをそこへ投入する（Streamlit では常駐ワーカープール
+#   ui/worker_pool.py のセッション窓口）。省略時は run() ごとに ProcessPoolExecutor を起動する。
+#
+# ===============================
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from config.params import (
+    SimulationParams,
+    ScheduleParams,
+    params_fingerprint,
+)
+from core.finance.metrics import batch_metrics, total_acquisition_cost
+
+# 未設定（None）でも既定値から生成して軸を適用できる子パラメータ
+_DEFAULT_CHILDREN = {"schedule": ScheduleParams}
+
+
+# 結果キューブに格納する指標（並び順固定）
+SWEEP_METRICS = ["final_cash", "npv", "min_cash", "total_tax", "irr", "equity_multiple", "min_dscr"]
+
+
+# ============================================================
+# 軸の適用
+# ============================================================
+def _set_path(obj, path: str, value):
+    """ドット区切りの属性パスに値を設定したコピーを返す（元オブジェクトは不変）。"""
+    head, _, rest = path.partition(".")
+    if not hasattr(obj, head):
+        raise ValueError(f"未知のパラメータです: {path}")
+    if not rest:
+        return replace(obj, **{head: value})
+    child = getattr(obj, head)
+    if child is None and head in _DEFAULT_CHILDREN:
+        child = _DEFAULT_CHILDREN[head]()   # 例：schedule.vacancy_rate → 定額スケジュールから変更
+    if child is None:
+        # 例：ltv=0 で initial_loan が消えた後の金利軸 → 結果に影響しないので無視
+        return obj
+    return replace(obj, **{head: _set_path(child, rest, value)})
+
+
+def set_ltv(p: SimulationParams, ltv: float) -> SimulationParams:
+    """
+    LTV（借入額 ÷ 取得総額）を設定する。
+    元入金は UI と同じく「取得総額 − 借入額」で再計算する。
+    金利・期間・返済方式は元の initial_loan を引き継ぐ。
+    """
+    total  = total_acquisition_cost(p)
+    amount = total * float(ltv)
+    if amount <= 0:
+        return replace(p, initial_loan=None, initial_equity=total)
+    if p.initial_loan is None:
+        raise ValueError("ltv 軸を使うには基準パラメータに initial_loan が必要です。")
+    loan = replace(p.initial_loan, amount=amount)
+    return replace(p, initial_loan=loan, initial_equity=max(total - amount, 0.0))
+
+
+def set_exit_cap_rate(p: SimulationParams, cap_rate: float) -> SimulationParams:
+    """
+    売却時キャップレートから売却価格を設定する。
+        売却価格（総額）= 年間 NOI ÷ キャップレート
+        NOI = 年間家賃（税込）− 管理費 − 修繕費 − 保険料 − 固定資産税 − その他販管費
+    土地・建物への配分は取得価格の比率による。
+    """
+    if cap_rate <= 0:
+        raise ValueError("exit_cap_rate は正の値で指定してください。")
+    noi = (
+        p.annual_rent_income_incl
+        - p.annual_management_fee_initial
+        - p.repair_cost_annual
+        - p.insurance_cost_annual
+        - p.fixed_asset_tax_land
+        - p.fixed_asset_tax_building
+        - p.other_management_fee_annual
+    )
+    price = max(noi, 0.0) / float(cap_rate)
+    basis = p.property_price_land + p.property_price_building
+    land_share = (p.property_price_land / basis) if basis > 0 else 0.0
+    exit_params = replace(
+        p.exit_params,
+        land_exit_price=price * land_share,
+        building_exit_price=price * (1.0 - land_share),
+    )
+    return replace(p, exit_params=exit_params)
+
+
+def set_holding_years(p: SimulationParams, years: int) -> SimulationParams:
+    """保有年数と売却年を同時に設定する（UI と同じく holding_years = exit_year）。"""
+    years = int(years)
+    return replace(p, holding_years=years, exit_params=replace(p.exit_params, exit_year=years))
+
+
+# 派生軸（単一フィールドに対応しない軸）
+AXIS_SETTERS = {
+    "ltv":           set_ltv,
+    "exit_cap_rate": set_exit_cap_rate,
+    "holding_years": set_holding_years,
+}
+
+
+def apply_axes(base: SimulationParams, assignment: dict) -> SimulationParams:
+    """{軸名: 値} を記述順に適用したパラメータを返す。"""
+    p = base
+    for name, value in assignment.items():
+        setter = AXIS_SETTERS.get(name)
+        p = setter(p, value) if setter else _set_path(p, name, value)
+    return p
+
+
+# ============================================================
+# 指標計算
+# ============================================================
+def _metrics_row(fs: dict, batch: dict, r: int) -> dict:
+    """batch_metrics の r 行目 + 預金・税の集計"""
+    bs, pl = fs["bs"], fs["pl"]
+    cash = bs.loc["預金"].to_numpy(dtype=float) if bs.shape[1] else np.zeros(1)
+    return {
+        "final_cash":      float(batch["final_cash"][r]),
+        "npv":             float(batch["npv"][r]),
+        "min_cash":        float(cash.min()),
+        "total_tax":       float(pl.loc["所得税（法人税）"].sum()),
+        "irr":             float(batch["irr"][r]),
+        "equity_multiple": float(batch["equity_multiple"][r]),
+        "min_dscr":        float(batch["min_dscr"][r]),
+    }
+
+
+def scenario_metrics(fs: dict, params: SimulationParams) -> dict:
+    """
+    1シナリオの主要指標（core/finance/metrics.py）。
+        final_cash      : 最終年末の預金残高
+        npv             : ui/app.py の経済探偵レポートと同じ DCF（営業収支 + 売却純収入）
+        min_cash        : 各年末預金残高の最小値
+        total_tax       : 所得税（法人税）の総額
+        irr             : 上記 DCF の内部収益率（解なしは NaN）
+        equity_multiple : 期末預金 ÷ 元入金
+        min_dscr        : 年次 DSCR の最小値（借入なしは NaN）
+    """
+    return _metrics_row(fs, batch_metrics([fs], [params]), 0)
+
+
+def _build_statements(params: SimulationParams, engine: str) -> dict:
+    if engine == "kernel":
+        from core.engine.cashflow_kernel import CashFlowKernel
+        return CashFlowKernel(params).run()
+    if engine in ("journal", "annual"):
+        from core.simulation.simulation import Simulation
+        from core.finance.fs_builder import FinancialStatementBuilder
+        granularity = "monthly" if engine == "journal" else "annual"
+        sim = Simulation(params, params.start_date, granularity=granularity)
+        sim.run()
+        return FinancialStatementBuilder(sim.ledger).build()
+    raise ValueError(f"未知の engine です: {engine}")
+
+
+def evaluate_batch(params_list: list, engine: str = "kernel", cache=None) -> list:
+    """
+    複数シナリオの財務諸表と指標（"metrics" キー）を返す。
+    未計算分の指標は batch_metrics でまとめて（シナリオ × 年の2次元配列で）計算する。
+    """
+    results = [None] * len(params_list)
+    misses  = []
+    for r, params in enumerate(params_list):
+        if cache is not None:
+            hit = cache.get(params, namespace=engine)
+            if hit is not None and "metrics" in hit:
+                results[r] = hit
+                continue
+        results[r] = _build_statements(params, engine)
+        misses.append(r)
+
+    if misses:
+        batch = batch_metrics([results[r] for r in misses], [params_list[r] for r in misses])
+        for row, r in enumerate(misses):
+            results[r]["metrics"] = _metrics_row(results[r], batch, row)
+            if cache is not None:
+                cache.put(params_list[r], results[r], namespace=engine)
+    return results
+
+
+def evaluate_scenario(params: SimulationParams, engine: str = "kernel", cache=None) -> dict:
+    """
+    1シナリオの財務諸表と指標（"metrics" キー）を返す。
+    cache（ResultCache）を渡すと計算前に参照し、未計算なら結果を保存する。
+    """
+    return evaluate_batch([params], engine, cache)[0]
+
+
+def evaluate_params(params: SimulationParams, engine: str = "kernel", cache=None) -> dict:
+    """1シナリオを計算して指標 dict を返す。"""
+    return evaluate_scenario(params, engine, cache)["metrics"]
+
+
+def _evaluate_chunk(chunk: list, engine: str, cache=None) -> list:
+    """[(key, params), ...] → [(key, metrics), ...]（ワーカープロセスから呼ばれる）"""
+    results = evaluate_batch([p for _, p in chunk], engine, cache)
+    return [(key, fs["metrics"]) for (key, _), fs in zip(chunk, results)]
+
+
+# ============================================================
+# 結果キューブ
+# ============================================================
+class ResultCube:
+    """
+    軸ラベル付きの N 次元指標配列。
+
+    axes    : {軸名: ラベル配列}（記述順 = 配列の次元順）
+    metrics : {指標名: ndarray（shape = 各軸の長さ）}
+    """
+
+    def __init__(self, axes: dict, metrics: dict):
+        self.axes    = {k: np.asarray(v) for k, v in axes.items()}
+        self.metrics = metrics
+
+    @property
+    def shape(self) -> tuple:
+        return tuple(len(v) for v in self.axes.values())
+
+    def __getitem__(self, metric: str) -> np.ndarray:
+        return self.metrics[metric]
+
+    def _label_index(self, axis: str, label) -> int:
+        labels = self.axes[axis]
+        hits = np.flatnonzero(labels == label)
+        if len(hits) == 0:
+            raise KeyError(f"{axis} に {label!r} はありません。")
+        return int(hits[0])
+
+    def sel(self, **labels) -> "ResultCube":
+        """指定軸をラベルで固定した部分キューブを返す（固定した軸は消える）。"""
+        index, axes = [], {}
+        for name, values in self.axes.items():
+            if name in labels:
+                index.append(self._label_index(name, labels[name]))
+            else:
+                index.append(slice(None))
+                axes[name] = values
+        idx = tuple(index)
+        return ResultCube(axes, {k: v[idx] for k, v in self.metrics.items()})
+
+    def to_frame(self) -> pd.DataFrame:
+        """縦持ち DataFrame（1行 = 1組合せ）。"""
+        names = list(self.axes)
+        grids = np.meshgrid(*self.axes.values(), indexing="ij") if names else []
+        data = {n: g.ravel() for n, g in zip(names, grids)}
+        for k, v in self.metrics.items():
+            data[k] = v.ravel()
+        return pd.DataFrame(data)
+
+    def save(self, path: str) -> None:
+        arrays = {f"axis__{k}": v for k, v in self.axes.items()}
+        arrays.update({f"metric__{k}": v for k, v in self.metrics.items()})
+        arrays["__axis_order__"] = np.array(list(self.axes))
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "ResultCube":
+        with np.load(path, allow_pickle=False) as z:
+            order   = [str(x) for x in z["__axis_order__"]]
+            axes    = {k: z[f"axis__{k}"] for k in order}
+            metrics = {
+                k[len("metric__"):]: z[k] for k in z.files if k.startswith("metric__")
+            }
+        return cls(axes, metrics)
+
+
+# ============================================================
+# スイープ本体
+# ============================================================
+class GridSweep:
+    """
+    使い方：
+        sweep = GridSweep(base_params, axes, checkpoint_dir="out/sweep1")
+        cube  = sweep.run()
+        cube.sel(ltv=0.7)["npv"]
+    """
+
+    PARTIAL_FILE = "partial.jsonl"
+    CUBE_FILE    = "cube.npz"
+
+    def __init__(
+        self,
+        base: SimulationParams,
+        axes: dict,
+        engine: str = "kernel",
+        max_workers: int = None,
+        chunk_size: int = 64,
+        checkpoint_dir: str = None,
+        cache=None,
+        executor=None,
+    ):
+        if not axes:
+            raise ValueError("axes が空です。")
+        self.base           = base
+        self.axes           = {k: list(v) for k, v in axes.items()}
+        self.engine         = engine
+        self.max_workers    = max_workers
+        self.chunk_size     = max(1, int(chunk_size))
+        self.checkpoint_dir = checkpoint_dir
+        self.cache          = cache   # ResultCache（core/simulation/result_cache.py）
+        self.executor       = executor
+
+    # --------------------------------------------------------
+    # 展開・重複排除
+    # --------------------------------------------------------
+    def expand(self):
+        """
+        Returns
+        -------
+        cell_keys : ndarray[object]（shape = キューブ形状）各セルのフィンガープリント
+        unique    : {フィンガープリント: SimulationParams}
+        """
+        names  = list(self.axes)
+        shape  = tuple(len(self.axes[n]) for n in names)
+        cell_keys = np.empty(shape, dtype=object)
+        unique = {}
+        for index in product(*(range(n) for n in shape)):
+            assignment = {n: self.axes[n][i] for n, i in zip(names, index)}
+            p   = apply_axes(self.base, assignment)
+            key = params_fingerprint(p)
+            cell_keys[index] = key
+            unique.setdefault(key, p)
+        return cell_keys, unique
+
+    # --------------------------------------------------------
+    # チェックポイント
+    # --------------------------------------------------------
+    def _partial_path(self):
+        return os.path.join(self.checkpoint_dir, self.PARTIAL_FILE) if self.checkpoint_dir else None
+
+    def load_partial(self) -> dict:
+        """
+        計算済みの {フィンガープリント: 指標} を読み込む。
+        壊れた末尾行、engine が異なる行、現在の SWEEP_METRICS の指標が欠けている行は無視する。
+        """
+        path = self._partial_path()
+        done = {}
+        if not path or not os.path.exists(path):
+            return done
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except json.JSONDecodeError:
+                    continue   # 中断時の書きかけ行
+                if rec.get("engine") != self.engine:
+                    continue
+                # 指標が足りない行（SWEEP_METRICS 追加前の記録）は未計算として再計算する
+                if all(m in rec["metrics"] for m in SWEEP_METRICS):
+                    done[rec["key"]] = rec["metrics"]
+        return done
+
+    def _append_partial(self, f, results: list) -> None:
+        if f is None:
+            return
+        for key, metrics in results:
+            f.write(json.dumps({"key": key, "engine": self.engine, "metrics": metrics}) + "\n")
+        f.flush()
+
+    # --------------------------------------------------------
+    # 実行
+    # --------------------------------------------------------
+    def run(self, progress=None) -> ResultCube:
+        """
+        progress : progress("sweep", 計算済み組合せ数, 全組合せ数) をチャンク完了ごとに呼ぶ。
+                   SimulationCancelled を送出すると未着手のチャンクを取り消して中断する
+                   （計算済み分は partial.jsonl に残り、再実行で再開できる）。
+        """
+        cell_keys, unique = self.expand()
+        done = self.load_partial()
+        pending = [(k, p) for k, p in unique.items() if k not in done]
+        chunks  = [
+            pending[i:i + self.chunk_size] for i in range(0, len(pending), self.chunk_size)
+        ]
+
+        def report():
+            if progress is not None:
+                progress("sweep", sum(k in done for k in unique), len(unique))
+
+        report()
+
+        f = None
+        if self.checkpoint_dir:
+            os.makedirs(self.checkpoint_dir, exist_ok=True)
+            f = open(self._partial_path(), "a", encoding="utf-8")
+        try:
+            if self.executor is None and (self.max_workers == 1 or len(chunks) <= 1):
+                for chunk in chunks:
+                    results = _evaluate_chunk(chunk, self.engine, self.cache)
+                    done.update(results)
+                    self._append_partial(f, results)
+                    report()
+            else:
+                ex = self.executor or ProcessPoolExecutor(max_workers=self.max_workers)
+                futures = []
+                try:
+                    futures = [ex.submit(_evaluate_chunk, c, self.engine, self.cache) for c in chunks]
+                    for fut in as_completed(futures):
+                        results = fut.result()
+                        done.update(results)
+                        self._append_partial(f, results)
+                        report()
+                finally:
+                    # 中断・例外時は未着手のチャンクを取り消す。
+                    # 呼び出し元の executor（セッション窓口など）は止めず、このスイープの分だけ取り消す
+                    if self.executor is None:
+                        ex.shutdown(wait=True, cancel_futures=True)
+                    else:
+                        for fut in futures:
+                            fut.cancel()
+        finally:
+            if f is not None:
+                f.close()
+
+        metrics = {
+            m: np.vectorize(lambda k, m=m: done[k][m], otypes=[float])(cell_keys)
+            for m in SWEEP_METRICS
+        }
+        cube = ResultCube(self.axes, metrics)
+        if self.checkpoint_dir:
+            cube.save(os.path.join(self.checkpoint_dir, self.CUBE_FILE))
+        return cube
+
+
+def grid_sweep(base: SimulationParams, axes: dict, **kwargs) -> ResultCube:
+    """GridSweep(base, axes, **kwargs).run() の簡易エントリポイント。"""
+    return GridSweep(base, axes, **kwargs).run()
+
+# ===============================
+# core/simulation/sweep.py end
+# ===============================
@@ -28,6 +28,8 @@
 
 import math as _math
 
+import numpy as np
+
 
 def split_vat(
     gross_amount: float,
@@ -104,6 +106,39 @@ def split_vat(
         "vat_nondeductible": vat_nd,
     }
 
+
+def split_vat_array(
+    gross_amount,
+    vat_rate: float,
+    non_taxable_ratio: float,
+) -> dict:
+    """
+    split_vat() の配列版（端数処理は "round" のみ）。
+
+    月次スケジュールのように金額が月ごとに変わる場合に、
+    全月分を一括で分解する。各要素の結果は split_vat() と完全に一致する
+    （Python の round() と np.round はいずれも偶数丸め）。
+    gross_amount <= 0 の要素は全て 0。
+    """
+    gross = np.asarray(gross_amount, dtype=float)
+    positive = gross > 0
+
+    if vat_rate > 0:
+        vat_total_raw = gross - gross / (1.0 + vat_rate)
+    else:
+        vat_total_raw = np.zeros_like(gross)
+
+    vat_d    = np.round(vat_total_raw * (1.0 - non_taxable_ratio))
+    vat_nd   = np.round(vat_total_raw * non_taxable_ratio)
+    tax_base = np.round(gross - vat_d - vat_nd)
+
+    zero = np.zeros_like(gross)
+    return {
+        "tax_base":          np.where(positive, tax_base, zero),
+        "vat_deductible":    np.where(positive, vat_d,    zero),
+        "vat_nondeductible": np.where(positive, vat_nd,   zero),
+    }
+
 # ================================
 # core/tax/tax_splitter.py end
 # ================================
\ No newline at end of file
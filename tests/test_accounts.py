@@ -0,0 +1,98 @@
+# ============================================================
+# tests/test_accounts.py
+# 勘定科目表（core/ledger/accounts.py）のテスト
+# ============================================================
+#
+# 【検証項目】
+#   N-01 : 仕訳エンジンが計上する全科目が科目表に登録され、get_df() の科目コードと一致
+#   N-02 : 区分フラグ・正常残高が BS / PL の表示行・残高の符号と整合する
+#   N-03 : 科目表にない科目は UNKNOWN（フラグなし）となり、試算表では個別に引けない
+#
+# 【実行方法】
+#   python -m pytest tests/test_accounts.py -v
+#
+# ============================================================
+
+import sys
+import os
+from datetime import date
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from core.ledger import accounts
+from core.ledger.journal_entry import make_entry_pair
+from core.ledger.ledger import LedgerManager
+from core.finance.fs_builder import FinancialStatementBuilder
+from core.simulation.simulation import Simulation
+from test_cashflow_kernel import CASES
+
+
+@pytest.fixture(scope="module")
+def runs():
+    out = {}
+    for name in ("overdraft_repaid_at_exit", "vat_refund_corporate"):
+        params = CASES[name]()
+        sim = Simulation(params, params.start_date)
+        sim.run()
+        out[name] = (sim.ledger.get_df(), FinancialStatementBuilder(sim.ledger).build())
+    return out
+
+
+class TestChartOfAccounts:
+
+    def test_N01_all_posted_accounts_registered(self, runs):
+        for df, _ in runs.values():
+            assert set(df["account"]) <= set(accounts.CODE)
+            expected = [accounts.CODE[a] for a in df["account"]]
+            assert df["account_code"].tolist() == expected
+            assert (df["account_code"] != accounts.UNKNOWN).all()
+
+    def test_N02_classification(self, runs):
+        codes = np.arange(accounts.UNKNOWN)
+        bs = accounts.has_flag(codes, accounts.BS)
+        pl = accounts.has_flag(codes, accounts.PL)
+        assert (bs ^ pl).all()
+
+        for a in accounts.CHART:
+            assert a.code == accounts.CODE[a.name]
+            assert a.kind == ("BS" if a.flags & accounts.BS else "PL")
+            debit_side = a.flags & (accounts.ASSET | accounts.OPEX | accounts.INTEREST | accounts.INCOME_TAX)
+            assert a.normal == ("debit" if debit_side else "credit")
+
+        _, fs = runs["overdraft_repaid_at_exit"]
+        # 表示行はそれぞれの表に含まれ、仮勘定は表示しない
+        assert set(accounts.statement_lines(accounts.PL)) <= set(fs["pl"].index)
+        assert set(accounts.statement_lines(accounts.BS)) <= set(fs["bs"].index)
+        for a in accounts.accounts_with(accounts.SUSPENSE):
+            assert a.line is None
+            assert a.name not in fs["bs"].index
+        # 評価勘定は資産のマイナスとして表示
+        assert (fs["bs"].loc["建物減価償却累計額"] <= 1e-6).all()
+
+    def test_N03_unknown_account(self):
+        ledger = LedgerManager()
+        d = date(2025, 1, 1)
+        ledger.add_entries(make_entry_pair(d, "現金", "売上高", 100.0))
+        ledger.add_entries(make_entry_pair(d, "小口現金", "現金", 30.0))
+        df = ledger.get_df()
+
+        codes = df["account_code"].to_numpy()
+        assert codes.tolist() == [
+            accounts.UNKNOWN, accounts.CODE["売上高"], accounts.UNKNOWN, accounts.UNKNOWN,
+        ]
+        assert not accounts.has_flag(codes[[0, 2, 3]], ~0).any()
+        tb = ledger.trial_balance()
+        assert tb.balance("売上高") == pytest.approx(-100.0)
+        assert tb.debit[accounts.UNKNOWN] == pytest.approx(130.0)
+        with pytest.raises(KeyError):
+            tb.balance("現金")
+        # 科目名での残高は従来どおり
+        assert ledger.get_account_balance("現金") == pytest.approx(70.0)
+
+# ============================================================
+# tests/test_accounts.py end
+# ============================================================
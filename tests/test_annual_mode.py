@@ -0,0 +1,98 @@
+# ============================================================
+# tests/test_annual_mode.py
+# 年次集計モード（Simulation(granularity="annual")）のテスト
+# ============================================================
+#
+# 【検証項目】
+#   A-01 : PL / BS / CF が月次モードと1円以内で一致（期首1月・4月）
+#   A-02 : 月次フェーズの仕訳件数が月次モードの 1/12 以下。
+#          取得・Exit・決算の仕訳（1回あたり約30件の固定分）は両モードで同数のため、
+#          全仕訳の比は保有年数が短いほど小さい（3年で約 1/8、10年で約 1/10）。
+#          シミュレーション年が決算月をまたぐ場合は事業年度ごとに分けて記帳するため、
+#          比較は期首1月（シミュレーション年 = 事業年度）で行う
+#   A-03 : 未知の granularity は ValueError
+#   A-04 : sweep の engine="annual" が engine="journal" と同じ指標を返す
+#
+# 【実行方法】
+#   python -m pytest tests/test_annual_mode.py -v
+#
+# ============================================================
+
+import sys
+import os
+from datetime import date
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from core.finance.fs_builder import FinancialStatementBuilder
+from core.simulation.simulation import Simulation
+from core.simulation.sweep import evaluate_params
+from test_cashflow_kernel import CASES
+from test_integration_cases import make_params
+
+
+def build(params, start, granularity):
+    sim = Simulation(params, start, granularity=granularity)
+    sim.run()
+    return sim, FinancialStatementBuilder(sim.ledger).build()
+
+
+def count_postings(params, start, granularity):
+    """(月次フェーズの仕訳数, それ以外の仕訳数) を progress の区切りで数える"""
+    sim   = Simulation(params, start, granularity=granularity)
+    marks = []
+    sim.run(progress=lambda phase, done, total: marks.append((phase, len(sim.ledger.entries))))
+    marks.append((None, len(sim.ledger.entries)))
+    recurring = sum(b - a for (phase, a), (_, b) in zip(marks, marks[1:]) if phase == "月次")
+    return recurring, len(sim.ledger.entries) - recurring
+
+
+class TestAnnualMatchesMonthly:
+
+    @pytest.mark.parametrize("start", [date(2025, 1, 1), date(2025, 4, 1)])
+    @pytest.mark.parametrize("case", sorted(CASES))
+    def test_A01_statements_match(self, case, start):
+        params = CASES[case]()
+        _, monthly = build(params, start, "monthly")
+        _, annual  = build(params, start, "annual")
+
+        for key in ("pl", "bs", "cf"):
+            assert list(annual[key].index)   == list(monthly[key].index)
+            assert list(annual[key].columns) == list(monthly[key].columns)
+            diff = np.abs(annual[key].values.astype(float) - monthly[key].values.astype(float))
+            assert np.nanmax(diff) <= 1.0, key
+
+    @pytest.mark.parametrize("case", sorted(CASES))
+    def test_A02_fewer_postings(self, case):
+        # 期首1月（シミュレーション年 = 事業年度）で数える
+        params = CASES[case]()
+        start  = date(2025, 1, 1)
+        m_recurring, m_fixed = count_postings(params, start, "monthly")
+        a_recurring, a_fixed = count_postings(params, start, "annual")
+        # 月次フェーズ（家賃・費用・償却・返済・当座借越）の仕訳は 1/12 以下
+        assert a_recurring * 12 <= m_recurring
+        # 取得・Exit・決算の仕訳は粒度によらず同数
+        assert a_fixed == m_fixed
+
+    def test_A03_unknown_granularity(self):
+        params = make_params()
+        with pytest.raises(ValueError):
+            Simulation(params, params.start_date, granularity="weekly")
+
+
+class TestAnnualSweepEngine:
+
+    def test_A04_sweep_engine(self):
+        params = CASES["overdraft_repaid_at_exit"]()
+        journal = evaluate_params(params, engine="journal")
+        annual  = evaluate_params(params, engine="annual")
+        for k in journal:
+            assert annual[k] == pytest.approx(journal[k], abs=1.0)
+
+# ============================================================
+# tests/test_annual_mode.py end
+# ============================================================
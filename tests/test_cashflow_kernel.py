@@ -0,0 +1,107 @@
+# ============================================================
+# tests/test_cashflow_kernel.py
+# 高速カーネル（core/engine/cashflow_kernel.py）の同値性テスト
+# ============================================================
+#
+# 【検証項目】
+#   K-01 : 代表ケースで仕訳エンジンと PL/BS/CF が一致する（当座借越の利息・借入を含め円単位で完全一致）
+#   K-02 : 行ラベル・列ラベルが FinancialStatementBuilder と同一
+#   K-03 : 不一致を検出すると KernelEquivalenceError を送出する
+#
+# 【実行方法】
+#   python -m pytest tests/test_cashflow_kernel.py -v
+#
+# ============================================================
+
+import sys
+import os
+from dataclasses import replace
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config.params import LoanParams, AdditionalInvestmentParams, ScheduleParams
+from core.engine.cashflow_kernel import CashFlowKernel, KernelEquivalenceError
+from test_integration_cases import make_params
+
+
+CASES = {
+    "minimal": lambda: make_params(),
+    "loan_and_capex": lambda: make_params(
+        holding_years=6,
+        exit_year=6,
+        initial_loan=LoanParams(30_000_000, 0.025, 20, "annuity"),
+        additional_investments=[
+            AdditionalInvestmentParams(
+                year=2, amount=3_300_000, life=10,
+                loan_amount=1_000_000, loan_years=5, loan_interest_rate=0.02,
+            )
+        ],
+    ),
+    "vat_refund_corporate": lambda: make_params(
+        non_taxable_ratio=0.80,
+        entity_type="corporate",
+        initial_loan=LoanParams(60_000_000, 0.03, 10, "equal_principal"),
+    ),
+    "loss_carryforward": lambda: make_params(
+        holding_years=4, exit_year=4, annual_rent_incl=500_000,
+    ),
+    "hold_after_exit": lambda: make_params(
+        holding_years=5, exit_year=3, building_exit_price_incl=10_000_000,
+    ),
+    "overdraft_repaid_at_exit": lambda: make_params(
+        holding_years=5, exit_year=3, annual_rent_incl=600_000,
+        initial_loan=LoanParams(50_000_000, 0.03, 10, "annuity"),
+    ),
+    # Exit 時点で借越が残り、最終精算（Exit 後最初の決算）で元入金へ振り替えた後も保有を続ける
+    "overdraft_open_after_exit": lambda: make_params(
+        holding_years=5, exit_year=3,
+        initial_loan=LoanParams(60_000_000, 0.03, 20, "annuity"),
+    ),
+    # 借越残高 × 年利 ÷ 12 が .5 円の境界に乗る月がある（浮動小数点の累積誤差で丸めが割れないこと）
+    "overdraft_half_yen_interest": lambda: replace(
+        make_params(
+            holding_years=8, exit_year=8,
+            initial_loan=LoanParams(20_000_000, 0.01, 6, "annuity"),
+        ),
+        start_date=date(2025, 9, 1),
+    ),
+    "rent_and_cost_schedule": lambda: replace(
+        make_params(holding_years=6, exit_year=6, other_annual=36_000),
+        schedule=ScheduleParams(
+            rent_age_decline_rate=0.01, rent_age_decline_until=8,
+            vacancy_by_year=[0.15, 0.05], cost_indexation_rate=0.02,
+        ),
+    ),
+}
+
+
+class TestKernelEquivalence:
+    """K-01 / K-02"""
+
+    @pytest.mark.parametrize("case", sorted(CASES))
+    def test_matches_journal_engine(self, case):
+        params = CASES[case]()
+        kernel = CashFlowKernel(params)
+        result = kernel.run()
+        reference = kernel.verify_equivalence(result, tol=0.01)
+
+        for key in ("pl", "bs", "cf"):
+            assert list(result[key].index)   == list(reference[key].index)
+            assert list(result[key].columns) == list(reference[key].columns)
+        assert result["is_balanced"]
+
+
+class TestKernelMismatch:
+    """K-03"""
+
+    def test_mismatch_raises(self):
+        params = make_params()
+        kernel = CashFlowKernel(params)
+        result = kernel.run()
+        result["bs"].iloc[0, 0] += 10_000
+        with pytest.raises(KernelEquivalenceError):
+            kernel.verify_equivalence(result)
@@ -0,0 +1,120 @@
+# ============================================================
+# tests/test_compare.py
+# 複数シナリオ比較（core/simulation/compare.py）と
+# カーネルの共通プレフィックスキャッシュ（core/engine/cashflow_kernel.py）のテスト
+# ============================================================
+#
+# 【検証項目】
+#   CP-01 : キャッシュを共有して計算した結果は、変種ごとに単独で計算した結果と完全に一致する
+#           （保有年数の長短どちらの順でも）
+#   CP-02 : Exit 条件だけが異なる変種は1グループにまとまり、取得〜月次を1回だけ計算する
+#   CP-03 : 比較表は行・年を揃え、ない年は NaN、Δ 列 = 各シナリオ − 基準
+#   CP-04 : executor 経由（ワーカープール）でも順次計算と同じ結果になる
+#
+# 【実行方法】
+#   python -m pytest tests/test_compare.py -v
+#
+# ============================================================
+
+import sys
+import os
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config.params import LoanParams
+from core.engine.cashflow_kernel import CashFlowKernel, clear_prefix_cache, prefix_cache_info
+from core.simulation.compare import (
+    MAX_VARIANTS, compare_scenarios, diff_table, group_by_prefix, metrics_table,
+)
+from core.simulation.sweep import SWEEP_METRICS, set_holding_years
+from ui.worker_pool import WorkerPool
+from test_cashflow_kernel import CASES
+from test_integration_cases import make_params
+
+
+def variants():
+    base = make_params()
+    return {
+        "3年":     base,
+        "5年":     set_holding_years(base, 5),
+        "売却高め": replace(base, exit_params=replace(base.exit_params, land_exit_price=40_000_000.0)),
+        "借入あり": replace(base, initial_loan=LoanParams(30_000_000, 0.02, 25, "annuity")),
+    }
+
+
+class TestCompare:
+
+    @pytest.mark.parametrize("case", ["loan_and_capex", "overdraft_repaid_at_exit", "rent_and_cost_schedule"])
+    def test_CP01_shared_prefix_is_exact(self, case):
+        base  = CASES[case]()
+        years = [2, 4, 6]
+        fresh = []
+        for h in years:
+            clear_prefix_cache()
+            fresh.append(CashFlowKernel(set_holding_years(base, h)).run())
+
+        for order in (years, years[::-1]):
+            clear_prefix_cache()
+            for h in order:
+                fs = CashFlowKernel(set_holding_years(base, h)).run()
+                for k in ("pl", "bs", "cf"):
+                    pd.testing.assert_frame_equal(fs[k], fresh[years.index(h)][k])
+        assert prefix_cache_info()["misses"] == 1
+
+    def test_CP02_grouping(self):
+        groups = group_by_prefix(variants())
+        assert sorted(len(g) for g in groups) == [1, 3]
+        shared = next(g for g in groups if len(g) == 3)
+        assert [name for name, _ in shared][0] == "5年"   # 保有年数の長い順
+
+        clear_prefix_cache()
+        compare_scenarios(variants())
+        info = prefix_cache_info()
+        assert (info["misses"], info["hits"]) == (2, 2)
+
+        with pytest.raises(ValueError):
+            compare_scenarios({})
+        with pytest.raises(ValueError):
+            compare_scenarios({f"v{i}": make_params() for i in range(MAX_VARIANTS + 1)})
+
+    def test_CP03_diff_table(self):
+        results = compare_scenarios(variants())
+        assert list(results) == list(variants())
+
+        table = diff_table(results, "bs", base="3年")
+        assert list(table.columns) == ["3年", "5年", "売却高め", "借入あり", "Δ 5年", "Δ 売却高め", "Δ 借入あり"]
+        years = table.index.get_level_values("年").unique().tolist()
+        assert years == list(results["5年"]["bs"].columns)
+
+        cash = table.loc["預金"]
+        np.testing.assert_array_equal(cash["5年"].to_numpy(), results["5年"]["bs"].loc["預金"].to_numpy(dtype=float))
+        assert cash["3年"].isna().sum() == 2
+        np.testing.assert_allclose(cash["Δ 借入あり"], cash["借入あり"] - cash["3年"])
+
+        metrics = metrics_table(results, base="売却高め")
+        assert list(metrics.index) == list(SWEEP_METRICS)
+        assert metrics.loc["final_cash", "Δ 3年"] == pytest.approx(
+            results["3年"]["metrics"]["final_cash"] - results["売却高め"]["metrics"]["final_cash"])
+        with pytest.raises(KeyError):
+            metrics_table(results, base="なし")
+
+    def test_CP04_executor(self):
+        serial = compare_scenarios(variants())
+        pool = WorkerPool(max_workers=1)
+        try:
+            pooled = compare_scenarios(variants(), executor=pool.executor("s"))
+        finally:
+            pool.shutdown()
+        for name in serial:
+            for k in ("pl", "bs", "cf"):
+                pd.testing.assert_frame_equal(pooled[name][k], serial[name][k])
+
+# ============================================================
+# tests/test_compare.py end
+# ============================================================
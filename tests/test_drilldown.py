@@ -0,0 +1,99 @@
+# ============================================================
+# tests/test_drilldown.py
+# 財務諸表ドリルダウン（core/finance/drilldown.py）のテスト
+# ============================================================
+#
+# 【検証項目】
+#   X-01 : 全セルで、構成仕訳の符号付き合計が財務諸表の値と一致する（決算月 3 を含む）
+#   X-02 : 科目行は該当する年・科目・貸借の仕訳だけを、摘要で区別する行は該当摘要の仕訳だけを返す
+#   X-03 : BS の行は年末までの累計、集計行は構成行の仕訳の和
+#
+# 【実行方法】
+#   python -m pytest tests/test_drilldown.py -v
+#
+# ============================================================
+
+import sys
+import os
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from core.engine.overdraft_engine import OD_REPAY_DESC
+from core.finance.fs_builder import FinancialStatementBuilder
+from core.simulation.simulation import Simulation
+from test_cashflow_kernel import CASES
+
+
+def build(params):
+    sim = Simulation(params, params.start_date)
+    sim.run()
+    builder = FinancialStatementBuilder(sim.ledger)
+    fs = builder.build()
+    return sim.ledger.get_df(), fs, builder.drilldown()
+
+
+@pytest.fixture(scope="module")
+def overdraft():
+    return build(CASES["overdraft_repaid_at_exit"]())
+
+
+class TestDrillDown:
+
+    @pytest.mark.parametrize("fye", [12, 3])
+    @pytest.mark.parametrize("case", ["loan_and_capex", "overdraft_repaid_at_exit", "hold_after_exit"])
+    def test_X01_cells_reconcile(self, case, fye):
+        _, fs, drill = build(replace(CASES[case](), fiscal_year_end_month=fye))
+        for key in ("pl", "bs", "cf"):
+            assert drill.rows(key) == list(fs[key].index)
+            for row in fs[key].index:
+                for col in fs[key].columns:
+                    assert drill.value(key, row, col) == pytest.approx(fs[key].loc[row, col], abs=1e-3), (key, row, col)
+
+    def test_X02_account_and_description_rows(self, overdraft):
+        df, fs, drill = overdraft
+        y = drill.years[1]
+
+        rows = drill.drill("pl", "管理費", y)
+        assert len(rows) > 0
+        assert (rows["account"] == "管理費").all() and (rows["dr_cr"] == "debit").all()
+        assert (rows["year"] == y).all() and (rows["sign"] == 1.0).all()
+        expected = df[(df["account"] == "管理費") & (df["dr_cr"] == "debit") & (df["year"] == y)]
+        assert drill.entry_ids("pl", "管理費", y).tolist() == sorted(expected["id"].tolist())
+
+        # 摘要で区別する行：当座借越の返済仕訳だけ（最終精算の振替は含まない）
+        repay_years = [v for v in drill.years if fs["cf"].loc["当座借越返済", f"Year {v}"] > 0]
+        assert repay_years
+        rows = drill.drill("cf", "当座借越返済", repay_years[0])
+        assert (rows["description"] == OD_REPAY_DESC).all()
+        assert (rows["account"] == "当座借越借入金").all()
+
+        # "Year XXXX" の列名でも引ける
+        assert drill.value("pl", "管理費", f"Year {y}") == drill.value("pl", "管理費", y)
+
+    def test_X03_cumulative_and_totals(self, overdraft):
+        df, fs, drill = overdraft
+        last = drill.years[-1]
+
+        rows = drill.drill("bs", "預金", last)
+        cash = df[df["account"] == "預金"]
+        assert len(rows) == len(cash)
+        assert set(rows["sign"]) <= {1.0, -1.0}
+
+        # 集計行の構成仕訳 = 構成行の構成仕訳の和集合
+        parts = set()
+        for row in ("長期借入金返済", "追加設備投資借入金返済", "当座借越返済"):
+            parts |= set(drill.entry_ids("cf", row, last).tolist())
+        assert set(drill.entry_ids("cf", "借入金返済計", last).tolist()) == parts
+
+        # 見出し行は構成仕訳を持たない
+        assert len(drill.drill("cf", "【営業収支】", last)) == 0
+        assert np.isclose(drill.value("cf", "【資金収支尻】", last), fs["cf"].loc["【資金収支尻】", f"Year {last}"])
+
+# ============================================================
+# tests/test_drilldown.py end
+# ============================================================
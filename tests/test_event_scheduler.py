@@ -0,0 +1,142 @@
+# ============================================================
+# tests/test_event_scheduler.py
+# イベントスケジューラ（core/simulation/event_scheduler.py）と
+# イベント駆動の月次仕訳生成のテスト
+# ============================================================
+#
+# 【検証項目】
+#   E-01 : 同じ月は登録順、月の早い順に取り出される（キューは独立）
+#   E-02 : 償却・返済の終了したユニットは以後の月で参照されない
+#   E-03 : 月次の減価償却費が全ユニット走査（is_active）の合計と一致（期首4月・追加設備多数）
+#   E-04 : 追加設備多数のケースでカーネルと仕訳エンジンの結果が一致
+#
+# 【実行方法】
+#   python -m pytest tests/test_event_scheduler.py -v
+#
+# ============================================================
+
+import sys
+import os
+from datetime import date
+from dataclasses import replace
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config.params import LoanParams, AdditionalInvestmentParams
+from core.bookkeeping.initial_entries import InitialEntryGenerator
+from core.bookkeeping.monthly_entries import MonthlyEntryGenerator
+from core.depreciation.unit import DepreciationUnit
+from core.engine.cashflow_kernel import CashFlowKernel
+from core.engine.loan_engine import LoanUnit
+from core.simulation.event_scheduler import EventScheduler
+from core.simulation.simulation import Simulation
+from test_integration_cases import make_params
+
+
+def many_capex_params(**kw):
+    # 毎年の追加設備（短い耐用年数・短期借入）で開始・終了イベントが多数発生するケース
+    return make_params(
+        holding_years=8,
+        exit_year=8,
+        initial_loan=LoanParams(30_000_000, 0.02, 3, "annuity"),
+        additional_investments=[
+            AdditionalInvestmentParams(
+                year=y, amount=1_100_000 * y, life=2,
+                loan_amount=500_000, loan_years=1, loan_interest_rate=0.03,
+            )
+            for y in range(1, 9)
+        ],
+        **kw,
+    )
+
+
+class TestEventScheduler:
+
+    def test_E01_order(self):
+        s = EventScheduler()
+        s.schedule(3, "b")
+        s.schedule(1, "a")
+        s.schedule(3, "c")
+        s.schedule(2, "x", queue="simulation")
+
+        assert [k for k, _ in s.pop_due(2)] == ["a"]
+        assert s.next_month() == 3
+
+        popped = []
+        for kind, _ in s.pop_due(3):
+            popped.append(kind)
+            if kind == "b":
+                s.schedule(3, "d")   # 取り出し中に同月へ追加
+        assert popped == ["b", "c", "d"]
+        assert len(s) == 1
+        assert [k for k, _ in s.pop_due(12, queue="simulation")] == ["x"]
+
+
+class TestEventDrivenMonthly:
+
+    def _generator(self, params):
+        sim = Simulation(params, params.start_date)
+        InitialEntryGenerator(params, sim.ledger).generate(params.start_date)
+        monthly = MonthlyEntryGenerator(params, sim.ledger, sim.map_sim_to_calendar)
+        return sim, monthly
+
+    def test_E02_expired_units_not_touched(self, monkeypatch):
+        params = many_capex_params()
+        sim, monthly = self._generator(params)
+
+        calls = {"dep": 0, "loan": 0}
+        dep_is_active, loan_is_active = DepreciationUnit.is_active, LoanUnit.is_active
+
+        def count_dep(self, *a):
+            calls["dep"] += 1
+            return dep_is_active(self, *a)
+
+        def count_loan(self, *a):
+            calls["loan"] += 1
+            return loan_is_active(self, *a)
+
+        monkeypatch.setattr(DepreciationUnit, "is_active", count_dep)
+        monkeypatch.setattr(LoanUnit, "is_active", count_loan)
+
+        for idx in range(1, params.holding_years * 12 + 1):
+            monthly.generate(idx)
+
+        # 償却期間は事前判定するため月次で is_active は呼ばれない
+        assert calls["dep"] == 0
+        # 借入は稼働中のもののみ（初期ローン36ヶ月 + 追加設備ローン12ヶ月 × 8件）
+        assert calls["loan"] == 36 + 12 * 8
+        # 最終年の追加設備のみ稼働中（建物は耐用年数内）
+        assert len(monthly._live_dep) == 3   # 建物・7年目・8年目の追加設備
+        assert len(monthly._live_loan) == 1  # 8年目の追加設備ローン（保有期間末で完済）
+
+    @pytest.mark.parametrize("start", [date(2025, 1, 1), date(2025, 4, 1)])
+    def test_E03_depreciation_matches_polling(self, start):
+        params = replace(many_capex_params(), start_date=start)
+        sim = Simulation(params, start)
+        sim.run()
+
+        df = sim.ledger.get_df()
+        dep = df[df["account"].isin(["建物減価償却費", "追加設備減価償却費"]) & (df["dr_cr"] == "debit")]
+        for idx in range(1, params.holding_years * 12 + 1):
+            d = sim.map_sim_to_calendar(idx)
+            expected = sum(
+                u.get_monthly_depreciation(d.year, d.month)
+                for u in sim.ledger.depreciation_units
+            )
+            actual = dep[(dep["year"] == d.year) & (dep["month"] == d.month)]["amount"].sum()
+            assert actual == pytest.approx(expected, abs=1e-6)
+
+        # 借入はすべて完済
+        assert all(l.get_remaining_balance() == 0 for l in sim.ledger.loan_units)
+
+    def test_E04_kernel_equivalence(self):
+        params = many_capex_params()
+        kernel = CashFlowKernel(params)
+        kernel.verify_equivalence(kernel.run())
+
+# ============================================================
+# tests/test_event_scheduler.py end
+# ============================================================
@@ -0,0 +1,118 @@
+# ============================================================
+# tests/test_integrity.py
+# 台帳の整合性チェック（core/ledger/integrity.py）のテスト
+# ============================================================
+#
+# 【検証項目】
+#   Y-01 : 通常のシミュレーション結果は full / sampled とも問題なし。
+#          貸借不一致の仕訳を作っても標準出力に警告を出さない
+#   Y-02 : 貸借不一致・負の金額・科目表外の科目・日付単位の不一致・年度単位の不一致を検出する
+#   Y-03 : Simulation(integrity=...) はフェーズの区切りごとに全仕訳を1回ずつ検査し、
+#          "off" では検査しない。集計シンクでは年度単位の検査のみ行う
+#
+# 【実行方法】
+#   python -m pytest tests/test_integrity.py -v
+#
+# ============================================================
+
+import sys
+import os
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from core.ledger.integrity import check_ledger
+from core.ledger.journal_entry import JournalEntry
+from core.ledger.journal_sink import AggregatingJournalSink
+from core.ledger.ledger import LedgerManager
+from core.simulation.simulation import Simulation
+from test_cashflow_kernel import CASES
+
+
+def entry(d, dr, dr_amount, cr, cr_amount, description="テスト"):
+    return JournalEntry(d, description, dr, dr_amount, cr, cr_amount)
+
+
+class TestIntegrity:
+
+    @pytest.mark.parametrize("case", ["loan_and_capex", "overdraft_repaid_at_exit", "hold_after_exit"])
+    def test_Y01_clean_ledger(self, case, capsys):
+        p = CASES[case]()
+        sim = Simulation(p, p.start_date)
+        sim.run()
+
+        full = sim.ledger.check_integrity("full")
+        assert full.ok, full.issues
+        assert full.n_checked == full.n_entries == len(sim.ledger.entries)
+
+        sampled = sim.ledger.check_integrity("sampled", sample_rate=0.2)
+        assert sampled.ok
+        assert 0 < sampled.n_checked < sampled.n_entries
+
+        entry(date(2025, 1, 1), "預金", 100.0, "売上高", 90.0)
+        assert capsys.readouterr().out == ""
+
+    def test_Y02_detects_faults(self):
+        ledger = LedgerManager()
+        ledger.add_entries([
+            entry(date(2025, 1, 1), "預金", 1000.0, "元入金", 1000.0),
+            entry(date(2025, 2, 1), "預金", 1000.0, "売上高", 900.0, "不一致"),
+            entry(date(2025, 3, 1), "管理費", -50.0, "預金", -50.0, "負の金額"),
+            entry(date(2025, 4, 1), "雑費用", 10.0, "預金", 10.0, "科目表外"),
+            # 1件ずつは許容誤差内だが、日付単位では不一致
+            entry(date(2025, 5, 1), "預金", 100.8, "売上高", 100.0),
+            entry(date(2025, 5, 1), "預金", 100.8, "売上高", 100.0),
+        ])
+        report = ledger.check_integrity("full")
+        issues = report.issues
+        assert not report.ok
+
+        bad = issues[issues["check"] == "entry_balance"]
+        assert bad["description"].tolist() == ["不一致"]
+        assert bad["position"].tolist() == [1] and bad["amount"].tolist() == [100.0]
+
+        assert issues[issues["check"] == "negative_amount"]["account"].tolist() == ["管理費", "預金"]
+        assert issues[issues["check"] == "unknown_account"]["account"].tolist() == ["雑費用"]
+
+        by_date = issues[issues["check"] == "date_balance"]
+        assert by_date["date"].tolist() == [date(2025, 2, 1), date(2025, 5, 1)]
+        assert by_date["amount"].iloc[1] == pytest.approx(1.6)
+
+        period = issues[issues["check"] == "period_balance"]
+        assert period["date"].tolist() == [2025]
+        assert period["amount"].iloc[0] == pytest.approx(101.6)
+
+        # 増分検査：start 以降の仕訳だけ
+        tail = ledger.check_integrity("full", start=4)
+        assert tail.n_entries == 2
+        assert set(tail.counts()) == {"date_balance", "period_balance"}
+
+        with pytest.raises(ValueError):
+            check_ledger(ledger, "partial")
+
+    def test_Y03_simulation_phases(self):
+        p = CASES["loan_and_capex"]()
+        sim = Simulation(p, p.start_date, integrity="full")
+        sim.run()
+        phases = [phase for phase, _ in sim.integrity_reports]
+        assert phases[0] == "取得" and phases[-1] == "完了"
+        assert sum(r.n_entries for _, r in sim.integrity_reports) == len(sim.ledger.entries)
+        assert all(r.ok for _, r in sim.integrity_reports)
+
+        off = Simulation(p, p.start_date)
+        off.run()
+        assert off.integrity_reports == []
+        with pytest.raises(ValueError):
+            Simulation(p, p.start_date, integrity="always")
+
+        agg = Simulation(p, p.start_date, journal_sink=AggregatingJournalSink())
+        agg.run()
+        report = agg.ledger.check_integrity("full")
+        assert report.ok and report.n_entries == 0
+
+# ============================================================
+# tests/test_integrity.py end
+# ============================================================
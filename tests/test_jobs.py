@@ -0,0 +1,124 @@
+# ============================================================
+# tests/test_jobs.py
+# バックグラウンドジョブ（ui/jobs.py）と進捗通知・中断のテスト
+# ============================================================
+#
+# 【検証項目】
+#   J-01 : Simulation.run の進捗がフェーズ順に通知され、結果が Job に入る
+#   J-02 : cancel() で実行中のシミュレーションが中断される
+#   J-03 : ジョブ内の例外は FAILED として Job.error に保持される
+#   J-04 : GridSweep.run の進捗通知と中断（計算済み分は partial に残る）
+#
+# 【実行方法】
+#   python -m pytest tests/test_jobs.py -v
+#
+# ============================================================
+
+import sys
+import os
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from core.simulation.simulation import Simulation, SimulationCancelled
+from core.simulation.sweep import GridSweep
+from ui.jobs import JobRunner, DONE, CANCELLED, FAILED
+from test_integration_cases import make_params
+
+
+def simulate(params, progress):
+    sim = Simulation(params, params.start_date)
+    sim.run(progress=progress)
+    return sim.ledger.cash_balance
+
+
+class TestJobs:
+
+    def setup_method(self):
+        self.runner = JobRunner(max_workers=1)
+
+    def teardown_method(self):
+        self.runner.shutdown()
+
+    def test_J01_progress_and_result(self):
+        params = make_params(holding_years=3, exit_year=3)
+        phases = []
+
+        def recording(p, progress):
+            def cb(phase, done, total):
+                phases.append((phase, done, total))
+                progress(phase, done, total)
+            return simulate(p, cb)
+
+        job = self.runner.submit(recording, params)
+        assert job.wait(60)
+        assert job.status == DONE
+        assert job.fraction == 1.0
+        assert job.result == pytest.approx(Simulation(params, params.start_date).build_statements()["bs"].loc["預金"].iloc[-1])
+
+        names = [ph for ph, _, _ in phases]
+        assert names[0] == "取得" and names[-1] == "完了"
+        assert names.index("Exit") < names.index("最終精算")
+        assert [d for _, d, _ in phases] == sorted(d for _, d, _ in phases)
+        assert all(t == 3 for _, _, t in phases)
+
+    def test_J02_cancel(self):
+        params  = make_params(holding_years=30, exit_year=30)
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocking(p, progress):
+            def cb(phase, done, total):
+                progress(phase, done, total)
+                if done == 1:
+                    started.set()
+                    release.wait(10)
+            return simulate(p, cb)
+
+        job = self.runner.submit(blocking, params)
+        assert started.wait(30)
+        job.cancel()
+        release.set()
+        assert job.wait(30)
+        assert job.status == CANCELLED
+        assert job.result is None
+        assert job.done < 30
+
+    def test_J03_failure(self):
+        def broken(progress):
+            progress("x", 0, 1)
+            raise RuntimeError("boom")
+
+        job = self.runner.submit(broken)
+        assert job.wait(10)
+        assert job.status == FAILED
+        assert "boom" in str(job.error)
+
+
+class TestSweepProgress:
+
+    def test_J04_sweep_progress_and_cancel(self, tmp_path):
+        axes = {"annual_rent_income_incl": [2_400_000, 2_600_000, 2_800_000, 3_000_000]}
+        seen = []
+
+        def cancel_after_two(phase, done, total):
+            seen.append((done, total))
+            if done >= 2:
+                raise SimulationCancelled()
+
+        sweep = GridSweep(make_params(), axes, max_workers=1, chunk_size=1, checkpoint_dir=str(tmp_path))
+        with pytest.raises(SimulationCancelled):
+            sweep.run(progress=cancel_after_two)
+        assert seen == [(0, 4), (1, 4), (2, 4)]
+        assert len(sweep.load_partial()) == 2
+
+        seen.clear()
+        sweep.run(progress=lambda ph, d, t: seen.append((d, t)))
+        assert seen[0] == (2, 4) and seen[-1] == (4, 4)
+
+# ============================================================
+# tests/test_jobs.py end
+# ============================================================
@@ -0,0 +1,83 @@
+# ============================================================
+# tests/test_journal_archive.py
+# 固定長バイナリの仕訳アーカイブ（core/ledger/journal_archive.py）のテスト
+# ============================================================
+#
+# 【検証項目】
+#   V-01 : 書き出したアーカイブを memmap で読み、事業年度 × 貸借 × 科目の合計が
+#          試算表と円単位の丸め差の範囲で一致する（決算月 3 を含む）
+#   V-02 : 複数実行の合計を積み重ねると各実行の合計と一致し、形式の異なるファイルは拒否する
+#
+# 【実行方法】
+#   python -m pytest tests/test_journal_archive.py -v
+#
+# ============================================================
+
+import sys
+import os
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from core.ledger.journal_archive import (
+    HEADER_SIZE, RECORD_DTYPE, JournalArchive, stack_year_account_totals,
+)
+from core.simulation.simulation import Simulation
+from test_cashflow_kernel import CASES
+
+
+def run(params):
+    sim = Simulation(params, params.start_date)
+    sim.run()
+    return sim.ledger
+
+
+class TestJournalArchive:
+
+    @pytest.mark.parametrize("fye", [12, 3])
+    def test_V01_matches_trial_balance(self, tmp_path, fye):
+        ledger = run(replace(CASES["loan_and_capex"](), fiscal_year_end_month=fye))
+        path   = str(tmp_path / "run.bkwj")
+        n      = ledger.write_archive(path)
+        assert n == 2 * len(ledger.entries)
+        assert os.path.getsize(path) == HEADER_SIZE + n * RECORD_DTYPE.itemsize
+
+        arc = JournalArchive(path)
+        assert isinstance(arc.records, np.memmap)
+        assert arc.fiscal_year_end_month == fye
+
+        years, totals = arc.year_account_totals()
+        assert years.tolist() == ledger.years
+        tol = 0.5 * n
+        for k, y in enumerate(years):
+            tb = ledger.trial_balance(int(y))
+            np.testing.assert_allclose(totals[k, 0], tb.debit,  atol=tol)
+            np.testing.assert_allclose(totals[k, 1], tb.credit, atol=tol)
+            # 貸借は年ごとに一致（丸め差の範囲）
+            assert abs(totals[k, 0].sum() - totals[k, 1].sum()) <= tol
+
+    def test_V02_stack_runs(self, tmp_path):
+        paths = []
+        for name in ("loan_and_capex", "overdraft_repaid_at_exit"):
+            path = str(tmp_path / f"{name}.bkwj")
+            run(CASES[name]()).write_archive(path)
+            paths.append(path)
+
+        years, stacked = stack_year_account_totals(paths)
+        assert stacked.shape[:2] == (2, len(years))
+        for k, path in enumerate(paths):
+            _, totals = JournalArchive(path).year_account_totals(years)
+            np.testing.assert_array_equal(stacked[k], totals)
+
+        bad = tmp_path / "bad.bkwj"
+        bad.write_bytes(b"not an archive" * 4)
+        with pytest.raises(ValueError):
+            JournalArchive(str(bad))
+
+# ============================================================
+# tests/test_journal_archive.py end
+# ============================================================
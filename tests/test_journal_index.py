@@ -0,0 +1,109 @@
+# ============================================================
+# tests/test_journal_index.py
+# 仕訳検索インデックス（core/ledger/journal_index.py）のテスト
+# ============================================================
+#
+# 【検証項目】
+#   I-01 : 科目・年・金額・摘要・貸借の絞り込みが DataFrame のフィルタと一致
+#   I-02 : ページ切り出しは指定ページの行だけを返し、全ページで該当行を網羅する
+#   I-03 : 50年保有・追加設備ローン多数でも絞り込み結果が正しい
+#
+# 【実行方法】
+#   python -m pytest tests/test_journal_index.py -v
+#
+# ============================================================
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config.params import LoanParams, AdditionalInvestmentParams
+from core.ledger.journal_index import JournalIndex
+from core.engine.overdraft_engine import OD_DRAW_DESC
+from core.simulation.simulation import Simulation
+from test_integration_cases import make_params
+
+
+def ledger_df(params):
+    sim = Simulation(params, params.start_date)
+    sim.run()
+    return sim.ledger.get_df().sort_values(["date", "id"]).reset_index(drop=True)
+
+
+@pytest.fixture(scope="module")
+def small():
+    params = make_params(
+        holding_years=5, exit_year=5, annual_rent_incl=600_000,
+        initial_loan=LoanParams(50_000_000, 0.03, 10, "annuity"),
+    )
+    df = ledger_df(params)
+    return df, JournalIndex(df)
+
+
+class TestJournalIndex:
+
+    def test_I01_filters_match_dataframe(self, small):
+        df, index = small
+        cases = [
+            ({"accounts": ["預金", "長期借入金"]}, df["account"].isin(["預金", "長期借入金"])),
+            ({"years": (2026, 2027)}, df["year"].between(2026, 2027)),
+            ({"amount_min": 100_000, "amount_max": 1_000_000}, df["amount"].between(100_000, 1_000_000)),
+            ({"descriptions": [OD_DRAW_DESC]}, df["description"] == OD_DRAW_DESC),
+            ({"accounts": ["預金"], "years": (2025, 2025), "dr_cr": "credit"},
+             (df["account"] == "預金") & (df["year"] == 2025) & (df["dr_cr"] == "credit")),
+            ({"accounts": ["存在しない科目"]}, pd.Series(False, index=df.index)),
+        ]
+        for kwargs, mask in cases:
+            pos = index.query(**kwargs)
+            pd.testing.assert_frame_equal(index.df.iloc[pos], df[mask.to_numpy()], check_like=False)
+
+    def test_I02_pages(self, small):
+        df, index = small
+        pos = index.query(accounts=["預金"])
+        size = 37
+        n = JournalIndex.n_pages(len(pos), size)
+        pages = [index.page(pos, p, size) for p in range(1, n + 1)]
+        assert all(len(p) == size for p in pages[:-1])
+        assert 0 < len(pages[-1]) <= size
+        pd.testing.assert_frame_equal(pd.concat(pages), index.df.iloc[pos])
+        assert len(index.page(pos, n + 1, size)) == 0
+
+
+class TestLargeJournal:
+
+    def test_I03_long_hold_many_loans(self):
+        params = make_params(
+            holding_years=50, exit_year=50,
+            initial_loan=LoanParams(50_000_000, 0.02, 35, "annuity"),
+            additional_investments=[
+                AdditionalInvestmentParams(
+                    year=y, amount=2_200_000, life=15,
+                    loan_amount=1_000_000, loan_years=10, loan_interest_rate=0.025,
+                )
+                for y in range(2, 50, 2)
+            ],
+        )
+        df = ledger_df(params)
+        index = JournalIndex(df)
+        assert len(index) > 30_000
+
+        pos = index.query(accounts=["追加設備借入利息"], years=(2040, 2049), amount_min=1_000)
+        mask = (
+            (df["account"] == "追加設備借入利息")
+            & df["year"].between(2040, 2049)
+            & (df["amount"] >= 1_000)
+        )
+        assert len(pos) == int(mask.sum()) > 0
+        page = index.page(pos, 2, 100)
+        assert len(page) == min(100, max(0, len(pos) - 100))
+        assert np.all(page["account"] == "追加設備借入利息")
+
+# ============================================================
+# tests/test_journal_index.py end
+# ============================================================
@@ -0,0 +1,234 @@
+# ============================================================
+# tests/test_journal_sink.py
+# ユニットテスト：仕訳保存先シンク（core/ledger/journal_sink.py）
+# ============================================================
+#
+# 【検証項目】
+#   S-01 : MemoryJournalSink は従来どおり ledger.entries を保持する
+#   S-02 : AggregatingJournalSink で同じ PL/BS/CF が得られる
+#   S-03 : AggregatingJournalSink の行数が仕訳件数に依存しない
+#   S-04 : SpillJournalSink の追記ログから仕訳が復元できる
+#   S-05 : SQLiteJournalSink の仕訳が復元でき、run_id ごとに分かれる
+#   S-06 : 保存済みの run_id を開くと、仕訳を読み込まずに SQL の集計から同じ PL/BS/CF が得られる
+#   S-07 : iter_entries(start) は start 件目以降を返し、追記ログは先頭から読み直さない
+#   S-08 : SpillJournalSink は変更のないログを読み直さず、追記分だけを読み足す
+#
+# 【実行方法】
+#   python -m pytest tests/test_journal_sink.py -v
+#
+# ============================================================
+
+import sys
+import os
+import datetime
+import sqlite3
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config.params import LoanParams, AdditionalInvestmentParams
+from core.simulation.simulation import Simulation
+from core.finance.fs_builder import FinancialStatementBuilder
+from core.ledger.ledger import LedgerManager
+from core.ledger.journal_entry import JournalEntry
+from core.ledger.journal_sink import (
+    MemoryJournalSink,
+    AggregatingJournalSink,
+    SpillJournalSink,
+    SQLiteJournalSink,
+)
+from test_integration_cases import make_params
+
+
+def _params(holding_years=3):
+    return make_params(
+        holding_years=holding_years,
+        exit_year=holding_years,
+        initial_loan=LoanParams(30_000_000, 0.025, 20, "annuity"),
+        additional_investments=[
+            AdditionalInvestmentParams(
+                year=2, amount=3_300_000, life=10,
+                loan_amount=1_000_000, loan_years=5, loan_interest_rate=0.02,
+            )
+        ],
+    )
+
+
+def _run(params, sink=None):
+    sim = Simulation(params, params.start_date, journal_sink=sink)
+    sim.run()
+    return sim.ledger, FinancialStatementBuilder(sim.ledger).build()
+
+
+class TestMemorySink:
+    """S-01: デフォルトはメモリ保持"""
+
+    def test_default_sink_is_memory(self):
+        ledger = LedgerManager()
+        assert isinstance(ledger.sink, MemoryJournalSink)
+        e = JournalEntry(datetime.date(2025, 1, 1), "", "預金", 100.0, "元入金", 100.0)
+        ledger.add_entry(e)
+        assert ledger.entries == [e]
+        assert ledger.get_account_balance("預金") == 100.0
+
+
+class TestAggregatingSink:
+    """S-02 / S-03: 集計シンクでも財務諸表が一致するか"""
+
+    def test_statements_match_memory_sink(self):
+        params = _params()
+        _, fs_mem = _run(params)
+        _, fs_agg = _run(params, AggregatingJournalSink())
+
+        for key in ("pl", "bs", "cf"):
+            a, b = fs_mem[key], fs_agg[key]
+            assert list(a.index) == list(b.index)
+            assert list(a.columns) == list(b.columns)
+            assert np.allclose(a.values, b.values, atol=1e-6), key
+        assert fs_agg["is_balanced"]
+
+    def test_row_count_independent_of_postings(self):
+        short_ledger, _ = _run(_params(3), AggregatingJournalSink())
+        long_ledger,  _ = _run(_params(6), AggregatingJournalSink())
+        assert len(long_ledger.sink) > len(short_ledger.sink)
+        # 行数は (年 × 科目) オーダー：仕訳件数よりはるかに少ない
+        assert len(long_ledger.get_df()) < len(long_ledger.sink)
+
+    def test_entries_not_available(self):
+        ledger = LedgerManager(sink=AggregatingJournalSink())
+        with pytest.raises(NotImplementedError):
+            ledger.entries
+
+
+class TestSpillSink:
+    """S-04: ディスク追記ログ"""
+
+    def test_entries_round_trip(self, tmp_path):
+        path = str(tmp_path / "journal.csv")
+        params = _params()
+        mem_ledger, fs_mem = _run(params)
+        sink = SpillJournalSink(path=path, buffer_size=50)
+        spill_ledger, fs_spill = _run(params, sink)
+
+        assert len(sink) == len(mem_ledger.entries)
+        assert spill_ledger.entries == mem_ledger.entries
+        assert np.allclose(fs_mem["bs"].values, fs_spill["bs"].values)
+
+    def test_temporary_file_removed_on_close(self):
+        sink = SpillJournalSink()
+        sink.append(JournalEntry(datetime.date(2025, 1, 1), "", "預金", 1.0, "元入金", 1.0))
+        assert os.path.exists(sink.path)
+        sink.close()
+        assert not os.path.exists(sink.path)
+
+class TestSQLiteSink:
+    """S-05 / S-06: SQLite アーカイブ"""
+
+    def test_entries_round_trip(self, tmp_path):
+        path = str(tmp_path / "journal.db")
+        params = _params()
+        mem_ledger, fs_mem = _run(params)
+        sink = SQLiteJournalSink(path=path, buffer_size=50)
+        sql_ledger, fs_sql = _run(params, sink)
+
+        assert len(sink) == len(mem_ledger.entries)
+        assert sql_ledger.entries == mem_ledger.entries
+        assert np.allclose(fs_mem["bs"].values, fs_sql["bs"].values)
+        assert sql_ledger.get_account_balance("預金") == pytest.approx(sink.account_balance("預金"))
+
+        # 別の run_id は同じファイルに独立して保存される
+        other = SQLiteJournalSink(path=path)
+        other.append(JournalEntry(datetime.date(2025, 1, 1), "", "預金", 1.0, "元入金", 1.0))
+        assert len(other) == 1 and len(other.to_frame()) == 2
+        sink.close()
+        other.close()
+        assert SQLiteJournalSink.list_runs(path) == [sink.run_id, other.run_id]
+
+        conn = sqlite3.connect(path)
+        indexes = {r[1] for r in conn.execute("PRAGMA index_list('journal')")}
+        conn.close()
+        assert {"ix_journal_account_year", "ix_journal_date", "ix_journal_id"} <= indexes
+
+    def test_statements_from_sql_aggregates(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "journal.db")
+        params = _params()
+        _, fs_mem = _run(params)
+        sink = SQLiteJournalSink(path=path)
+        _run(params, sink)
+        sink.close()
+
+        # 仕訳全件の読み込み（to_frame / iter_entries）は行わない
+        monkeypatch.setattr(SQLiteJournalSink, "to_frame", None)
+        monkeypatch.setattr(SQLiteJournalSink, "iter_entries", None)
+        reopened = SQLiteJournalSink(path=path, run_id=sink.run_id)
+        ledger = LedgerManager(sink=reopened)
+        fs_sql = FinancialStatementBuilder(ledger).build()
+        reopened.close()
+
+        for key in ("pl", "bs", "cf"):
+            assert list(fs_sql[key].columns) == list(fs_mem[key].columns)
+            assert np.allclose(fs_mem[key].values, fs_sql[key].values, atol=1e-6), key
+        assert fs_sql["is_balanced"]
+
+
+class TestIterFromStart:
+    """S-07: 途中からの読み出し（増分の整合性チェック用）"""
+
+    @pytest.mark.parametrize("make_sink", [
+        lambda tmp: MemoryJournalSink(),
+        lambda tmp: SpillJournalSink(path=str(tmp / "journal.csv"), buffer_size=50),
+        lambda tmp: SQLiteJournalSink(path=str(tmp / "journal.db"), buffer_size=50),
+    ], ids=["memory", "spill", "sqlite"])
+    def test_iter_from_start(self, tmp_path, make_sink):
+        sink = make_sink(tmp_path)
+        ledger, _ = _run(_params(), sink)
+        entries = list(sink.iter_entries())
+        n = len(entries)
+        for start in (0, 1, 49, 50, 51, n - 1, n, n + 5):
+            assert list(sink.iter_entries(start)) == entries[start:], start
+        assert ledger.check_integrity("full", start=n - 10).n_entries == 10
+        sink.close()
+
+    def test_spill_seeks_to_flush(self, tmp_path):
+        path = str(tmp_path / "journal.csv")
+        sink = SpillJournalSink(path=path, buffer_size=50, cache_reads=False)
+        _run(_params(), sink)
+        tail = list(sink.iter_entries(120))
+
+        # 先頭の flush 分を壊しても、それより後からの読み出しには影響しない
+        with open(path, "r+b") as f:
+            head = f.read(200)
+            f.seek(0)
+            f.write(bytes(b if b in b"\r\n" else ord("x") for b in head))
+        assert list(sink.iter_entries(120)) == tail
+        with pytest.raises(ValueError):
+            list(sink.iter_entries(0))
+
+
+class TestSpillReadCache:
+    """S-08: 追記ログの読み出しキャッシュ"""
+
+    def test_reads_only_new_entries(self, tmp_path):
+        path = str(tmp_path / "journal.csv")
+        sink = SpillJournalSink(path=path, buffer_size=50)
+        ledger, _ = _run(_params(), sink)
+        df      = ledger.get_df()
+        entries = list(sink.iter_entries())
+
+        # ここまでに読んだ範囲を壊しても、読み出し結果は変わらない（読み直していない）
+        size = os.path.getsize(path)
+        with open(path, "r+b") as f:
+            f.write(bytes(b if b in b"\r\n" else ord("x") for b in f.read()))
+        assert ledger.get_df().equals(df)
+        assert list(sink.iter_entries()) == entries
+
+        # 追記した仕訳だけを読み足す
+        extra = JournalEntry(datetime.date(2030, 1, 1), "追加", "預金", 1.0, "元入金", 1.0)
+        sink.append(extra)
+        assert list(sink.iter_entries(len(entries))) == [extra]
+        assert len(sink.to_frame()) == len(df) + 2
+        assert os.path.getsize(path) > size
+        sink.close()
@@ -0,0 +1,108 @@
+# ============================================================
+# tests/test_ledger_compaction.py
+# 仕訳の圧縮（CompactJournalSink / LedgerManager.compact）のテスト
+# ============================================================
+#
+# 【検証項目】
+#   D-01 : 圧縮シンクで実行しても財務諸表が一致し、行数が減る（count 列の合計 = 元の件数）
+#   D-02 : 監査リンク：expand() で元の仕訳列を受け取り順に復元でき、各行の内訳を引ける
+#   D-03 : LedgerManager.compact() は残高・試算表を変えず、以後の仕訳もまとめる
+#
+# 【実行方法】
+#   python -m pytest tests/test_ledger_compaction.py -v
+#
+# ============================================================
+
+import sys
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from core.finance.fs_builder import FinancialStatementBuilder
+from core.ledger.journal_entry import make_entry_pair
+from core.ledger.journal_sink import CompactJournalSink
+from core.simulation.simulation import Simulation
+from test_cashflow_kernel import CASES
+
+
+def run(params, sink=None):
+    sim = Simulation(params, params.start_date, journal_sink=sink)
+    sim.run()
+    return sim
+
+
+@pytest.fixture(scope="module")
+def reference():
+    return run(CASES["loan_and_capex"]())
+
+
+class TestLedgerCompaction:
+
+    def test_D01_statements_match(self, reference):
+        sink = CompactJournalSink()
+        sim  = run(CASES["loan_and_capex"](), sink)
+
+        n = len(reference.ledger.entries)
+        assert len(sink) == n
+        assert sink.n_rows < n
+        df = sim.ledger.get_df()
+        assert len(df) == 2 * sink.n_rows
+        assert df["count"].sum() == 2 * n
+
+        fs  = FinancialStatementBuilder(sim.ledger).build()
+        ref = FinancialStatementBuilder(reference.ledger).build()
+        for k in ("pl", "bs", "cf"):
+            pd.testing.assert_frame_equal(fs[k], ref[k], atol=1e-6)
+
+    def test_D02_audit_link(self, reference):
+        original = reference.ledger.entries
+        sink = CompactJournalSink.from_entries(original)
+        assert list(sink.expand()) == list(original)
+
+        # 複数件をまとめた行の内訳は元の仕訳そのもの
+        row = int(np.argmax(sink.counts))
+        parts = sink.components(row)
+        assert len(parts) == sink.counts[row] > 1
+        for seq, entry in parts:
+            assert entry == original[seq]
+            assert sink.row_of(seq) == row
+        merged = list(sink.iter_entries())[row]
+        assert merged.dr_amount == pytest.approx(sum(e.dr_amount for _, e in parts))
+
+        light = CompactJournalSink.from_entries(original, keep_components=False)
+        assert light.counts == sink.counts
+        with pytest.raises(ValueError):
+            light.components(0)
+
+    def test_D03_compact_on_demand(self):
+        sim = run(CASES["overdraft_repaid_at_exit"]())
+        ledger = sim.ledger
+        before = {y: ledger.trial_balance(y).net for y in ledger.years}
+        cash   = ledger.cash_balance
+        n      = len(ledger.entries)
+
+        sink = ledger.compact()
+        assert ledger.sink is sink and ledger.compact() is sink
+        assert len(ledger.entries) == sink.n_rows < n
+        assert ledger.cash_balance == cash
+        for y, net in before.items():
+            np.testing.assert_allclose(ledger.trial_balance(y).net, net, atol=1e-6)
+
+        # 圧縮後の仕訳も同じ行にまとめられる
+        d = date(2030, 1, 1)
+        ledger.add_entries(make_entry_pair(d, "管理費", "預金", 10.0))
+        ledger.add_entries(make_entry_pair(d, "管理費", "預金", 5.0))
+        assert sink.n_rows == len(ledger.entries)
+        last = ledger.entries[-1]
+        assert (last.dr_account, last.dr_amount, sink.counts[-1]) == ("管理費", 15.0, 2)
+        assert len(sink) == n + 2
+
+# ============================================================
+# tests/test_ledger_compaction.py end
+# ============================================================
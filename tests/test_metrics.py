@@ -0,0 +1,83 @@
+# ============================================================
+# tests/test_metrics.py
+# 投資指標（core/finance/metrics.py）のテスト
+# ============================================================
+#
+# 【検証項目】
+#   M-01 : IRR が既知の解と一致し、解なしは NaN（2次元でも行ごとに独立）
+#   M-02 : 財務諸表からの IRR で NPV = 0、バッチ計算が1シナリオずつの結果と一致
+#   M-03 : DSCR・LTV・エクイティマルチプルの定義（0除算は NaN）
+#   M-04 : 約定返済額は売却年まで、借入なしは DSCR 対象外
+#
+# 【実行方法】
+#   python -m pytest tests/test_metrics.py -v
+#
+# ============================================================
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from core.engine.cashflow_kernel import CashFlowKernel
+from core.finance.metrics import (
+    batch_metrics, debt_service_schedule, dscr, equity_multiple,
+    investment_metrics, irr, ltv_path, npv, total_acquisition_cost,
+)
+from test_cashflow_kernel import CASES
+
+
+class TestArrayFunctions:
+
+    def test_M01_irr_known_values(self):
+        assert irr([-100.0, 60.0, 60.0]) == pytest.approx(0.130662386, abs=1e-8)
+        assert irr([-100.0, 110.0]) == pytest.approx(0.10, abs=1e-10)
+        assert np.isnan(irr([-100.0, -10.0, -10.0]))
+
+        batch = irr([[-100.0, 110.0, 0.0], [100.0, 50.0, 50.0], [-100.0, 0.0, 121.0]])
+        assert batch[0] == pytest.approx(0.10, abs=1e-10)
+        assert np.isnan(batch[1])
+        assert batch[2] == pytest.approx(0.10, abs=1e-10)
+
+    def test_M03_ratios(self):
+        np.testing.assert_allclose(dscr([120, 100, 50], [100, 0, 50]), [1.2, np.nan, 1.0])
+        np.testing.assert_allclose(ltv_path([[50, 40]], [100]), [[0.5, 0.4]])
+        np.testing.assert_allclose(equity_multiple([150, 10], [100, 0]), [1.5, np.nan])
+        assert npv([110.0], 0.10, 100.0) == pytest.approx(0.0)
+
+
+class TestStatementMetrics:
+
+    def test_M02_irr_and_batch(self):
+        names  = sorted(CASES)
+        params = [CASES[n]() for n in names]
+        fss    = [CashFlowKernel(p).run() for p in params]
+        batch  = batch_metrics(fss, params)
+
+        for r, (fs, p) in enumerate(zip(fss, params)):
+            single = investment_metrics(fs, p)
+            for key in ("npv", "irr", "equity_multiple", "min_dscr", "max_ltv"):
+                np.testing.assert_allclose(batch[key][r], single[key])
+            if np.isfinite(single["irr"]):
+                residual = npv(single["flows"], single["irr"], total_acquisition_cost(p))
+                assert abs(residual) < 1.0
+
+    def test_M04_debt_service(self):
+        p = CASES["hold_after_exit"]()
+        assert np.isnan(investment_metrics(CashFlowKernel(p).run(), p)["min_dscr"])
+
+        p  = CASES["loan_and_capex"]()
+        ds = debt_service_schedule(p, p.holding_years)
+        # 1年目は初期ローンのみ、2年目から追加設備ローンが加わる
+        assert ds[1] > ds[0] > 0
+        m = investment_metrics(CashFlowKernel(p).run(), p)
+        assert np.isfinite(m["dscr"]).all()
+        assert 0 < m["max_ltv"] < 1
+
+# ============================================================
+# tests/test_metrics.py end
+# ============================================================
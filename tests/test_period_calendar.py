@@ -0,0 +1,125 @@
+# ============================================================
+# tests/test_period_calendar.py
+# 期間表（core/simulation/period_calendar.py）と決算月のテスト
+# ============================================================
+#
+# 【検証項目】
+#   F-01 : 期間表の日付・事業年度・期中の月・締め月（年をまたいで折り返さない）
+#   F-02 : 3月決算では消費税精算・税計算が3月末に行われ、year 列・財務諸表の列が事業年度
+#   F-03 : 決算月・開始月を変えても高速カーネルと仕訳エンジンが一致する
+#   F-04 : 3月決算でも年次集計モードが月次モードと一致する
+#   F-05 : 3月決算の事業体で、1物件のポートフォリオが単体 Simulation と一致する
+#
+# 【実行方法】
+#   python -m pytest tests/test_period_calendar.py -v
+#
+# ============================================================
+
+import sys
+import os
+from dataclasses import replace
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config.params import EntityParams, LoanParams
+from core.engine.cashflow_kernel import CashFlowKernel
+from core.finance.fs_builder import FinancialStatementBuilder
+from core.simulation.period_calendar import PeriodCalendar
+from core.simulation.portfolio import Portfolio
+from core.simulation.simulation import Simulation
+from test_cashflow_kernel import CASES
+from test_integration_cases import make_params
+
+
+def march_close(params):
+    return replace(params, fiscal_year_end_month=3)
+
+
+def build(params, start=None, granularity="monthly"):
+    sim = Simulation(params, start or params.start_date, granularity=granularity)
+    sim.run()
+    return sim, FinancialStatementBuilder(sim.ledger).build()
+
+
+class TestPeriodCalendar:
+
+    def test_F01_calendar_table(self):
+        cal = PeriodCalendar(date(2025, 4, 1), 24, fiscal_year_end_month=3)
+        assert cal(1) == date(2025, 4, 1)
+        assert cal(10) == date(2026, 1, 1)
+        assert cal(24) == date(2027, 3, 1)
+        assert cal(25) == date(2027, 4, 1)   # 保有期間外も同じ規則
+        assert cal.fiscal_year.tolist() == [2026] * 12 + [2027] * 12
+        assert cal.fiscal_period.tolist() == list(range(1, 13)) * 2
+        assert cal.closes() == [(12, 2026, date(2026, 3, 31)), (24, 2027, date(2027, 3, 31))]
+
+        # 12月決算・4月開始：12月と保有期間の最終月で締める
+        cal = PeriodCalendar(date(2025, 4, 1), 24)
+        assert [c[0] for c in cal.closes()] == [9, 21, 24]
+        assert [c[1] for c in cal.closes()] == [2025, 2026, 2027]
+        assert cal.year_end_date(2026) == date(2026, 12, 31)
+
+        # Simulation のカレンダーマッパーも暦どおりに進む
+        sim = Simulation(make_params(), date(2025, 4, 1))
+        dates = [sim.map_sim_to_calendar(k) for k in range(1, 61)]
+        assert dates == sorted(dates)
+        assert sim.map_sim_to_calendar(10) == date(2026, 1, 1)
+
+        with pytest.raises(ValueError):
+            PeriodCalendar(date(2025, 1, 1), 12, fiscal_year_end_month=13)
+
+    def test_F02_march_year_end(self):
+        params = march_close(make_params(entity_type="corporate"))
+        sim, fs = build(params)
+        df = sim.ledger.get_df()
+
+        # 2025年1月〜2027年12月 → 2025年3月期〜2028年3月期（最終期は12月で締める）
+        assert list(fs["pl"].columns) == [f"Year {y}" for y in range(2025, 2029)]
+        expected_year = df["date"].dt.year + (df["date"].dt.month > 3)
+        assert (df["year"] == expected_year).all()
+
+        closes = df[df["account"].isin(["仮受消費税", "所得税（法人税）"]) & (df["dr_cr"] == "debit")]
+        close_dates = sorted(set(closes["date"].dt.date))
+        assert close_dates == [date(y, 3, 31) for y in range(2025, 2028)] + [date(2027, 12, 31)]
+
+        # 仮払・仮受消費税は各事業年度の決算で精算済み
+        for y in sim.ledger.years:
+            tb = sim.ledger.trial_balance(y)
+            assert tb.balance("仮払消費税") == pytest.approx(0.0, abs=1e-6)
+            assert tb.balance("仮受消費税") == pytest.approx(0.0, abs=1e-6)
+        assert fs["is_balanced"]
+
+    @pytest.mark.parametrize("fye,start", [(3, date(2025, 1, 1)), (12, date(2025, 4, 1)), (9, date(2025, 7, 1))])
+    @pytest.mark.parametrize("case", ["loan_and_capex", "hold_after_exit", "overdraft_repaid_at_exit"])
+    def test_F03_kernel_equivalence(self, case, fye, start):
+        params = replace(CASES[case](), fiscal_year_end_month=fye, start_date=start)
+        kernel = CashFlowKernel(params)
+        kernel.verify_equivalence(kernel.run())
+
+    @pytest.mark.parametrize("case", ["loan_and_capex", "overdraft_repaid_at_exit"])
+    def test_F04_annual_matches_monthly(self, case):
+        params = march_close(CASES[case]())
+        _, monthly = build(params)
+        _, annual  = build(params, granularity="annual")
+        for key in ("pl", "bs", "cf"):
+            assert list(annual[key].columns) == list(monthly[key].columns)
+            diff = np.abs(annual[key].values.astype(float) - monthly[key].values.astype(float))
+            assert np.nanmax(diff) <= 1.0, key
+
+    def test_F05_portfolio_march_year_end(self):
+        p = march_close(make_params(entity_type="corporate", initial_loan=LoanParams(30_000_000, 0.02, 25)))
+        entity = EntityParams(entity_type="corporate", corporate_tax_rate=0.30, fiscal_year_end_month=3)
+        fs  = Portfolio([p], entity, max_workers=1).build_statements()
+        _, ref = build(p)
+        for k in ("pl", "bs", "cf"):
+            pd.testing.assert_frame_equal(fs[k], ref[k], atol=1e-6)
+
+# ============================================================
+# tests/test_period_calendar.py end
+# ============================================================
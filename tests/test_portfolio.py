@@ -0,0 +1,97 @@
+# ============================================================
+# tests/test_portfolio.py
+# ポートフォリオ連結シミュレーション（core/simulation/portfolio.py）のテスト
+# ============================================================
+#
+# 【検証項目】
+#   P-01 : 1物件のポートフォリオは単体 Simulation と PL/BS/CF が一致
+#   P-02 : 赤字物件と黒字物件の損益が通算され、税額は単体合計より小さい
+#   P-03 : journal="full" と "aggregate" で連結財務諸表が一致
+#   P-04 : 並列実行と逐次実行で結果が一致
+#
+# 【実行方法】
+#   python -m pytest tests/test_portfolio.py -v
+#
+# ============================================================
+
+import sys
+import os
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config.params import EntityParams, LoanParams
+from core.simulation.simulation import Simulation
+from core.simulation.portfolio import Portfolio
+from test_integration_cases import make_params
+
+
+CORP = EntityParams(entity_type="corporate", corporate_tax_rate=0.30)
+
+
+def standalone(params):
+    return Simulation(params, params.start_date).build_statements()
+
+
+def total_tax(fs):
+    return float(fs["pl"].loc["所得税（法人税）"].sum())
+
+
+def properties():
+    return [
+        make_params(entity_type="corporate", annual_rent_incl=6_000_000),
+        make_params(entity_type="corporate", annual_rent_incl=300_000, start_year=2026,
+                    initial_loan=LoanParams(40_000_000, 0.03, 20, "annuity")),
+        make_params(entity_type="corporate", holding_years=4, exit_year=4),
+    ]
+
+
+class TestPortfolio:
+
+    def test_P01_single_property_matches_simulation(self):
+        p  = make_params(entity_type="corporate", initial_loan=LoanParams(30_000_000, 0.02, 25))
+        fs = Portfolio([p], CORP, max_workers=1).build_statements()
+        ref = standalone(p)
+        for k in ("pl", "bs", "cf"):
+            pd.testing.assert_frame_equal(fs[k], ref[k], atol=1e-6)
+
+    def test_P02_losses_offset_across_properties(self):
+        props = properties()
+        fs = Portfolio(props, CORP, max_workers=1).build_statements()
+        separate = sum(total_tax(standalone(p)) for p in props)
+        assert fs["is_balanced"]
+        assert total_tax(fs) < separate
+
+        # 最終 BS は預金・元入金・繰越利益剰余金のみ
+        last = fs["bs"].iloc[:, -1]
+        for acct in ("未払所得税（法人税）", "未払消費税", "長期借入金", "建物"):
+            assert last.get(acct, 0.0) == pytest.approx(0.0, abs=1.0)
+
+    def test_P03_full_journal_matches_aggregate(self):
+        props = properties()
+        agg  = Portfolio(props, CORP, max_workers=1).build_statements()
+        full = Portfolio(props, CORP, journal="full", max_workers=1)
+        fs   = full.build_statements()
+        assert len(full.ledger.entries) > 0
+        for k in ("pl", "bs", "cf"):
+            pd.testing.assert_frame_equal(fs[k], agg[k], atol=1e-4)
+
+    def test_P04_parallel_matches_serial(self):
+        props = properties() * 2
+        serial   = Portfolio(props, CORP, max_workers=1).build_statements()
+        parallel = Portfolio(props, CORP, max_workers=2, chunk_size=2).build_statements()
+        for k in ("pl", "bs", "cf"):
+            pd.testing.assert_frame_equal(parallel[k], serial[k], atol=1e-4)
+
+    def test_requires_start_date(self):
+        from dataclasses import replace
+        with pytest.raises(ValueError):
+            Portfolio([replace(make_params(), start_date=None)])
+
+
+# ============================================================
+# tests/test_portfolio.py end
+# ============================================================
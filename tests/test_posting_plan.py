@@ -0,0 +1,132 @@
+# ============================================================
+# tests/test_posting_plan.py
+# 月次経常仕訳の記帳計画（core/bookkeeping/posting_plan.py）のテスト
+# ============================================================
+#
+# 【検証項目】
+#   L-01 : 記帳計画が MonthlySchedule から従来の分岐どおりに展開される（金額 0 の行を省く）
+#   L-02 : 同じシミュレーション年の月は1つのテンプレートを共有する
+#   L-03 : 費用関連の入力が同じシナリオ間で計画が再利用され、異なれば別の計画になる
+#   L-04 : 保有期間を超える月も延長した計画で記帳される
+#
+# 【実行方法】
+#   python -m pytest tests/test_posting_plan.py -v
+#
+# ============================================================
+
+import sys
+import os
+from dataclasses import replace
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config.params import LoanParams, ScheduleParams
+from core.bookkeeping.monthly_entries import MonthlyEntryGenerator
+from core.bookkeeping.posting_plan import CostInputs, compile_posting_plan
+from core.bookkeeping.schedule import MonthlySchedule
+from core.ledger.ledger import LedgerManager
+from core.simulation.period_calendar import PeriodCalendar
+from test_integration_cases import make_params
+
+
+def scheduled_params(**kw):
+    return replace(
+        make_params(**kw),
+        schedule=ScheduleParams(rent_growth_rate=-0.01, vacancy_by_year=[0.0, 0.1, 1.0],
+                                cost_indexation_rate=0.02),
+    )
+
+
+def reference_rows(sc, i):
+    """従来の MonthlyEntryGenerator.generate() 1)〜6) の分岐"""
+    rows = []
+    if sc.rent_gross[i] > 0:
+        rows.append(("預金", "売上高", float(sc.rent_sales[i])))
+        if sc.rent_recv_vat[i] > 0:
+            rows.append(("預金", "仮受消費税", float(sc.rent_recv_vat[i])))
+
+    def taxable(acct):
+        e = sc.expenses[acct]
+        if e["gross"][i] <= 0:
+            return
+        rows.append((acct, "預金", float(e["tax_base"][i])))
+        if e["vat_deductible"][i] > 0:
+            rows.append(("仮払消費税", "預金", float(e["vat_deductible"][i])))
+        if e["vat_nondeductible"][i] > 0:
+            rows.append(("租税公課（消費税）", "預金", float(e["vat_nondeductible"][i])))
+
+    taxable("管理費")
+    taxable("修繕費")
+    if sc.insurance[i] > 0:
+        rows.append(("保険料", "預金", float(sc.insurance[i])))
+    taxable("その他販管費")
+    if sc.fa_tax_land[i] > 0:
+        rows.append(("固定資産税（土地）", "預金", float(sc.fa_tax_land[i])))
+    if sc.fa_tax_building[i] > 0:
+        rows.append(("固定資産税（建物）", "預金", float(sc.fa_tax_building[i])))
+    return tuple(rows)
+
+
+class TestPostingPlan:
+
+    @pytest.mark.parametrize("params", [
+        make_params(),
+        make_params(repair_annual=0, insurance_annual=0),
+        scheduled_params(),
+    ])
+    def test_L01_matches_reference(self, params):
+        plan = compile_posting_plan(params)
+        sc   = MonthlySchedule(params)
+        for i in range(plan.n_months):
+            assert plan.postings(i) == reference_rows(sc, i)
+
+        # 空室率 100% の年は家賃行がない
+        if params.schedule is not None:
+            assert all(dr != "預金" for dr, _, _ in plan.postings(24))
+
+    def test_L02_templates_shared(self):
+        plan = compile_posting_plan(scheduled_params())
+        assert len(plan.templates) == 3
+        assert plan.month_template.tolist() == [0] * 12 + [1] * 12 + [2] * 12
+        assert len(compile_posting_plan(make_params()).templates) == 1
+
+    def test_L03_cached_across_scenarios(self):
+        base = make_params()
+        same_costs = [
+            replace(base, initial_loan=LoanParams(30_000_000, 0.02, 25)),
+            replace(base, property_price_land=base.property_price_land * 2),
+            make_params(exit_year=2),
+        ]
+        plan = compile_posting_plan(base)
+        for p in same_costs:
+            assert compile_posting_plan(p) is plan
+
+        assert compile_posting_plan(make_params(repair_annual=240_000)) is not plan
+        assert compile_posting_plan(replace(base, consumption_tax_rate=0.08)) is not plan
+        assert compile_posting_plan(scheduled_params()) is not plan
+        assert compile_posting_plan(base, n_months=48) is not plan
+
+        # ScheduleParams（リストを含む）もハッシュ可能なキーに変換して同じ値に戻せる
+        inputs = CostInputs.of(scheduled_params())
+        assert hash(inputs) == hash(CostInputs.of(scheduled_params()))
+        assert inputs.schedule.vacancy_by_year == (0.0, 0.1, 1.0)
+
+    def test_L04_beyond_horizon(self):
+        params = make_params()
+        n      = params.holding_years * 12
+        ledger = LedgerManager()
+        gen    = MonthlyEntryGenerator(params, ledger, PeriodCalendar(params.start_date, n))
+        assert gen.plan is compile_posting_plan(params)
+
+        gen.generate(n + 1)
+        assert gen.plan.n_months == n + 12
+        expected = compile_posting_plan(params, n_months=n + 12).postings(n)
+        posted   = [(e.dr_account, e.cr_account, e.dr_amount) for e in ledger.entries]
+        assert posted[:len(expected)] == list(expected)
+
+# ============================================================
+# tests/test_posting_plan.py end
+# ============================================================
@@ -0,0 +1,121 @@
+# ============================================================
+# tests/test_reconciliation.py
+# CF 資金収支尻と BS 預金の照合（core/finance/reconciliation.py）のテスト
+# ============================================================
+#
+# 【検証項目】
+#   Q-01 : 相手科目別の預金ブリッジは 期首預金 + 増減 = BS 預金（決算月 3 を含む）、
+#          科目別の未説明差異の合計は年次の未説明差異と一致する
+#   Q-02 : 一括照合は実行ごとの年次ブリッジと一致し、年数の異なる実行を混在できる。
+#          差異のない財務諸表は flagged にならない
+#   Q-03 : CLI はシナリオファイル・ウェアハウスの両方を照合し、--strict で終了コード 1
+#   Q-04 : build() 済みの builder と fs を渡すと財務諸表を作り直さず、同じ結果になる
+#
+# 【実行方法】
+#   python -m pytest tests/test_reconciliation.py -v
+#
+# ============================================================
+
+import sys
+import os
+import json
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config.params import params_to_dict
+from core.finance.fs_builder import FinancialStatementBuilder
+from core.finance.reconciliation import (
+    CASH, CF_TOTAL, check_batch, reconcile_ledger, statement_bridge,
+)
+from core.simulation import reconcile_cli
+from core.simulation.results_store import ResultsStore
+from core.simulation.simulation import Simulation
+from core.simulation.sweep import evaluate_scenario
+from test_cashflow_kernel import CASES
+from test_integration_cases import make_params
+
+
+def run(params):
+    sim = Simulation(params, params.start_date)
+    sim.run()
+    return sim.ledger
+
+
+class TestReconciliation:
+
+    @pytest.mark.parametrize("fye", [12, 3])
+    @pytest.mark.parametrize("case", ["loan_and_capex", "overdraft_repaid_at_exit"])
+    def test_Q01_ledger_bridge(self, case, fye):
+        ledger = run(replace(CASES[case](), fiscal_year_end_month=fye))
+        result = reconcile_ledger(ledger)
+        bridge, summary = result["bridge"], result["summary"]
+
+        np.testing.assert_allclose(bridge.loc["期末預金"], summary.loc["期末預金（BS）"], atol=1e-3)
+        np.testing.assert_allclose(bridge.iloc[1:-1].sum(axis=0),
+                                   summary.loc["期末預金（BS）"] - summary.loc["期首預金"], atol=1e-3)
+
+        # 科目別の未説明差異の合計 = 年次の未説明差異
+        np.testing.assert_allclose(result["unexplained"].sum(axis=0).reindex(summary.columns, fill_value=0.0),
+                                   summary.loc["未説明差異"], atol=1e-3)
+        np.testing.assert_allclose(result["cf"].sum(axis=0), summary.loc["資金収支尻"], atol=1e-3)
+        assert (summary.loc["flagged"].astype(bool)
+                == (np.abs(summary.loc["未説明差異"]) > 1.0)).all()
+
+    def test_Q02_batch_matches_bridge(self):
+        results = [evaluate_scenario(make_params(holding_years=h, exit_year=h)) for h in (3, 5)]
+        checked = check_batch(results, names=["h3", "h5"])
+        assert checked["n_years"].tolist() == [r["bs"].shape[1] for r in results]
+        for k, fs in enumerate(results):
+            delta = statement_bridge(fs).loc["未説明差異"]
+            assert checked["max_abs_delta"].iloc[k] == pytest.approx(np.abs(delta).max())
+            assert checked["flagged"].iloc[k] == bool((np.abs(delta) > 1.0).any())
+
+        # 資金収支尻を BS 預金の増減に合わせた財務諸表は差異なし
+        fs = results[0]
+        cash = fs["bs"].loc[CASH].to_numpy(dtype=float)
+        cf = fs["cf"].astype(float)
+        cf.loc[CF_TOTAL] = np.diff(np.r_[0.0, cash])
+        clean = check_batch([dict(fs, cf=cf)])
+        assert not clean["flagged"].iloc[0]
+        assert clean["first_flagged"].iloc[0] is None
+        assert clean["max_abs_delta"].iloc[0] == pytest.approx(0.0)
+
+    def test_Q03_cli(self, tmp_path, capsys):
+        scenario = tmp_path / "case.json"
+        scenario.write_text(json.dumps(params_to_dict(make_params())), encoding="utf-8")
+        assert reconcile_cli.main([str(scenario)]) == 0
+        assert "=== case ===" in capsys.readouterr().out
+
+        db = str(tmp_path / "results.db")
+        store = ResultsStore(db)
+        p = make_params()
+        store.record(p, evaluate_scenario(p), name="case", batch="b1")
+        store.close()
+
+        assert reconcile_cli.main(["--store", db, "--batch", "b1"]) == 0
+        rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert len(rows) == 1 and set(rows[0]) >= {"run", "max_abs_delta", "flagged"}
+
+        expected = 1 if rows[0]["flagged"] else 0
+        assert reconcile_cli.main(["--store", db, "--strict"]) == expected
+
+    def test_Q04_reuses_built_statements(self, monkeypatch):
+        ledger   = run(CASES["overdraft_repaid_at_exit"]())
+        expected = reconcile_ledger(ledger)
+
+        builder = FinancialStatementBuilder(ledger)
+        fs      = builder.build()
+        monkeypatch.setattr(FinancialStatementBuilder, "build", None)
+        result  = reconcile_ledger(ledger, fs=fs, builder=builder)
+        for key in expected:
+            pd.testing.assert_frame_equal(result[key], expected[key])
+
+# ============================================================
+# tests/test_reconciliation.py end
+# ============================================================
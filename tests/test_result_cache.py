@@ -0,0 +1,127 @@
+# ============================================================
+# tests/test_result_cache.py
+# 結果キャッシュ（core/simulation/result_cache.py）のテスト
+# ============================================================
+#
+# 【検証項目】
+#   R-01 : 保存した PL/BS/CF・指標がそのまま復元される
+#   R-02 : パラメータ・namespace・salt が異なれば別キー
+#   R-03 : Simulation.build_statements はヒット時に再計算しない
+#   R-04 : 合計サイズ超過時に最終利用の古いものから削除される
+#   R-05 : CLI が2回目の実行でキャッシュを使う
+#   R-06 : put() は合計サイズを増分で更新し、max_bytes 以内ならディレクトリを走査しない
+#
+# 【実行方法】
+#   python -m pytest tests/test_result_cache.py -v
+#
+# ============================================================
+
+import sys
+import os
+import json
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config.params import params_to_dict
+from core.simulation.simulation import Simulation
+from core.simulation.result_cache import ResultCache
+from core.simulation.sweep import evaluate_scenario
+from core.simulation import cli
+from test_integration_cases import make_params
+
+
+class TestResultCache:
+
+    def test_R01_roundtrip(self, tmp_path):
+        cache  = ResultCache(root=str(tmp_path))
+        params = make_params()
+        fs = evaluate_scenario(params, engine="kernel", cache=cache)
+
+        hit = cache.get(params, namespace="kernel")
+        assert hit is not None
+        for k in ("pl", "bs", "cf"):
+            pd.testing.assert_frame_equal(hit[k], fs[k])
+        assert hit["is_balanced"] is True
+        assert pd.Series(hit["metrics"]).equals(pd.Series(fs["metrics"]))   # NaN（DSCR 対象外）も一致
+
+    def test_R02_key_components(self, tmp_path):
+        cache = ResultCache(root=str(tmp_path), salt="v1")
+        p1, p2 = make_params(), make_params(annual_rent_incl=3_000_000)
+        assert cache.key(p1) == cache.key(make_params())
+        assert cache.key(p1) != cache.key(p2)
+        assert cache.key(p1, "journal") != cache.key(p1, "kernel")
+        assert cache.key(p1) != ResultCache(root=str(tmp_path), salt="v2").key(p1)
+
+    def test_R03_simulation_uses_cache(self, tmp_path):
+        cache  = ResultCache(root=str(tmp_path))
+        params = make_params()
+        first  = Simulation(params, params.start_date).build_statements(cache=cache)
+
+        sim = Simulation(params, params.start_date)
+        second = sim.build_statements(cache=cache)
+        assert len(sim.ledger.entries) == 0   # run() は呼ばれていない
+        pd.testing.assert_frame_equal(first["bs"], second["bs"])
+
+    def test_R04_lru_eviction(self, tmp_path):
+        cache = ResultCache(root=str(tmp_path))
+        params = [make_params(annual_rent_incl=2_400_000 + i * 10_000) for i in range(3)]
+        for i, p in enumerate(params):
+            evaluate_scenario(p, engine="kernel", cache=cache)
+            path = cache._path(cache.key(p, "kernel"))
+            os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+
+        # 最古（params[0]）を利用して最新にする
+        assert cache.get(params[0], namespace="kernel") is not None
+
+        one = cache.size_bytes() // 3
+        cache.max_bytes = one * 2 + one // 2
+        assert cache.evict() == 1
+        assert (params[1], "kernel") not in cache
+        assert (params[0], "kernel") in cache
+        assert (params[2], "kernel") in cache
+
+    def test_R05_cli_reuses_cache(self, tmp_path, capsys):
+        scenario = tmp_path / "case.json"
+        scenario.write_text(json.dumps(params_to_dict(make_params())), encoding="utf-8")
+        args = [str(scenario), "--engine", "kernel", "--cache-dir", str(tmp_path / "cache")]
+
+        assert cli.main(args) == 0
+        assert cli.main(args) == 0
+        rows = [json.loads(l) for l in capsys.readouterr().out.splitlines()]
+        assert [r["cached"] for r in rows] == [False, True]
+        assert rows[0]["final_cash"] == rows[1]["final_cash"]
+
+    def test_R06_put_does_not_scan(self, tmp_path, monkeypatch):
+        cache  = ResultCache(root=str(tmp_path))
+        params = [make_params(annual_rent_incl=2_400_000 + i * 10_000) for i in range(3)]
+        evaluate_scenario(params[0], engine="kernel", cache=cache)   # 初回は .size を作るため走査
+
+        scans = []
+        orig  = cache._scan
+        monkeypatch.setattr(cache, "_scan", lambda: scans.append(1) or orig())
+        fs = evaluate_scenario(params[1], engine="kernel")
+        cache.put(params[1], fs, namespace="kernel")
+        cache.put(params[1], fs, namespace="kernel")   # 同じキーの上書きは二重に数えない
+        assert scans == []
+        total = cache._read_total()
+        assert total == cache.size_bytes()
+
+        # max_bytes を超えた put() だけが走査して古いものを削除する
+        cache.max_bytes = total
+        scans.clear()
+        evaluate_scenario(params[2], engine="kernel", cache=cache)
+        assert scans == [1]
+        assert (params[2], "kernel") in cache
+        assert cache._read_total() == cache.size_bytes() <= cache.max_bytes
+
+        cache.clear()
+        assert cache._read_total() == 0
+
+
+# ============================================================
+# tests/test_result_cache.py end
+# ============================================================
@@ -0,0 +1,129 @@
+# ============================================================
+# tests/test_results_store.py
+# 実行結果ウェアハウス（core/simulation/results_store.py）のテスト
+# ============================================================
+#
+# 【検証項目】
+#   G-01 : 記録した実行を指標条件で絞り込み・並べ替えでき、各指標に索引がある
+#   G-02 : 記録した財務諸表・パラメータを再計算なしで復元できる
+#   G-03 : 未知の指標・演算子は拒否し、NaN の指標は条件に一致しない
+#   G-04 : CLI の --store / --batch で実行結果が記録される
+#
+# 【実行方法】
+#   python -m pytest tests/test_results_store.py -v
+#
+# ============================================================
+
+import sys
+import os
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config.params import params_fingerprint, params_to_dict
+from core.simulation import cli
+from core.simulation.results_store import ResultsStore
+from core.simulation.sweep import SWEEP_METRICS, evaluate_scenario
+from test_integration_cases import make_params
+
+
+RENTS = [2_400_000, 3_600_000, 4_800_000]
+
+
+@pytest.fixture(scope="module")
+def runs():
+    out = []
+    for rent in RENTS:
+        p = make_params(annual_rent_incl=rent)
+        out.append((p, evaluate_scenario(p), f"rent_{rent}"))
+    return out
+
+
+@pytest.fixture
+def store(runs):
+    s = ResultsStore(":memory:")
+    s.record_many(runs, batch="nightly", engine="kernel")
+    yield s
+    s.close()
+
+
+class TestResultsStore:
+
+    def test_G01_screening_query(self, store, runs):
+        assert len(store) == len(RENTS)
+        assert store.batches() == ["nightly"]
+
+        npv = {name: fs["metrics"]["npv"] for _, fs, name in runs}
+        threshold = sorted(npv.values())[0]
+        df = store.query([("npv", ">", threshold), ("final_cash", ">", -1e12)],
+                         order_by="npv", descending=True)
+        expected = sorted((n for n in npv if npv[n] > threshold), key=npv.get, reverse=True)
+        assert df["name"].tolist() == expected
+        assert store.query(order_by="npv", limit=1)["name"].tolist() == [min(npv, key=npv.get)]
+        assert store.query(batch="other").empty
+
+        indexes = {r[1] for r in store._conn.execute("PRAGMA index_list(runs)")}
+        assert {f"ix_runs_{m}" for m in SWEEP_METRICS} <= indexes
+        plan = " ".join(str(r) for r in store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT run_id FROM runs WHERE npv > 0"))
+        assert "ix_runs_npv" in plan
+
+    def test_G02_round_trip(self, store, runs):
+        df = store.query()
+        for (params, fs, name), run_id in zip(runs, df["run_id"]):
+            restored = store.statements(run_id)
+            for k in ("pl", "bs", "cf"):
+                assert list(restored[k].index) == list(fs[k].index)
+                pd.testing.assert_frame_equal(restored[k], fs[k].astype(float), check_names=False)
+            assert params_fingerprint(store.params(run_id)) == params_fingerprint(params)
+
+        row = df.iloc[0]
+        for m in SWEEP_METRICS:
+            expected = runs[0][1]["metrics"][m]
+            if np.isnan(expected):
+                assert np.isnan(row[m])
+            else:
+                assert row[m] == pytest.approx(expected)
+
+        with pytest.raises(KeyError):
+            store.statements("missing")
+
+    def test_G03_rejects_unknown_and_nan(self, store, runs):
+        with pytest.raises(ValueError):
+            store.query([("npv; DROP TABLE runs", ">", 0)])
+        with pytest.raises(ValueError):
+            store.query([("npv", "LIKE", 0)])
+        with pytest.raises(ValueError):
+            store.query(order_by="name")
+
+        params, fs, _ = runs[0]
+        fs = dict(fs, metrics=dict(fs["metrics"], irr=float("nan")))
+        run_id = store.record(params, fs, name="no_irr")
+        assert run_id not in store.query([("irr", ">", -1e9)])["run_id"].tolist()
+        assert store.query(order_by="irr")["run_id"].iloc[-1] == run_id
+
+    def test_G04_cli_records(self, tmp_path, capsys):
+        scenario = tmp_path / "case.json"
+        scenario.write_text(json.dumps(params_to_dict(make_params())), encoding="utf-8")
+        db = tmp_path / "results.db"
+        args = [str(scenario), "--engine", "kernel", "--no-cache",
+                "--store", str(db), "--batch", "b1"]
+
+        assert cli.main(args) == 0
+        printed = json.loads(capsys.readouterr().out.splitlines()[0])
+
+        store = ResultsStore(str(db))
+        df = store.query(batch="b1")
+        assert df["name"].tolist() == ["case"]
+        assert df["engine"].tolist() == ["kernel"]
+        assert df["final_cash"].iloc[0] == pytest.approx(printed["final_cash"])
+        store.close()
+
+# ============================================================
+# tests/test_results_store.py end
+# ============================================================
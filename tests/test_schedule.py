@@ -0,0 +1,88 @@
+# ============================================================
+# tests/test_schedule.py
+# 月次スケジュール（core/bookkeeping/schedule.py）のテスト
+# ============================================================
+#
+# 【検証項目】
+#   H-01 : schedule=None では従来の定額金額と完全一致
+#   H-02 : 築年数による家賃下落は停止築年数で止まる
+#   H-03 : 空室率・物価連動が年次の PL に反映される
+#   H-04 : split_vat_array が split_vat と要素ごとに一致
+#
+# 【実行方法】
+#   python -m pytest tests/test_schedule.py -v
+#
+# ============================================================
+
+import sys
+import os
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config.params import ScheduleParams, params_from_dict, params_to_dict
+from core.bookkeeping.schedule import MonthlySchedule, yearly_factors
+from core.tax.tax_splitter import split_vat, split_vat_array
+from core.simulation.simulation import Simulation
+from core.finance.fs_builder import FinancialStatementBuilder
+from test_integration_cases import make_params
+
+
+def build(params):
+    sim = Simulation(params, params.start_date)
+    sim.run()
+    return FinancialStatementBuilder(sim.ledger).build()
+
+
+class TestMonthlySchedule:
+
+    def test_H01_flat_default(self):
+        p  = make_params(other_annual=36_000)
+        sc = MonthlySchedule(p)
+        assert sc.n_months == 36
+        np.testing.assert_array_equal(sc.rent_gross, np.full(36, p.monthly_rent_incl))
+        s = split_vat(p.monthly_admin_cost_incl, p.consumption_tax_rate, p.non_taxable_proportion)
+        assert sc.expenses["管理費"]["tax_base"][0] == s["tax_base"]
+        assert sc.expenses["管理費"]["vat_deductible"][35] == s["vat_deductible"]
+
+    def test_H02_age_decline_stops(self):
+        # 築5年、築7年で下落停止 → 1年目→2年目、2年目→3年目のみ下落
+        p = replace(make_params(holding_years=5, exit_year=5), schedule=ScheduleParams(
+            rent_age_decline_rate=0.10, rent_age_decline_until=7,
+        ))
+        f = yearly_factors(p, 5)
+        np.testing.assert_allclose(f["rent"], [1.0, 0.9, 0.81, 0.81, 0.81])
+
+    def test_H03_vacancy_and_indexation_in_statements(self):
+        base  = make_params(holding_years=3, exit_year=3)
+        sched = replace(base, schedule=ScheduleParams(
+            vacancy_by_year=[0.5, 0.0], cost_indexation_rate=0.10,
+        ))
+        flat, fs = build(base), build(sched)
+
+        y1, y2 = flat["pl"].columns[:2]
+        assert fs["pl"].loc["売上高", y1] == pytest.approx(flat["pl"].loc["売上高", y1] / 2, abs=12)
+        assert fs["pl"].loc["売上高", y2] == pytest.approx(flat["pl"].loc["売上高", y2])
+        assert fs["pl"].loc["保険料", y2] == pytest.approx(flat["pl"].loc["保険料", y2] * 1.1)
+        assert fs["is_balanced"]
+
+    def test_H04_split_vat_array_matches_scalar(self):
+        gross = np.array([0.0, -5.0, 1.0, 105.0, 19_999.5, 123_456.0, 1_100_000.0])
+        arr = split_vat_array(gross, 0.10, 0.35)
+        for i, g in enumerate(gross):
+            s = split_vat(float(g), 0.10, 0.35)
+            for k in s:
+                assert arr[k][i] == s[k]
+
+    def test_schedule_roundtrips_through_dict(self):
+        p = replace(make_params(), schedule=ScheduleParams(vacancy_by_year=[0.1, 0.05]))
+        assert params_from_dict(params_to_dict(p)) == p
+
+
+# ============================================================
+# tests/test_schedule.py end
+# ============================================================
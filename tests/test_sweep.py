@@ -0,0 +1,149 @@
+# ============================================================
+# tests/test_sweep.py
+# グリッドスイープ（core/simulation/sweep.py）のテスト
+# ============================================================
+#
+# 【検証項目】
+#   W-01 : キューブの形状・軸ラベルが axes の指定どおり
+#   W-02 : 同一内容の組合せは1回だけ計算される（重複排除）
+#   W-03 : 各セルの指標が単体実行（evaluate_params）と一致する
+#   W-04 : partial.jsonl から中断したスイープを再開できる（指標が欠けた古い記録は再計算）
+#   W-05 : ResultCube の save / load / sel / to_frame
+#   W-06 : engine の異なるチェックポイントは再利用しない
+#
+# 【実行方法】
+#   python -m pytest tests/test_sweep.py -v
+#
+# ============================================================
+
+import json
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from config.params import LoanParams, params_fingerprint
+from core.simulation.sweep import (
+    GridSweep, ResultCube, SWEEP_METRICS, apply_axes, evaluate_params,
+)
+from test_integration_cases import make_params
+
+
+def base_params():
+    return make_params(initial_loan=LoanParams(40_000_000, 0.02, 20, "annuity"))
+
+
+AXES = {
+    "ltv":                        [0.0, 0.5],
+    "initial_loan.interest_rate": [0.01, 0.03],
+    "annual_rent_income_incl":    [2_400_000, 3_000_000],
+}
+
+
+class TestGridSweep:
+
+    def test_W01_cube_shape_and_labels(self):
+        cube = GridSweep(base_params(), AXES, max_workers=1).run()
+        assert cube.shape == (2, 2, 2)
+        assert list(cube.axes) == list(AXES)
+        for m in SWEEP_METRICS:
+            assert cube[m].shape == (2, 2, 2)
+            if m != "min_dscr":
+                assert np.isfinite(cube[m]).all()
+        # 借入なし（ltv=0）の行は DSCR 対象外
+        assert np.isnan(cube["min_dscr"][0]).all()
+        assert np.isfinite(cube["min_dscr"][1]).all()
+
+    def test_W02_deduplicates_identical_combinations(self):
+        cell_keys, unique = GridSweep(base_params(), AXES).expand()
+        # ltv=0 では借入なしとなり金利軸が無関係 → 2 + 4 = 6 通り
+        assert len(unique) == 6
+        assert cell_keys[0, 0, 0] == cell_keys[0, 1, 0]
+        assert cell_keys[1, 0, 0] != cell_keys[1, 1, 0]
+
+    def test_W03_cells_match_single_runs(self):
+        cube = GridSweep(base_params(), AXES, max_workers=1).run()
+        p = apply_axes(base_params(), {
+            "ltv": 0.5, "initial_loan.interest_rate": 0.03,
+            "annual_rent_income_incl": 3_000_000,
+        })
+        expected = evaluate_params(p)
+        for m in SWEEP_METRICS:
+            assert cube[m][1, 1, 1] == pytest.approx(expected[m])
+
+    def test_W04_resume_from_partial(self, tmp_path):
+        ckpt = str(tmp_path / "sweep")
+        first = GridSweep(base_params(), AXES, max_workers=1, checkpoint_dir=ckpt).run()
+
+        # 先頭3件だけを残して中断状態を再現（末尾は書きかけ行）。
+        # 3件目は指標が追加される前の記録（指標が1つ欠けている）→ 再計算の対象
+        path = os.path.join(ckpt, GridSweep.PARTIAL_FILE)
+        with open(path, encoding="utf-8") as f:
+            lines = f.readlines()
+        old = json.loads(lines[2])
+        del old["metrics"][SWEEP_METRICS[-1]]
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(lines[:2])
+            f.write(json.dumps(old) + "\n")
+            f.write('{"key": "trunc')
+
+        sweep = GridSweep(base_params(), AXES, max_workers=1, checkpoint_dir=ckpt)
+        assert len(sweep.load_partial()) == 2
+
+        calls = []
+        import core.simulation.sweep as sweep_mod
+        orig = sweep_mod._build_statements
+
+        def counting(p, engine="kernel"):
+            calls.append(params_fingerprint(p))
+            return orig(p, engine)
+
+        sweep_mod._build_statements = counting
+        try:
+            resumed = sweep.run()
+        finally:
+            sweep_mod._build_statements = orig
+
+        assert len(calls) == 4
+        for m in SWEEP_METRICS:
+            np.testing.assert_allclose(resumed[m], first[m])
+
+    def test_W05_cube_roundtrip_and_slicing(self, tmp_path):
+        cube = GridSweep(base_params(), AXES, max_workers=1).run()
+        path = str(tmp_path / "cube.npz")
+        cube.save(path)
+        loaded = ResultCube.load(path)
+
+        assert list(loaded.axes) == list(cube.axes)
+        np.testing.assert_allclose(loaded["npv"], cube["npv"])
+
+        sub = loaded.sel(ltv=0.5, annual_rent_income_incl=3_000_000)
+        assert list(sub.axes) == ["initial_loan.interest_rate"]
+        np.testing.assert_allclose(sub["npv"], cube["npv"][1, :, 1])
+
+        df = cube.to_frame()
+        assert len(df) == 8
+        assert set(AXES) | set(SWEEP_METRICS) <= set(df.columns)
+
+    def test_W06_checkpoint_is_per_engine(self, tmp_path):
+        ckpt = str(tmp_path / "sweep")
+        GridSweep(base_params(), AXES, max_workers=1, checkpoint_dir=ckpt).run()
+        assert len(GridSweep(base_params(), AXES, checkpoint_dir=ckpt).load_partial()) > 0
+
+        annual = GridSweep(base_params(), AXES, max_workers=1, checkpoint_dir=ckpt, engine="annual")
+        assert annual.load_partial() == {}
+        annual.run()
+        assert len(annual.load_partial()) == len(annual.expand()[1])
+
+    def test_unknown_axis_raises(self):
+        with pytest.raises(ValueError):
+            GridSweep(base_params(), {"no_such_field": [1, 2]}).expand()
+
+
+# ============================================================
+# tests/test_sweep.py end
+# ============================================================
@@ -0,0 +1,116 @@
+# ============================================================
+# tests/test_trial_balance.py
+# 期間別試算表（LedgerManager.trial_balance / core/ledger/trial_balance.py）のテスト
+# ============================================================
+#
+# 【検証項目】
+#   B-01 : 年次・月次・累計の試算表が get_df() の絞り込み集計と一致
+#   B-02 : 累計スナップショットは再利用され、過去月への記帳ではその月以降のみ再計算
+#   B-03 : 既存の仕訳を持つシンク（集計シンク）から初期化しても年次試算表が一致
+#
+# 【実行方法】
+#   python -m pytest tests/test_trial_balance.py -v
+#
+# ============================================================
+
+import sys
+import os
+from datetime import date
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from core.ledger import accounts
+from core.ledger.journal_entry import make_entry_pair
+from core.ledger.journal_sink import AggregatingJournalSink
+from core.ledger.ledger import LedgerManager
+from core.simulation.simulation import Simulation
+from test_cashflow_kernel import CASES
+
+
+def df_totals(df):
+    """get_df() の行から (借方, 貸方) の科目コード別合計"""
+    n = accounts.UNKNOWN + 1
+    codes  = df["account_code"].to_numpy()
+    amount = df["amount"].to_numpy(dtype=float)
+    debit  = df["dr_cr"].to_numpy() == "debit"
+    return (
+        np.bincount(codes[debit],  weights=amount[debit],  minlength=n),
+        np.bincount(codes[~debit], weights=amount[~debit], minlength=n),
+    )
+
+
+@pytest.fixture(scope="module")
+def ledger():
+    params = CASES["overdraft_repaid_at_exit"]()
+    sim = Simulation(params, params.start_date)
+    sim.run()
+    return sim.ledger
+
+
+class TestTrialBalance:
+
+    def test_B01_matches_frame(self, ledger):
+        df = ledger.get_df()
+        assert ledger.years == sorted(df["year"].unique().tolist())
+
+        for y in ledger.years:
+            for tb, rows in (
+                (ledger.trial_balance(y),                  df[df["year"] == y]),
+                (ledger.trial_balance(y, cumulative=True), df[df["year"] <= y]),
+                (ledger.trial_balance((y, 3)),             df[(df["year"] == y) & (df["month"] == 3)]),
+            ):
+                dr, cr = df_totals(rows)
+                np.testing.assert_allclose(tb.debit,  dr, atol=1e-6)
+                np.testing.assert_allclose(tb.credit, cr, atol=1e-6)
+
+        tb = ledger.trial_balance()
+        assert tb.debit.sum() == pytest.approx(tb.credit.sum())
+        for account in ("預金", "元入金", "建物"):
+            assert tb.balance(account) == pytest.approx(ledger.get_account_balance(account), abs=1e-6)
+
+    def test_B02_snapshot_reuse(self):
+        ledger = LedgerManager()
+        for m in range(1, 13):
+            ledger.add_entries(make_entry_pair(date(2025, m, 1), "預金", "売上高", 100.0))
+
+        periods = ledger._periods
+        assert ledger.trial_balance(2025, cumulative=True).balance("預金") == 1200.0
+        snapshots = list(periods._cum)
+        assert len(snapshots) == 12
+
+        # 再問い合わせは既存のスナップショットをそのまま使う
+        ledger.trial_balance((2025, 6), cumulative=True)
+        assert all(a is b for a, b in zip(periods._cum, snapshots))
+
+        # 過去月（4月）への記帳 → 4月以降のみ破棄
+        ledger.add_entries(make_entry_pair(date(2025, 4, 15), "管理費", "預金", 50.0))
+        assert len(periods._cum) == 3
+        assert all(a is b for a, b in zip(periods._cum, snapshots[:3]))
+
+        assert ledger.trial_balance((2025, 3), cumulative=True).balance("預金") == 300.0
+        assert ledger.trial_balance((2025, 4), cumulative=True).balance("預金") == 350.0
+        assert ledger.trial_balance(2025).debit_of("管理費") == 50.0
+        assert ledger.trial_balance().balance("預金") == 1150.0
+
+    def test_B03_prefilled_sink(self, ledger):
+        sink = AggregatingJournalSink()
+        for e in ledger.entries:
+            sink.append(e)
+        restored = LedgerManager(sink=sink)
+
+        assert restored.years == ledger.years
+        for y in ledger.years:
+            np.testing.assert_allclose(
+                restored.trial_balance(y).net, ledger.trial_balance(y).net, atol=1e-6
+            )
+        assert restored.description_totals("預金", "debit") == pytest.approx(
+            ledger.description_totals("預金", "debit")
+        )
+
+# ============================================================
+# tests/test_trial_balance.py end
+# ============================================================
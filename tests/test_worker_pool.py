@@ -0,0 +1,96 @@
+# ============================================================
+# tests/test_worker_pool.py
+# 常駐ワーカープロセスプール（ui/worker_pool.py）のテスト
+# ============================================================
+#
+# 【検証項目】
+#   Z-01 : 起動時に全ワーカーが立ち上がり、計算エンジンのモジュールが import 済み
+#   Z-02 : 後から投入したセッションのタスクは、先行セッションの待ち行列を待たずに実行される
+#   Z-03 : GridSweep(executor=...) はプール経由でも単独実行と同じ結果になり、
+#          セッションの取り消しは未着手タスクだけを取り消す。
+#          スイープは渡された窓口を止めず、同じセッションのほかのタスクを取り消さない
+#
+# 【実行方法】
+#   python -m pytest tests/test_worker_pool.py -v
+#
+# ============================================================
+
+import sys
+import os
+import time
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from core.simulation.sweep import SWEEP_METRICS, GridSweep
+from ui.worker_pool import WARM_MODULES, WorkerPool
+from test_integration_cases import make_params
+
+
+def loaded_modules(names):
+    return [n for n in names if n in sys.modules]
+
+
+def started_at(delay):
+    t = time.time()
+    time.sleep(delay)
+    return t
+
+
+@pytest.fixture(scope="module")
+def pool():
+    p = WorkerPool(max_workers=1)
+    yield p
+    p.shutdown()
+
+
+class TestWorkerPool:
+
+    def test_Z01_warm_start(self, pool):
+        assert len(pool.pids) == 1
+        assert pool.submit("s", os.getpid).result(30) == pool.pids[0]
+        assert pool.submit("s", loaded_modules, WARM_MODULES).result(30) == list(WARM_MODULES)
+
+    def test_Z02_fair_queue(self, pool):
+        first = [pool.submit("sweep", started_at, 0.05) for _ in range(6)]
+        other = pool.submit("compare", started_at, 0.0)
+        t_other = other.result(30)
+        t_first = sorted(f.result(30) for f in first)
+        # 1台のワーカーでも、後着のセッションは先行セッションの2件目以内に割り込む
+        assert t_other < t_first[2]
+        assert pool.pending() == 0
+
+    def test_Z03_sweep_and_cancel(self, pool):
+        base = make_params()
+        axes = {"holding_years": [2, 3, 4], "annual_rent_income_incl": [2_400_000.0, 3_000_000.0]}
+        serial = GridSweep(base, axes, max_workers=1).run()
+        pooled = GridSweep(base, axes, chunk_size=2, executor=pool.executor("s1")).run()
+        for m in SWEEP_METRICS:
+            np.testing.assert_allclose(pooled[m], serial[m], equal_nan=True)
+
+        # スイープは呼び出し元の窓口を止めず、同じセッションのほかのタスクも取り消さない
+        session = pool.executor("s3")
+        other   = []
+
+        def queue_other(stage, done, total):
+            # 最後のチャンクの完了時に、同じセッションへ別のタスクを積む（スイープ終了時点で未着手）
+            if done == total:
+                other.append(session.submit(started_at, 0.2))
+
+        GridSweep(base, axes, chunk_size=2, executor=session).run(progress=queue_other)
+        assert not other[0].cancelled() and other[0].result(30) > 0
+        assert session.submit(os.getpid).result(30) == pool.pids[0]
+
+        running = pool.submit("s2", started_at, 0.2)
+        queued  = [pool.submit("s2", started_at, 0.0) for _ in range(3)]
+        time.sleep(0.05)
+        assert pool.cancel("s2") == 3
+        assert all(f.cancelled() for f in queued)
+        assert running.result(30) > 0
+
+# ============================================================
+# tests/test_worker_pool.py end
+# ============================================================
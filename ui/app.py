@@ -23,6 +23,7 @@ import pandas as pd
 import numpy as np
 import datetime
 import traceback
+import uuid
 from io import BytesIO
 from typing import List
 
@@ -31,9 +32,15 @@ from config.params import (
     LoanParams,
     ExitParams,
     AdditionalInvestmentParams,
+    ScheduleParams,
 )
 from core.simulation.simulation import Simulation
 from core.finance.fs_builder import FinancialStatementBuilder
+from core.finance.metrics import investment_metrics, total_acquisition_cost
+from core.ledger.journal_index import JournalIndex
+from core.simulation.compare import MAX_VARIANTS, compare_scenarios, diff_table, metrics_table
+from ui.jobs import JobRunner, DONE, CANCELLED
+from ui.worker_pool import SessionExecutor, WorkerPool
 
 
 # ============================================================
@@ -234,72 +241,18 @@ def calc_detective_metrics(fs_data: dict, params: SimulationParams, ledger_df: p
     total_tax  = float(pl.loc["所得税（法人税）"].sum()) if "所得税（法人税）" in pl.index else 0.0
     final_cash = float(bs.loc["預金"].iloc[-1])          if "預金"             in bs.index else 0.0
 
-    # 日付・年月カラムの準備
-    ldf = ledger_df.copy()
-    if "year" not in ldf.columns or "month" not in ldf.columns:
-        dc = next((c for c in ["date", "booking_date", "txn_date"] if c in ldf.columns), None)
-        if dc:
-            ldf[dc] = pd.to_datetime(ldf[dc])
-            ldf["year"]  = ldf[dc].dt.year
-            ldf["month"] = ldf[dc].dt.month
-        else:
-            ldf["year"] = ldf["month"] = 1
-
-    # ── CFテーブルの「営業収支」行を直接使用（表示と一致させる）──
+    # ── 年次CF指標（core/finance/metrics.py）──────────────────
+    #   CFテーブルの「営業収支」行を使用（表示と一致させる）
+    m   = investment_metrics(fs_data, params)
     cf_tbl = fs_data.get("cf", pd.DataFrame())
-    # 営業収支の年次値を取得
-    op_cf_row = None
-    for label in ["営業収支"]:
-        if label in cf_tbl.index:
-            op_cf_row = cf_tbl.loc[label]
-            break
-
-    if op_cf_row is not None:
-        # 営業収支が初めてプラスになる年を判定
-        pos_year = None
-        for col in op_cf_row.index:
-            if isinstance(op_cf_row[col], (int, float)) and op_cf_row[col] > 0:
-                # col は "Year XXXX" 形式
-                try:
-                    pos_year = int(str(col).replace("Year ", "").strip())
-                except Exception:
-                    pass
-                if pos_year:
-                    break
-        pos_s = f"{pos_year}年" if pos_year else "黒字転換なし"
-
-        # 投資回収：累積営業収支が inv_base を超えた年
-        cumulative = 0.0
-        rec_year = None
-        for col in op_cf_row.index:
-            try:
-                v = float(op_cf_row[col])
-                cumulative += v
-                yr = int(str(col).replace("Year ", "").strip())
-                total_inv_check = (params.property_price_building
-                                   + params.property_price_land
-                                   + params.brokerage_fee_amount_incl)
-                inv_b = params.initial_equity if params.initial_equity > 0 else total_inv_check
-                if cumulative >= inv_b:
-                    rec_year = yr
-                    break
-            except Exception:
-                continue
-        rec_s = f"{rec_year}年" if rec_year else "未回収"
-
-        # NPV は CFテーブルの年次営業収支から
-        dr = params.cf_discount_rate or 0.03
-        op_vals = []
-        for col in op_cf_row.index:
-            try:
-                op_vals.append(float(op_cf_row[col]))
-            except Exception:
-                pass
+    if "営業収支" in cf_tbl.index:
+        years = m["years"]
+        pos_i, rec_i = m["positive_index"], m["payback_index"]
+        pos_s = f"{int(years[pos_i])}年" if pos_i >= 0 else "黒字転換なし"
+        rec_s = f"{int(years[rec_i])}年" if rec_i >= 0 else "未回収"
     else:
         pos_s = "データなし"
         rec_s = "データなし"
-        op_vals = []
-        dr = params.cf_discount_rate or 0.03
 
     # ──────────────────────────────────────────────────────────
     # 投資指標の計算
@@ -307,11 +260,8 @@ def calc_detective_metrics(fs_data: dict, params: SimulationParams, ledger_df: p
     #   借入ありの不動産投資では「自己資金（equity）」を基準にする。
     #   自己資金ゼロ（全額借入）の場合は、
     #     ROI・年率ROI は「総投資額ベース」に切り替え（分母ゼロ回避）
-    #     DCF は「レバレッジ後の自己CF」ベース（I₀=自己資金）で計算
     # ──────────────────────────────────────────────────────────
-    total_inv = (params.property_price_building
-                 + params.property_price_land
-                 + params.brokerage_fee_amount_incl)
+    total_inv = total_acquisition_cost(params)
     equity = params.initial_equity   # 自己資金（元入金）
 
     # ROI: 自己資金があればその利回り、なければ総投資額ベース
@@ -332,24 +282,11 @@ def calc_detective_metrics(fs_data: dict, params: SimulationParams, ledger_df: p
     ann_roi = roi / params.holding_years if params.holding_years > 0 else 0.0
 
     # ── DCF ──────────────────────────────────────────────────
-    # 売却純収入 = BS終期預金残高 − 累積営業収支
-    op_tot   = float(sum(op_vals))
-    exit_net = final_cash - op_tot
-
-    # 最終年に売却純収入を加算
-    op_vals_dcf = list(op_vals)
-    if op_vals_dcf:
-        op_vals_dcf[-1] += exit_net
-
-    pv = sum(cf / ((1 + dr) ** (i + 1)) for i, cf in enumerate(op_vals_dcf))
-
-    # I₀ = 自己資金（全額借入なら0）
-    # I₀ = 総取得費用（土地＋建物＋仲介手数料）
+    #   年次CF = 営業収支（最終年に売却純収入 = 期末預金 − 累積営業収支 を加算）
+    #   I₀ = 総取得費用（土地＋建物＋仲介手数料）
     #   ※ 自己資金・借入の別を問わず、物件取得に実際に要した費用の合計。
-    #   NPV = PV(将来CF) - I₀
-    dcf_i0 = total_inv
-    npv    = pv - dcf_i0
-
+    #   NPV = PV(将来CF) - I₀、IRR は NPV = 0 となる割引率
+    op_tot = float(np.sum(m["op"]))
 
     return {
         "受け取った家賃収入の総額":     total_rent,
@@ -362,13 +299,40 @@ def calc_detective_metrics(fs_data: dict, params: SimulationParams, ledger_df: p
         "全体の投資利回り":             roi,
         "全体の投資利回り年率":         ann_roi,
         "_roi_label":                   roi_label,
-        "DCF収益の現在価値（PV）":     pv,
-        "DCF初期投資額（I₀）":          dcf_i0,
-        "DCF純現在価値（NPV）":         npv,
+        "DCF収益の現在価値（PV）":     m["pv"],
+        "DCF初期投資額（I₀）":          total_inv,
+        "DCF純現在価値（NPV）":         m["npv"],
+        "内部収益率（IRR）":            m["irr"],
+        "自己資金IRR":                  m["equity_irr"],
+        "エクイティマルチプル":         m["equity_multiple"],
+        "最低DSCR":                     m["min_dscr"],
+        "最大LTV":                      m["max_ltv"],
         "借入返済期間中の営業収支合計": op_tot,
     }
 
 
+def _metric_kind(key: str) -> str:
+    """表示形式：率（%）・倍率・金額"""
+    if "利回り" in key or "÷" in key or "IRR" in key or "LTV" in key:
+        return "pct"
+    if "DSCR" in key or "マルチプル" in key:
+        return "times"
+    return "yen"
+
+
+def format_detective_value(key: str, val) -> str:
+    if isinstance(val, str):
+        return val
+    if val is None or not np.isfinite(val):
+        return "—"
+    kind = _metric_kind(key)
+    if kind == "pct":
+        return f"{val:.1%}"
+    if kind == "times":
+        return f"{val:.2f} 倍"
+    return f"{int(val):,} 円"
+
+
 def economic_detective_report(fs_data: dict, params: SimulationParams, ledger_df: pd.DataFrame):
     st.subheader("🕵️‍♂️ 経済探偵の分析レポート")
     metrics = calc_detective_metrics(fs_data, params, ledger_df)
@@ -378,11 +342,7 @@ def economic_detective_report(fs_data: dict, params: SimulationParams, ledger_df
                 f'<div class="bkw-value">{value}</div></div>')
 
     def fv(key, val):
-        if isinstance(val, str):
-            return val
-        if "利回り" in key or "÷" in key:
-            return f"{val:.1%}"
-        return f"{int(val):,} 円"
+        return format_detective_value(key, val)
 
     # ROIのラベルに基準を付記
     roi_lb = metrics.get("_roi_label", "")
@@ -410,6 +370,11 @@ def economic_detective_report(fs_data: dict, params: SimulationParams, ledger_df
         "DCF収益の現在価値（PV）",
         "DCF初期投資額（I₀）",
         "DCF純現在価値（NPV）",
+        "内部収益率（IRR）",
+        "自己資金IRR",
+        "エクイティマルチプル",
+        "最低DSCR",
+        "最大LTV",
     ]
     cl, cr = st.columns(2)
     for i, k in enumerate(order):
@@ -446,6 +411,7 @@ def build_scenario_csv(params: SimulationParams, scenario_name: str) -> bytes:
         ("課税主体",                 "個人" if params.entity_type == "individual" else "法人"),
         ("所得税率（%）",            f"{params.income_tax_rate*100:.1f}%"),
         ("法人税率（%）",            f"{params.corporate_tax_rate*100:.1f}%"),
+        ("決算月",                   f"{params.fiscal_year_end_month}月"),
         ("当座借越金利（%）",        f"{params.overdraft_interest_rate*100:.2f}%"),
         ("売却予定年",               params.holding_years),
         ("土地売却額",               f"{params.exit_params.land_exit_price:,.0f}"),
@@ -512,6 +478,7 @@ def build_result_excel(
             ("課税主体",                 "個人" if params.entity_type == "individual" else "法人"),
             ("所得税率（%）",            params.income_tax_rate * 100),
             ("法人税率（%）",            params.corporate_tax_rate * 100),
+            ("決算月",                   params.fiscal_year_end_month),
             ("当座借越金利（%）",        params.overdraft_interest_rate * 100),
             ("売却予定年",               params.holding_years),
             ("土地売却額",               params.exit_params.land_exit_price),
@@ -543,13 +510,19 @@ def build_result_excel(
             "全体の投資利回り",
             "全体の投資利回り年率",
             "DCF収益の現在価値（PV）",
-        "DCF初期投資額（I₀）",
-        "DCF純現在価値（NPV）",
+            "DCF初期投資額（I₀）",
+            "DCF純現在価値（NPV）",
+            "内部収益率（IRR）",
+            "自己資金IRR",
+            "エクイティマルチプル",
+            "最低DSCR",
+            "最大LTV",
         ]
         for k in det_order:
             v = metrics.get(k, "")
             if isinstance(v, float):
-                v = f"{v:.1%}" if ("利回り" in k or "÷" in k) else round(v)
+                # 金額は数値のまま、率・倍率は表示用文字列
+                v = round(v) if _metric_kind(k) == "yen" and np.isfinite(v) else format_detective_value(k, v)
             input_rows.append((k, v))
 
         pd.DataFrame(input_rows, columns=["項目", "値"]).to_excel(
@@ -741,6 +714,37 @@ def setup_sidebar() -> SimulationParams:
             value=0.0, step=10_000.0, format=C,
         )
 
+    # ── 3-2. 家賃・費用の推移 ─────────────────────────────────
+    with st.sidebar.expander("📈 3-2. 家賃・費用の推移", expanded=False):
+        st.caption("すべて 0 の場合は保有期間中ずっと定額で計算します。")
+        rent_growth = st.number_input(
+            "家賃変動率（年率 %）", min_value=-50.0, max_value=50.0, value=0.0, step=0.1,
+        ) / 100
+        age_decline = st.number_input(
+            "築年数による家賃下落率（年率 %）", min_value=0.0, max_value=50.0, value=0.0, step=0.1,
+        ) / 100
+        age_decline_until = st.number_input(
+            "家賃下落が止まる築年数（0 = 止まらない）", min_value=0, max_value=100, value=0, step=1,
+            disabled=(age_decline == 0),
+        )
+        vacancy = st.number_input(
+            "空室率（%）", min_value=0.0, max_value=100.0, value=0.0, step=1.0,
+        ) / 100
+        cost_index = st.number_input(
+            "費用の物価上昇率（年率 %）※固定資産税を除く",
+            min_value=-50.0, max_value=50.0, value=0.0, step=0.1,
+        ) / 100
+        schedule = (
+            ScheduleParams(
+                rent_growth_rate=float(rent_growth),
+                rent_age_decline_rate=float(age_decline),
+                rent_age_decline_until=int(age_decline_until) or None,
+                vacancy_rate=float(vacancy),
+                cost_indexation_rate=float(cost_index),
+            )
+            if any([rent_growth, age_decline, vacancy, cost_index]) else None
+        )
+
     # ── 4. 税率設定 ───────────────────────────────────────────
     with st.sidebar.expander("📊 4. 税率設定", expanded=False):
         vat_rate = st.number_input(
@@ -756,6 +760,16 @@ def setup_sidebar() -> SimulationParams:
             "所得税率（%）" if entity_type == "individual" else "法人税率（%）",
             min_value=0.0, max_value=100.0, value=30.0, step=0.1,
         ) / 100
+        # 個人は暦年課税（12月締め）。法人は決算月を選ぶ
+        fiscal_year_end_month = 12
+        if entity_type == "corporate":
+            fiscal_year_end_month = st.selectbox(
+                "決算月",
+                options=list(range(1, 13)),
+                index=11,
+                format_func=lambda m: f"{m}月",
+                key="fye",
+            )
         od_rate = st.number_input(
             "当座借越金利（%）", min_value=0.0, max_value=100.0, value=5.0, step=0.01,
         ) / 100
@@ -828,6 +842,8 @@ def setup_sidebar() -> SimulationParams:
         entity_type=entity_type,
         income_tax_rate=tax_rate if entity_type == "individual" else 0.0,
         corporate_tax_rate=tax_rate if entity_type == "corporate"  else 0.0,
+        schedule=schedule,
+        fiscal_year_end_month=int(fiscal_year_end_month),
     )
 
 
@@ -862,12 +878,317 @@ def validate_params(params: SimulationParams) -> list:
 # ============================================================
 # メイン
 # ============================================================
+# ============================================================
+# 全仕訳（ページング・サーバー側絞り込み）
+#   core/ledger/journal_index.py の索引で絞り込み、表示ページの行だけを描画する。
+# ============================================================
+JOURNAL_PAGE_SIZES = [50, 100, 200, 500]
+
+
+def render_journal(index: JournalIndex):
+    if len(index) == 0:
+        st.info("仕訳がありません。")
+        return
+
+    years = index.years
+    f1, f2 = st.columns(2)
+    with f1:
+        accounts = st.multiselect("科目", index.accounts, key="jnl_accounts")
+    with f2:
+        if len(years) > 1:
+            year_range = st.slider("年", years[0], years[-1], (years[0], years[-1]), key="jnl_years")
+        else:
+            year_range = (years[0], years[0])
+
+    f3, f4, f5 = st.columns(3)
+    with f3:
+        amount_min = st.number_input("金額（以上）", min_value=0, value=0, step=10_000, key="jnl_amt_min")
+    with f4:
+        amount_max = st.number_input("金額（以下、0 は上限なし）", min_value=0, value=0, step=10_000, key="jnl_amt_max")
+    with f5:
+        descriptions = st.multiselect("摘要", index.descriptions, key="jnl_desc")
+
+    positions = index.query(
+        accounts=accounts or None,
+        years=year_range,
+        amount_min=amount_min or None,
+        amount_max=amount_max or None,
+        descriptions=descriptions or None,
+    )
+
+    p1, p2, p3 = st.columns([1, 1, 2])
+    with p1:
+        page_size = st.selectbox("表示件数", JOURNAL_PAGE_SIZES, index=1, key="jnl_page_size")
+    n_pages = JournalIndex.n_pages(len(positions), page_size)
+    # 絞り込みでページ数が減った場合は最終ページに合わせる
+    if st.session_state.get("jnl_page", 1) > n_pages:
+        st.session_state["jnl_page"] = n_pages
+    with p2:
+        page = st.number_input("ページ", min_value=1, max_value=n_pages, step=1, key="jnl_page")
+    with p3:
+        st.caption(f"該当 {len(positions):,} 行 / 全 {len(index):,} 行（{n_pages:,} ページ）")
+
+    page_df = index.page(positions, page, page_size)
+    st.dataframe(
+        page_df.style.set_properties(subset=["amount"], **{"text-align": "right"}),
+        use_container_width=True,
+        hide_index=True,
+    )
+
+
+# ============================================================
+# ドリルダウン（財務諸表のセル → 仕訳）
+#   core/finance/drilldown.py の逆引き索引で、選択したセルを構成する仕訳だけを表示する。
+# ============================================================
+DRILL_STATEMENTS = {"pl": "損益計算書（PL）", "bs": "貸借対照表（BS）", "cf": "資金収支（CF）"}
+DRILL_LABEL_MAPS = {"pl": PL_LABEL_MAP, "cf": CF_LABEL_MAP}
+
+
+def render_drilldown(drill):
+    d1, d2, d3 = st.columns([1, 2, 1])
+    with d1:
+        statement = st.selectbox("表", list(DRILL_STATEMENTS), format_func=DRILL_STATEMENTS.get,
+                                 key="drill_statement")
+    lmap = DRILL_LABEL_MAPS.get(statement, {})
+    with d2:
+        row = st.selectbox("行", drill.rows(statement), format_func=lambda r: lmap.get(r, r),
+                           key=f"drill_row_{statement}")
+    with d3:
+        year = st.selectbox("年", drill.years, key="drill_year")
+
+    rows = drill.drill(statement, row, year)
+    st.caption(
+        f"{lmap.get(row, row)}（Year {year}）= {drill.value(statement, row, year):,.0f}　"
+        f"構成仕訳 {len(rows):,} 行（sign：セルへの寄与の符号）"
+    )
+    if statement == "bs":
+        st.caption("BS は期首からの累計残高のため、過年度の仕訳も含みます。")
+    st.dataframe(
+        rows.style.set_properties(subset=["amount"], **{"text-align": "right"}),
+        use_container_width=True,
+        hide_index=True,
+    )
+
+
+# ============================================================
+# バックグラウンド実行（ui/jobs.py）
+# ============================================================
+@st.cache_resource
+def get_job_runner() -> JobRunner:
+    """全セッション共有のジョブ実行プール"""
+    return JobRunner(max_workers=2)
+
+
+@st.cache_resource
+def get_worker_pool() -> WorkerPool:
+    """全セッション共有の常駐ワーカープロセスプール（比較・スイープ用、ui/worker_pool.py）"""
+    return WorkerPool()
+
+
+def session_executor() -> SessionExecutor:
+    """このセッションの窓口（プールの公平キューはセッション単位で巡回する）"""
+    if "pool_session" not in st.session_state:
+        st.session_state["pool_session"] = uuid.uuid4().hex
+    return get_worker_pool().executor(st.session_state["pool_session"])
+
+
+def run_simulation_job(params: SimulationParams, scenario_name: str, progress) -> dict:
+    """
+    ワーカースレッドで実行する計算本体（st.* を呼ばないこと）。
+    シミュレーション → 財務諸表 → 経済探偵メトリクス → ダウンロード用ファイル。
+    """
+    total = params.holding_years
+    sim = Simulation(params, params.start_date)
+    sim.run(progress=progress)
+
+    progress("財務諸表", total, total)
+    ledger_df        = sim.ledger.get_df()
+    ledger_df_sorted = ledger_df.sort_values(["date", "id"]).reset_index(drop=True)
+    builder    = FinancialStatementBuilder(sim.ledger)
+    fs_data    = builder.build()
+    display_fs = create_display_dataframes(fs_data)
+    journal_index = JournalIndex(ledger_df_sorted)
+    drilldown     = builder.drilldown(ledger_df_sorted)
+
+    # 経済探偵メトリクス（ダウンロードとUIで共用）
+    metrics = calc_detective_metrics(fs_data, params, ledger_df_sorted)
+
+    progress("Excel出力", total, total)
+    excel = build_result_excel(fs_data, ledger_df_sorted, params, scenario_name, metrics)
+
+    return {
+        "params":           params,
+        "fs_data":          fs_data,
+        "display_fs":       display_fs,
+        "ledger_df_sorted": ledger_df_sorted,
+        "journal_index":    journal_index,
+        "drilldown":        drilldown,
+        "metrics":          metrics,
+        "scenario_csv":     build_scenario_csv(params, scenario_name),
+        "excel":            excel,
+        "now_str":          datetime.datetime.now().strftime("%Y%m%d_%H%M"),
+    }
+
+
+@st.fragment(run_every=0.5)
+def render_job_status():
+    """実行中ジョブの進捗表示（0.5秒ごとに再描画）。完了したら結果を session_state へ移す。"""
+    job = st.session_state.get("sim_job")
+    if job is None:
+        return
+
+    if not job.finished:
+        text = f"計算中… {job.phase}（{job.done}/{job.total} 年）" if job.total else "計算待ち…"
+        st.progress(job.fraction, text=text)
+        if st.button("⏹ 中断", key=f"cancel_{job.id}"):
+            job.cancel()
+        return
+
+    st.session_state["sim_job"] = None
+    if job.status == DONE:
+        st.session_state["sim_result"] = job.result
+        st.session_state["display_fs"]       = job.result["display_fs"]
+        st.session_state["ledger_df_sorted"] = job.result["ledger_df_sorted"]
+        st.session_state["journal_index"]    = job.result["journal_index"]
+        st.session_state["drilldown"]        = job.result["drilldown"]
+    elif job.status == CANCELLED:
+        st.session_state["sim_notice"] = "シミュレーションを中断しました。"
+    else:
+        st.session_state["sim_error"] = job.error
+    st.rerun(scope="app")
+
+
+def render_simulation_result(result: dict):
+    """貸借チェック・ダウンロード・経済探偵レポート"""
+    fs_data = result["fs_data"]
+    diff = fs_data.get("balance_diff", 0)
+    if fs_data.get("is_balanced", False):
+        st.success(f"✅ 貸借合致（差額 {diff:.0f} 円）")
+    else:
+        st.error(f"❌ 貸借不一致（差額 {diff:.0f} 円）")
+
+    # ── ダウンロードボタン ────────────────────────────
+    now_str = result["now_str"]
+    dl1, dl2 = st.columns(2)
+    with dl1:
+        st.download_button(
+            "📥 入力条件CSV をダウンロード",
+            data=result["scenario_csv"],
+            file_name=f"bkw_sim_input_{now_str}.csv",
+            mime="text/csv",
+            use_container_width=True,
+        )
+    with dl2:
+        st.download_button(
+            "📊 演算結果Excel をダウンロード",
+            data=result["excel"],
+            file_name=f"bkw_sim_result_{now_str}.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            use_container_width=True,
+        )
+
+    # 経済探偵レポート（UI表示）
+    economic_detective_report(fs_data, result["params"], result["ledger_df_sorted"])
+
+
+
+# ============================================================
+# シナリオ比較（core/simulation/compare.py）
+#   サイドバーの入力を変種として最大 MAX_VARIANTS 件保持し、
+#   常駐ワーカープールで並列に計算して比較表（基準との差額付き）を表示する。
+# ============================================================
+def run_compare_job(variants: dict, executor, progress) -> dict:
+    """ワーカースレッドで実行（各変種の計算はワーカープロセス）。st.* を呼ばないこと。"""
+    return compare_scenarios(variants, executor=executor, progress=progress)
+
+
+@st.fragment(run_every=0.5)
+def render_compare_status():
+    """比較ジョブの進捗表示。完了したら結果を session_state へ移す。"""
+    job = st.session_state.get("compare_job")
+    if job is None:
+        return
+
+    if not job.finished:
+        text = f"比較計算中…（{job.done}/{job.total} シナリオ）" if job.total else "計算待ち…"
+        st.progress(job.fraction, text=text)
+        if st.button("⏹ 中断", key=f"cancel_compare_{job.id}"):
+            job.cancel()
+        return
+
+    st.session_state["compare_job"] = None
+    if job.status == DONE:
+        st.session_state["compare_result"] = job.result
+    elif job.status == CANCELLED:
+        st.session_state["sim_notice"] = "シナリオ比較を中断しました。"
+    else:
+        st.session_state["sim_error"] = job.error
+    st.rerun(scope="app")
+
+
+def render_comparison(params: SimulationParams, scenario_name: str, run_disabled: bool):
+    """比較する変種の管理・実行・比較表"""
+    variants = st.session_state.setdefault("compare_variants", {})
+
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        add = st.button(
+            "➕ 現在の入力を比較に追加", use_container_width=True,
+            disabled=run_disabled or len(variants) >= MAX_VARIANTS,
+        )
+    if add:
+        name = scenario_name or f"シナリオ{len(variants) + 1}"
+        while name in variants:
+            name += "'"
+        variants[name] = params
+        st.session_state.pop("compare_result", None)
+    with c2:
+        run = st.button("🆚 比較を実行", use_container_width=True, disabled=len(variants) < 2)
+    with c3:
+        if st.button("🗑 比較をクリア", use_container_width=True, disabled=not variants):
+            variants.clear()
+            st.session_state.pop("compare_result", None)
+
+    if variants:
+        st.caption("比較対象：" + "、".join(
+            f"{n}（{p.holding_years}年・借入 {p.initial_loan.amount:,.0f}）" if p.initial_loan
+            else f"{n}（{p.holding_years}年・借入なし）"
+            for n, p in variants.items()
+        ))
+    if run:
+        prev = st.session_state.get("compare_job")
+        if prev is not None and not prev.finished:
+            prev.cancel()
+        st.session_state["compare_job"] = get_job_runner().submit(
+            run_compare_job, dict(variants), session_executor(), label="比較",
+        )
+
+    if st.session_state.get("compare_job") is not None:
+        render_compare_status()
+
+    results = st.session_state.get("compare_result")
+    if results is None:
+        return
+    base = st.selectbox("基準シナリオ（Δ = 各シナリオ − 基準）", list(results), key="compare_base")
+    st.markdown("#### 指標")
+    st.dataframe(metrics_table(results, base).style.format("{:,.4g}", na_rep="—"),
+                 use_container_width=True)
+    tabs = st.tabs([DRILL_STATEMENTS[k] for k in ("pl", "bs", "cf")])
+    for tab, key in zip(tabs, ("pl", "bs", "cf")):
+        with tab:
+            table = diff_table(results, key, base).rename(index=DRILL_LABEL_MAPS.get(key, {}), level=0)
+            st.dataframe(table.style.format("{:,.0f}", na_rep="—"), use_container_width=True)
+
+
 def main():
     st.set_page_config(layout="wide", page_title="BKW Invest Sim (Amelia v4)")
     inject_global_css()
     st.title("💰 BKW 不動産投資シミュレーション")
     st.caption("仕様書 v4訂正済準拠版")
 
+    # ワーカープールはサーバー起動後の最初の表示で立ち上げておく（初回の比較・スイープを待たせない）
+    get_worker_pool()
+
     params = setup_sidebar()
 
     # ── 4) 前提条件サマリー（3列、全18項目）────────────────────
@@ -958,59 +1279,34 @@ def main():
     if errors:
         st.caption("※ 入力エラーを修正すると実行できます。")
 
-    # ── 実行処理 ──────────────────────────────────────────────
+    # ── 実行処理（バックグラウンドジョブ）────────────────────
     if run_clicked:
-        try:
-            with st.spinner("計算中..."):
-                sim = Simulation(params, params.start_date)
-                sim.run()
+        prev = st.session_state.get("sim_job")
+        if prev is not None and not prev.finished:
+            prev.cancel()
+        st.session_state["sim_job"] = get_job_runner().submit(
+            run_simulation_job, params, scenario_name, label=scenario_name,
+        )
 
-            ledger_df        = sim.ledger.get_df()
-            ledger_df_sorted = ledger_df.sort_values(["date", "id"]).reset_index(drop=True)
+    if st.session_state.get("sim_job") is not None:
+        render_job_status()
 
-            fs_builder = FinancialStatementBuilder(sim.ledger)
-            fs_data    = fs_builder.build()
-            display_fs = create_display_dataframes(fs_data)
+    notice = st.session_state.pop("sim_notice", None)
+    if notice:
+        st.info(notice)
+    error = st.session_state.pop("sim_error", None)
+    if error is not None:
+        st.error(f"シミュレーションエラー: {str(error)}")
+        st.code("".join(traceback.format_exception(error)))
 
-            diff = fs_data.get("balance_diff", 0)
-            if fs_data.get("is_balanced", False):
-                st.success(f"✅ 貸借合致（差額 {diff:.0f} 円）")
-            else:
-                st.error(f"❌ 貸借不一致（差額 {diff:.0f} 円）")
-
-            # 経済探偵メトリクス（ダウンロードとUIで共用）
-            metrics = calc_detective_metrics(fs_data, params, ledger_df_sorted)
-
-            # ── ダウンロードボタン ────────────────────────────
-            now_str = datetime.datetime.now().strftime("%Y%m%d_%H%M")
-            dl1, dl2 = st.columns(2)
-            with dl1:
-                st.download_button(
-                    "📥 入力条件CSV をダウンロード",
-                    data=build_scenario_csv(params, scenario_name),
-                    file_name=f"bkw_sim_input_{now_str}.csv",
-                    mime="text/csv",
-                    use_container_width=True,
-                )
-            with dl2:
-                st.download_button(
-                    "📊 演算結果Excel をダウンロード",
-                    data=build_result_excel(fs_data, ledger_df_sorted, params, scenario_name, metrics),
-                    file_name=f"bkw_sim_result_{now_str}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    use_container_width=True,
-                )
-
-            # 経済探偵レポート（UI表示）
-            economic_detective_report(fs_data, params, ledger_df_sorted)
-
-            st.session_state["display_fs"]       = display_fs
-            st.session_state["ledger_df_sorted"] = ledger_df_sorted
+    result = st.session_state.get("sim_result")
+    if result is not None:
+        render_simulation_result(result)
 
-        except Exception as e:
-            st.error(f"シミュレーションエラー: {str(e)}")
-            st.code(traceback.format_exc())
-            return
+    # ── シナリオ比較 ──────────────────────────────────────────
+    with st.expander("🆚 シナリオ比較（借入条件・売却年などの違いを並べて表示）",
+                     expanded=bool(st.session_state.get("compare_variants"))):
+        render_comparison(params, scenario_name, run_disabled)
 
     # ── 財務三表タブ ──────────────────────────────────────────
     if "display_fs" in st.session_state:
@@ -1021,17 +1317,22 @@ def main():
             "🏦 貸借対照表（BS）",
             "💸 資金収支（CF）",
             "📒 全仕訳",
+            "🔍 ドリルダウン",
         ])
         with tabs[0]: render_pl(dfs)
         with tabs[1]: render_bs(dfs)
         with tabs[2]: render_cf(dfs)
         with tabs[3]:
-            amt_cols = ["amount"] if "amount" in ldfs.columns else []
-            st.dataframe(
-                ldfs.style.set_properties(subset=amt_cols, **{"text-align": "right"})
-                if amt_cols else ldfs,
-                use_container_width=True,
-            )
+            index = st.session_state.get("journal_index")
+            if index is None:
+                index = st.session_state["journal_index"] = JournalIndex(ldfs)
+            render_journal(index)
+        with tabs[4]:
+            drill = st.session_state.get("drilldown")
+            if drill is None:
+                st.info("再計算するとドリルダウンを利用できます。")
+            else:
+                render_drilldown(drill)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,117 @@
+# ==============================
+#  bkw_sim_amelia1/ui/jobs.py
+#  バックグラウンドジョブ（進捗表示・中断）
+# ==============================
+#
+# 【責務】
+#   シミュレーション・Excel 出力などの重い処理をワーカースレッドで実行し、
+#   Streamlit のセッション（画面）を止めずに進捗と結果を受け渡す。
+#
+# 【構成】
+#   JobRunner : 全セッション共有のスレッドプール（app.py で st.cache_resource に保持）
+#   Job       : セッションごとのジョブハンドル（st.session_state に保持）
+#               status / phase / done / total / result / error を参照し、cancel() で中断要求
+#
+# 【ジョブ関数の書き方】
+#   runner.submit(fn, *args) で登録すると、fn は progress キーワード引数付きで呼ばれる。
+#     fn(*args, progress=callback)
+#   callback(phase, done, total) は Job の進捗を更新し、中断要求があれば
+#   SimulationCancelled を送出する。Simulation.run(progress=...) /
+#   GridSweep.run(progress=...) にそのまま渡せる。
+#
+# ==============================
+
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from core.simulation.simulation import SimulationCancelled
+
+
+PENDING   = "pending"
+RUNNING   = "running"
+DONE      = "done"
+FAILED    = "failed"
+CANCELLED = "cancelled"
+
+
+class Job:
+    """1件のジョブの状態（ワーカースレッドが更新し、画面側は読むだけ）。"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, label: str = ""):
+        self.id     = next(self._ids)
+        self.label  = label
+        self.status = PENDING
+        self.phase  = ""
+        self.done   = 0
+        self.total  = 0
+        self.result = None
+        self.error  = None
+        self._cancel = threading.Event()
+        self._finished = threading.Event()
+
+    # --------------------------------------------------------
+    # 画面側
+    # --------------------------------------------------------
+    @property
+    def fraction(self) -> float:
+        if self.status == DONE:
+            return 1.0
+        return min(1.0, self.done / self.total) if self.total else 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    def cancel(self) -> None:
+        """中断を要求する（次の進捗通知の時点で中断される）。"""
+        self._cancel.set()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._finished.wait(timeout)
+
+    # --------------------------------------------------------
+    # ワーカー側
+    # --------------------------------------------------------
+    def progress(self, phase: str, done: int, total: int) -> None:
+        if self._cancel.is_set():
+            raise SimulationCancelled()
+        self.phase, self.done, self.total = phase, done, total
+
+    def _run(self, fn, args, kwargs) -> None:
+        if self._cancel.is_set():
+            self.status = CANCELLED
+            self._finished.set()
+            return
+        self.status = RUNNING
+        try:
+            self.result = fn(*args, progress=self.progress, **kwargs)
+            self.status = DONE
+        except SimulationCancelled:
+            self.status = CANCELLED
+        except Exception as e:   # 画面側で表示する
+            self.error  = e
+            self.status = FAILED
+        finally:
+            self._finished.set()
+
+
+class JobRunner:
+    """全セッション共有のスレッドプール。"""
+
+    def __init__(self, max_workers: int = 2):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bkw-job")
+
+    def submit(self, fn, *args, label: str = "", **kwargs) -> Job:
+        job = Job(label)
+        self._pool.submit(job._run, fn, args, kwargs)
+        return job
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+# ==============================
+#  ui/jobs.py end
+# ==============================
@@ -0,0 +1,99 @@
+# ==============================
+#  bkw_sim_amelia1/ui/pages/results_warehouse.py
+#  実行結果ウェアハウスの閲覧（core/simulation/results_store.py）
+#  指標条件で絞り込み・並べ替え → 選択した実行の PL/BS/CF を表示
+# ==============================
+
+import os
+import sys
+
+current_dir  = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, "..", ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import streamlit as st
+
+st.set_page_config(
+    page_title="BKW Invest Sim - 結果ウェアハウス",
+    layout="wide"
+)
+
+from core.simulation.results_store import DEFAULT_STORE_PATH, FILTER_OPS, ResultsStore
+from core.simulation.sweep import SWEEP_METRICS
+
+
+METRIC_LABELS = {
+    "final_cash":      "最終預金残高",
+    "npv":             "NPV",
+    "min_cash":        "最小預金残高",
+    "total_tax":       "税額合計",
+    "irr":             "IRR",
+    "equity_multiple": "エクイティ倍率",
+    "min_dscr":        "最小DSCR",
+}
+
+
+@st.cache_resource
+def get_store(path: str) -> ResultsStore:
+    return ResultsStore(path)
+
+
+def filter_inputs() -> list:
+    """サイドバーの指標条件 → [(指標, 演算子, 値), ...]"""
+    filters = []
+    n = st.sidebar.number_input("条件の数", min_value=0, max_value=len(SWEEP_METRICS), value=0, step=1)
+    for i in range(int(n)):
+        c1, c2, c3 = st.sidebar.columns([3, 2, 3])
+        metric = c1.selectbox("指標", SWEEP_METRICS, index=i, key=f"wh_metric_{i}",
+                              format_func=METRIC_LABELS.get)
+        op     = c2.selectbox("演算子", FILTER_OPS, index=FILTER_OPS.index(">"), key=f"wh_op_{i}")
+        value  = c3.number_input("値", value=0.0, key=f"wh_value_{i}", format="%.4f")
+        filters.append((metric, op, value))
+    return filters
+
+
+def main():
+    st.title("結果ウェアハウス")
+
+    path  = st.sidebar.text_input("データベース", os.environ.get("BKW_RESULTS_DB", DEFAULT_STORE_PATH))
+    store = get_store(path)
+    if len(store) == 0:
+        st.info("記録された実行結果がありません（python -m core.simulation.cli ... --store で記録）。")
+        return
+
+    batch = st.sidebar.selectbox("バッチ", ["（すべて）"] + store.batches())
+    filters = filter_inputs()
+    order_by = st.sidebar.selectbox("並べ替え", ["（記録順）"] + SWEEP_METRICS,
+                                    format_func=lambda m: METRIC_LABELS.get(m, m))
+    descending = st.sidebar.checkbox("降順", value=True)
+    limit = st.sidebar.number_input("表示件数", min_value=10, max_value=10_000, value=500, step=10)
+
+    df = store.query(
+        filters,
+        order_by=None if order_by == "（記録順）" else order_by,
+        descending=descending,
+        limit=int(limit),
+        batch=None if batch == "（すべて）" else batch,
+    )
+    st.caption(f"該当 {len(df):,} 件 / 全 {len(store):,} 件")
+    st.dataframe(
+        df.rename(columns=METRIC_LABELS).style.set_properties(
+            subset=[METRIC_LABELS[m] for m in SWEEP_METRICS], **{"text-align": "right"}
+        ),
+        use_container_width=True,
+        hide_index=True,
+    )
+    if df.empty:
+        return
+
+    labels = {r.run_id: f"{r.name or r.run_id[:8]}（{r.batch or '-'}）" for r in df.itertuples()}
+    run_id = st.selectbox("財務諸表を表示する実行", list(labels), format_func=labels.get)
+    fs = store.statements(run_id)
+    tabs = st.tabs(["📊 損益計算書（PL）", "🏦 貸借対照表（BS）", "💸 資金収支（CF）"])
+    for tab, key in zip(tabs, ("pl", "bs", "cf")):
+        with tab:
+            st.dataframe(fs[key].style.format("{:,.0f}", na_rep=""), use_container_width=True)
+
+
+main()
@@ -0,0 +1,185 @@
+# ==============================
+#  bkw_sim_amelia1/ui/worker_pool.py
+#  常駐ワーカープロセスプール（セッション間で公平に共有）
+# ==============================
+#
+# 【責務】
+#   複数シナリオの比較・グリッドスイープなど CPU を使う計算を、
+#   サーバープロセスに1つだけ常駐するワーカープロセス群で実行する。
+#   クリックのたびにプロセスを起動すると 1シミュレーションより起動の方が重いため、
+#   プールは起動時に全ワーカーを立ち上げ、計算エンジンのモジュールを import 済みにしておく。
+#
+# 【構成】
+#   WorkerPool      : サーバー全体で1つ（app.py で st.cache_resource に保持）
+#   SessionExecutor : セッションごとの窓口（concurrent.futures.Executor 互換）
+#                     GridSweep(executor=...) にそのまま渡せる
+#
+# 【公平なキュー】
+#   タスクはセッションごとの待ち行列に入り、ディスパッチャがセッションを順に巡回して
+#   1件ずつワーカーへ渡す（ラウンドロビン）。ワーカーへ渡すのは空いている台数分だけなので、
+#   大きなスイープを投入したセッションがあっても、後から来たセッションのタスクは
+#   次に空いたワーカーで実行される。
+#
+# 【ジョブ関数の書き方】
+#   ワーカープロセスで実行するため、fn・引数・戻り値は pickle できること
+#   （モジュールの最上位で定義した関数。st.* を呼ばないこと）。
+#
+# ==============================
+
+import importlib
+import os
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import CancelledError, Executor, Future, ProcessPoolExecutor
+
+
+# ワーカー起動時に import しておくモジュール（初回タスクの import 待ちをなくす）
+WARM_MODULES = (
+    "config.params",
+    "core.simulation.simulation",
+    "core.simulation.sweep",
+    "core.finance.fs_builder",
+    "core.engine.cashflow_kernel",
+)
+
+
+def _warm(modules: tuple) -> None:
+    """ワーカープロセスの初期化（ProcessPoolExecutor の initializer）"""
+    for name in modules:
+        importlib.import_module(name)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class WorkerPool:
+    """サーバー全体で共有する常駐ワーカープロセスプール。"""
+
+    def __init__(self, max_workers: int = None, modules: tuple = WARM_MODULES):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=_warm, initargs=(tuple(modules),),
+        )
+        self._cond      = threading.Condition()
+        self._queues    = OrderedDict()   # セッション → deque[(fn, args, kwargs, future)]
+        self._in_flight = 0
+        self._closed    = False
+
+        # 全ワーカーを起動して import を済ませる（起動したワーカーの pid）
+        self.pids = sorted({f.result() for f in [self._pool.submit(_ping) for _ in range(self.max_workers)]})
+
+        self._dispatcher = threading.Thread(
+            target=self._dispatch, name="bkw-pool-dispatch", daemon=True,
+        )
+        self._dispatcher.start()
+
+    # --------------------------------------------------------
+    # 投入・取り消し
+    # --------------------------------------------------------
+    def submit(self, session, fn, *args, **kwargs) -> Future:
+        """session の待ち行列に fn(*args, **kwargs) を追加する。"""
+        fut = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("WorkerPool は停止しています。")
+            self._queues.setdefault(session, deque()).append((fn, args, kwargs, fut))
+            self._cond.notify_all()
+        return fut
+
+    def cancel(self, session) -> int:
+        """session の未着手のタスクを取り消し、取り消した件数を返す。"""
+        with self._cond:
+            queue = self._queues.pop(session, ())
+        for *_, fut in queue:
+            fut.cancel()
+        return len(queue)
+
+    def pending(self, session=None) -> int:
+        """未着手のタスク数（session 省略時は全セッション）"""
+        with self._cond:
+            if session is not None:
+                return len(self._queues.get(session, ()))
+            return sum(len(q) for q in self._queues.values())
+
+    def executor(self, session) -> "SessionExecutor":
+        return SessionExecutor(self, session)
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._closed = True
+            sessions = list(self._queues)
+            self._cond.notify_all()
+        for s in sessions:
+            self.cancel(s)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # --------------------------------------------------------
+    # ディスパッチャ（ラウンドロビン）
+    # --------------------------------------------------------
+    def _dispatch(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed and (self._in_flight >= self.max_workers or not self._queues):
+                    self._cond.wait()
+                if self._closed:
+                    return
+                session, queue = next(iter(self._queues.items()))
+                fn, args, kwargs, fut = queue.popleft()
+                # 次はほかのセッションの番（待ち行列が空になったセッションは外す）
+                if queue:
+                    self._queues.move_to_end(session)
+                else:
+                    del self._queues[session]
+                if not fut.set_running_or_notify_cancel():
+                    continue
+                self._in_flight += 1
+
+            try:
+                inner = self._pool.submit(fn, *args, **kwargs)
+            except Exception as e:   # BrokenProcessPool など
+                self._finish(fut, None, e)
+                continue
+            inner.add_done_callback(lambda f, fut=fut: self._finish(fut, f))
+
+    def _finish(self, fut: Future, inner: Future, error: Exception = None) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+        if inner is not None:
+            error = CancelledError() if inner.cancelled() else inner.exception()
+        if error is not None:
+            fut.set_exception(error)
+        else:
+            fut.set_result(inner.result())
+
+
+class SessionExecutor(Executor):
+    """
+    1セッション分の窓口（concurrent.futures.Executor 互換）。
+    shutdown(cancel_futures=True) はこのセッションの未着手タスクだけを取り消し、
+    プール自体は止めない。
+    """
+
+    def __init__(self, pool: WorkerPool, session):
+        self.pool    = pool
+        self.session = session
+        self._futures = []
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        fut = self.pool.submit(self.session, fn, *args, **kwargs)
+        self._futures.append(fut)
+        return fut
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        if cancel_futures:
+            self.pool.cancel(self.session)
+        if wait:
+            for fut in self._futures:
+                if not fut.cancelled():
+                    fut.exception()
+        self._futures = []
+
+# ==============================
+#  ui/worker_pool.py end
+# ==============================